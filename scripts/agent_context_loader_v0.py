@@ -9,13 +9,46 @@ strict file/character budgets.
 from __future__ import annotations
 
 import argparse
+import codecs
+import io
 import json
+import mmap
+import os
+import sys
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator, TextIO
+
+from context_artifact_index_v0 import ArtifactIndex, default_index_file
+from context_bm25_index_v0 import Bm25Index
+from context_bm25_index_v0 import default_index_file as default_bm25_index_file
+from context_bundle_cache_v0 import DEFAULT_MAX_BYTES, BundleCache, cache_key, default_cache_dir
+from context_bundle_delta_v0 import build_delta, load_manifest, record_manifest
+from context_packer_v0 import CHARS_PER_TOKEN, pack_files
+from file_digest_cache_v0 import DigestCache
+from file_digest_cache_v0 import default_cache_file as default_digest_cache_file
+from parallel_io_v0 import io_workers, map_ordered
 
 
 DEFAULT_MAX_FILES = 12
 DEFAULT_MAX_CHARS_PER_FILE = 2500
+# With a global budget, up to this many times --max-files candidates compete for the packed characters.
+PACK_CANDIDATE_FACTOR = 4
+# Loader modules whose digests salt bundle cache keys, so a code change never serves stale bundles.
+BUNDLE_CACHE_CODE_FILES = (
+    "agent_context_loader_v0.py",
+    "context_artifact_index_v0.py",
+    "context_bm25_index_v0.py",
+    "context_bundle_delta_v0.py",
+    "context_packer_v0.py",
+)
+
+# Excerpts decode only the bytes their character budget needs. Files at or above the mmap
+# threshold are decoded straight from the mapping; smaller ones are read through one reusable
+# per-thread buffer.
+EXCERPT_READ_BUFFER_BYTES = 64 * 1024
+EXCERPT_MIN_READ_BYTES = 4096
+EXCERPT_MMAP_THRESHOLD_BYTES = 1024 * 1024
 
 CONTROL_PLANE_ORDER = [
     ".cortex/manifest_v0.json",
@@ -52,7 +85,7 @@ TASK_PATTERNS = {
 }
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description=__doc__)
     p.add_argument("--project-dir", required=True)
     p.add_argument("--task", default="default")
@@ -69,7 +102,65 @@ def parse_args() -> argparse.Namespace:
         help="Optional assets root for compatibility metadata (reserved for future asset-backed loading).",
     )
     p.add_argument("--out-file", help="Optional output path; defaults to stdout")
-    return p.parse_args()
+    p.add_argument(
+        "--format",
+        choices=["json", "ndjson"],
+        default="json",
+        help="One JSON bundle (default) or streamed NDJSON records: header, one per file as it is read, summary.",
+    )
+    p.add_argument(
+        "--max-total-chars",
+        type=int,
+        help="Global character budget; packs the best sections of candidate files instead of per-file excerpts.",
+    )
+    p.add_argument(
+        "--max-tokens",
+        type=int,
+        help=f"Approximate global token budget ({CHARS_PER_TOKEN} characters per token); the smaller budget wins.",
+    )
+    p.add_argument(
+        "--ranking",
+        choices=["pattern", "bm25"],
+        default="pattern",
+        help="Order task files by TASK_PATTERNS glob order (default) or by BM25 score against the full task text.",
+    )
+    p.add_argument(
+        "--no-artifact-index",
+        action="store_true",
+        help="Glob and tokenize directly instead of using the persisted indexes under .cortex/state/cache/.",
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always rebuild the bundle instead of serving it from the bundle cache under .cortex/state/cache/.",
+    )
+    p.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Size limit of the bundle cache; least recently used bundles are evicted beyond it.",
+    )
+    p.add_argument(
+        "--since-bundle",
+        metavar="SHA256",
+        help="Emit only sections added, changed or removed since the bundle whose output bytes hash to SHA256.",
+    )
+    p.add_argument(
+        "--watch",
+        action="store_true",
+        help="Serve NDJSON load requests from an in-memory corpus kept current by inotify (or mtime polling).",
+    )
+    p.add_argument("--socket", help="With --watch, listen on this Unix socket instead of stdin/stdout.")
+    p.add_argument(
+        "--watch-backend",
+        choices=["auto", "inotify", "poll"],
+        default="auto",
+        help="Change tracking for --watch (default: inotify when available, else stat polling per request).",
+    )
+    args = p.parse_args(argv)
+    if args.format == "ndjson" and args.since_bundle:
+        p.error("--since-bundle requires --format json")
+    return args
 
 
 def normalize_task(task: str) -> str:
@@ -85,27 +176,139 @@ def normalize_task(task: str) -> str:
     return "default"
 
 
+_read_buffers = threading.local()
+
+
+def _shared_read_buffer() -> memoryview:
+    buf = getattr(_read_buffers, "buf", None)
+    if buf is None:
+        buf = memoryview(bytearray(EXCERPT_READ_BUFFER_BYTES))
+        _read_buffers.buf = buf
+    return buf
+
+
 def read_excerpt(path: Path, max_chars: int) -> tuple[str, bool]:
-    text = path.read_text(encoding="utf-8", errors="replace")
+    # Decodes exactly like `read_text(encoding="utf-8", errors="replace")` (newline translation included),
+    # but stops once `max_chars + 1` characters exist; the extra character only decides `truncated`.
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True)
+    parts: list[str] = []
+    have = 0
+    with path.open("rb") as fh:
+        file_size = os.fstat(fh.fileno()).st_size
+        if file_size >= EXCERPT_MMAP_THRESHOLD_BYTES:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                offset = 0
+                while have <= max_chars and offset < len(view):
+                    size = max(max_chars + 1 - have, EXCERPT_MIN_READ_BYTES)
+                    with view[offset : offset + size] as chunk:
+                        text = decoder.decode(chunk)
+                        offset += len(chunk)
+                    parts.append(text)
+                    have += len(text)
+        else:
+            buf = _shared_read_buffer()
+            while have <= max_chars:
+                size = min(len(buf), max(max_chars + 1 - have, EXCERPT_MIN_READ_BYTES))
+                count = fh.readinto(buf[:size])
+                if not count:
+                    break
+                text = decoder.decode(buf[:count])
+                parts.append(text)
+                have += len(text)
+    if have <= max_chars:
+        parts.append(decoder.decode(b"", final=True))
+    text = "".join(parts)
     if len(text) <= max_chars:
         return text, False
     return text[:max_chars], True
 
 
-def find_latest(path_glob: str, project_dir: Path) -> Path | None:
-    candidates = sorted(project_dir.glob(path_glob))
+def _read_file(
+    project_dir: Path,
+    rel: str,
+    max_chars: int | None,
+    read_text: Callable[[str], str] | None,
+) -> tuple[str, bool]:
+    """Excerpt of `rel` (whole file when `max_chars` is None), from disk or from a `read_text` corpus."""
+    if read_text is None:
+        if max_chars is None:
+            return (project_dir / rel).read_text(encoding="utf-8", errors="replace"), False
+        return read_excerpt(project_dir / rel, max_chars)
+    text = read_text(rel)
+    if max_chars is None or len(text) <= max_chars:
+        return text, False
+    return text[:max_chars], True
+
+
+def _read_files(
+    project_dir: Path,
+    entries: list[dict[str, Any]],
+    max_chars: int | None,
+    read_text: Callable[[str], str] | None,
+) -> list[tuple[str | None, bool]]:
+    """`_read_file` for each entry in order, concurrently from disk; `(None, False)` for files gone since selection."""
+    rels = [str(entry["path"]) for entry in entries]
+    if read_text is None:
+        outcomes = map_ordered(lambda rel: _read_file(project_dir, rel, max_chars, None), rels)
+    else:
+        # Corpus readers keep unsynchronized caches; stay on this thread.
+        outcomes = []
+        for rel in rels:
+            try:
+                outcomes.append((_read_file(project_dir, rel, max_chars, read_text), None))
+            except OSError as exc:
+                outcomes.append((None, exc))
+    reads: list[tuple[str | None, bool]] = []
+    for result, error in outcomes:
+        if isinstance(error, FileNotFoundError):
+            reads.append((None, False))
+        elif error is not None:
+            raise error
+        else:
+            reads.append(result or (None, False))
+    return reads
+
+
+def index_patterns() -> list[str]:
+    """Every directory glob the loader selects from (indexed by `context_artifact_index_v0`)."""
+    patterns = [rel for rel in CONTROL_PLANE_ORDER if "*" in rel] + [ACTIVE_DECISION_GLOB]
+    for task_patterns in TASK_PATTERNS.values():
+        patterns.extend(pat for pat in task_patterns if pat not in patterns)
+    return patterns
+
+
+def _sorted_matches(
+    project_dir: Path,
+    path_glob: str,
+    index: ArtifactIndex | None,
+    files_only: bool = False,
+) -> list[str]:
+    if index is not None:
+        return index.matches(path_glob, files_only=files_only)
+    return [
+        str(p.relative_to(project_dir))
+        for p in sorted(project_dir.glob(path_glob))
+        if not files_only or p.is_file()
+    ]
+
+
+def find_latest(path_glob: str, project_dir: Path, index: ArtifactIndex | None = None) -> Path | None:
+    candidates = _sorted_matches(project_dir, path_glob, index)
     if not candidates:
         return None
-    return candidates[-1]
+    return project_dir / candidates[-1]
 
 
-def select_control_plane(project_dir: Path) -> tuple[list[dict[str, Any]], list[str]]:
+def select_control_plane(
+    project_dir: Path,
+    index: ArtifactIndex | None = None,
+) -> tuple[list[dict[str, Any]], list[str]]:
     selected: list[dict[str, Any]] = []
     warnings: list[str] = []
 
     for rel in CONTROL_PLANE_ORDER:
         if "*" in rel:
-            p = find_latest(rel, project_dir)
+            p = find_latest(rel, project_dir, index)
         else:
             p = project_dir / rel
 
@@ -115,29 +318,30 @@ def select_control_plane(project_dir: Path) -> tuple[list[dict[str, Any]], list[
         selected.append({"path": str(p.relative_to(project_dir)), "selected_by": "control_plane"})
 
     # Load latest promoted decision artifacts early so future agents inherit recent decisions.
-    decision_candidates = sorted(project_dir.glob(ACTIVE_DECISION_GLOB))
+    decision_candidates = _sorted_matches(project_dir, ACTIVE_DECISION_GLOB, index)
     if not decision_candidates:
         warnings.append(f"missing_control_plane_file:{ACTIVE_DECISION_GLOB}")
     else:
-        for p in decision_candidates[-MAX_ACTIVE_DECISIONS:]:
+        for rel in decision_candidates[-MAX_ACTIVE_DECISIONS:]:
             selected.append(
                 {
-                    "path": str(p.relative_to(project_dir)),
+                    "path": rel,
                     "selected_by": "control_plane:active_decision",
                 }
             )
     return selected, warnings
 
 
-def select_task_files(project_dir: Path, task_key: str) -> list[dict[str, Any]]:
+def select_task_files(
+    project_dir: Path,
+    task_key: str,
+    index: ArtifactIndex | None = None,
+) -> list[dict[str, Any]]:
     patterns = TASK_PATTERNS.get(task_key, TASK_PATTERNS["default"])
     out: list[dict[str, Any]] = []
     seen: set[str] = set()
     for pat in patterns:
-        for p in sorted(project_dir.glob(pat)):
-            if not p.is_file():
-                continue
-            rel = str(p.relative_to(project_dir))
+        for rel in _sorted_matches(project_dir, pat, index, files_only=True):
             if rel in seen:
                 continue
             seen.add(rel)
@@ -145,76 +349,228 @@ def select_task_files(project_dir: Path, task_key: str) -> list[dict[str, Any]]:
     return out
 
 
-def build_bundle(
+def ranking_candidates(project_dir: Path, index: ArtifactIndex | None = None) -> list[str]:
+    """Every file any task bucket could select, in first-seen pattern order."""
+    seen: dict[str, None] = {}
+    for pat in index_patterns():
+        if pat in CONTROL_PLANE_ORDER or pat == ACTIVE_DECISION_GLOB:
+            continue
+        for rel in _sorted_matches(project_dir, pat, index, files_only=True):
+            seen.setdefault(rel, None)
+    return list(seen)
+
+
+def rank_task_files(
     project_dir: Path,
     task: str,
-    max_files: int,
-    max_chars_per_file: int,
+    task_key: str,
+    index: ArtifactIndex | None = None,
+    bm25_index: Bm25Index | None = None,
+) -> list[dict[str, Any]]:
+    """BM25-ranked candidates first, then the remaining pattern-order task files as a fallback tail."""
+    if bm25_index is None:
+        bm25_index = Bm25Index(project_dir, None)
+    candidates = ranking_candidates(project_dir, index)
+    bm25_index.refresh(candidates)
+    out = [
+        {"path": rel, "selected_by": "task:bm25", "score": score}
+        for rel, score in bm25_index.rank(task, candidates)
+    ]
+    ranked = {entry["path"] for entry in out}
+    out.extend(entry for entry in select_task_files(project_dir, task_key, index) if entry["path"] not in ranked)
+    return out
+
+
+def contributing_files(project_dir: Path, index: ArtifactIndex | None = None) -> list[str]:
+    """Every path whose presence or content can change a bundle, for any task or ranking."""
+    rels = [rel for rel in CONTROL_PLANE_ORDER if "*" not in rel]
+    for pat in index_patterns():
+        rels.extend(_sorted_matches(project_dir, pat, index))
+    return list(dict.fromkeys(rels))
+
+
+def bundle_cache_key(
+    args: argparse.Namespace,
+    project_dir: Path,
+    max_total_chars: int | None,
+    index: ArtifactIndex,
+    digest_cache: DigestCache,
+) -> str:
+    code_dir = Path(__file__).resolve().parent
+    rels = contributing_files(project_dir, index)
+    paths = [code_dir / name for name in BUNDLE_CACHE_CODE_FILES] + [project_dir / rel for rel in rels]
+    digests: list[str | None] = []
+    for digest, error in digest_cache.sha256_many(paths):
+        if error is not None and not isinstance(error, OSError):
+            raise error
+        # Missing files and matched directories contribute only their (non-)existence.
+        digests.append(digest)
+    code_count = len(BUNDLE_CACHE_CODE_FILES)
+    return cache_key(
+        {
+            "project_dir": str(project_dir),
+            "assets_dir": str(Path(args.assets_dir).resolve()) if args.assets_dir else None,
+            "task": args.task,
+            "ranking": args.ranking,
+            "fallback_mode": args.fallback_mode,
+            "max_files": args.max_files,
+            "max_chars_per_file": args.max_chars_per_file,
+            "max_total_chars": max_total_chars,
+            "code": dict(zip(BUNDLE_CACHE_CODE_FILES, digests[:code_count])),
+            "files": dict(zip(rels, digests[code_count:])),
+        }
+    )
+
+
+def _out_path(args: argparse.Namespace, project_dir: Path) -> Path:
+    out = Path(args.out_file)
+    if not out.is_absolute():
+        out = project_dir / out
+    out.parent.mkdir(parents=True, exist_ok=True)
+    return out
+
+
+def write_output(args: argparse.Namespace, project_dir: Path, output: str) -> None:
+    if args.out_file:
+        _out_path(args, project_dir).write_text(output, encoding="utf-8")
+    else:
+        print(output, end="")
+
+
+def select_bundle_files(
+    project_dir: Path,
+    task: str,
+    file_limit: int,
     unrestricted: bool = False,
-) -> dict[str, Any]:
+    index: ArtifactIndex | None = None,
+    ranking: str = "pattern",
+    bm25_index: Bm25Index | None = None,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Ordered selection (`path`, `selected_by`, optional `score`) and selection warnings."""
     task_key = normalize_task(task)
     warnings: list[str] = []
 
-    control_files, control_warnings = select_control_plane(project_dir)
+    control_files, control_warnings = select_control_plane(project_dir, index)
     warnings.extend(control_warnings)
 
-    task_files = select_task_files(project_dir, task_key)
+    if ranking == "bm25":
+        task_files = rank_task_files(project_dir, task, task_key, index, bm25_index)
+    else:
+        task_files = select_task_files(project_dir, task_key, index)
     selected_meta: list[dict[str, Any]] = []
 
     # Always include control plane first.
     for entry in control_files:
-        if (not unrestricted) and len(selected_meta) >= max_files:
+        if (not unrestricted) and len(selected_meta) >= file_limit:
             break
         selected_meta.append(entry)
 
     # Then add task files.
     for entry in task_files:
-        if (not unrestricted) and len(selected_meta) >= max_files:
+        if (not unrestricted) and len(selected_meta) >= file_limit:
             break
         if any(e["path"] == entry["path"] for e in selected_meta):
             continue
         selected_meta.append(entry)
+    return selected_meta, warnings
 
-    excerpts: list[dict[str, Any]] = []
-    truncated_count = 0
-    for entry in selected_meta:
-        path = project_dir / entry["path"]
-        try:
-            if unrestricted:
-                excerpt = path.read_text(encoding="utf-8", errors="replace")
-                truncated = False
-            else:
-                excerpt, truncated = read_excerpt(path, max_chars_per_file)
-        except FileNotFoundError:
-            warnings.append(f"missing_after_select:{entry['path']}")
-            continue
-        if truncated:
-            truncated_count += 1
-        excerpts.append(
-            {
+
+def iter_bundle_files(
+    project_dir: Path,
+    selected: list[dict[str, Any]],
+    max_chars: int | None,
+    warnings: list[str],
+    read_text: Callable[[str], str] | None = None,
+    window: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Excerpt items for `selected` in order, reading `window` files at a time (default: all at once).
+
+    Files gone since selection are skipped with a `missing_after_select` warning appended to `warnings`.
+    """
+    window = max(1, window or len(selected))
+    for start in range(0, len(selected), window):
+        chunk = selected[start : start + window]
+        for entry, (excerpt, truncated) in zip(chunk, _read_files(project_dir, chunk, max_chars, read_text)):
+            if excerpt is None:
+                warnings.append(f"missing_after_select:{entry['path']}")
+                continue
+            item = {
                 "path": entry["path"],
                 "selected_by": entry["selected_by"],
                 "truncated": truncated,
                 "excerpt": excerpt,
             }
-        )
+            if "score" in entry:
+                item["score"] = entry["score"]
+            yield item
 
-    report = {
+
+def bundle_header(
+    project_dir: Path,
+    task: str,
+    ranking: str,
+    max_files: int,
+    max_chars_per_file: int,
+    unrestricted: bool,
+) -> dict[str, Any]:
+    return {
         "version": "v0",
         "project_dir": str(project_dir),
         "assets_dir": None,
         "task": task,
-        "task_key": task_key,
+        "task_key": normalize_task(task),
+        "ranking": ranking,
         "budget": {
             "max_files": None if unrestricted else max_files,
             "max_chars_per_file": None if unrestricted else max_chars_per_file,
             "unrestricted": unrestricted,
         },
-        "selected_file_count": len(excerpts),
-        "truncated_file_count": truncated_count,
-        "warnings": warnings,
-        "files": excerpts,
     }
+
+
+def build_bundle(
+    project_dir: Path,
+    task: str,
+    max_files: int,
+    max_chars_per_file: int,
+    unrestricted: bool = False,
+    index: ArtifactIndex | None = None,
+    ranking: str = "pattern",
+    bm25_index: Bm25Index | None = None,
+    max_total_chars: int | None = None,
+    read_text: Callable[[str], str] | None = None,
+) -> dict[str, Any]:
+    packed = max_total_chars is not None and not unrestricted
+    file_limit = max_files * PACK_CANDIDATE_FACTOR if packed else max_files
+    selected_meta, warnings = select_bundle_files(
+        project_dir, task, file_limit, unrestricted, index, ranking, bm25_index
+    )
+
+    if packed:
+        total = max(0, int(max_total_chars or 0))
+        candidates = [
+            {**item, "text": item["excerpt"]}
+            for item in iter_bundle_files(project_dir, selected_meta, total, warnings, read_text)
+        ]
+        excerpts, pack_warnings, packed_chars = pack_files(candidates, task, total, max_chars_per_file)
+        warnings.extend(pack_warnings)
+    else:
+        max_chars = None if unrestricted else max_chars_per_file
+        excerpts = list(iter_bundle_files(project_dir, selected_meta, max_chars, warnings, read_text))
+
+    report = bundle_header(project_dir, task, ranking, max_files, max_chars_per_file, unrestricted)
+    report.update(
+        {
+            "selected_file_count": len(excerpts),
+            "truncated_file_count": sum(1 for item in excerpts if item["truncated"]),
+            "warnings": warnings,
+            "files": excerpts,
+        }
+    )
+    if packed:
+        report["budget"]["max_total_chars"] = max_total_chars
+        report["budget"]["packed_chars"] = packed_chars
+        report["budget"]["candidate_file_limit"] = file_limit
     return report
 
 
@@ -231,87 +587,244 @@ def _bundle_success(report: dict[str, Any]) -> bool:
     return True
 
 
-def main() -> int:
-    args = parse_args()
-    project_dir = Path(args.project_dir).resolve()
-    base_files = max(1, args.max_files)
-    base_chars = max(100, args.max_chars_per_file)
-    bundle = build_bundle(
-        project_dir=project_dir,
-        task=args.task,
-        max_files=base_files,
-        max_chars_per_file=base_chars,
-    )
-    if args.assets_dir:
-        bundle["assets_dir"] = str(Path(args.assets_dir).resolve())
-
-    attempts: list[dict[str, Any]] = [
+def fallback_levels(
+    fallback_mode: str,
+    base_files: int,
+    base_chars: int,
+    base_total: int | None,
+) -> list[dict[str, Any]]:
+    """Budget attempts in order (`fallback_attempts` entries without `success`)."""
+    levels: list[dict[str, Any]] = [
         {
             "level": "restricted",
             "max_files": base_files,
             "max_chars_per_file": base_chars,
+            "max_total_chars": base_total,
             "unrestricted": False,
-            "success": _bundle_success(bundle),
         }
     ]
-    fallback_level = "restricted"
-
-    if args.fallback_mode == "priority" and not _bundle_success(bundle):
-        relaxed_files = max(2, int(base_files * 2))
-        relaxed_chars = max(200, int(base_chars * 2))
-        relaxed = build_bundle(
-            project_dir=project_dir,
-            task=args.task,
-            max_files=relaxed_files,
-            max_chars_per_file=relaxed_chars,
-        )
-        relaxed_ok = _bundle_success(relaxed)
-        attempts.append(
+    if fallback_mode == "priority":
+        levels.append(
             {
                 "level": "relaxed",
-                "max_files": relaxed_files,
-                "max_chars_per_file": relaxed_chars,
+                "max_files": max(2, int(base_files * 2)),
+                "max_chars_per_file": max(200, int(base_chars * 2)),
+                "max_total_chars": base_total * 2 if base_total is not None else None,
                 "unrestricted": False,
-                "success": relaxed_ok,
             }
         )
-        if relaxed_ok:
-            bundle = relaxed
-            fallback_level = "relaxed"
-
-    if args.fallback_mode == "priority" and not _bundle_success(bundle):
-        unrestricted = build_bundle(
-            project_dir=project_dir,
-            task=args.task,
-            max_files=base_files,
-            max_chars_per_file=base_chars,
-            unrestricted=True,
-        )
-        unrestricted_ok = _bundle_success(unrestricted)
-        attempts.append(
+        levels.append(
             {
                 "level": "unrestricted",
                 "max_files": None,
                 "max_chars_per_file": None,
+                "max_total_chars": None,
                 "unrestricted": True,
-                "success": unrestricted_ok,
             }
         )
-        bundle = unrestricted
-        fallback_level = "unrestricted"
+    return levels
+
+
+def _adopt_attempt(level: dict[str, Any], success: bool, first: bool) -> bool:
+    # The restricted attempt is the default, relaxed replaces it only on success, unrestricted always does.
+    return first or success or bool(level["unrestricted"])
+
+
+def build_output(
+    args: argparse.Namespace,
+    project_dir: Path,
+    base_files: int,
+    base_chars: int,
+    base_total: int | None,
+    index: ArtifactIndex,
+    bm25_index: Bm25Index | None,
+    read_text: Callable[[str], str] | None = None,
+) -> str:
+    bundle: dict[str, Any] = {}
+    fallback_level = "restricted"
+    attempts: list[dict[str, Any]] = []
+    for level in fallback_levels(args.fallback_mode, base_files, base_chars, base_total):
+        candidate = build_bundle(
+            project_dir=project_dir,
+            task=args.task,
+            max_files=level["max_files"] or base_files,
+            max_chars_per_file=level["max_chars_per_file"] or base_chars,
+            unrestricted=level["unrestricted"],
+            index=index,
+            ranking=args.ranking,
+            bm25_index=bm25_index,
+            max_total_chars=level["max_total_chars"],
+            read_text=read_text,
+        )
+        if not attempts and args.assets_dir:
+            candidate["assets_dir"] = str(Path(args.assets_dir).resolve())
+        success = _bundle_success(candidate)
+        if _adopt_attempt(level, success, not attempts):
+            bundle = candidate
+            fallback_level = level["level"]
+        attempts.append({**level, "success": success})
+        if success:
+            break
 
     bundle["fallback_level"] = fallback_level
     bundle["fallback_attempts"] = attempts
+    return json.dumps(bundle, indent=2, sort_keys=True) + "\n"
 
-    output = json.dumps(bundle, indent=2, sort_keys=True) + "\n"
-    if args.out_file:
-        out = Path(args.out_file)
-        if not out.is_absolute():
-            out = project_dir / out
-        out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(output, encoding="utf-8")
+
+def budgets(args: argparse.Namespace) -> tuple[int, int, int | None]:
+    """(max files, max chars per file, global character budget or None) after clamping."""
+    total_budgets = [args.max_total_chars, args.max_tokens * CHARS_PER_TOKEN if args.max_tokens else None]
+    total_budgets = [value for value in total_budgets if value]
+    base_total = max(100, min(total_budgets)) if total_budgets else None
+    return max(1, args.max_files), max(100, args.max_chars_per_file), base_total
+
+
+def finish_output(args: argparse.Namespace, output: str, manifest_cache: BundleCache | None) -> str:
+    """Record the bundle's section manifest and, with --since-bundle, replace `output` by its delta."""
+    if manifest_cache is None:
+        return output
+    # Manifests of emitted bundles are what later --since-bundle requests diff against.
+    bundle_sha256, bundle, manifest = record_manifest(manifest_cache, output)
+    if not args.since_bundle:
+        return output
+    previous = load_manifest(manifest_cache, args.since_bundle)
+    delta = build_delta(bundle, bundle_sha256, manifest, args.since_bundle, previous)
+    return json.dumps(delta, indent=2, sort_keys=True) + "\n"
+
+
+def _write_record(out: TextIO, record: dict[str, Any]) -> None:
+    out.write(json.dumps(record, sort_keys=True) + "\n")
+    out.flush()
+
+
+def stream_output(
+    args: argparse.Namespace,
+    project_dir: Path,
+    base_files: int,
+    base_chars: int,
+    base_total: int | None,
+    index: ArtifactIndex,
+    bm25_index: Bm25Index | None,
+    out: TextIO,
+    read_text: Callable[[str], str] | None = None,
+) -> None:
+    """Write the bundle as NDJSON: a header, one record per file as it is read, then a summary.
+
+    Fallback levels are decided from the selection alone, so nothing is read before the header is written.
+    Packed levels are the exception: packing needs every candidate's text, but their excerpts are already bounded
+    by the total budget. Unrestricted files are read one at a time, so peak memory is bounded by the largest file.
+    """
+    chosen: dict[str, Any] = {}
+    attempts: list[dict[str, Any]] = []
+    for level in fallback_levels(args.fallback_mode, base_files, base_chars, base_total):
+        max_files = level["max_files"] or base_files
+        max_chars = level["max_chars_per_file"] or base_chars
+        header = bundle_header(project_dir, args.task, args.ranking, max_files, max_chars, level["unrestricted"])
+        if level["max_total_chars"] is not None:
+            report = build_bundle(
+                project_dir=project_dir,
+                task=args.task,
+                max_files=max_files,
+                max_chars_per_file=max_chars,
+                index=index,
+                ranking=args.ranking,
+                bm25_index=bm25_index,
+                max_total_chars=level["max_total_chars"],
+                read_text=read_text,
+            )
+            header["budget"] = report["budget"]
+            plan = {"header": header, "warnings": report["warnings"], "files": report["files"]}
+            success = _bundle_success(report)
+        else:
+            selected, warnings = select_bundle_files(
+                project_dir, args.task, max_files, level["unrestricted"], index, args.ranking, bm25_index
+            )
+            plan = {"header": header, "warnings": warnings, "selected": selected}
+            success = _bundle_success({"files": selected})
+        if _adopt_attempt(level, success, not attempts):
+            chosen = {**plan, "level": level}
+        attempts.append({**level, "success": success})
+        if success:
+            break
+
+    header = chosen["header"]
+    if args.assets_dir and chosen["level"]["level"] == "restricted":
+        header["assets_dir"] = str(Path(args.assets_dir).resolve())
+    header.update({"record": "header", "fallback_level": chosen["level"]["level"], "fallback_attempts": attempts})
+    _write_record(out, header)
+
+    warnings = chosen["warnings"]
+    files: Iterator[dict[str, Any]] | list[dict[str, Any]]
+    if "files" in chosen:
+        files = chosen["files"]
     else:
-        print(output, end="")
+        unrestricted = bool(chosen["level"]["unrestricted"])
+        max_chars = None if unrestricted else header["budget"]["max_chars_per_file"]
+        window = 1 if unrestricted else io_workers()
+        files = iter_bundle_files(project_dir, chosen["selected"], max_chars, warnings, read_text, window)
+    selected_count = 0
+    truncated_count = 0
+    for item in files:
+        selected_count += 1
+        truncated_count += 1 if item["truncated"] else 0
+        _write_record(out, {"record": "file", **item})
+    _write_record(
+        out,
+        {
+            "record": "summary",
+            "selected_file_count": selected_count,
+            "truncated_file_count": truncated_count,
+            "warnings": warnings,
+        },
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    project_dir = Path(args.project_dir).resolve()
+    if args.watch:
+        from context_watch_v0 import serve
+
+        return serve(args, project_dir)
+
+    base_files, base_chars, base_total = budgets(args)
+    index = ArtifactIndex(project_dir, None if args.no_artifact_index else default_index_file(project_dir))
+    bm25_index = None
+    if args.ranking == "bm25":
+        bm25_index = Bm25Index(project_dir, None if args.no_artifact_index else default_bm25_index_file(project_dir))
+
+    if args.format == "ndjson":
+        if args.out_file:
+            with _out_path(args, project_dir).open("w", encoding="utf-8") as handle:
+                stream_output(args, project_dir, base_files, base_chars, base_total, index, bm25_index, handle)
+        else:
+            stream_output(args, project_dir, base_files, base_chars, base_total, index, bm25_index, sys.stdout)
+        index.save()
+        if bm25_index is not None:
+            bm25_index.save()
+        return 0
+
+    bundle_cache = None
+    key = ""
+    output = None
+    digest_cache = DigestCache(None if args.no_artifact_index else default_digest_cache_file(project_dir, ".cortex"))
+    if not args.no_cache:
+        bundle_cache = BundleCache(default_cache_dir(project_dir), max(0, args.cache_max_bytes))
+        key = bundle_cache_key(args, project_dir, base_total, index, digest_cache)
+        output = bundle_cache.get(key)
+    if output is None:
+        output = build_output(args, project_dir, base_files, base_chars, base_total, index, bm25_index)
+        if bundle_cache is not None:
+            bundle_cache.put(key, output)
+    index.save()
+    if bm25_index is not None:
+        bm25_index.save()
+    digest_cache.save()
+
+    manifest_cache = bundle_cache
+    if manifest_cache is None and args.since_bundle:
+        manifest_cache = BundleCache(default_cache_dir(project_dir), max(0, args.cache_max_bytes))
+    write_output(args, project_dir, finish_output(args, output, manifest_cache))
     return 0
 
 
@@ -14,6 +14,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from parallel_io_v0 import map_ordered
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
@@ -92,6 +94,21 @@ def _load_sha_index(path: Path) -> dict[str, str]:
     return index
 
 
+def _probe_bundle_file(src: Path) -> dict[str, Any] | None:
+    """Existence, type, digest and mode of one bundle file; None when it is missing."""
+    if not src.exists():
+        return None
+    if not src.is_file():
+        return {"is_file": False}
+    stat = src.stat()
+    return {
+        "is_file": True,
+        "sha256": _sha256(src),
+        "size_bytes": stat.st_size,
+        "is_executable_source": bool(stat.st_mode & 0o111),
+    }
+
+
 def _verify_bundle(
     *,
     bundle_root: Path,
@@ -103,12 +120,20 @@ def _verify_bundle(
     if not isinstance(entries, list) or not entries:
         raise RuntimeError("bundle manifest missing non-empty `files` array")
 
+    # Stat and hash every bundle file on the shared I/O pool; results are consumed in manifest order.
+    probes = map_ordered(
+        _probe_bundle_file,
+        [bundle_root / str(raw.get("bundle_path", "")).strip() for raw in entries if isinstance(raw, dict)],
+    )
+    probe_iter = iter(probes)
+
     verified: list[dict[str, Any]] = []
     failures: list[dict[str, Any]] = []
     for raw in entries:
         if not isinstance(raw, dict):
             failures.append({"error": "non-object manifest entry"})
             continue
+        probe, probe_error = next(probe_iter)
         bundle_path = str(raw.get("bundle_path", "")).strip()
         target_path = str(raw.get("target_path", "")).strip()
         expected_sha = str(raw.get("sha256", "")).strip()
@@ -116,17 +141,18 @@ def _verify_bundle(
         if not bundle_path or not target_path or not expected_sha:
             failures.append({"bundle_path": bundle_path, "target_path": target_path, "error": "missing required fields"})
             continue
-        src = bundle_root / bundle_path
-        if not src.exists():
+        if probe_error is not None:
+            raise probe_error
+        if probe is None:
             failures.append({"bundle_path": bundle_path, "target_path": target_path, "error": "source file missing"})
             continue
-        if not src.is_file():
+        if not probe["is_file"]:
             failures.append({"bundle_path": bundle_path, "target_path": target_path, "error": "source path is not a file"})
             continue
 
         relative_in_snapshot = bundle_path.split("/", 1)[1] if "/" in bundle_path else bundle_path
         indexed_sha = sha_index.get(relative_in_snapshot, "")
-        actual_sha = _sha256(src)
+        actual_sha = probe["sha256"]
         if actual_sha != expected_sha or (indexed_sha and indexed_sha != actual_sha):
             failures.append(
                 {
@@ -146,8 +172,8 @@ def _verify_bundle(
                 "bundle_path": bundle_path,
                 "target_path": target_path,
                 "sha256": actual_sha,
-                "size_bytes": src.stat().st_size,
-                "is_executable_source": bool(src.stat().st_mode & 0o111),
+                "size_bytes": probe["size_bytes"],
+                "is_executable_source": probe["is_executable_source"],
             }
         )
     return verified, failures
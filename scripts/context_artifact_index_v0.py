@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Persistent artifact index for context-load candidate selection.
+
+The loader's selection patterns are single-directory globs (`specs/*.md`,
+`.cortex/artifacts/decisions/decision_*_v*.md`, ...). Instead of listing those directories on
+every call, the index records each directory's entries (path, kind, version, size, mtime) keyed
+by the directory's own mtime. A directory is re-listed only when its mtime changes, so a load
+costs one `stat` per indexed directory regardless of how many artifacts it holds.
+
+Directories modified within `RACY_WINDOW_NS` of the listing are not persisted, since a same-tick
+create/delete would leave the mtime unchanged. Entry size/mtime are as of the last directory
+listing; selection only relies on names and file-ness, which always follow the directory mtime.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from file_digest_cache_v0 import RACY_WINDOW_NS
+
+
+INDEX_VERSION = "v0"
+INDEX_FILE_NAME = "context_artifact_index_v0.json"
+GLOB_CHARS = frozenset("*?[")
+VERSION_RE = re.compile(r"_v(\d+)(?:\.[^.]+)+$")
+# Entries are stored as compact rows; the path is `<directory>/<name>`.
+ENTRY_FIELDS = ("name", "is_file", "kind", "version", "size", "mtime_ns")
+
+
+def default_index_file(project_dir: Path, cortex_root: str = ".cortex") -> Path:
+    return project_dir / cortex_root / "state" / "cache" / INDEX_FILE_NAME
+
+
+def artifact_kind(rel_path: str) -> str:
+    parts = rel_path.split("/")
+    dirs, name = parts[:-1], parts[-1]
+    if "decisions" in dirs:
+        return "decision"
+    if "reflections" in dirs:
+        return "reflection"
+    if dirs[:1] == ["specs"]:
+        return "spec"
+    if dirs[:1] == ["policies"]:
+        return "policy"
+    for prefix, kind in (
+        ("decision_", "decision"),
+        ("reflection_", "reflection"),
+        ("spec_", "spec"),
+        ("policy_", "policy"),
+        ("governance_", "policy"),
+        ("design_", "design"),
+        ("direction_", "direction"),
+    ):
+        if name.startswith(prefix):
+            return kind
+    if "design" in name:
+        return "design"
+    return "other"
+
+
+def artifact_version(name: str) -> int | None:
+    match = VERSION_RE.search(name)
+    return int(match.group(1)) if match else None
+
+
+class ArtifactIndex:
+    """Directory listings for single-directory globs, refreshed by directory mtime."""
+
+    def __init__(self, project_dir: Path, index_file: Path | None) -> None:
+        self.project_dir = project_dir
+        self.index_file = index_file
+        self.scanned = 0
+        self.reused = 0
+        self._dirs: dict[str, dict[str, Any]] = {}
+        self._session: dict[str, list[list[Any]]] = {}
+        self._dirty = False
+        if index_file is not None:
+            self._load(index_file)
+
+    def _load(self, index_file: Path) -> None:
+        try:
+            payload = json.loads(index_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+            return
+        directories = payload.get("directories")
+        if isinstance(directories, dict):
+            self._dirs = {str(key): value for key, value in directories.items() if isinstance(value, dict)}
+
+    def _scan(self, rel_dir: str, mtime_ns: int) -> dict[str, Any]:
+        directory = self.project_dir / rel_dir if rel_dir else self.project_dir
+        entries: list[list[Any]] = []
+        with os.scandir(directory) as it:
+            for item in it:
+                try:
+                    is_file = item.is_file()
+                    stat = item.stat()
+                except OSError:
+                    continue
+                rel = f"{rel_dir}/{item.name}" if rel_dir else item.name
+                kind = artifact_kind(rel)
+                entries.append([item.name, is_file, kind, artifact_version(item.name), stat.st_size, stat.st_mtime_ns])
+        entries.sort(key=lambda entry: entry[0])
+        return {"mtime_ns": mtime_ns, "entries": entries}
+
+    def directory(self, rel_dir: str) -> list[list[Any]]:
+        """`ENTRY_FIELDS` rows of `rel_dir` sorted by name; empty when the directory does not exist."""
+        listing = self._session.get(rel_dir)
+        if listing is not None:
+            return listing
+        directory = self.project_dir / rel_dir if rel_dir else self.project_dir
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            if self._dirs.pop(rel_dir, None) is not None:
+                self._dirty = True
+            self._session[rel_dir] = []
+            return []
+
+        cached = self._dirs.get(rel_dir)
+        if cached is not None and cached.get("mtime_ns") == mtime_ns and isinstance(cached.get("entries"), list):
+            self.reused += 1
+        else:
+            cached = self._scan(rel_dir, mtime_ns)
+            self.scanned += 1
+            if time.time_ns() - mtime_ns >= RACY_WINDOW_NS:
+                self._dirs[rel_dir] = cached
+                self._dirty = True
+            elif self._dirs.pop(rel_dir, None) is not None:
+                self._dirty = True
+        self._session[rel_dir] = cached["entries"]
+        return cached["entries"]
+
+    def matches(self, pattern: str, files_only: bool = False) -> list[str]:
+        """Sorted project-relative paths matching `pattern`, as `sorted(project_dir.glob(pattern))` would list them."""
+        rel_dir, _, name_pattern = pattern.rpartition("/")
+        if GLOB_CHARS.intersection(rel_dir) or not name_pattern:
+            return [
+                path.relative_to(self.project_dir).as_posix()
+                for path in sorted(self.project_dir.glob(pattern))
+                if not files_only or path.is_file()
+            ]
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        match = re.compile(fnmatch.translate(name_pattern)).match
+        return [
+            prefix + name
+            for name, is_file, *_ in self.directory(rel_dir)
+            if (is_file or not files_only) and match(name)
+        ]
+
+    def save(self) -> None:
+        if self.index_file is None or not self._dirty:
+            return
+        payload = {"version": INDEX_VERSION, "directories": self._dirs}
+        tmp_path = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(payload, separators=(",", ":"), sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.index_file)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._dirty = False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.index_file is not None,
+            "directories_scanned": self.scanned,
+            "directories_reused": self.reused,
+        }
+
+
+def main() -> int:
+    from agent_context_loader_v0 import index_patterns
+
+    parser = argparse.ArgumentParser(description="Build or refresh the context-load artifact index.")
+    parser.add_argument("--project-dir", default=".")
+    parser.add_argument("--index-file", default="", help=f"Defaults to .cortex/state/cache/{INDEX_FILE_NAME}.")
+    parser.add_argument("--format", default="text", choices=("text", "json"))
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir).resolve()
+    index_file = Path(args.index_file) if args.index_file else default_index_file(project_dir)
+    if not index_file.is_absolute():
+        index_file = project_dir / index_file
+    index = ArtifactIndex(project_dir, index_file)
+
+    kinds: dict[str, int] = {}
+    seen: set[str] = set()
+    for pattern in index_patterns():
+        for rel in index.matches(pattern, files_only=True):
+            if rel in seen:
+                continue
+            seen.add(rel)
+            kind = artifact_kind(rel)
+            kinds[kind] = kinds.get(kind, 0) + 1
+    index.save()
+
+    payload = {
+        "version": INDEX_VERSION,
+        "project_dir": str(project_dir),
+        "index_file": str(index_file),
+        "artifact_count": len(seen),
+        "kinds": dict(sorted(kinds.items())),
+        **index.stats(),
+    }
+    if args.format == "json":
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+    else:
+        lines = [
+            f"index_file: {index_file}",
+            f"artifacts: {len(seen)}",
+            f"directories: scanned={index.scanned} reused={index.reused}",
+        ]
+        lines.extend(f"- {kind}: {count}" for kind, count in payload["kinds"].items())
+        sys.stdout.write("\n".join(lines) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Persistent BM25 inverted index over context-load candidate artifacts.
+
+Postings map each term to `{path: term_frequency}`; each document records its stat token
+(size, mtime_ns), token length and distinct terms, so a changed file is re-tokenized and its
+old postings removed without touching the rest of the index. Files modified within the racy
+window are indexed without a stat token and re-tokenized on the next refresh. Documents are
+tokenized from the first `MAX_DOC_CHARS` characters plus their path, lowercased and split on
+non-alphanumerics.
+
+Ranking is Okapi BM25 (k1=1.2, b=0.75) over the candidate set passed in; ties are broken by path
+so the order is deterministic.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from file_digest_cache_v0 import RACY_WINDOW_NS
+from parallel_io_v0 import map_ordered
+
+
+INDEX_VERSION = "v0"
+INDEX_FILE_NAME = "context_bm25_index_v0.json"
+MAX_DOC_CHARS = 200_000
+MIN_TOKEN_CHARS = 2
+BM25_K1 = 1.2
+BM25_B = 0.75
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def default_index_file(project_dir: Path, cortex_root: str = ".cortex") -> Path:
+    return project_dir / cortex_root / "state" / "cache" / INDEX_FILE_NAME
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if len(token) >= MIN_TOKEN_CHARS]
+
+
+class Bm25Index:
+    """Incrementally maintained BM25 postings for project-relative document paths."""
+
+    def __init__(self, project_dir: Path, index_file: Path | None) -> None:
+        self.project_dir = project_dir
+        self.index_file = index_file
+        self.indexed = 0
+        self.reused = 0
+        self._docs: dict[str, dict[str, Any]] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._dirty = False
+        if index_file is not None:
+            self._load(index_file)
+
+    def _load(self, index_file: Path) -> None:
+        try:
+            payload = json.loads(index_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+            return
+        if payload.get("max_doc_chars") != MAX_DOC_CHARS or payload.get("min_token_chars") != MIN_TOKEN_CHARS:
+            return
+        docs = payload.get("docs")
+        postings = payload.get("postings")
+        if isinstance(docs, dict) and isinstance(postings, dict):
+            self._docs = docs
+            self._postings = postings
+
+    def _remove(self, rel: str) -> None:
+        doc = self._docs.pop(rel, None)
+        if doc is None:
+            return
+        for term in doc.get("terms", []):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(rel, None)
+            if not posting:
+                del self._postings[term]
+        self._dirty = True
+
+    def _read(self, rel: str) -> str:
+        with (self.project_dir / rel).open("r", encoding="utf-8", errors="replace") as fh:
+            return fh.read(MAX_DOC_CHARS)
+
+    def _add_text(self, rel: str, text: str, stat_token: list[int] | None) -> None:
+        counts: dict[str, int] = {}
+        tokens = tokenize(rel) + tokenize(text)
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[rel] = tf
+        self._docs[rel] = {"stat": stat_token, "length": len(tokens), "terms": sorted(counts)}
+        self._dirty = True
+
+    def refresh(self, rel_paths: list[str]) -> None:
+        """Index new or changed documents among `rel_paths`; drop documents that no longer exist."""
+        # Stats and reads go through the shared I/O pool; postings are updated in input order.
+        stale: list[tuple[str, list[int] | None]] = []
+        for rel, (stat, error) in zip(rel_paths, map_ordered(lambda rel: (self.project_dir / rel).stat(), rel_paths)):
+            if error is not None or stat is None:
+                self._remove(rel)
+                continue
+            token = [stat.st_size, stat.st_mtime_ns]
+            doc = self._docs.get(rel)
+            if doc is not None and doc.get("stat") == token:
+                self.reused += 1
+                continue
+            # A file written within the racy window could change again without a stat change; keep it unkeyed.
+            racy = time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS
+            stale.append((rel, None if racy else token))
+        texts = map_ordered(self._read, [rel for rel, _ in stale])
+        for (rel, token), (text, error) in zip(stale, texts):
+            if error is not None:
+                raise error
+            self._remove(rel)
+            self._add_text(rel, text or "", token)
+            self.indexed += 1
+        listed = set(rel_paths)
+        for rel in [rel for rel in self._docs if rel not in listed and not (self.project_dir / rel).exists()]:
+            self._remove(rel)
+
+    def rank(self, query: str, rel_paths: list[str]) -> list[tuple[str, float]]:
+        """Candidates with a positive BM25 score for `query`, ordered by (-score, path). Call `refresh` first."""
+        candidates = [rel for rel in dict.fromkeys(rel_paths) if rel in self._docs]
+        if not candidates:
+            return []
+        candidate_set = set(candidates)
+        avgdl = sum(int(self._docs[rel]["length"]) for rel in candidates) / len(candidates) or 1.0
+        scores: dict[str, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            posting = self._postings.get(term, {})
+            matched = [(rel, tf) for rel, tf in posting.items() if rel in candidate_set]
+            if not matched:
+                continue
+            idf = math.log(1.0 + (len(candidates) - len(matched) + 0.5) / (len(matched) + 0.5))
+            for rel, tf in matched:
+                norm = BM25_K1 * (1.0 - BM25_B + BM25_B * int(self._docs[rel]["length"]) / avgdl)
+                scores[rel] = scores.get(rel, 0.0) + idf * (tf * (BM25_K1 + 1.0)) / (tf + norm)
+        ranked = [(rel, round(score, 6)) for rel, score in scores.items() if score > 0]
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked
+
+    def save(self) -> None:
+        if self.index_file is None or not self._dirty:
+            return
+        payload = {
+            "version": INDEX_VERSION,
+            "max_doc_chars": MAX_DOC_CHARS,
+            "min_token_chars": MIN_TOKEN_CHARS,
+            "docs": self._docs,
+            "postings": self._postings,
+        }
+        tmp_path = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(payload, separators=(",", ":"), sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.index_file)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._dirty = False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.index_file is not None,
+            "documents": len(self._docs),
+            "terms": len(self._postings),
+            "documents_indexed": self.indexed,
+            "documents_reused": self.reused,
+        }
+
+
+def main() -> int:
+    from agent_context_loader_v0 import ranking_candidates
+    from context_artifact_index_v0 import ArtifactIndex
+    from context_artifact_index_v0 import default_index_file as default_artifact_index_file
+
+    parser = argparse.ArgumentParser(description="Build the BM25 index or rank context-load candidates for a task.")
+    parser.add_argument("--project-dir", default=".")
+    parser.add_argument("--task", default="", help="Rank candidates for this task text.")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--format", default="text", choices=("text", "json"))
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir).resolve()
+    artifact_index = ArtifactIndex(project_dir, default_artifact_index_file(project_dir))
+    index = Bm25Index(project_dir, default_index_file(project_dir))
+    candidates = ranking_candidates(project_dir, artifact_index)
+    index.refresh(candidates)
+    ranked = index.rank(args.task, candidates)[: max(0, args.top)] if args.task else []
+    index.save()
+    artifact_index.save()
+
+    payload = {
+        "version": INDEX_VERSION,
+        "project_dir": str(project_dir),
+        "index_file": str(index.index_file),
+        "candidate_count": len(candidates),
+        "task": args.task,
+        "ranked": [{"path": rel, "score": score} for rel, score in ranked],
+        **index.stats(),
+    }
+    if args.format == "json":
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+    else:
+        lines = [
+            f"index_file: {index.index_file}",
+            f"documents: {len(candidates)} (indexed={index.indexed} reused={index.reused})",
+        ]
+        lines.extend(f"{score:>10.4f}  {rel}" for rel, score in ranked)
+        sys.stdout.write("\n".join(lines) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Content-addressed cache of serialized context bundles.
+
+Entries live under `<cortex_root>/state/cache/context_bundles/<key>.json` and hold the exact
+output bytes of one loader run. The key is a sha256 over the request (task, budgets, ranking, ...)
+and the content digests of every file that can influence selection, so any edit, addition or
+removal of a contributing file changes the key; stale entries are never read, only evicted.
+
+Eviction is LRU by size: a hit refreshes the entry's mtime, and a store removes the least
+recently used entries until the directory fits in `max_bytes`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+
+CACHE_VERSION = "v0"
+CACHE_DIR_NAME = "context_bundles"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_cache_dir(project_dir: Path, cortex_root: str = ".cortex") -> Path:
+    return project_dir / cortex_root / "state" / "cache" / CACHE_DIR_NAME
+
+
+def cache_key(parts: dict[str, Any]) -> str:
+    encoded = json.dumps({"version": CACHE_VERSION, **parts}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class BundleCache:
+    """Byte-for-byte bundle storage with LRU size eviction."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    @staticmethod
+    def _touch(entry: Path) -> None:
+        # Explicit nanosecond stamps: filesystem clocks can be too coarse to order back-to-back uses.
+        now = time.time_ns()
+        try:
+            os.utime(entry, ns=(now, now))
+        except OSError:
+            pass
+
+    def get(self, key: str) -> str | None:
+        entry = self._entry(key)
+        try:
+            text = entry.read_bytes().decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            self.misses += 1
+            return None
+        self._touch(entry)
+        self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        entry = self._entry(key)
+        tmp_path = entry.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(text.encode("utf-8"))
+            os.replace(tmp_path, entry)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._touch(entry)
+        self._evict(keep=entry)
+
+    def _evict(self, keep: Path) -> None:
+        entries: list[tuple[int, str, Path, int]] = []
+        total = 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for item in it:
+                    if not item.name.endswith(".json"):
+                        continue
+                    try:
+                        stat = item.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, item.name, Path(item.path), stat.st_size))
+                    total += stat.st_size
+        except OSError:
+            return
+        entries.sort()
+        for _, _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self.evicted += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "evicted": self.evicted}
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Section-level deltas between context bundles.
+
+Every emitted bundle is identified by the sha256 of its exact output bytes. Its manifest lists, per
+file, the sha256 of each excerpt section (markdown split at headings, anything else as one section)
+and is stored next to the cached bundles. A delta against an earlier bundle carries the new manifest
+plus the text of only those sections whose hash the earlier bundle did not contain; everything else
+is rebuilt from the earlier bundle by section hash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+from context_bundle_cache_v0 import BundleCache
+from context_packer_v0 import split_sections
+
+
+MANIFEST_VERSION = "v0"
+MANIFEST_KEY_PREFIX = "manifest-"
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def excerpt_sections(rel_path: str, excerpt: str) -> list[tuple[str, str]]:
+    """(title, text) sections that concatenate back to `excerpt` exactly."""
+    if rel_path.endswith(".md"):
+        return split_sections(rel_path, excerpt)
+    return [("", excerpt)]
+
+
+def bundle_manifest(bundle: dict[str, Any]) -> dict[str, Any]:
+    files = []
+    for entry in bundle.get("files", []):
+        path = str(entry.get("path", ""))
+        excerpt = str(entry.get("excerpt", ""))
+        files.append(
+            {
+                "path": path,
+                "selected_by": entry.get("selected_by"),
+                "truncated": bool(entry.get("truncated")),
+                "sha256": sha256_text(excerpt),
+                "sections": [
+                    {"title": title, "sha256": sha256_text(text)} for title, text in excerpt_sections(path, excerpt)
+                ],
+            }
+        )
+    return {"version": MANIFEST_VERSION, "files": files}
+
+
+def record_manifest(cache: BundleCache, output: str) -> tuple[str, dict[str, Any], dict[str, Any]]:
+    """Store the manifest of the bundle serialized as `output`; returns (bundle sha256, bundle, manifest)."""
+    bundle_sha256 = sha256_text(output)
+    bundle = json.loads(output)
+    manifest = load_manifest(cache, bundle_sha256)
+    if manifest is None:
+        manifest = bundle_manifest(bundle)
+        cache.put(MANIFEST_KEY_PREFIX + bundle_sha256, json.dumps(manifest, sort_keys=True, separators=(",", ":")))
+    return bundle_sha256, bundle, manifest
+
+
+def load_manifest(cache: BundleCache, bundle_sha256: str) -> dict[str, Any] | None:
+    if not all(ch in "0123456789abcdef" for ch in bundle_sha256) or len(bundle_sha256) != 64:
+        return None
+    text = cache.get(MANIFEST_KEY_PREFIX + bundle_sha256)
+    if text is None:
+        return None
+    try:
+        manifest = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def build_delta(
+    bundle: dict[str, Any],
+    bundle_sha256: str,
+    manifest: dict[str, Any],
+    since_bundle: str,
+    previous: dict[str, Any] | None,
+) -> dict[str, Any]:
+    """Delta of `bundle` against the bundle whose manifest is `previous` (None: everything is added)."""
+    previous_files = {str(entry["path"]): entry for entry in (previous or {}).get("files", [])}
+    previous_hashes = {
+        section["sha256"] for entry in previous_files.values() for section in entry.get("sections", [])
+    }
+
+    sections: list[dict[str, Any]] = []
+    removed: list[dict[str, Any]] = []
+    unchanged = 0
+    chars_total = 0
+    for entry in bundle.get("files", []):
+        path = str(entry.get("path", ""))
+        old = previous_files.get(path, {}).get("sections", [])
+        old_titles = {section["title"] for section in old}
+        for title, text in excerpt_sections(path, str(entry.get("excerpt", ""))):
+            chars_total += len(text)
+            digest = sha256_text(text)
+            if digest in previous_hashes:
+                unchanged += 1
+                continue
+            status = "changed" if title in old_titles else "added"
+            sections.append({"path": path, "title": title, "sha256": digest, "status": status, "text": text})
+
+    current = {str(entry["path"]): entry for entry in manifest["files"]}
+    for path, entry in previous_files.items():
+        new_sections = current.get(path, {}).get("sections", [])
+        kept = {section["sha256"] for section in new_sections} | {section["title"] for section in new_sections}
+        for section in entry.get("sections", []):
+            if section["sha256"] not in kept and section["title"] not in kept:
+                removed.append({"path": path, "title": section["title"], "sha256": section["sha256"]})
+
+    warnings = list(bundle.get("warnings", []))
+    if previous is None:
+        warnings.append(f"since_bundle_not_found:{since_bundle}")
+    return {
+        "version": "v0",
+        "mode": "delta",
+        "since_bundle": since_bundle,
+        "since_bundle_found": previous is not None,
+        "bundle_sha256": bundle_sha256,
+        "project_dir": bundle.get("project_dir"),
+        "task": bundle.get("task"),
+        "task_key": bundle.get("task_key"),
+        "ranking": bundle.get("ranking"),
+        "budget": bundle.get("budget"),
+        "fallback_level": bundle.get("fallback_level"),
+        "warnings": warnings,
+        "manifest": manifest["files"],
+        "sections": sections,
+        "removed": removed,
+        "stats": {
+            "sections_total": unchanged + len(sections),
+            "sections_sent": len(sections),
+            "sections_unchanged": unchanged,
+            "sections_removed": len(removed),
+            "chars_total": chars_total,
+            "chars_sent": sum(len(section["text"]) for section in sections),
+        },
+    }
+
+
+def rebuild_excerpts(delta: dict[str, Any], previous_bundle: dict[str, Any]) -> dict[str, str]:
+    """Full `{path: excerpt}` view from a delta and the bundle it was taken against."""
+    texts = {
+        sha256_text(text): text
+        for entry in previous_bundle.get("files", [])
+        for _, text in excerpt_sections(str(entry.get("path", "")), str(entry.get("excerpt", "")))
+    }
+    texts.update({section["sha256"]: section["text"] for section in delta["sections"]})
+    return {
+        entry["path"]: "".join(texts[section["sha256"]] for section in entry["sections"])
+        for entry in delta["manifest"]
+    }
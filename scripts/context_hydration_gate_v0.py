@@ -4,20 +4,26 @@
 from __future__ import annotations
 
 import argparse
-import hashlib
 import json
+import os
 import subprocess
 import sys
 import tempfile
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import jsonschema
+from file_digest_cache_v0 import RACY_WINDOW_NS, DigestCache, default_cache_file
+from schema_registry_v0 import load_validator, validate_instance
 
 
 EVENTS = ("new_session", "window_rollover", "pre_mutation", "pre_closeout")
 ENFORCEMENT_MODES = ("advisory", "warn", "block")
+HISTORY_INDEX_FILE = "history_index_v0.ndjson"
+HISTORY_INDEX_SEGMENT_GLOB = "history_index_v0.*.ndjson"
+HISTORY_SUMMARY_FILE = "history_index_summary_v0.json"
+HISTORY_INDEX_ROTATE_LINES = 10_000
 
 
 def _now_utc() -> datetime:
@@ -39,14 +45,6 @@ def _parse_iso(value: str) -> datetime | None:
     return parsed.astimezone(timezone.utc)
 
 
-def _sha256(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as fh:
-        for chunk in iter(lambda: fh.read(65536), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
-
-
 def _safe_rel_path(project_dir: Path, path: Path) -> str:
     try:
         return str(path.resolve().relative_to(project_dir.resolve()))
@@ -93,11 +91,28 @@ def _required_capsule_paths(project_dir: Path, cortex_root: str) -> dict[str, Pa
     }
 
 
+def _capsule_digests(paths: dict[str, Path], digest_cache: DigestCache) -> dict[str, str | None]:
+    """Digest of each capsule input, hashed concurrently; None for inputs that do not exist."""
+    keys = list(paths)
+    outcomes = digest_cache.sha256_many([paths[key] for key in keys])
+    digests: dict[str, str | None] = {}
+    for key, (digest, error) in zip(keys, outcomes):
+        if isinstance(error, FileNotFoundError):
+            digests[key] = None
+        elif error is not None:
+            raise error
+        else:
+            digests[key] = digest
+    return digests
+
+
 def _build_capsule(
     project_dir: Path,
     cortex_root: str,
+    digest_cache: DigestCache,
 ) -> tuple[dict[str, Any], list[dict[str, str]], list[str]]:
     paths = _required_capsule_paths(project_dir, cortex_root)
+    digests = _capsule_digests(paths, digest_cache)
     capsule: dict[str, Any] = {}
     hydration_inputs: list[dict[str, str]] = []
     missing: list[str] = []
@@ -105,10 +120,10 @@ def _build_capsule(
         hash_key = path_key.replace("_path", "_sha256")
         rel_path = _safe_rel_path(project_dir, file_path)
         capsule[path_key] = rel_path
-        if not file_path.exists():
+        digest = digests[path_key]
+        if digest is None:
             missing.append(rel_path)
             continue
-        digest = _sha256(file_path)
         capsule[hash_key] = digest
         hydration_inputs.append({"path": rel_path, "sha256": digest})
     return capsule, hydration_inputs, missing
@@ -120,14 +135,11 @@ def _schema_path(project_dir: Path) -> Path:
 
 def _validate_receipt_schema(project_dir: Path, payload: dict[str, Any]) -> str | None:
     schema_file = _schema_path(project_dir)
-    schema = _load_json(schema_file)
-    if schema is None:
-        return f"invalid or missing schema: {schema_file}"
     try:
-        jsonschema.validate(instance=payload, schema=schema)
-    except jsonschema.ValidationError as exc:
-        return str(exc)
-    return None
+        load_validator(schema_file)
+    except Exception:  # noqa: BLE001
+        return f"invalid or missing schema: {schema_file}"
+    return validate_instance(schema_file, payload)
 
 
 def _as_findings(
@@ -150,11 +162,12 @@ def _build_receipt(
     max_age_minutes: int,
     session_id: str,
     turn_count: int,
+    digest_cache: DigestCache,
 ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
     now = _now_utc()
     fresh_until = now + timedelta(minutes=max(1, max_age_minutes))
     git_head = _run_git_head(project_dir)
-    capsule, hydration_inputs, missing_capsule = _build_capsule(project_dir, cortex_root)
+    capsule, hydration_inputs, missing_capsule = _build_capsule(project_dir, cortex_root, digest_cache)
 
     findings: list[dict[str, Any]] = []
     if not git_head:
@@ -197,28 +210,186 @@ def _build_receipt(
     return receipt, findings
 
 
-def _list_history_events(history_dir: Path) -> list[str]:
-    if not history_dir.exists():
-        return []
-    events: list[str] = []
-    for path in sorted(history_dir.glob("*.json")):
-        payload = _load_json(path)
-        if not payload:
+def _history_entry(receipt_name: str, payload: dict[str, Any] | None) -> dict[str, str] | None:
+    if not payload:
+        return None
+    event = payload.get("event")
+    if not isinstance(event, str):
+        return None
+    return {
+        "receipt": receipt_name,
+        "event": event,
+        "hydrated_at": str(payload.get("hydrated_at", "")),
+        "receipt_id": str(payload.get("receipt_id", "")),
+    }
+
+
+def _read_history_log(path: Path) -> list[dict[str, str]]:
+    entries: list[dict[str, str]] = []
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return entries
+    for line in lines:
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
             continue
-        event = payload.get("event")
-        if isinstance(event, str):
-            events.append(event)
+        if isinstance(item, dict) and isinstance(item.get("receipt"), str) and isinstance(item.get("event"), str):
+            entries.append({key: str(item.get(key, "")) for key in ("receipt", "event", "hydrated_at", "receipt_id")})
+    return entries
+
+
+def _summarize_history(entries: list[dict[str, str]]) -> dict[str, dict[str, Any]]:
+    events: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        _count_history_entry(events, entry)
     return events
 
 
+def _count_history_entry(events: dict[str, dict[str, Any]], entry: dict[str, str]) -> None:
+    item = events.setdefault(entry["event"], {"count": 0, "first_hydrated_at": "", "last_hydrated_at": ""})
+    item["count"] += 1
+    hydrated_at = entry["hydrated_at"]
+    if hydrated_at and (not item["first_hydrated_at"] or hydrated_at < item["first_hydrated_at"]):
+        item["first_hydrated_at"] = hydrated_at
+    if hydrated_at > item["last_hydrated_at"]:
+        item["last_hydrated_at"] = hydrated_at
+
+
+def _stat_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return -1
+
+
+def _write_history_summary(history_dir: Path, summary: dict[str, Any]) -> None:
+    # Rewrite in place (no rename) so the directory mtime recorded below stays valid.
+    summary_path = history_dir / HISTORY_SUMMARY_FILE
+    summary_path.touch(exist_ok=True)
+    summary["log_size"] = _stat_size(history_dir / HISTORY_INDEX_FILE)
+    summary["dir_mtime_ns"] = history_dir.stat().st_mtime_ns
+    summary["written_at_ns"] = time.time_ns()
+    with summary_path.open("r+", encoding="utf-8") as fh:
+        fh.write(json.dumps(summary, indent=2, sort_keys=True) + "\n")
+        fh.truncate()
+
+
+def _rebuild_history_index(history_dir: Path) -> dict[str, Any]:
+    """Re-sync the index with receipts on disk: parse only unindexed receipts, drop entries for removed ones."""
+    log_paths = sorted(history_dir.glob(HISTORY_INDEX_SEGMENT_GLOB)) + [history_dir / HISTORY_INDEX_FILE]
+    indexed: dict[str, dict[str, str]] = {}
+    for log_path in log_paths:
+        for entry in _read_history_log(log_path):
+            indexed[entry["receipt"]] = entry
+
+    entries: list[dict[str, str]] = []
+    for path in sorted(history_dir.glob("*.json")):
+        if path.name == HISTORY_SUMMARY_FILE:
+            continue
+        entry = indexed.get(path.name) or _history_entry(path.name, _load_json(path))
+        if entry is not None:
+            entries.append(entry)
+
+    rotate = HISTORY_INDEX_ROTATE_LINES
+    chunks = [entries[idx : idx + rotate] for idx in range(0, len(entries), rotate)]
+    active = chunks.pop() if chunks and len(chunks[-1]) < rotate else []
+    segment_paths = [history_dir / f"history_index_v0.{seq:06d}.ndjson" for seq in range(1, len(chunks) + 1)]
+    # Logs that are rewritten are truncated in place, so an unchanged history leaves the directory mtime alone.
+    for log_path in set(log_paths) - {*segment_paths, history_dir / HISTORY_INDEX_FILE}:
+        log_path.unlink(missing_ok=True)
+    for segment_path, chunk in zip(segment_paths, chunks):
+        segment_path.write_text(
+            "".join(json.dumps(entry, sort_keys=True) + "\n" for entry in chunk), encoding="utf-8"
+        )
+    (history_dir / HISTORY_INDEX_FILE).write_text(
+        "".join(json.dumps(entry, sort_keys=True) + "\n" for entry in active), encoding="utf-8"
+    )
+
+    summary: dict[str, Any] = {
+        "version": "v0",
+        "events": _summarize_history(entries),
+        "receipt_count": len(entries),
+        "segment_count": len(chunks),
+        "active_lines": len(active),
+    }
+    _write_history_summary(history_dir, summary)
+    return summary
+
+
+def _load_history_summary(history_dir: Path) -> dict[str, Any]:
+    """Return the per-event history summary; O(1) unless receipts were added or removed outside the gate.
+
+    Directory mtimes are coarse, so a summary written within `RACY_WINDOW_NS` of the directory's last change
+    is rebuilt rather than trusted, as `DigestCache` does for racily modified files.
+    """
+    if not history_dir.exists():
+        return {"version": "v0", "events": {}, "receipt_count": 0, "segment_count": 0, "active_lines": 0}
+    summary = _load_json(history_dir / HISTORY_SUMMARY_FILE)
+    if (
+        summary is not None
+        and summary.get("version") == "v0"
+        and isinstance(summary.get("events"), dict)
+        and summary.get("dir_mtime_ns") == history_dir.stat().st_mtime_ns
+        and int(summary.get("written_at_ns", 0)) - int(summary["dir_mtime_ns"]) >= RACY_WINDOW_NS
+        and summary.get("log_size") == _stat_size(history_dir / HISTORY_INDEX_FILE)
+    ):
+        return summary
+    return _rebuild_history_index(history_dir)
+
+
+def _append_history_receipt(history_dir: Path, history_name: str, receipt: dict[str, Any]) -> None:
+    summary = _load_history_summary(history_dir)
+    replaced = (history_dir / history_name).exists()
+    _write_json(history_dir / history_name, receipt)
+    entry = _history_entry(history_name, receipt)
+    if replaced:
+        _rebuild_history_index(history_dir)
+        return
+    if entry is None:
+        return
+
+    log_path = history_dir / HISTORY_INDEX_FILE
+    if int(summary.get("active_lines", 0)) >= HISTORY_INDEX_ROTATE_LINES:
+        segment_count = int(summary.get("segment_count", 0)) + 1
+        os.replace(log_path, history_dir / f"history_index_v0.{segment_count:06d}.ndjson")
+        summary["segment_count"] = segment_count
+        summary["active_lines"] = 0
+    with log_path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry, sort_keys=True) + "\n")
+
+    _count_history_entry(summary["events"], entry)
+    summary["receipt_count"] = int(summary.get("receipt_count", 0)) + 1
+    summary["active_lines"] = int(summary.get("active_lines", 0)) + 1
+    _write_history_summary(history_dir, summary)
+
+
+def _list_history_events(history_dir: Path, since: datetime | None = None) -> dict[str, int]:
+    """Event name -> all-time receipt count, limited to events last hydrated at or after `since`.
+
+    The count is not narrowed to `since`: the summary keeps one count per event so coverage stays O(1).
+    """
+    events = _load_history_summary(history_dir).get("events", {})
+    coverage: dict[str, int] = {}
+    for event, item in sorted(events.items()):
+        if since is not None:
+            last_seen = _parse_iso(str(item.get("last_hydrated_at", "")))
+            if last_seen is None or last_seen < since:
+                continue
+        coverage[event] = int(item.get("count", 0))
+    return coverage
+
+
 def _verify_receipt(
     *,
     project_dir: Path,
     cortex_root: str,
     receipt_payload: dict[str, Any],
     max_age_minutes: int,
-    history_events: list[str],
+    history_events: dict[str, int],
     required_events: list[str],
+    digest_cache: DigestCache,
 ) -> list[dict[str, Any]]:
     findings: list[dict[str, Any]] = []
     schema_error = _validate_receipt_schema(project_dir, receipt_payload)
@@ -278,6 +449,7 @@ def _verify_receipt(
         return findings
 
     required_paths = _required_capsule_paths(project_dir, cortex_root)
+    current_digests = _capsule_digests(required_paths, digest_cache)
     for path_key, file_path in required_paths.items():
         hash_key = path_key.replace("_path", "_sha256")
         expected_rel = _safe_rel_path(project_dir, file_path)
@@ -293,7 +465,8 @@ def _verify_receipt(
                 expected_path=expected_rel,
             )
             continue
-        if not file_path.exists():
+        current_hash = current_digests[path_key]
+        if current_hash is None:
             _as_findings(
                 findings,
                 "missing_governance_capsule_input",
@@ -302,7 +475,6 @@ def _verify_receipt(
                 path=expected_rel,
             )
             continue
-        current_hash = _sha256(file_path)
         if receipt_hash != current_hash:
             _as_findings(
                 findings,
@@ -315,14 +487,14 @@ def _verify_receipt(
             )
 
     if required_events:
-        missing = sorted(set(required_events) - set(str(event) for event in history_events))
+        missing = sorted(set(required_events) - set(history_events))
         if missing:
             _as_findings(
                 findings,
                 "missing_required_hydration_events",
                 "Required hydration events are missing from history coverage.",
                 required_events=required_events,
-                history_events=history_events,
+                history_events=sorted(history_events),
                 missing_events=missing,
             )
 
@@ -383,6 +555,12 @@ def _write_optional_out_file(project_dir: Path, out_file: str, payload: dict[str
     return str(out_path)
 
 
+def _digest_cache(args: argparse.Namespace, project_dir: Path) -> DigestCache:
+    if args.no_digest_cache:
+        return DigestCache(None)
+    return DigestCache(default_cache_file(project_dir, args.cortex_root))
+
+
 def _handle_emit(args: argparse.Namespace) -> int:
     project_dir = Path(args.project_dir).resolve()
     latest_path = Path(args.latest_receipt_path)
@@ -392,6 +570,7 @@ def _handle_emit(args: argparse.Namespace) -> int:
     if not history_dir.is_absolute():
         history_dir = (project_dir / history_dir).resolve()
 
+    digest_cache = _digest_cache(args, project_dir)
     receipt, findings = _build_receipt(
         project_dir=project_dir,
         cortex_root=args.cortex_root,
@@ -400,13 +579,15 @@ def _handle_emit(args: argparse.Namespace) -> int:
         max_age_minutes=args.max_age_minutes,
         session_id=args.session_id,
         turn_count=args.turn_count,
+        digest_cache=digest_cache,
     )
+    digest_cache.save()
     status, returncode = _status_for_findings(findings, args.enforcement_mode, args.override_reason)
     if status in {"pass", "warn"}:
         _write_json(latest_path, receipt)
         if args.write_history:
             history_name = f"receipt_{receipt['hydrated_at'].replace(':', '').replace('-', '')}_{args.event}_v0.json"
-            _write_json(history_dir / history_name, receipt)
+            _append_history_receipt(history_dir, history_name, receipt)
 
     payload: dict[str, Any] = {
         "artifact": "context_hydration_gate_v0",
@@ -420,6 +601,7 @@ def _handle_emit(args: argparse.Namespace) -> int:
         "history_dir": _safe_rel_path(project_dir, history_dir),
         "override_reason": args.override_reason.strip(),
         "receipt": receipt,
+        "digest_cache": digest_cache.stats(),
         "findings": findings,
         "summary": {
             "finding_count": len(findings),
@@ -477,8 +659,10 @@ def _handle_verify(args: argparse.Namespace) -> int:
         _emit_payload(payload, args.format)
         return returncode
 
-    history_events = _list_history_events(history_dir)
+    required_since = _parse_iso(args.required_since) if args.required_since else None
+    history_events = _list_history_events(history_dir, since=required_since)
     required_events = [item.strip() for item in args.required_events.split(",") if item.strip()]
+    digest_cache = _digest_cache(args, project_dir)
     findings = _verify_receipt(
         project_dir=project_dir,
         cortex_root=args.cortex_root,
@@ -486,7 +670,16 @@ def _handle_verify(args: argparse.Namespace) -> int:
         max_age_minutes=args.max_age_minutes,
         history_events=history_events,
         required_events=required_events,
+        digest_cache=digest_cache,
     )
+    digest_cache.save()
+    if args.required_since and required_since is None:
+        _as_findings(
+            findings,
+            "invalid_required_since",
+            "--required-since is not a valid ISO-8601 timestamp.",
+            required_since=args.required_since,
+        )
     status, returncode = _status_for_findings(findings, args.enforcement_mode, args.override_reason)
     payload = {
         "artifact": "context_hydration_gate_v0",
@@ -499,9 +692,12 @@ def _handle_verify(args: argparse.Namespace) -> int:
         "latest_receipt_path": _safe_rel_path(project_dir, latest_path),
         "history_dir": _safe_rel_path(project_dir, history_dir),
         "required_events": required_events,
-        "history_events": history_events,
+        "required_since": _to_iso(required_since) if required_since else "",
+        "history_events": sorted(history_events),
+        "history_event_total_counts": history_events,
         "override_reason": args.override_reason.strip(),
         "receipt": receipt_payload,
+        "digest_cache": digest_cache.stats(),
         "findings": findings,
         "summary": {
             "finding_count": len(findings),
@@ -542,6 +738,7 @@ def _handle_compliance(args: argparse.Namespace) -> int:
         history_dir = Path(tempfile.mkdtemp(prefix="context_hydration_history_"))
 
     events_to_emit = [item.strip() for item in args.emit_events.split(",") if item.strip()]
+    digest_cache = _digest_cache(args, project_dir)
     emit_results: list[dict[str, Any]] = []
     overall_findings: list[dict[str, Any]] = []
 
@@ -554,12 +751,13 @@ def _handle_compliance(args: argparse.Namespace) -> int:
             max_age_minutes=args.max_age_minutes,
             session_id=args.session_id,
             turn_count=args.turn_count,
+            digest_cache=digest_cache,
         )
         emit_status, emit_rc = _status_for_findings(emit_findings, args.enforcement_mode, "")
         if emit_status in {"pass", "warn"}:
             _write_json(latest_path, receipt)
             history_name = f"receipt_{receipt['hydrated_at'].replace(':', '').replace('-', '')}_{event}_v0.json"
-            _write_json(history_dir / history_name, receipt)
+            _append_history_receipt(history_dir, history_name, receipt)
         emit_results.append(
             {
                 "event": event,
@@ -591,7 +789,9 @@ def _handle_compliance(args: argparse.Namespace) -> int:
         max_age_minutes=args.max_age_minutes,
         history_events=history_events,
         required_events=required_events,
+        digest_cache=digest_cache,
     )
+    digest_cache.save()
     verify_status, verify_rc = _status_for_findings(verify_findings, args.enforcement_mode, args.override_reason)
     overall_findings.extend(verify_findings)
 
@@ -602,7 +802,7 @@ def _handle_compliance(args: argparse.Namespace) -> int:
             "missing_required_hydration_events",
             "Required hydration events are missing from compliance coverage.",
             required_events=required_events,
-            history_events=history_events,
+            history_events=sorted(history_events),
             missing_events=missing_events,
         )
     if verify_rc != 0:
@@ -626,10 +826,12 @@ def _handle_compliance(args: argparse.Namespace) -> int:
         "emit_events": events_to_emit,
         "verify_event": args.verify_event,
         "required_events": required_events,
-        "history_events": history_events,
+        "history_events": sorted(history_events),
+        "history_event_total_counts": history_events,
         "latest_receipt_path": _safe_rel_path(project_dir, latest_path),
         "history_dir": _safe_rel_path(project_dir, history_dir),
         "emit_results": emit_results,
+        "digest_cache": digest_cache.stats(),
         "verify_result": {
             "returncode": verify_rc,
             "status": verify_status,
@@ -673,6 +875,7 @@ def _build_parser() -> argparse.ArgumentParser:
         target.add_argument("--override-reason", default="")
         target.add_argument("--out-file", default="")
         target.add_argument("--format", default="text", choices=("text", "json"))
+        target.add_argument("--no-digest-cache", action="store_true")
 
     emit = subparsers.add_parser("emit")
     add_common(emit)
@@ -685,6 +888,11 @@ def _build_parser() -> argparse.ArgumentParser:
     add_common(verify)
     verify.add_argument("--event", required=True, choices=EVENTS)
     verify.add_argument("--required-events", default="new_session,window_rollover")
+    verify.add_argument(
+        "--required-since",
+        default="",
+        help="Only count history events last hydrated at or after this ISO-8601 timestamp.",
+    )
 
     compliance = subparsers.add_parser("compliance")
     compliance.add_argument("--project-dir", default=".")
@@ -701,6 +909,7 @@ def _build_parser() -> argparse.ArgumentParser:
     compliance.add_argument("--turn-count", type=int, default=0)
     compliance.add_argument("--out-file", default="")
     compliance.add_argument("--format", default="text", choices=("text", "json"))
+    compliance.add_argument("--no-digest-cache", action="store_true")
     return parser
 
 
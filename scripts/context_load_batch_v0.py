@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Batch `context-load` execution from one warm process.
+
+Evaluation harnesses used to spawn one `cortex-coach context-load` process per query per repeat run.
+`ContextLoadSession` starts a single worker under the coach's Python interpreter and streams NDJSON
+requests to it; the worker runs the coach entry script in-process (`runpy`), so imports and any
+module-level state the coach keeps warm are reused across requests. Coaches that are not Python
+scripts fall back to one subprocess per request with identical results.
+
+CLI form reads NDJSON requests (`task`, `retrieval_profile`, `weighting_mode`, `max_files`,
+`max_chars_per_file`, `adapter_mode`, `adapter_file`, `adapter_max_items`, `adapter_stale_seconds`,
+optional `id`/`project_dir`/`extra_args`) and writes one `{id, returncode, elapsed_seconds, bundle, error}`
+line per request.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import select
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from cortex_coach_daemon_v0 import run_console_script, shebang_interpreter
+
+
+REQUEST_FLAGS = (
+    ("task", "--task"),
+    ("retrieval_profile", "--retrieval-profile"),
+    ("weighting_mode", "--weighting-mode"),
+    ("adapter_mode", "--adapter-mode"),
+    ("adapter_file", "--adapter-file"),
+    ("adapter_max_items", "--adapter-max-items"),
+    ("adapter_stale_seconds", "--adapter-stale-seconds"),
+    ("max_files", "--max-files"),
+    ("max_chars_per_file", "--max-chars-per-file"),
+)
+
+
+def context_load_argv(request: dict[str, Any], project_dir: Path) -> list[str]:
+    """Map one NDJSON batch request onto `context-load` CLI arguments."""
+    argv = ["context-load", "--project-dir", str(request.get("project_dir") or project_dir)]
+    for key, flag in REQUEST_FLAGS:
+        value = request.get(key)
+        if value is None or value == "":
+            continue
+        argv.extend([flag, str(value)])
+    extra = request.get("extra_args", [])
+    if isinstance(extra, list):
+        argv.extend(str(item) for item in extra)
+    return argv
+
+
+def _worker_target(base_cmd: list[str]) -> tuple[str, str] | None:
+    """(interpreter, entry script) for running `base_cmd` in a warm worker, or None if it is not Python."""
+    if len(base_cmd) == 2:
+        return base_cmd[0], base_cmd[1]
+    if len(base_cmd) != 1:
+        return None
+    entry = shutil.which(base_cmd[0]) or base_cmd[0]
+    interpreter = shebang_interpreter(entry)
+    if interpreter is None:
+        return None
+    return interpreter, entry
+
+
+class ContextLoadSession:
+    """Run coach/loader commands through one warm worker; `run` mirrors `subprocess.run(capture_output=True)`."""
+
+    def __init__(
+        self,
+        base_cmd: list[str],
+        env: dict[str, str] | None = None,
+        cwd: Path | None = None,
+        warm: bool = True,
+    ) -> None:
+        self.base_cmd = list(base_cmd)
+        self.env = env
+        self.cwd = cwd
+        self.mode = "process"
+        self._worker: subprocess.Popen[str] | None = None
+        target = _worker_target(self.base_cmd) if warm else None
+        if target is not None:
+            interpreter, entry = target
+            self._worker = subprocess.Popen(
+                [interpreter, str(Path(__file__).resolve()), "--worker", "--entry", entry],
+                cwd=str(cwd) if cwd else None,
+                env=env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+            self.mode = "batch"
+
+    def __enter__(self) -> ContextLoadSession:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        if worker.stdin:
+            worker.stdin.close()
+        try:
+            worker.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+            worker.wait()
+
+    def _run_subprocess(self, argv: list[str], timeout_seconds: float | None) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            [*self.base_cmd, *argv],
+            cwd=str(self.cwd) if self.cwd else None,
+            text=True,
+            capture_output=True,
+            check=False,
+            timeout=timeout_seconds,
+            env=self.env,
+        )
+
+    def run(
+        self,
+        argv: list[str],
+        timeout_seconds: float | None = None,
+    ) -> tuple[subprocess.CompletedProcess[str], float]:
+        """Run one command; returns (completed process, elapsed seconds). Raises TimeoutExpired like subprocess."""
+        cmd = [*self.base_cmd, *argv]
+        started = time.perf_counter()
+        worker = self._worker
+        if worker is None or worker.stdin is None or worker.stdout is None:
+            proc = self._run_subprocess(argv, timeout_seconds)
+            return proc, time.perf_counter() - started
+
+        worker.stdin.write(json.dumps({"argv": argv}) + "\n")
+        worker.stdin.flush()
+        ready, _, _ = select.select([worker.stdout], [], [], timeout_seconds)
+        if not ready:
+            worker.kill()
+            self._worker = None
+            raise subprocess.TimeoutExpired(cmd, timeout_seconds or 0)
+        line = worker.stdout.readline()
+        elapsed = time.perf_counter() - started
+        if not line:
+            self._worker = None
+            return subprocess.CompletedProcess(cmd, 1, "", "context-load batch worker exited unexpectedly\n"), elapsed
+        response = json.loads(line)
+        return (
+            subprocess.CompletedProcess(
+                cmd,
+                int(response.get("returncode", 1)),
+                str(response.get("stdout", "")),
+                str(response.get("stderr", "")),
+            ),
+            elapsed,
+        )
+
+
+def run_batch(
+    session: ContextLoadSession,
+    requests: Iterable[dict[str, Any]],
+    project_dir: Path,
+    timeout_seconds: float | None = None,
+) -> Iterable[dict[str, Any]]:
+    """Yield one result per request: `{id, returncode, elapsed_seconds, bundle, error}`."""
+    for index, request in enumerate(requests):
+        proc, elapsed = session.run(context_load_argv(request, project_dir), timeout_seconds=timeout_seconds)
+        bundle: Any = None
+        error: str | None = None
+        if proc.returncode != 0:
+            error = f"context-load returned {proc.returncode}: {proc.stderr.strip()}"
+        else:
+            try:
+                bundle = json.loads(proc.stdout)
+            except json.JSONDecodeError as exc:
+                error = f"context-load returned invalid JSON: {exc}"
+        yield {
+            "id": request.get("id", index),
+            "returncode": proc.returncode,
+            "elapsed_seconds": elapsed,
+            "bundle": bundle,
+            "error": error,
+        }
+
+
+def _worker_main(entry: str) -> int:
+    # Keep the protocol streams private so the coach cannot read requests or interleave output.
+    protocol_in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    protocol_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    for line in protocol_in:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        argv = [str(item) for item in request.get("argv", [])]
+        returncode, stdout, stderr = run_console_script(entry, argv)
+        protocol_out.write(json.dumps({"returncode": returncode, "stdout": stdout, "stderr": stderr}) + "\n")
+        protocol_out.flush()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run many context-load requests from one warm coach process.")
+    parser.add_argument("--project-dir", default=".")
+    parser.add_argument("--coach-bin", default="cortex-coach")
+    parser.add_argument("--coach-script", default="", help="Run `--python-bin <coach-script>` instead of --coach-bin.")
+    parser.add_argument("--python-bin", default=sys.executable)
+    parser.add_argument("--requests-file", default="-", help="NDJSON requests; `-` reads stdin.")
+    parser.add_argument("--timeout-seconds", type=float, default=120.0)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--entry", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return _worker_main(args.entry)
+
+    project_dir = Path(args.project_dir).resolve()
+    if args.requests_file == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        lines = Path(args.requests_file).read_text(encoding="utf-8").splitlines()
+    requests = [json.loads(line) for line in lines if line.strip()]
+
+    base_cmd = [args.python_bin, str(Path(args.coach_script).resolve())] if args.coach_script else [args.coach_bin]
+    failed = False
+    with ContextLoadSession(base_cmd, cwd=project_dir) as session:
+        for result in run_batch(session, requests, project_dir, timeout_seconds=args.timeout_seconds):
+            failed = failed or result["error"] is not None
+            sys.stdout.write(json.dumps(result, sort_keys=True) + "\n")
+            sys.stdout.flush()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Global character-budget packing for context bundles.
+
+Candidate files are split into sections (markdown by heading, JSON objects by top-level key,
+anything else as one section). Control-plane sections are taken first, in order, while they fit.
+The remaining budget is filled with task sections by a 0/1 knapsack that maximizes relevance to
+the task text plus a small prior for better-ranked files. Weights are rounded up to
+`PACK_CHAR_UNIT` characters, so the packed size never exceeds the budget. Very large problems
+fall back to greedy value-per-character selection.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from context_bm25_index_v0 import tokenize
+
+
+CHARS_PER_TOKEN = 4
+PACK_CHAR_UNIT = 64
+PACK_DP_CELL_LIMIT = 2_000_000
+PACK_VALUE_SCALE = 1000
+MARKDOWN_HEADING_RE = re.compile(r"^#{1,6}\s", re.MULTILINE)
+
+
+@dataclass
+class Section:
+    file_index: int
+    order: int
+    title: str
+    text: str
+    clipped: bool
+    control_plane: bool
+    value: int = 0
+
+
+def split_sections(rel_path: str, text: str) -> list[tuple[str, str]]:
+    """(title, text) sections whose texts concatenate back to the file's content (JSON: re-serialized per key)."""
+    if rel_path.endswith(".md"):
+        starts = [match.start() for match in MARKDOWN_HEADING_RE.finditer(text)]
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+        sections = []
+        for start, end in zip(starts, [*starts[1:], len(text)]):
+            chunk = text[start:end]
+            first_line = chunk.split("\n", 1)[0]
+            title = first_line.lstrip("#").strip() if MARKDOWN_HEADING_RE.match(first_line) else ""
+            sections.append((title, chunk))
+        return sections
+    if rel_path.endswith(".json"):
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError:
+            return [("", text)]
+        if isinstance(payload, dict) and payload:
+            return [(str(key), json.dumps({key: value}, indent=2) + "\n") for key, value in payload.items()]
+    return [("", text)]
+
+
+def _relevance(query_terms: set[str], text: str) -> float:
+    counts: dict[str, int] = {}
+    for token in tokenize(text):
+        if token in query_terms:
+            counts[token] = counts.get(token, 0) + 1
+    return sum(math.log1p(tf) for tf in counts.values())
+
+
+def _weight(section: Section) -> int:
+    return -(-len(section.text) // PACK_CHAR_UNIT)
+
+
+def _knapsack(items: list[Section], capacity_units: int) -> set[int]:
+    if len(items) * (capacity_units + 1) > PACK_DP_CELL_LIMIT:
+        chosen: set[int] = set()
+        remaining = capacity_units
+        ranked = sorted(range(len(items)), key=lambda idx: (-items[idx].value / max(1, _weight(items[idx])), idx))
+        for idx in ranked:
+            if _weight(items[idx]) <= remaining:
+                chosen.add(idx)
+                remaining -= _weight(items[idx])
+        return chosen
+
+    best = [0] * (capacity_units + 1)
+    keep: list[bytearray] = []
+    for item in items:
+        weight = _weight(item)
+        taken = bytearray(capacity_units + 1)
+        for cap in range(capacity_units, weight - 1, -1):
+            candidate = best[cap - weight] + item.value
+            if candidate > best[cap]:
+                best[cap] = candidate
+                taken[cap] = 1
+        keep.append(taken)
+
+    chosen = set()
+    cap = capacity_units
+    for idx in range(len(items) - 1, -1, -1):
+        if keep[idx][cap]:
+            chosen.add(idx)
+            cap -= _weight(items[idx])
+    return chosen
+
+
+def pack_files(
+    files: list[dict[str, Any]],
+    task: str,
+    max_total_chars: int,
+    max_section_chars: int,
+) -> tuple[list[dict[str, Any]], list[str], int]:
+    """Pack `files` (`path`, `selected_by`, `text`, `truncated`, optional `score`) into `max_total_chars`.
+
+    Returns (bundle file entries in input order, warnings, packed character count).
+    """
+    sections: list[Section] = []
+    section_counts: list[int] = []
+    task_rank = 0
+    query_terms = set(tokenize(task))
+    for file_index, entry in enumerate(files):
+        control_plane = str(entry["selected_by"]).startswith("control_plane")
+        parts = [part for part in split_sections(str(entry["path"]), str(entry["text"])) if part[1].strip()]
+        section_counts.append(len(parts))
+        prior = 0.0 if control_plane else 1.0 / (1 + task_rank)
+        task_rank += 0 if control_plane else 1
+        for order, (title, text) in enumerate(parts):
+            clipped = len(text) > max_section_chars
+            section = Section(file_index, order, title, text[:max_section_chars], clipped, control_plane)
+            section.value = int(round((_relevance(query_terms, section.text) + prior) * PACK_VALUE_SCALE))
+            sections.append(section)
+
+    chosen: list[Section] = []
+    remaining = max(0, max_total_chars)
+    for section in sections:
+        if section.control_plane and len(section.text) <= remaining:
+            chosen.append(section)
+            remaining -= len(section.text)
+    task_sections = [section for section in sections if not section.control_plane and section.value > 0]
+    picked = _knapsack(task_sections, remaining // PACK_CHAR_UNIT)
+    chosen.extend(task_sections[idx] for idx in sorted(picked))
+
+    by_file: dict[int, list[Section]] = {}
+    for section in chosen:
+        by_file.setdefault(section.file_index, []).append(section)
+
+    out: list[dict[str, Any]] = []
+    warnings: list[str] = []
+    packed_chars = 0
+    for file_index, entry in enumerate(files):
+        file_sections = sorted(by_file.get(file_index, []), key=lambda section: section.order)
+        if not file_sections:
+            if str(entry["selected_by"]).startswith("control_plane"):
+                warnings.append(f"packing_budget_exhausted:{entry['path']}")
+            continue
+        excerpt = "".join(section.text for section in file_sections)
+        packed_chars += len(excerpt)
+        truncated = (
+            bool(entry.get("truncated"))
+            or len(file_sections) < section_counts[file_index]
+            or any(section.clipped for section in file_sections)
+        )
+        item = {
+            "path": entry["path"],
+            "selected_by": entry["selected_by"],
+            "truncated": truncated,
+            "excerpt": excerpt,
+            "sections": [section.title for section in file_sections],
+            "section_count": section_counts[file_index],
+        }
+        if "score" in entry:
+            item["score"] = entry["score"]
+        out.append(item)
+    return out, warnings, packed_chars
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""Watch-mode context loader serving bundles from a live in-memory corpus.
+
+`agent_context_loader_v0.py --watch` keeps directory listings, decoded file texts and the BM25
+postings in memory across requests. Before each request the watcher applies pending changes:
+
+- `inotify` (Linux, via libc): each candidate directory is watched for entry changes and each of its
+  ancestors for directory create/delete/rename, so only touched files and listings are dropped;
+  a request with no changes costs no file system calls beyond draining the event queue.
+- `poll`: every cached text is re-validated by stat token (size, mtime_ns, inode) and every listing
+  by directory mtime. Files modified within the racy window are always re-read.
+
+Requests and responses are single JSON lines, over stdin/stdout or a Unix socket (`--socket`):
+
+- request: `{"version": "v0", "op": "load", "id": ..., "argv": ["--task", "spec", ...]}`
+- response: `{"version": "v0", "id": ..., "status": "ok", "returncode": 0, "stdout": "...", "stderr": "", ...}`
+
+`argv` takes the one-shot loader's options (`--project-dir` is fixed by the server); `stdout` is
+byte-for-byte what the one-shot loader would print. `ping` and `shutdown` ops are also accepted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import ctypes
+import ctypes.util
+import io
+import json
+import os
+import socketserver
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, TextIO
+
+import agent_context_loader_v0 as loader
+from context_artifact_index_v0 import GLOB_CHARS, ArtifactIndex
+from context_bm25_index_v0 import MAX_DOC_CHARS, Bm25Index
+from context_bundle_cache_v0 import BundleCache, default_cache_dir
+from file_digest_cache_v0 import RACY_WINDOW_NS
+
+
+PROTOCOL_VERSION = "v0"
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_STRUCTURE = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+IN_SELF = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+# Candidate directories report every entry change; ancestors only report their own structure.
+DIRECTORY_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_STRUCTURE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+ANCESTOR_MASK = IN_STRUCTURE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _parent(rel: str) -> str:
+    return rel.rpartition("/")[0]
+
+
+def _under(rel: str, root: str) -> bool:
+    return not root or rel == root or rel.startswith(root + "/")
+
+
+def watch_dirs() -> list[str]:
+    """Project-relative directories whose entries can contribute to a bundle."""
+    dirs = {_parent(rel) for rel in loader.CONTROL_PLANE_ORDER if "*" not in rel}
+    for pattern in loader.index_patterns():
+        rel_dir = _parent(pattern)
+        if not GLOB_CHARS.intersection(rel_dir):
+            dirs.add(rel_dir)
+    return sorted(dirs)
+
+
+class LiveCorpus(ArtifactIndex):
+    """Artifact listings and decoded file texts kept in memory until a watcher drops them."""
+
+    def __init__(self, project_dir: Path, watched_dirs: list[str]) -> None:
+        super().__init__(project_dir, None)
+        self.watched = set(watched_dirs)
+        self.reads = 0
+        self._texts: dict[str, tuple[str, list[int]]] = {}
+
+    def read_text(self, rel: str) -> str:
+        cached = self._texts.get(rel)
+        if cached is not None:
+            return cached[0]
+        path = self.project_dir / rel
+        # Stat before reading: a write racing the read leaves a stale token, never a stale text.
+        stat = path.stat()
+        text = path.read_text(encoding="utf-8", errors="replace")
+        self.reads += 1
+        if _parent(rel) in self.watched:
+            self._texts[rel] = (text, [stat.st_size, stat.st_mtime_ns, stat.st_ino])
+        return text
+
+    def cached_texts(self) -> dict[str, list[int]]:
+        return {rel: token for rel, (_, token) in self._texts.items()}
+
+    def forget_listing(self, rel_dir: str) -> None:
+        self._session.pop(rel_dir, None)
+
+    def forget_text(self, rel: str) -> None:
+        self._texts.pop(rel, None)
+
+    def forget_under(self, root: str) -> None:
+        for rel_dir in [rel_dir for rel_dir in self._session if _under(rel_dir, root)]:
+            del self._session[rel_dir]
+        for rel in [rel for rel in self._texts if _under(rel, root)]:
+            del self._texts[rel]
+
+    def stats(self) -> dict[str, Any]:
+        return {**super().stats(), "cached_texts": len(self._texts), "file_reads": self.reads}
+
+
+class LiveBm25Index(Bm25Index):
+    """BM25 postings over corpus texts; a document is re-tokenized only when the corpus re-read it."""
+
+    def __init__(self, corpus: LiveCorpus) -> None:
+        super().__init__(corpus.project_dir, None)
+        self.corpus = corpus
+        self._sources: dict[str, str] = {}
+
+    def _remove(self, rel: str) -> None:
+        self._sources.pop(rel, None)
+        super()._remove(rel)
+
+    def refresh(self, rel_paths: list[str]) -> None:
+        listed = set(rel_paths)
+        for rel in [rel for rel in self._docs if rel not in listed]:
+            self._remove(rel)
+        for rel in rel_paths:
+            try:
+                text = self.corpus.read_text(rel)
+            except OSError:
+                self._remove(rel)
+                continue
+            if self._sources.get(rel) is text:
+                self.reused += 1
+                continue
+            self._remove(rel)
+            self._add_text(rel, text[:MAX_DOC_CHARS], None)
+            self._sources[rel] = text
+            self.indexed += 1
+
+
+class PollingWatcher:
+    backend = "poll"
+
+    def __init__(self, corpus: LiveCorpus) -> None:
+        self.corpus = corpus
+
+    def sync(self) -> int:
+        """Drop listings and stale texts; returns the number of texts dropped."""
+        for rel_dir in self.corpus.watched:
+            self.corpus.forget_listing(rel_dir)
+        dropped = 0
+        now = time.time_ns()
+        for rel, token in self.corpus.cached_texts().items():
+            try:
+                stat = (self.corpus.project_dir / rel).stat()
+            except OSError:
+                stat = None
+            if (
+                stat is None
+                or [stat.st_size, stat.st_mtime_ns, stat.st_ino] != token
+                or now - stat.st_mtime_ns < RACY_WINDOW_NS
+            ):
+                self.corpus.forget_text(rel)
+                dropped += 1
+        return dropped
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    backend = "inotify"
+
+    def __init__(self, corpus: LiveCorpus) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.corpus = corpus
+        self._masks: dict[str, int] = {}
+        for rel_dir in corpus.watched:
+            parts = rel_dir.split("/") if rel_dir else []
+            for depth in range(len(parts)):
+                self._masks.setdefault("/".join(parts[:depth]), ANCESTOR_MASK)
+        self._masks.update({rel_dir: DIRECTORY_MASK for rel_dir in corpus.watched})
+        self._wd_dirs: dict[int, str] = {}
+        self._dir_wds: dict[str, int] = {}
+        self._add_missing()
+
+    def _add_missing(self) -> None:
+        # Shallow directories first, so a directory is watched before its children are listed.
+        for rel_dir in sorted(set(self._masks) - set(self._dir_wds), key=lambda rel: (rel.count("/"), rel)):
+            path = self.corpus.project_dir / rel_dir if rel_dir else self.corpus.project_dir
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self._masks[rel_dir])
+            if wd < 0:
+                continue
+            self._wd_dirs[wd] = rel_dir
+            self._dir_wds[rel_dir] = wd
+            # Anything may have changed while the directory was unwatched.
+            self.corpus.forget_under(rel_dir)
+
+    def _reset(self, root: str) -> None:
+        for rel_dir in [rel_dir for rel_dir in self._dir_wds if _under(rel_dir, root)]:
+            wd = self._dir_wds.pop(rel_dir)
+            self._wd_dirs.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+        self.corpus.forget_under(root)
+
+    def _drain(self) -> bytes:
+        chunks = []
+        while True:
+            try:
+                chunk = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def sync(self) -> int:
+        """Apply queued events and re-watch directories that (re)appeared; returns the number of events."""
+        data = self._drain()
+        events = 0
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + EVENT_HEADER.size : offset + EVENT_HEADER.size + length]
+            offset += EVENT_HEADER.size + length
+            events += 1
+            if mask & IN_Q_OVERFLOW:
+                self._reset("")
+                continue
+            rel_dir = self._wd_dirs.get(wd)
+            if rel_dir is None:
+                continue
+            if mask & IN_SELF:
+                self._reset(rel_dir)
+                continue
+            name = os.fsdecode(raw_name.rstrip(b"\0"))
+            if not name:
+                continue
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            if mask & IN_ISDIR and mask & IN_STRUCTURE:
+                self._reset(rel)
+            if rel_dir in self.corpus.watched:
+                self.corpus.forget_listing(rel_dir)
+                self.corpus.forget_text(rel)
+        self._add_missing()
+        return events
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def make_watcher(backend: str, corpus: LiveCorpus) -> PollingWatcher | InotifyWatcher:
+    if backend == "poll":
+        return PollingWatcher(corpus)
+    try:
+        return InotifyWatcher(corpus)
+    except (OSError, AttributeError):
+        if backend == "inotify":
+            raise
+        return PollingWatcher(corpus)
+
+
+class WatchServer:
+    def __init__(self, project_dir: Path, backend: str, cache_max_bytes: int) -> None:
+        self.project_dir = project_dir
+        self.corpus = LiveCorpus(project_dir, watch_dirs())
+        self.watcher = make_watcher(backend, self.corpus)
+        self.bm25_index = LiveBm25Index(self.corpus)
+        self.manifest_cache = BundleCache(default_cache_dir(project_dir), max(0, cache_max_bytes))
+        self.served = 0
+        self.stopping = False
+
+    def _load(self, argv: list[str]) -> dict[str, Any]:
+        stderr = io.StringIO()
+        try:
+            with contextlib.redirect_stderr(stderr), contextlib.redirect_stdout(stderr):
+                args = loader.parse_args(["--project-dir", str(self.project_dir), *argv])
+        except SystemExit as exc:
+            returncode = exc.code if isinstance(exc.code, int) else 2
+            return {"status": "ok", "returncode": returncode, "stdout": "", "stderr": stderr.getvalue()}
+        if Path(args.project_dir).resolve() != self.project_dir or args.watch:
+            return {"status": "rejected", "reason": "argv must not change --project-dir or request --watch"}
+
+        changes = self.watcher.sync()
+        base_files, base_chars, base_total = loader.budgets(args)
+        bm25_index = self.bm25_index if args.ranking == "bm25" else None
+        try:
+            if args.format == "ndjson":
+                buffer = io.StringIO()
+                loader.stream_output(
+                    args,
+                    self.project_dir,
+                    base_files,
+                    base_chars,
+                    base_total,
+                    self.corpus,
+                    bm25_index,
+                    buffer,
+                    read_text=self.corpus.read_text,
+                )
+                output = buffer.getvalue()
+            else:
+                output = loader.build_output(
+                    args,
+                    self.project_dir,
+                    base_files,
+                    base_chars,
+                    base_total,
+                    self.corpus,
+                    bm25_index,
+                    read_text=self.corpus.read_text,
+                )
+                output = loader.finish_output(args, output, self.manifest_cache)
+        except OSError as exc:
+            return {"status": "ok", "returncode": 1, "stdout": "", "stderr": f"{exc}\n", "changes": changes}
+        stdout = output
+        if args.out_file:
+            loader.write_output(args, self.project_dir, output)
+            stdout = ""
+        self.served += 1
+        return {"status": "ok", "returncode": 0, "stdout": stdout, "stderr": "", "changes": changes}
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        op = request.get("op", "load")
+        started = time.perf_counter()
+        if request.get("version", PROTOCOL_VERSION) != PROTOCOL_VERSION:
+            response = {"status": "rejected", "reason": "unsupported version"}
+        elif op == "ping":
+            response = {
+                "status": "ok",
+                "pid": os.getpid(),
+                "backend": self.watcher.backend,
+                "served": self.served,
+                **self.corpus.stats(),
+            }
+        elif op == "shutdown":
+            self.stopping = True
+            response = {"status": "ok", "pid": os.getpid()}
+        elif op != "load":
+            response = {"status": "rejected", "reason": f"unsupported op: {op!r}"}
+        elif not isinstance(request.get("argv", []), list):
+            response = {"status": "rejected", "reason": "argv must be a list"}
+        else:
+            response = self._load([str(item) for item in request.get("argv", [])])
+        response["version"] = PROTOCOL_VERSION
+        response["elapsed_seconds"] = round(time.perf_counter() - started, 6)
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def handle_line(self, line: str) -> dict[str, Any]:
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            request = None
+        if not isinstance(request, dict):
+            return {"version": PROTOCOL_VERSION, "status": "rejected", "reason": "invalid request"}
+        return self.handle(request)
+
+    def close(self) -> None:
+        self.watcher.close()
+
+
+def _serve_stdio(server: WatchServer, stdin: TextIO, stdout: TextIO) -> int:
+    for line in stdin:
+        if not line.strip():
+            continue
+        stdout.write(json.dumps(server.handle_line(line), sort_keys=True) + "\n")
+        stdout.flush()
+        if server.stopping:
+            break
+    return 0
+
+
+def _serve_socket(server: WatchServer, socket_path: Path) -> int:
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                response = server.handle_line(line.decode("utf-8", errors="replace"))
+                self.wfile.write(json.dumps(response, sort_keys=True).encode("utf-8") + b"\n")
+                self.wfile.flush()
+                if server.stopping:
+                    break
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+    previous_umask = os.umask(0o077)
+    try:
+        unix_server = socketserver.UnixStreamServer(str(socket_path), Handler)
+    finally:
+        os.umask(previous_umask)
+    unix_server.timeout = 1.0
+    try:
+        while not server.stopping:
+            unix_server.handle_request()
+    finally:
+        unix_server.server_close()
+        socket_path.unlink(missing_ok=True)
+    return 0
+
+
+def serve(args: argparse.Namespace, project_dir: Path) -> int:
+    server = WatchServer(project_dir, args.watch_backend, args.cache_max_bytes)
+    try:
+        if args.socket:
+            return _serve_socket(server, Path(args.socket))
+        return _serve_stdio(server, sys.stdin, sys.stdout)
+    finally:
+        server.close()
@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""Opt-in warm daemon for `cortex_project_coach_v0.py` delegated `cortex-coach` commands.
+
+`start` launches a background server on a Unix socket using the interpreter from the `cortex-coach`
+shebang. The server runs the `cortex-coach` console script in-process with `runpy`, so after the first
+command the coach package stays imported and each command skips interpreter and import startup.
+Requests and responses are single JSON lines:
+
+- request: `{"version": "v0", "op": "run", "argv": [...], "cwd": "...", "env": {...}, "coach_bin": "...",
+  "stream": false}`
+- response: `{"version": "v0", "status": "ok", "returncode": 0, "stdout": "...", "stderr": "..."}`
+
+With `"stream": true` the daemon first sends `{"version": "v0", "status": "output", "stream": "stdout", "data": "..."}`
+lines as the command writes, then the final response with empty `stdout`/`stderr`. Passthrough commands use this so
+long-running output appears as it is produced, as it does under `subprocess`.
+
+Commands are served one at a time. The delegator uses the daemon only when `CORTEX_COACH_DAEMON=1` is set,
+and falls back to `subprocess` when the socket is not up or the daemon rejects a request (for example after
+`cortex-coach` was reinstalled).
+
+The socket lives in a per-user 0700 directory. Before sending anything, the client requires that directory
+and the socket to be owned by the current user with no group/other permission bits, and the peer process
+to run as the current user, so another local user cannot pose as the daemon. Requests carry only the
+environment variables in `FORWARDED_ENV_NAMES` / `FORWARDED_ENV_PREFIXES`, not the caller's full environment.
+"""
+
+from __future__ import annotations
+
+import argparse
+import codecs
+import contextlib
+import json
+import os
+import runpy
+import shutil
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping
+
+
+PROTOCOL_VERSION = "v0"
+SOCKET_ENV_VAR = "CORTEX_COACH_DAEMON_SOCKET"
+ENABLE_ENV_VAR = "CORTEX_COACH_DAEMON"
+CONNECT_TIMEOUT_SECONDS = 0.5
+START_TIMEOUT_SECONDS = 10.0
+STREAM_POLL_SECONDS = 0.05
+SOCKET_FILE_NAME = "daemon.sock"
+FORWARDED_ENV_NAMES = ("HOME", "LANG", "LANGUAGE", "PATH", "TERM", "TMPDIR", "TZ", "USER", "NO_COLOR")
+FORWARDED_ENV_PREFIXES = ("CORTEX_", "LC_", "PYTHON")
+
+OutputCallback = Callable[[str, str], None]
+
+
+def default_socket_path() -> Path:
+    override = os.environ.get(SOCKET_ENV_VAR, "").strip()
+    if override:
+        return Path(override)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", "").strip() or tempfile.gettempdir()
+    return Path(runtime_dir) / f"cortex-coach-daemon-{os.getuid()}" / SOCKET_FILE_NAME
+
+
+def _is_private(path: Path, expect_type: Callable[[int], bool]) -> bool:
+    """True when `path` (not followed) has the expected type, is ours, and grants no group/other access."""
+    try:
+        info = path.lstat()
+    except OSError:
+        return False
+    return expect_type(info.st_mode) and info.st_uid == os.getuid() and info.st_mode & 0o077 == 0
+
+
+def socket_is_trusted(socket_path: Path) -> bool:
+    return _is_private(socket_path.parent, stat.S_ISDIR) and _is_private(socket_path, stat.S_ISSOCK)
+
+
+def _peer_is_current_user(client: socket.socket) -> bool:
+    if not hasattr(socket, "SO_PEERCRED"):
+        # No peer credentials on this platform; the private directory and socket checks still apply.
+        return True
+    creds = client.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return uid == os.getuid()
+
+
+def forwarded_env(environ: Mapping[str, str]) -> dict[str, str]:
+    """The subset of `environ` a delegated coach command needs; credentials and tokens stay with the caller."""
+    return {
+        name: value
+        for name, value in environ.items()
+        if name in FORWARDED_ENV_NAMES or name.startswith(FORWARDED_ENV_PREFIXES)
+    }
+
+
+def _coach_stat_token(coach_bin: str) -> str:
+    try:
+        stat = Path(coach_bin).stat()
+    except OSError:
+        return ""
+    return f"{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}"
+
+
+def shebang_interpreter(coach_bin: str) -> str | None:
+    """Python interpreter named by the console-script shebang, or None if it is not a Python script."""
+    try:
+        with open(coach_bin, "rb") as fh:
+            first_line = fh.readline(4096).decode("utf-8", errors="replace").strip()
+    except OSError:
+        return None
+    if not first_line.startswith("#!"):
+        return None
+    parts = first_line[2:].split()
+    if not parts:
+        return None
+    if Path(parts[0]).name == "env" and len(parts) > 1:
+        parts = [shutil.which(parts[1]) or parts[1], *parts[2:]]
+    if "python" not in Path(parts[0]).name:
+        return None
+    return parts[0]
+
+
+def _send(
+    socket_path: Path,
+    request: dict[str, Any],
+    timeout: float | None,
+    on_output: OutputCallback | None = None,
+) -> dict[str, Any] | None:
+    """Send one request; None if no trusted daemon is reachable. Raises ConnectionError if it dies mid-request.
+
+    Streamed `output` messages are passed to `on_output(stream, data)` until the final response arrives.
+    """
+    if not socket_is_trusted(socket_path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(CONNECT_TIMEOUT_SECONDS)
+        try:
+            client.connect(str(socket_path))
+        except OSError:
+            return None
+        if not _peer_is_current_user(client):
+            return None
+        client.settimeout(timeout)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as reader:
+            while True:
+                line = reader.readline()
+                if not line:
+                    raise ConnectionError("cortex-coach daemon closed the connection without a response")
+                try:
+                    response = json.loads(line)
+                except ValueError as exc:
+                    raise ConnectionError(f"cortex-coach daemon sent an unreadable response: {exc}") from exc
+                if not isinstance(response, dict) or response.get("version") != PROTOCOL_VERSION:
+                    raise ConnectionError("cortex-coach daemon sent an unsupported response")
+                if response.get("status") != "output":
+                    return response
+                if on_output is not None:
+                    on_output(str(response.get("stream", "stdout")), str(response.get("data", "")))
+    finally:
+        client.close()
+
+
+def run_command(
+    coach_bin: str,
+    argv: list[str],
+    on_output: OutputCallback | None = None,
+) -> subprocess.CompletedProcess[str] | None:
+    """Run `cortex-coach argv` through the daemon; None means the caller should fall back to subprocess.
+
+    With `on_output`, output is streamed to it while the command runs and the result carries only what the
+    daemon did not stream.
+    """
+    if os.environ.get(ENABLE_ENV_VAR, "") != "1":
+        return None
+    request = {
+        "version": PROTOCOL_VERSION,
+        "op": "run",
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": forwarded_env(os.environ),
+        "coach_bin": str(Path(coach_bin).resolve()),
+        "stream": on_output is not None,
+    }
+    try:
+        response = _send(default_socket_path(), request, timeout=None, on_output=on_output)
+    except ConnectionError as exc:
+        # The command may already have run; re-running it via subprocess could duplicate writes.
+        return subprocess.CompletedProcess([coach_bin, *argv], 1, "", f"{exc}\n")
+    if response is None or response.get("status") != "ok":
+        return None
+    return subprocess.CompletedProcess(
+        [coach_bin, *argv],
+        int(response.get("returncode", 1)),
+        str(response.get("stdout", "")),
+        str(response.get("stderr", "")),
+    )
+
+
+@contextlib.contextmanager
+def _captured_fds() -> Iterator[tuple[Path, Path]]:
+    """Redirect fd 1/2 to temp files so output from the coach and its subprocesses is captured."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    out_fd, out_name = tempfile.mkstemp(prefix="cortex_coach_daemon_", suffix=".out")
+    err_fd, err_name = tempfile.mkstemp(prefix="cortex_coach_daemon_", suffix=".err")
+    saved_stdout = os.dup(1)
+    saved_stderr = os.dup(2)
+    try:
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+        yield Path(out_name), Path(err_name)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_stdout, 1)
+        os.dup2(saved_stderr, 2)
+        for fd in (saved_stdout, saved_stderr, out_fd, err_fd):
+            os.close(fd)
+
+
+@contextlib.contextmanager
+def _forwarding(paths: dict[str, Path], on_output: OutputCallback) -> Iterator[None]:
+    """Forward text appended to each captured file to `on_output(stream, text)` until the block exits."""
+    handles = {name: path.open("rb") for name, path in paths.items()}
+    decoders = {name: codecs.getincrementaldecoder("utf-8")(errors="replace") for name in paths}
+    stop = threading.Event()
+
+    def _pump(final: bool = False) -> None:
+        for name, handle in handles.items():
+            text = decoders[name].decode(handle.read() or b"", final=final)
+            if text:
+                on_output(name, text)
+
+    def _loop() -> None:
+        while not stop.wait(STREAM_POLL_SECONDS):
+            _pump()
+
+    # Line buffering makes the coach's own prints reach the captured files as they happen.
+    saved_buffering = (sys.stdout.line_buffering, sys.stderr.line_buffering)
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stderr.reconfigure(line_buffering=True)
+    thread = threading.Thread(target=_loop, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        stop.set()
+        thread.join()
+        _pump(final=True)
+        sys.stdout.reconfigure(line_buffering=saved_buffering[0])
+        sys.stderr.reconfigure(line_buffering=saved_buffering[1])
+        for handle in handles.values():
+            handle.close()
+
+
+def run_console_script(
+    script: str,
+    argv: list[str],
+    cwd: str | None = None,
+    env: dict[str, str] | None = None,
+    on_output: OutputCallback | None = None,
+) -> tuple[int, str, str]:
+    """Execute a Python console script in this interpreter as `script argv...`; returns (returncode, stdout, stderr).
+
+    With `on_output`, output is forwarded while the script runs and the returned stdout/stderr are empty.
+    """
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    saved_argv = sys.argv
+    returncode = 0
+    with _captured_fds() as (out_path, err_path), contextlib.ExitStack() as forwarding:
+        if on_output is not None:
+            forwarding.enter_context(_forwarding({"stdout": out_path, "stderr": err_path}, on_output))
+        try:
+            if cwd is not None:
+                os.chdir(cwd)
+            if env is not None:
+                os.environ.clear()
+                os.environ.update(env)
+            sys.argv = [script, *argv]
+            # Match `python script.py`, which puts the script directory first on sys.path.
+            script_dir = str(Path(script).resolve().parent)
+            if script_dir not in sys.path:
+                sys.path.insert(0, script_dir)
+            runpy.run_path(script, run_name="__main__")
+        except SystemExit as exc:
+            code = exc.code
+            if code is None:
+                returncode = 0
+            elif isinstance(code, int):
+                returncode = code
+            else:
+                print(code, file=sys.stderr)
+                returncode = 1
+        except Exception as exc:  # noqa: BLE001
+            print(f"{Path(script).name}: {type(exc).__name__}: {exc}", file=sys.stderr)
+            returncode = 1
+        finally:
+            sys.argv = saved_argv
+            if env is not None:
+                os.environ.clear()
+                os.environ.update(saved_env)
+            os.chdir(saved_cwd)
+    try:
+        stdout = "" if on_output else out_path.read_text(encoding="utf-8", errors="replace")
+        stderr = "" if on_output else err_path.read_text(encoding="utf-8", errors="replace")
+    finally:
+        out_path.unlink(missing_ok=True)
+        err_path.unlink(missing_ok=True)
+    return returncode, stdout, stderr
+
+
+class CoachDaemon:
+    def __init__(self, coach_bin: str, idle_timeout_seconds: float) -> None:
+        self.coach_bin = str(Path(coach_bin).resolve())
+        self.coach_stat = _coach_stat_token(self.coach_bin)
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.last_activity = time.monotonic()
+        self.served = 0
+        self.stopping = False
+
+    def handle(self, request: dict[str, Any], emit: Callable[[dict[str, Any]], None] | None = None) -> dict[str, Any]:
+        self.last_activity = time.monotonic()
+        op = request.get("op")
+        if op == "ping":
+            response = {"status": "ok", "pid": os.getpid(), "coach_bin": self.coach_bin, "served": self.served}
+        elif op == "shutdown":
+            self.stopping = True
+            response = {"status": "ok", "pid": os.getpid()}
+        elif op != "run":
+            response = {"status": "rejected", "reason": f"unsupported op: {op!r}"}
+        elif request.get("coach_bin") != self.coach_bin or _coach_stat_token(self.coach_bin) != self.coach_stat:
+            # The installed coach changed under us; let callers fall back and retire this daemon.
+            self.stopping = True
+            response = {"status": "rejected", "reason": "coach_bin_changed"}
+        else:
+            argv = request.get("argv")
+            cwd = request.get("cwd")
+            env = request.get("env")
+            if not isinstance(argv, list) or not isinstance(cwd, str) or not isinstance(env, dict):
+                response = {"status": "rejected", "reason": "invalid run request"}
+            else:
+                on_output = None
+                if request.get("stream") and emit is not None:
+
+                    def on_output(stream: str, data: str) -> None:
+                        emit({"version": PROTOCOL_VERSION, "status": "output", "stream": stream, "data": data})
+
+                returncode, stdout, stderr = run_console_script(
+                    self.coach_bin,
+                    [str(item) for item in argv],
+                    cwd=cwd,
+                    env={str(k): str(v) for k, v in env.items()},
+                    on_output=on_output,
+                )
+                response = {"status": "ok", "returncode": returncode, "stdout": stdout, "stderr": stderr}
+                self.served += 1
+        response["version"] = PROTOCOL_VERSION
+        return response
+
+
+def _serve(socket_path: Path, daemon: CoachDaemon) -> int:
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            line = self.rfile.readline()
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                request = None
+            if not isinstance(request, dict) or request.get("version") != PROTOCOL_VERSION:
+                response = {"version": PROTOCOL_VERSION, "status": "rejected", "reason": "invalid request"}
+            else:
+                response = daemon.handle(request, emit=self._emit)
+            self._emit(response)
+
+        def _emit(self, message: dict[str, Any]) -> None:
+            try:
+                self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+            except OSError:
+                # The client went away; the command still runs to completion.
+                pass
+
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not _is_private(socket_path.parent, stat.S_ISDIR):
+        sys.stderr.write(f"refusing to serve: {socket_path.parent} must be a 0700 directory owned by this user\n")
+        return 1
+    socket_path.unlink(missing_ok=True)
+    previous_umask = os.umask(0o077)
+    try:
+        server = socketserver.UnixStreamServer(str(socket_path), Handler)
+    finally:
+        os.umask(previous_umask)
+    server.timeout = 1.0
+    try:
+        while not daemon.stopping:
+            server.handle_request()
+            idle = time.monotonic() - daemon.last_activity
+            if daemon.idle_timeout_seconds > 0 and idle > daemon.idle_timeout_seconds:
+                break
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+    return 0
+
+
+def _ping(socket_path: Path) -> dict[str, Any] | None:
+    try:
+        return _send(socket_path, {"version": PROTOCOL_VERSION, "op": "ping"}, timeout=CONNECT_TIMEOUT_SECONDS)
+    except (ConnectionError, OSError):
+        return None
+
+
+def _emit(payload: dict[str, Any], output_format: str) -> None:
+    if output_format == "json":
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+        return
+    for key in ("status", "socket", "pid", "coach_bin", "served", "message"):
+        if key in payload:
+            sys.stdout.write(f"{key}: {payload[key]}\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Warm cortex-coach daemon for the project coach delegator.")
+    parser.add_argument("action", choices=("start", "serve", "status", "stop"))
+    parser.add_argument(
+        "--socket",
+        default="",
+        help=f"Defaults to ${SOCKET_ENV_VAR} or a socket in a per-user 0700 runtime directory.",
+    )
+    parser.add_argument("--coach-bin", default="", help="Defaults to `cortex-coach` on PATH.")
+    parser.add_argument("--idle-timeout-seconds", type=float, default=1800.0)
+    parser.add_argument("--format", default="text", choices=("text", "json"))
+    args = parser.parse_args()
+
+    socket_path = Path(args.socket) if args.socket else default_socket_path()
+    payload: dict[str, Any] = {"version": PROTOCOL_VERSION, "socket": str(socket_path)}
+
+    if args.action == "status":
+        info = _ping(socket_path)
+        payload.update(info or {})
+        payload["status"] = "running" if info else "stopped"
+        _emit(payload, args.format)
+        return 0 if info else 1
+
+    if args.action == "stop":
+        try:
+            info = _send(socket_path, {"version": PROTOCOL_VERSION, "op": "shutdown"}, timeout=5.0)
+        except (ConnectionError, OSError):
+            info = None
+        payload["status"] = "stopped"
+        if info:
+            payload["pid"] = info.get("pid")
+        _emit(payload, args.format)
+        return 0
+
+    coach_bin = args.coach_bin or shutil.which("cortex-coach") or ""
+    interpreter = shebang_interpreter(coach_bin) if coach_bin else None
+    if interpreter is None:
+        payload["status"] = "fail"
+        payload["message"] = "cortex-coach not found or not a Python console script; delegator keeps using subprocess."
+        _emit(payload, args.format)
+        return 1
+
+    if args.action == "serve":
+        daemon = CoachDaemon(coach_bin, args.idle_timeout_seconds)
+        return _serve(socket_path, daemon)
+
+    existing = _ping(socket_path)
+    if existing:
+        payload.update(existing)
+        payload["status"] = "running"
+        _emit(payload, args.format)
+        return 0
+    if socket_path.parent.exists() and not _is_private(socket_path.parent, stat.S_ISDIR):
+        payload["status"] = "fail"
+        payload["message"] = f"{socket_path.parent} must be a 0700 directory owned by this user."
+        _emit(payload, args.format)
+        return 1
+
+    command = [
+        interpreter,
+        str(Path(__file__).resolve()),
+        "serve",
+        "--socket",
+        str(socket_path),
+        "--coach-bin",
+        coach_bin,
+        "--idle-timeout-seconds",
+        str(args.idle_timeout_seconds),
+    ]
+    subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    info = None
+    while time.monotonic() < deadline:
+        info = _ping(socket_path)
+        if info:
+            break
+        time.sleep(0.05)
+    payload.update(info or {})
+    payload["status"] = "running" if info else "fail"
+    if not info:
+        payload["message"] = "daemon did not become ready before timeout."
+    _emit(payload, args.format)
+    return 0 if info else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
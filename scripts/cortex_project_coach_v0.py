@@ -14,6 +14,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from cortex_coach_daemon_v0 import run_command as run_daemon_command
+
 
 NATIVE_FORMAT_COMMANDS = {
     "audit-needed",
@@ -936,7 +938,7 @@ def _run_bootstrap_scaffold_command(argv: list[str], coach_bin: str | None) -> i
         if force:
             init_cmd.append("--force")
 
-        proc = subprocess.run(init_cmd, check=False, text=True, capture_output=True)
+        proc = _run_coach_captured(init_cmd[0], init_cmd[1:])
         init_result = {
             "performed": True,
             "returncode": proc.returncode,
@@ -1160,7 +1162,24 @@ def _emit_shim_json(
     _emit_json_payload(_shim_json_payload(subcommand, forwarded_argv, proc))
 
 
+def _run_coach_captured(coach_bin: str, argv: list[str]) -> subprocess.CompletedProcess[str]:
+    proc = run_daemon_command(coach_bin, argv)
+    if proc is not None:
+        return proc
+    return subprocess.run([coach_bin, *argv], check=False, text=True, capture_output=True)
+
+
+def _forward_output(stream: str, text: str) -> None:
+    target = sys.stderr if stream == "stderr" else sys.stdout
+    target.write(text)
+    target.flush()
+
+
 def _run_passthrough(coach_bin: str, argv: list[str]) -> int:
+    daemon_proc = run_daemon_command(coach_bin, argv, on_output=_forward_output)
+    if daemon_proc is not None:
+        _emit_text(daemon_proc.stdout, daemon_proc.stderr)
+        return daemon_proc.returncode
     proc = subprocess.run([coach_bin, *argv], check=False)
     return proc.returncode
 
@@ -1174,7 +1193,7 @@ def _run_with_format_shim(coach_bin: str, argv: list[str], subcommand: str, requ
         return _run_passthrough(coach_bin, argv)
 
     forwarded_argv = _strip_option(argv, "--format")
-    proc = subprocess.run([coach_bin, *forwarded_argv], check=False, text=True, capture_output=True)
+    proc = _run_coach_captured(coach_bin, forwarded_argv)
     if requested_format == "text":
         _emit_text(proc.stdout, proc.stderr)
         return proc.returncode
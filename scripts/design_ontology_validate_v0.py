@@ -12,7 +12,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-import jsonschema
+from schema_registry_v0 import validate_instance
 
 
 DEFAULT_SCHEMA = Path("templates/design_ontology_v0.schema.json")
@@ -62,9 +62,10 @@ def syntax_check(path: Path) -> tuple[str, str]:
 
 def schema_check(instance: Path, schema: Path) -> tuple[str, str]:
     try:
-        schema_obj = json.loads(schema.read_text(encoding="utf-8"))
         instance_obj = json.loads(instance.read_text(encoding="utf-8"))
-        jsonschema.validate(instance=instance_obj, schema=schema_obj)
+        error = validate_instance(schema, instance_obj)
+        if error is not None:
+            return "fail", error
         return "pass", ""
     except Exception as exc:  # noqa: BLE001
         return "fail", str(exc)
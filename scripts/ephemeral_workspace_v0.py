@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Pooled ephemeral git workspaces for performance and reliability packs.
+
+Packs measure gates inside a throwaway repository whose single commit is a snapshot of the project's working
+tree (tracked and untracked, non-ignored files) with a clean `git status`. Copying the tree and re-hashing every
+file for each measurement costs more than many gates, so `ephemeral_workspace(project_dir)` instead:
+
+- snapshots the working tree into a cached bare object store (`<git-dir>/cortex/ephemeral_workspace_v0/`).
+  The store borrows the project's objects through `objects/info/alternates` and keeps its own index, so a
+  re-snapshot only hashes files whose stat data changed.
+- hands out a pooled `git worktree` of that snapshot, reset to it with `git reset --hard` plus `git clean -ffdx`.
+  Only files that differ from the previous use are rewritten.
+
+Slots are guarded by `flock`, so concurrent packs get separate worktrees. Projects outside git keep their store
+under the system temp directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator
+
+
+STORE_VERSION = "v0"
+STORE_REL_PATH = Path("cortex") / "ephemeral_workspace_v0"
+DEFAULT_POOL_SIZE = 4
+BASELINE_REF = "refs/heads/baseline"
+# Mirrors the ignore list of the former per-run `shutil.copytree` copies.
+SNAPSHOT_EXCLUDES = (".uv-cache/", "__pycache__/", "*.pyc", ".pytest_cache/")
+IDENTITY = {
+    "GIT_AUTHOR_NAME": "Cortex Ephemeral Workspace",
+    "GIT_AUTHOR_EMAIL": "ephemeral-workspace@example.com",
+    "GIT_AUTHOR_DATE": "2000-01-01T00:00:00Z",
+    "GIT_COMMITTER_NAME": "Cortex Ephemeral Workspace",
+    "GIT_COMMITTER_EMAIL": "ephemeral-workspace@example.com",
+    "GIT_COMMITTER_DATE": "2000-01-01T00:00:00Z",
+}
+
+
+def _git(*args: str, cwd: Path | None = None, env: dict[str, str] | None = None) -> str:
+    proc = subprocess.run(
+        ["git", *args],
+        cwd=str(cwd) if cwd is not None else None,
+        env={**os.environ, **(env or {})},
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {proc.stderr.strip()}")
+    return proc.stdout.strip()
+
+
+def _source_git_dir(project_dir: Path) -> Path | None:
+    try:
+        common = _git("rev-parse", "--git-common-dir", cwd=project_dir)
+    except (RuntimeError, OSError):
+        return None
+    path = Path(common)
+    return path if path.is_absolute() else (project_dir / path).resolve()
+
+
+def default_store_dir(project_dir: Path) -> Path:
+    git_dir = _source_git_dir(project_dir)
+    if git_dir is not None:
+        return git_dir / STORE_REL_PATH
+    digest = hashlib.sha256(str(project_dir).encode("utf-8")).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"cortex_ephemeral_workspace_{STORE_VERSION}" / digest
+
+
+@contextlib.contextmanager
+def _locked(path: Path, blocking: bool = True) -> Iterator[bool]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class WorkspaceProvider:
+    """Snapshots `project_dir` into a bare store and leases pooled worktrees of the snapshot."""
+
+    def __init__(self, project_dir: Path, store_dir: Path | None = None, pool_size: int = DEFAULT_POOL_SIZE):
+        self.project_dir = project_dir.resolve()
+        self.store_dir = (store_dir or default_store_dir(self.project_dir)).resolve()
+        self.pool_size = max(1, pool_size)
+        self.git_dir = self.store_dir / "store.git"
+
+    def _store_git(self, *args: str, cwd: Path | None = None, env: dict[str, str] | None = None) -> str:
+        return _git(f"--git-dir={self.git_dir}", *args, cwd=cwd, env=env)
+
+    def _init_store(self) -> None:
+        if (self.git_dir / "HEAD").exists():
+            return
+        shutil.rmtree(self.git_dir, ignore_errors=True)
+        _git("init", "--bare", "-q", str(self.git_dir))
+        self._store_git("config", "gc.auto", "0")
+        self._store_git("config", "user.name", IDENTITY["GIT_COMMITTER_NAME"])
+        self._store_git("config", "user.email", IDENTITY["GIT_COMMITTER_EMAIL"])
+        source_git_dir = _source_git_dir(self.project_dir)
+        if source_git_dir is not None and (source_git_dir / "objects").is_dir():
+            (self.git_dir / "objects" / "info" / "alternates").write_text(
+                f"{source_git_dir / 'objects'}\n", encoding="utf-8"
+            )
+        excludes = [*SNAPSHOT_EXCLUDES]
+        if self.store_dir.is_relative_to(self.project_dir):
+            excludes.append(f"/{self.store_dir.relative_to(self.project_dir).as_posix()}/")
+        (self.git_dir / "info").mkdir(exist_ok=True)
+        (self.git_dir / "info" / "exclude").write_text("\n".join(excludes) + "\n", encoding="utf-8")
+
+    def _snapshot_once(self) -> str:
+        self._init_store()
+        env = {
+            **IDENTITY,
+            "GIT_WORK_TREE": str(self.project_dir),
+            "GIT_INDEX_FILE": str(self.git_dir / "snapshot_index"),
+        }
+        self._store_git("add", "-A", "--", ".", cwd=self.project_dir, env=env)
+        tree = self._store_git("write-tree", cwd=self.project_dir, env=env)
+        commit = self._store_git("commit-tree", tree, "-m", "ephemeral workspace baseline", env=IDENTITY)
+        self._store_git("update-ref", BASELINE_REF, commit)
+        return commit
+
+    def snapshot(self) -> str:
+        """Commit the current working tree into the store; unchanged trees yield the same commit."""
+        with _locked(self.store_dir / "snapshot.lock"):
+            try:
+                return self._snapshot_once()
+            except RuntimeError:
+                # A damaged store (for example objects pruned from the alternate) is rebuilt from scratch.
+                shutil.rmtree(self.git_dir, ignore_errors=True)
+                return self._snapshot_once()
+
+    def resolve(self, ref: str) -> str:
+        """Commit id of `ref` in the project repository; its objects reach the store through the alternate."""
+        return _git("rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}", cwd=self.project_dir)
+
+    def _checkout(self, slot: Path, commit: str) -> None:
+        if (slot / ".git").is_file():
+            try:
+                _git("reset", "-q", "--hard", commit, cwd=slot)
+                _git("clean", "-q", "-ffdx", cwd=slot)
+                return
+            except RuntimeError:
+                pass
+        shutil.rmtree(slot, ignore_errors=True)
+        self._store_git("worktree", "prune")
+        self._store_git("worktree", "add", "-q", "--detach", str(slot), commit)
+
+    @contextlib.contextmanager
+    def acquire(self, commit: str | None = None) -> Iterator[Path]:
+        """Lease a pooled worktree checked out at `commit` (default: a fresh snapshot)."""
+        commit = commit or self.snapshot()
+        pool_dir = self.store_dir / "pool"
+        for idx in range(self.pool_size):
+            with _locked(pool_dir / f"slot{idx}.lock", blocking=False) as acquired:
+                if not acquired:
+                    continue
+                slot = pool_dir / f"slot{idx}"
+                with _locked(self.store_dir / "worktrees.lock"):
+                    self._checkout(slot, commit)
+                yield slot
+                return
+        # Every pooled slot is busy: fall back to a worktree that is removed afterwards.
+        slot = Path(tempfile.mkdtemp(prefix="cortex_ephemeral_workspace_")) / "repo"
+        with _locked(self.store_dir / "worktrees.lock"):
+            self._store_git("worktree", "add", "-q", "--detach", str(slot), commit)
+        try:
+            yield slot
+        finally:
+            shutil.rmtree(slot.parent, ignore_errors=True)
+            with _locked(self.store_dir / "worktrees.lock"):
+                self._store_git("worktree", "prune")
+
+
+@contextlib.contextmanager
+def ephemeral_workspace(project_dir: Path, store_dir: Path | None = None, ref: str | None = None) -> Iterator[Path]:
+    """A committed, clean git workspace holding the current working tree of `project_dir`, or its commit `ref`."""
+    provider = WorkspaceProvider(project_dir, store_dir)
+    with provider.acquire(provider.resolve(ref) if ref else None) as workspace:
+        yield workspace
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Snapshot the project and report ephemeral workspace setup time.")
+    parser.add_argument("--project-dir", default=".")
+    parser.add_argument("--store-dir", help="Override the store location (default: under the project's git dir).")
+    parser.add_argument("--reset", action="store_true", help="Delete the store and its pooled worktrees first.")
+    parser.add_argument("--format", default="text", choices=("text", "json"))
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir).resolve()
+    provider = WorkspaceProvider(project_dir, Path(args.store_dir) if args.store_dir else None)
+    if args.reset:
+        shutil.rmtree(provider.store_dir, ignore_errors=True)
+
+    started = time.perf_counter()
+    commit = provider.snapshot()
+    snapshot_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    with provider.acquire(commit) as workspace:
+        acquire_seconds = time.perf_counter() - started
+        file_count = len(_git("ls-files", cwd=workspace).splitlines())
+    payload = {
+        "version": STORE_VERSION,
+        "status": "pass",
+        "project_dir": str(project_dir),
+        "store_dir": str(provider.store_dir),
+        "commit": commit,
+        "workspace": str(workspace),
+        "file_count": file_count,
+        "snapshot_seconds": snapshot_seconds,
+        "acquire_seconds": acquire_seconds,
+    }
+    if args.format == "json":
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(
+            f"workspace: {workspace}\ncommit: {commit}\nfiles: {file_count}\n"
+            f"snapshot_seconds: {snapshot_seconds:.3f}\nacquire_seconds: {acquire_seconds:.3f}\n"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Persistent sha256 digest cache keyed by file stat metadata.
+
+A cached digest is reused only while the file's size, mtime_ns and inode are unchanged; any stat
+change re-reads and re-hashes the file. Files modified within `RACY_WINDOW_NS` of the hash are not
+cached, because a same-timestamp rewrite would otherwise go unnoticed (git's "racy clean" case).
+Lookups are thread-safe; `sha256_many` hashes a batch on the shared I/O pool.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from parallel_io_v0 import map_ordered
+
+
+CACHE_VERSION = "v0"
+CACHE_FILE_NAME = "file_digest_cache_v0.json"
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_cache_file(project_dir: Path, cortex_root: str) -> Path:
+    return project_dir / cortex_root / "state" / "cache" / CACHE_FILE_NAME
+
+
+class DigestCache:
+    """Digest lookups backed by an on-disk JSON map; call `save()` to persist new entries."""
+
+    def __init__(self, cache_file: Path | None) -> None:
+        self.cache_file = cache_file
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if cache_file is not None:
+            self._load(cache_file)
+
+    def _load(self, cache_file: Path) -> None:
+        try:
+            payload = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+            return
+        entries = payload.get("entries")
+        if isinstance(entries, dict):
+            self._entries = {str(key): value for key, value in entries.items() if isinstance(value, dict)}
+
+    def sha256(self, path: Path) -> str:
+        if self.cache_file is None:
+            digest = sha256_file(path)
+            with self._lock:
+                self.misses += 1
+            return digest
+
+        key = str(path.resolve())
+        stat = path.stat()
+        token = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.get("stat") == token and isinstance(entry.get("sha256"), str):
+                self.hits += 1
+                return str(entry["sha256"])
+
+        digest = sha256_file(path)
+        with self._lock:
+            self.misses += 1
+            if time.time_ns() - stat.st_mtime_ns >= RACY_WINDOW_NS:
+                self._entries[key] = {"stat": token, "sha256": digest}
+                self._dirty = True
+            elif self._entries.pop(key, None) is not None:
+                self._dirty = True
+        return digest
+
+    def sha256_many(self, paths: list[Path]) -> list[tuple[str | None, Exception | None]]:
+        """`sha256` of each path on the shared I/O pool, as `(digest, None)` or `(None, error)` in input order."""
+        return map_ordered(self.sha256, paths)
+
+    def save(self) -> None:
+        if self.cache_file is None or not self._dirty:
+            return
+        payload = {"version": CACHE_VERSION, "entries": self._entries}
+        tmp_path = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(payload, separators=(",", ":"), sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._dirty = False
+
+    def stats(self) -> dict[str, Any]:
+        return {"enabled": self.cache_file is not None, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""Per-step timing and resource records for the quality gate bundle.
+
+Each gate step yields one record:
+
+- `wall_seconds`
+- `cpu_seconds`: user plus system time, including reaped subprocesses
+- `peak_rss_bytes`
+- `bytes_read`: the `/proc/self/io` rchar delta, which includes reaped subprocesses
+- `files_read`: distinct paths opened for reading by the gate interpreter
+- `subprocesses_spawned`: processes started by the gate interpreter
+
+The last two come from a `sys.addaudithook` probe. They are `null` for steps that are not Python gates.
+
+Sources:
+
+- `quality_gate_runner_v0.py --timing-out` times its steps in process.
+- The shell gates time every `run_quiet` step through `record` when `CORTEX_QG_TIMING_RECORDS` names a records
+  file (one JSON record per line). `report` turns that file into the timing artifact, with an optional Chrome
+  trace-event export (load it in `chrome://tracing` or Perfetto).
+
+`attribute_steps` compares per-step samples of two arms, so overhead reports can name the gates that got slower.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from perf_measurement_v0 import DEFAULT_THRESHOLD_PERCENT, REGRESSED, compare_samples
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_TIMING_PATH = ".cortex/reports/project_state/quality_gate_step_timing_v0.json"
+RECORDS_ENV = "CORTEX_QG_TIMING_RECORDS"
+PROBE_OUT_ENV = "CORTEX_QG_STEP_PROBE_OUT"
+# `os.posix_spawn` is left out: subprocess.Popen raises its own event before using it.
+SPAWN_EVENTS = frozenset({"subprocess.Popen", "os.system", "os.fork", "os.forkpty"})
+
+# Runs a Python gate under the audit probe, then leaves its counts in $CORTEX_QG_STEP_PROBE_OUT.
+_PYTHON_PROBE = """
+import os, runpy, sys
+sys.path.insert(0, {scripts_dir!r})
+from gate_step_timing_v0 import StepProbe
+script = sys.argv[1]
+sys.argv = sys.argv[1:]
+sys.path[:2] = [os.path.dirname(os.path.abspath(script))]
+probe = StepProbe()
+try:
+    with probe:
+        runpy.run_path(script, run_name="__main__")
+finally:
+    sys.stdout.flush()
+    probe.dump(os.environ[{probe_env!r}])
+"""
+
+_ACTIVE_PROBES: list["StepProbe"] = []
+_HOOK_INSTALLED = False
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _opens_for_read(mode: Any, flags: Any) -> bool:
+    if isinstance(mode, str):
+        return "r" in mode or "+" in mode
+    if isinstance(flags, int):
+        return (flags & os.O_ACCMODE) in (os.O_RDONLY, os.O_RDWR)
+    return False
+
+
+def _audit_hook(event: str, args: tuple[Any, ...]) -> None:
+    if not _ACTIVE_PROBES:
+        return
+    if event == "open":
+        path, mode, flags = args
+        if isinstance(path, (str, bytes)) and _opens_for_read(mode, flags):
+            name = os.fsdecode(path)
+            for probe in _ACTIVE_PROBES:
+                probe.files_read.add(name)
+    elif event in SPAWN_EVENTS:
+        for probe in _ACTIVE_PROBES:
+            probe.subprocesses_spawned += 1
+
+
+class StepProbe:
+    """Counts files opened for reading and processes spawned by this interpreter while active."""
+
+    def __init__(self) -> None:
+        self.files_read: set[str] = set()
+        self.subprocesses_spawned = 0
+
+    def __enter__(self) -> "StepProbe":
+        global _HOOK_INSTALLED
+        # Audit hooks cannot be removed, so one hook is installed per process and idles without active probes.
+        if not _HOOK_INSTALLED:
+            sys.addaudithook(_audit_hook)
+            _HOOK_INSTALLED = True
+        _ACTIVE_PROBES.append(self)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        _ACTIVE_PROBES.remove(self)
+
+    def counts(self) -> dict[str, int]:
+        return {"files_read": len(self.files_read), "subprocesses_spawned": self.subprocesses_spawned}
+
+    def dump(self, path: str) -> None:
+        Path(path).write_text(json.dumps(self.counts()), encoding="utf-8")
+
+
+def _rchar() -> int | None:
+    try:
+        with open("/proc/self/io", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _rss_bytes(maxrss: int) -> int:
+    return maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def _usage(include_self: bool) -> dict[str, Any]:
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = children.ru_utime + children.ru_stime
+    peak = children.ru_maxrss
+    if include_self:
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        cpu += own.ru_utime + own.ru_stime
+        peak = max(peak, own.ru_maxrss)
+    return {"perf": time.perf_counter(), "cpu": cpu, "peak_rss": _rss_bytes(peak), "rchar": _rchar()}
+
+
+def _record(
+    label: str,
+    step_id: str | None,
+    probe_kind: str,
+    returncode: int,
+    started_at: float,
+    before: dict[str, Any],
+    after: dict[str, Any],
+    counts: dict[str, int] | None,
+) -> dict[str, Any]:
+    bytes_read = None
+    if before["rchar"] is not None and after["rchar"] is not None:
+        bytes_read = after["rchar"] - before["rchar"]
+    return {
+        "label": label,
+        "step_id": step_id,
+        "probe": probe_kind,
+        "pid": os.getpid(),
+        "returncode": returncode,
+        "started_at_unix": started_at,
+        "wall_seconds": after["perf"] - before["perf"],
+        "cpu_seconds": after["cpu"] - before["cpu"],
+        "peak_rss_bytes": after["peak_rss"],
+        "bytes_read": bytes_read,
+        "files_read": None if counts is None else counts["files_read"],
+        "subprocesses_spawned": None if counts is None else counts["subprocesses_spawned"],
+    }
+
+
+def time_in_process(label: str, call: Callable[[], int], step_id: str | None = None) -> tuple[int, dict[str, Any]]:
+    """Run `call` in this process under the probe.
+
+    Peak RSS is the process high-water mark, so an in-process step reports at least the RSS of earlier steps.
+    """
+    started_at = time.time()
+    before = _usage(include_self=True)
+    with StepProbe() as probe:
+        returncode = call()
+    after = _usage(include_self=True)
+    return returncode, _record(label, step_id, "in_process", returncode, started_at, before, after, probe.counts())
+
+
+def _is_python_gate(command: list[str]) -> bool:
+    return len(command) >= 2 and Path(command[0]).name.startswith("python") and command[1].endswith(".py")
+
+
+def time_command(label: str, command: list[str], step_id: str | None = None) -> tuple[int, dict[str, Any]]:
+    """Run `command` as a subprocess; `python3 <gate>.py` commands run under the audit probe."""
+    env = None
+    probe_path: Path | None = None
+    argv = list(command)
+    if _is_python_gate(command):
+        fd, probe_name = tempfile.mkstemp(prefix="gate_step_probe_", suffix=".json")
+        os.close(fd)
+        probe_path = Path(probe_name)
+        env = {**os.environ, PROBE_OUT_ENV: probe_name}
+        shim = _PYTHON_PROBE.format(scripts_dir=str(SCRIPTS_DIR), probe_env=PROBE_OUT_ENV)
+        argv = [sys.executable, "-c", shim, *command[1:]]
+
+    started_at = time.time()
+    before = _usage(include_self=False)
+    returncode = subprocess.run(argv, env=env, check=False).returncode
+    after = _usage(include_self=False)
+
+    counts = None
+    if probe_path is not None:
+        try:
+            counts = json.loads(probe_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            counts = None
+        finally:
+            probe_path.unlink(missing_ok=True)
+    kind = "python_gate" if probe_path is not None else "command"
+    return returncode, _record(label, step_id, kind, returncode, started_at, before, after, counts)
+
+
+def append_record(records_file: Path, record: dict[str, Any]) -> None:
+    records_file.parent.mkdir(parents=True, exist_ok=True)
+    with records_file.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def read_records(records_file: Path) -> list[dict[str, Any]]:
+    if not records_file.exists():
+        return []
+    records: list[dict[str, Any]] = []
+    for line in records_file.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(item, dict):
+            records.append(item)
+    return records
+
+
+def build_report(records: list[dict[str, Any]], source: str) -> dict[str, Any]:
+    slowest = max(records, key=lambda item: float(item.get("wall_seconds", 0.0)), default=None)
+    return {
+        "version": "v0",
+        "artifact": "quality_gate_step_timing_v0",
+        "run_at": _now_iso(),
+        "status": "pass" if all(int(item.get("returncode", 1)) == 0 for item in records) else "fail",
+        "source": source,
+        "step_count": len(records),
+        "total_wall_seconds": sum(float(item.get("wall_seconds", 0.0)) for item in records),
+        "total_cpu_seconds": sum(float(item.get("cpu_seconds", 0.0)) for item in records),
+        "slowest_step": slowest.get("label") if slowest else None,
+        "steps": records,
+    }
+
+
+def chrome_trace(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Trace-event JSON with one complete ("X") event per step; parallel workers get their own rows."""
+    origin = min((float(item.get("started_at_unix", 0.0)) for item in records), default=0.0)
+    events: list[dict[str, Any]] = []
+    for item in records:
+        events.append(
+            {
+                "name": item.get("label", ""),
+                "cat": "quality_gate",
+                "ph": "X",
+                "ts": round((float(item.get("started_at_unix", 0.0)) - origin) * 1_000_000),
+                "dur": round(float(item.get("wall_seconds", 0.0)) * 1_000_000),
+                "pid": 1,
+                "tid": int(item.get("pid", 0)),
+                "args": {
+                    key: item.get(key)
+                    for key in (
+                        "returncode",
+                        "cpu_seconds",
+                        "peak_rss_bytes",
+                        "bytes_read",
+                        "files_read",
+                        "subprocesses_spawned",
+                    )
+                },
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_report(
+    records: list[dict[str, Any]],
+    out_file: Path,
+    source: str,
+    chrome_trace_file: Path | None = None,
+) -> dict[str, Any]:
+    payload = build_report(records, source)
+    _write_json(out_file, payload)
+    if chrome_trace_file is not None:
+        _write_json(chrome_trace_file, chrome_trace(records))
+    return payload
+
+
+def attribute_steps(
+    baseline_runs: list[list[dict[str, Any]]],
+    candidate_runs: list[list[dict[str, Any]]],
+    threshold_percent: float = DEFAULT_THRESHOLD_PERCENT,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Compare per-step wall times of two arms (one list of step records per run) and rank the slowdowns."""
+
+    def _by_label(runs: list[list[dict[str, Any]]]) -> dict[str, list[float]]:
+        samples: dict[str, list[float]] = {}
+        for run in runs:
+            for item in run:
+                samples.setdefault(str(item.get("label", "")), []).append(float(item.get("wall_seconds", 0.0)))
+        return samples
+
+    baseline = _by_label(baseline_runs)
+    candidate = _by_label(candidate_runs)
+    steps: list[dict[str, Any]] = []
+    for label, values in candidate.items():
+        if label not in baseline:
+            continue
+        comparison = compare_samples(baseline[label], values, threshold_percent=threshold_percent, seed=seed)
+        base_median = comparison["baseline"]["median_seconds"]
+        cand_median = comparison["candidate"]["median_seconds"]
+        steps.append(
+            {
+                "label": label,
+                "baseline_median_seconds": base_median,
+                "candidate_median_seconds": cand_median,
+                "delta_seconds": cand_median - base_median,
+                "delta_percent": comparison["delta_percent"],
+                "delta_percent_ci": comparison["delta_percent_ci"],
+                "verdict": comparison["verdict"],
+            }
+        )
+    slowdown = sum(item["delta_seconds"] for item in steps if item["delta_seconds"] > 0)
+    for item in steps:
+        share = item["delta_seconds"] / slowdown if slowdown > 0 and item["delta_seconds"] > 0 else 0.0
+        item["share_of_slowdown"] = share
+    steps.sort(key=lambda item: (-item["delta_seconds"], item["label"]))
+    return {
+        "threshold_percent": threshold_percent,
+        "steps": steps,
+        "regressed_steps": [item["label"] for item in steps if item["verdict"] == REGRESSED],
+        "baseline_only_steps": sorted(set(baseline) - set(candidate)),
+        "candidate_only_steps": sorted(set(candidate) - set(baseline)),
+    }
+
+
+def step_medians(runs: list[list[dict[str, Any]]]) -> dict[str, float]:
+    samples: dict[str, list[float]] = {}
+    for run in runs:
+        for item in run:
+            samples.setdefault(str(item.get("label", "")), []).append(float(item.get("wall_seconds", 0.0)))
+    return {label: float(statistics.median(values)) for label, values in samples.items()}
+
+
+def _format_text(payload: dict[str, Any]) -> str:
+    lines = [
+        f"status: {payload['status']}",
+        f"steps: {payload['step_count']}",
+        f"total_wall_seconds: {payload['total_wall_seconds']:.3f}",
+        f"slowest_step: {payload['slowest_step']}",
+    ]
+    for item in payload["steps"]:
+        files = "-" if item.get("files_read") is None else item["files_read"]
+        spawned = "-" if item.get("subprocesses_spawned") is None else item["subprocesses_spawned"]
+        lines.append(
+            f"- {item.get('label')}: wall={float(item.get('wall_seconds', 0.0)):.3f}s "
+            f"cpu={float(item.get('cpu_seconds', 0.0)):.3f}s rss={int(item.get('peak_rss_bytes', 0)) // 1024}KiB "
+            f"files={files} spawned={spawned}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Record and report per-step quality gate timings.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="Run one gate step and append its timing record.")
+    record.add_argument("--records-file", required=True)
+    record.add_argument("--label", required=True)
+    record.add_argument("--step-id")
+    record.add_argument("argv", nargs=argparse.REMAINDER, help="Step command, after `--`.")
+
+    report = sub.add_parser("report", help="Write the timing artifact from a records file.")
+    report.add_argument("--project-dir", default=".")
+    report.add_argument("--records-file", required=True)
+    report.add_argument("--out-file", default=DEFAULT_TIMING_PATH)
+    report.add_argument("--chrome-trace", help="Also write a Chrome trace-event JSON file.")
+    report.add_argument("--format", default="text", choices=("text", "json"))
+    args = parser.parse_args()
+
+    if args.command == "record":
+        command = args.argv[1:] if args.argv[:1] == ["--"] else args.argv
+        if not command:
+            parser.error("record requires a step command after `--`")
+        returncode, item = time_command(args.label, command, args.step_id)
+        append_record(Path(args.records_file), item)
+        return returncode
+
+    project_dir = Path(args.project_dir).resolve()
+    out_file = Path(args.out_file)
+    if not out_file.is_absolute():
+        out_file = project_dir / out_file
+    trace_file = Path(args.chrome_trace) if args.chrome_trace else None
+    if trace_file is not None and not trace_file.is_absolute():
+        trace_file = project_dir / trace_file
+    payload = write_report(read_records(Path(args.records_file)), out_file, args.records_file, trace_file)
+    if args.format == "json":
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(_format_text(payload) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Shared bounded thread pool for file reads, stats and digests.
+
+On network-backed volumes per-file latency, not bandwidth, dominates context loads and hydration
+checks. `map_ordered` issues those calls concurrently on one process-wide pool (the GIL is released
+during I/O and sha256 updates) and returns outcomes in input order, so callers keep their
+deterministic sequential post-processing. The pool width defaults to `DEFAULT_IO_WORKERS` and is
+overridden by `CORTEX_IO_WORKERS`; `CORTEX_IO_WORKERS=1` runs everything inline. One pool is kept per
+width and never shut down, so changing the width cannot break a `map_ordered` call already in flight.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import threading
+from typing import Callable, Sequence, TypeVar
+
+
+IO_WORKERS_ENV_VAR = "CORTEX_IO_WORKERS"
+DEFAULT_IO_WORKERS = 8
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_pools: dict[int, concurrent.futures.ThreadPoolExecutor] = {}
+_pool_lock = threading.Lock()
+
+
+def io_workers() -> int:
+    raw = os.environ.get(IO_WORKERS_ENV_VAR, "").strip()
+    try:
+        return max(1, int(raw)) if raw else DEFAULT_IO_WORKERS
+    except ValueError:
+        return DEFAULT_IO_WORKERS
+
+
+def _shared_pool(workers: int) -> concurrent.futures.ThreadPoolExecutor:
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cortex-io")
+            _pools[workers] = pool
+        return pool
+
+
+def _call(fn: Callable[[T], R], item: T) -> tuple[R | None, Exception | None]:
+    try:
+        return fn(item), None
+    except Exception as exc:  # noqa: BLE001 - handed back to the caller in order
+        return None, exc
+
+
+def map_ordered(fn: Callable[[T], R], items: Sequence[T]) -> list[tuple[R | None, Exception | None]]:
+    """`(result, None)` or `(None, exception)` for each item, in input order.
+
+    `fn` must be thread-safe. Calls made from a pool thread run inline, so nesting cannot deadlock.
+    """
+    width = io_workers()
+    if min(width, len(items)) <= 1 or threading.current_thread().name.startswith("cortex-io"):
+        return [_call(fn, item) for item in items]
+    pool = _shared_pool(width)
+    return list(pool.map(lambda item: _call(fn, item), items))
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Benchmark compiled boundary/release-surface path matchers against per-pattern loops."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Callable
+
+from path_matcher_v0 import GlobMatcher, RootMatcher
+
+
+EXTENSIONS = ("md", "json", "py", "txt", "yaml")
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _safe_rel_path(project_dir: Path, path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(project_dir.resolve()))
+    except ValueError:
+        return str(path.resolve())
+
+
+def _synthetic_corpus(
+    rng: random.Random,
+    path_count: int,
+    pattern_count: int,
+) -> tuple[list[str], list[str], list[str]]:
+    tops = [f"area{idx:03d}" for idx in range(max(8, pattern_count // 4))]
+    subs = [f"mod{idx:02d}" for idx in range(40)]
+    paths = [
+        "/".join(
+            [
+                rng.choice(tops),
+                rng.choice(subs),
+                f"part{rng.randrange(20):02d}",
+                f"file_{idx}_{rng.randrange(100):02d}.{rng.choice(EXTENSIONS)}",
+            ]
+        )
+        for idx in range(path_count)
+    ]
+
+    roots = sorted({f"{rng.choice(tops)}/{rng.choice(subs)}" for _ in range(pattern_count * 2)})[:pattern_count]
+
+    globs: list[str] = []
+    for idx in range(pattern_count):
+        shape = idx % 5
+        top = rng.choice(tops)
+        sub = rng.choice(subs)
+        suffix = f"{rng.randrange(100):02d}"
+        if shape == 0:
+            globs.append(f"{top}/{sub}/*_{suffix}.md")
+        elif shape == 1:
+            globs.append(f"{top}/*/part{rng.randrange(20):02d}/*.json")
+        elif shape == 2:
+            globs.append(f"{top}/{sub}/part?{rng.randrange(10)}/file_*")
+        elif shape == 3:
+            globs.append(f"{top}/[a-m]*/*_{suffix}.py")
+        else:
+            globs.append(f"*/{sub}/*/file_{rng.randrange(1000)}_*.yaml")
+    return paths, roots, globs
+
+
+def _naive_root(roots: list[str]) -> Callable[[str], str | None]:
+    def _is_path_under(path: str, root: str) -> bool:
+        normalized_path = path.strip("/")
+        normalized_root = root.strip("/")
+        if not normalized_root:
+            return False
+        return normalized_path == normalized_root or normalized_path.startswith(f"{normalized_root}/")
+
+    return lambda path: next((root for root in roots if _is_path_under(path, root)), None)
+
+
+def _naive_glob(globs: list[str]) -> Callable[[str], bool]:
+    return lambda path: any(fnmatch(path, pattern) for pattern in globs)
+
+
+def _time_classify(func: Callable[[str], Any], paths: list[str]) -> tuple[float, list[Any]]:
+    started = time.perf_counter()
+    results = [func(path) for path in paths]
+    return time.perf_counter() - started, results
+
+
+def _render_text(payload: dict[str, Any]) -> str:
+    lines = [
+        f"status: {payload.get('status')}",
+        f"patterns: {payload.get('pattern_count')}",
+    ]
+    for row in payload.get("scales", []):
+        lines.append(
+            f"- paths={row['path_count']} roots_s={row['root_seconds']:.3f} globs_s={row['glob_seconds']:.3f} "
+            f"root_us_per_path={row['root_us_per_path']:.2f} glob_us_per_path={row['glob_us_per_path']:.2f}"
+        )
+    naive = payload.get("naive_baseline", {})
+    lines.append(
+        f"naive_estimate_at_max_scale: roots_s={naive.get('root_seconds_estimated', 0.0):.1f} "
+        f"globs_s={naive.get('glob_seconds_estimated', 0.0):.1f}"
+    )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--project-dir", default=".")
+    parser.add_argument("--paths", type=int, default=500_000)
+    parser.add_argument("--patterns", type=int, default=1_000)
+    parser.add_argument("--scales", default="10000,100000,500000")
+    parser.add_argument("--naive-sample", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--max-per-path-growth", type=float, default=2.0)
+    parser.add_argument(
+        "--out-file",
+        default=".cortex/reports/project_state/path_matcher_benchmark_report_v0.json",
+    )
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("--fail-on-target-miss", action="store_true")
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir).resolve()
+    out_file = Path(args.out_file)
+    if not out_file.is_absolute():
+        out_file = (project_dir / out_file).resolve()
+
+    rng = random.Random(args.seed)
+    paths, roots, globs = _synthetic_corpus(rng, max(1, args.paths), max(1, args.patterns))
+    scales = sorted({min(len(paths), int(item)) for item in args.scales.split(",") if item.strip()} | {len(paths)})
+
+    started = time.perf_counter()
+    root_matcher = RootMatcher(roots)
+    glob_matcher = GlobMatcher(globs)
+    compile_seconds = time.perf_counter() - started
+
+    scale_rows: list[dict[str, Any]] = []
+    for scale in scales:
+        subset = paths[:scale]
+        root_seconds, _ = _time_classify(root_matcher.match, subset)
+        glob_seconds, _ = _time_classify(glob_matcher.matches, subset)
+        scale_rows.append(
+            {
+                "path_count": scale,
+                "root_seconds": root_seconds,
+                "glob_seconds": glob_seconds,
+                "root_us_per_path": root_seconds / scale * 1e6,
+                "glob_us_per_path": glob_seconds / scale * 1e6,
+            }
+        )
+
+    sample = rng.sample(paths, min(len(paths), max(1, args.naive_sample)))
+    naive_root_seconds, naive_roots = _time_classify(_naive_root(roots), sample)
+    naive_glob_seconds, naive_globs = _time_classify(_naive_glob(globs), sample)
+    _, compiled_roots = _time_classify(root_matcher.match, sample)
+    _, compiled_globs = _time_classify(glob_matcher.matches, sample)
+    mismatches = sum(1 for a, b in zip(naive_roots, compiled_roots) if a != b)
+    mismatches += sum(1 for a, b in zip(naive_globs, compiled_globs) if a != b)
+
+    max_row = scale_rows[-1]
+    min_row = scale_rows[0]
+    scale_factor = len(paths) / len(sample)
+    naive_root_estimate = naive_root_seconds * scale_factor
+    naive_glob_estimate = naive_glob_seconds * scale_factor
+    root_growth = max_row["root_us_per_path"] / max(min_row["root_us_per_path"], 1e-9)
+    glob_growth = max_row["glob_us_per_path"] / max(min_row["glob_us_per_path"], 1e-9)
+
+    target_results = {
+        "compiled_matches_naive_met": mismatches == 0,
+        "root_per_path_cost_flat_met": root_growth <= args.max_per_path_growth,
+        "glob_per_path_cost_flat_met": glob_growth <= args.max_per_path_growth,
+        "faster_than_naive_met": (
+            max_row["root_seconds"] < naive_root_estimate and max_row["glob_seconds"] < naive_glob_estimate
+        ),
+    }
+    status = "pass" if all(target_results.values()) else "fail"
+
+    payload: dict[str, Any] = {
+        "artifact": "path_matcher_benchmark_report_v0",
+        "version": "v0",
+        "run_at": _now_iso(),
+        "project_dir": str(project_dir),
+        "seed": args.seed,
+        "path_count": len(paths),
+        "pattern_count": len(globs),
+        "root_count": len(roots),
+        "compile_seconds": compile_seconds,
+        "scales": scale_rows,
+        "naive_baseline": {
+            "sample_size": len(sample),
+            "root_seconds_sample": naive_root_seconds,
+            "glob_seconds_sample": naive_glob_seconds,
+            "root_seconds_estimated": naive_root_estimate,
+            "glob_seconds_estimated": naive_glob_estimate,
+            "mismatch_count": mismatches,
+        },
+        "speedup_at_max_scale": {
+            "roots": naive_root_estimate / max(max_row["root_seconds"], 1e-9),
+            "globs": naive_glob_estimate / max(max_row["glob_seconds"], 1e-9),
+        },
+        "per_path_growth": {
+            "roots": root_growth,
+            "globs": glob_growth,
+            "max_allowed": args.max_per_path_growth,
+        },
+        "target_results": target_results,
+        "status": status,
+    }
+    _write_json(out_file, payload)
+    payload["out_file"] = _safe_rel_path(project_dir, out_file)
+
+    if args.format == "json":
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(_render_text(payload))
+        sys.stdout.write("\n")
+
+    if args.fail_on_target_miss and status != "pass":
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Compiled path matchers shared by the boundary and release-surface gates.
+
+`RootMatcher` answers "which configured root is this path under" with a segment trie, and
+`GlobMatcher` answers "does any fnmatch glob match this path" by bucketing globs on their
+leading literal segments and testing one combined regex per bucket. Both keep the semantics of
+the per-pattern loops they replace (`_is_path_under` and `fnmatch.fnmatch`).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from fnmatch import translate
+from typing import Iterable
+
+
+_WILDCARD_CHARS = frozenset("*?[")
+# Path segments never contain NUL, so it is a safe trie key for terminal entries.
+_TERMINAL = "\0"
+
+
+def _normalize_root(value: str) -> str:
+    return value.strip("/")
+
+
+class RootMatcher:
+    """Match paths against directory roots; first declared root wins, like the original loop."""
+
+    def __init__(self, roots: Iterable[str]) -> None:
+        self.roots: list[str] = []
+        self._trie: dict[str, dict] = {}
+        for root in roots:
+            normalized = _normalize_root(root)
+            self.roots.append(normalized)
+            if not normalized:
+                continue
+            node = self._trie
+            for segment in normalized.split("/"):
+                node = node.setdefault(segment, {})
+            # Keep the lowest declaration index when a root is repeated.
+            node.setdefault(_TERMINAL, len(self.roots) - 1)
+
+    def match(self, path: str) -> str | None:
+        node = self._trie
+        best: int | None = None
+        for segment in _normalize_root(path).split("/"):
+            node = node.get(segment)  # type: ignore[assignment]
+            if node is None:
+                break
+            index = node.get(_TERMINAL)
+            if index is not None and (best is None or index < best):
+                best = index
+        return None if best is None else self.roots[best]
+
+    def __contains__(self, path: str) -> bool:
+        return self.match(path) is not None
+
+
+def _literal_segments(pattern: str) -> list[str]:
+    """Leading path segments that contain no wildcard; `*` may span `/`, so stop at the first wildcard."""
+    segments = pattern.split("/")
+    literal: list[str] = []
+    for segment in segments[:-1]:
+        if _WILDCARD_CHARS.intersection(segment):
+            break
+        literal.append(segment)
+    return literal
+
+
+def _interior_literal(pattern: str) -> str | None:
+    """Longest literal segment with a `/` on both sides; any match must contain `/<segment>/`.
+
+    Bracket expressions may contain `/`, so patterns using them are never indexed this way.
+    """
+    if "[" in pattern or "]" in pattern:
+        return None
+    segments = pattern.split("/")
+    interior = [segment for segment in segments[1:-1] if segment and not _WILDCARD_CHARS.intersection(segment)]
+    if not interior:
+        return None
+    return max(interior, key=len)
+
+
+def _compile_bucket(patterns: list[str]):
+    return re.compile("|".join(f"(?:{translate(pattern)})" for pattern in patterns)).match
+
+
+class GlobMatcher:
+    """fnmatch-compatible matcher over many globs at once.
+
+    Globs are bucketed by their leading literal segments (walked as a trie) or, for globs that
+    start with a wildcard, by an interior literal segment looked up per path segment. Only the
+    remaining globs are tested against every path.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = list(patterns)
+        prefixed: dict[tuple[str, ...], list[str]] = {}
+        anywhere: dict[str, list[str]] = {}
+        for pattern in self.patterns:
+            normalized = os.path.normcase(pattern)
+            key = tuple(_literal_segments(normalized))
+            interior = None if key else _interior_literal(normalized)
+            if interior is not None:
+                anywhere.setdefault(interior, []).append(normalized)
+            else:
+                prefixed.setdefault(key, []).append(normalized)
+
+        self._trie: dict[str, dict] = {}
+        for key, bucket in prefixed.items():
+            node = self._trie
+            for segment in key:
+                node = node.setdefault(segment, {})
+            node[_TERMINAL] = _compile_bucket(bucket)
+        self._anywhere = {segment: _compile_bucket(bucket) for segment, bucket in anywhere.items()}
+
+    def matches(self, path: str) -> bool:
+        name = os.path.normcase(path)
+        segments = name.split("/")
+        last = len(segments) - 1
+
+        node = self._trie
+        for depth in range(len(segments)):
+            matcher = node.get(_TERMINAL)
+            if matcher is not None and matcher(name) is not None:
+                return True
+            if depth == last:
+                break
+            node = node.get(segments[depth])  # type: ignore[assignment]
+            if node is None:
+                break
+
+        if self._anywhere:
+            for segment in set(segments[1:last]):
+                matcher = self._anywhere.get(segment)
+                if matcher is not None and matcher(name) is not None:
+                    return True
+        return False
+
+    def __contains__(self, path: str) -> bool:
+        return self.matches(path)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Shared A/B runtime measurement engine for the phase performance packs.
+
+A single median compared against a stored number flaps on noisy CI machines. This module gives the packs:
+
+- `run_interleaved`: warmup runs per arm (discarded), then measured runs alternating in ABBA order, so drift
+  such as thermal throttling or cache warming hits both arms evenly.
+- `compare_samples`: drops outliers by modified z-score (median absolute deviation), then bootstraps a confidence
+  interval for the percent change of the candidate median over the baseline median.
+
+The verdict compares that interval with the allowed overhead:
+
+- `regressed`: the whole interval is above the threshold
+- `not_regressed`: the whole interval is at or below it
+- `inconclusive`: the interval straddles the threshold or there are too few samples
+
+`overhead_target_met` fails `regressed`, and also fails `inconclusive` when the point estimate is above the
+threshold, so a noisier measurement never turns a failing delta into a pass.
+
+A one-value baseline is treated as a fixed reference, such as a median stored by an earlier phase report.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+from typing import Any, Callable, Sequence
+
+
+REGRESSED = "regressed"
+NOT_REGRESSED = "not_regressed"
+INCONCLUSIVE = "inconclusive"
+
+DEFAULT_THRESHOLD_PERCENT = 10.0
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_RESAMPLES = 2000
+DEFAULT_OUTLIER_Z = 3.5
+MIN_SAMPLES = 3
+# With fewer values the MAD is just the smaller gap around the median, which flags ordinary jitter.
+MIN_OUTLIER_SAMPLES = 5
+
+
+def run_interleaved(
+    arms: Sequence[str],
+    run_once: Callable[[str], dict[str, Any]],
+    runs: int,
+    warmup_runs: int = 1,
+) -> dict[str, dict[str, list[dict[str, Any]]]]:
+    """`{arm: {"warmup": [...], "runs": [...]}}` of `run_once(arm)` records, each with `run` added.
+
+    `run_once` must return a record holding `duration_seconds`. Warmup rounds run every arm once per round.
+    """
+    results: dict[str, dict[str, list[dict[str, Any]]]] = {arm: {"warmup": [], "runs": []} for arm in arms}
+    for round_idx in range(max(0, warmup_runs)):
+        for arm in arms:
+            results[arm]["warmup"].append({"run": round_idx + 1, **run_once(arm)})
+    for round_idx in range(max(1, runs)):
+        order = list(arms) if round_idx % 2 == 0 else list(reversed(arms))
+        for arm in order:
+            results[arm]["runs"].append({"run": round_idx + 1, **run_once(arm)})
+    return results
+
+
+def durations(records: list[dict[str, Any]]) -> list[float]:
+    return [float(record["duration_seconds"]) for record in records]
+
+
+def reject_outliers(values: list[float], z_limit: float = DEFAULT_OUTLIER_Z) -> tuple[list[float], list[float]]:
+    """`(kept, rejected)` by modified z-score `0.6745 * |x - median| / MAD`; small or flat samples are kept."""
+    if len(values) < MIN_OUTLIER_SAMPLES:
+        return list(values), []
+    center = statistics.median(values)
+    mad = statistics.median(abs(value - center) for value in values)
+    if mad <= 0:
+        return list(values), []
+    kept: list[float] = []
+    rejected: list[float] = []
+    for value in values:
+        (rejected if 0.6745 * abs(value - center) / mad > z_limit else kept).append(value)
+    return kept, rejected
+
+
+def _delta_percent(baseline: float, candidate: float) -> float:
+    return (candidate - baseline) / baseline * 100.0 if baseline > 0 else 0.0
+
+
+def bootstrap_delta_ci(
+    baseline: list[float],
+    candidate: list[float],
+    confidence: float = DEFAULT_CONFIDENCE,
+    resamples: int = DEFAULT_RESAMPLES,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """Percentile-bootstrap interval of the percent change between the candidate and baseline medians."""
+    rng = random.Random(seed)
+    deltas: list[float] = []
+    for _ in range(max(1, resamples)):
+        base = statistics.median(rng.choices(baseline, k=len(baseline)))
+        cand = statistics.median(rng.choices(candidate, k=len(candidate)))
+        deltas.append(_delta_percent(base, cand))
+    deltas.sort()
+    tail = (1.0 - confidence) / 2.0
+    low = deltas[min(len(deltas) - 1, int(tail * len(deltas)))]
+    high = deltas[min(len(deltas) - 1, int((1.0 - tail) * len(deltas)))]
+    return low, high
+
+
+def verdict(low: float, high: float, threshold_percent: float) -> str:
+    if low > threshold_percent:
+        return REGRESSED
+    if high <= threshold_percent:
+        return NOT_REGRESSED
+    return INCONCLUSIVE
+
+
+def _arm_summary(values: list[float], kept: list[float], rejected: list[float]) -> dict[str, Any]:
+    return {
+        "sample_count": len(values),
+        "kept_count": len(kept),
+        "rejected_outliers_seconds": rejected,
+        "median_seconds": float(statistics.median(kept)) if kept else 0.0,
+    }
+
+
+def compare_samples(
+    baseline: list[float],
+    candidate: list[float],
+    threshold_percent: float = DEFAULT_THRESHOLD_PERCENT,
+    confidence: float = DEFAULT_CONFIDENCE,
+    resamples: int = DEFAULT_RESAMPLES,
+    seed: int = 0,
+    outlier_z: float = DEFAULT_OUTLIER_Z,
+) -> dict[str, Any]:
+    """Outlier-filtered, bootstrapped comparison of candidate durations against baseline durations."""
+    base_kept, base_rejected = reject_outliers(baseline, outlier_z)
+    cand_kept, cand_rejected = reject_outliers(candidate, outlier_z)
+    fixed_reference = len(baseline) == 1
+    enough = len(cand_kept) >= MIN_SAMPLES and (fixed_reference or len(base_kept) >= MIN_SAMPLES)
+
+    payload: dict[str, Any] = {
+        "version": "v0",
+        "baseline_kind": "fixed_reference" if fixed_reference else "samples",
+        "baseline": _arm_summary(baseline, base_kept, base_rejected),
+        "candidate": _arm_summary(candidate, cand_kept, cand_rejected),
+        "threshold_percent": threshold_percent,
+        "confidence": confidence,
+        "resamples": resamples,
+        "outlier_z_limit": outlier_z,
+        "min_samples": MIN_SAMPLES,
+    }
+    if not base_kept or not cand_kept or payload["baseline"]["median_seconds"] <= 0:
+        payload.update({"delta_percent": 0.0, "delta_percent_ci": None, "verdict": INCONCLUSIVE})
+        return payload
+
+    low, high = bootstrap_delta_ci(base_kept, cand_kept, confidence, resamples, seed)
+    base_median = payload["baseline"]["median_seconds"]
+    payload["delta_percent"] = _delta_percent(base_median, payload["candidate"]["median_seconds"])
+    payload["delta_percent_ci"] = {"low": low, "high": high}
+    payload["verdict"] = verdict(low, high, threshold_percent) if enough else INCONCLUSIVE
+    return payload
+
+
+def overhead_target_met(comparison: dict[str, Any]) -> bool:
+    """False when `regressed`, or `inconclusive` with the point estimate itself above the threshold."""
+    if comparison["verdict"] == REGRESSED:
+        return False
+    if comparison["verdict"] == INCONCLUSIVE:
+        return float(comparison["delta_percent"]) <= float(comparison["threshold_percent"])
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare two duration samples and print an overhead verdict.")
+    parser.add_argument("--baseline", required=True, help="Comma-separated baseline seconds (one value = reference).")
+    parser.add_argument("--candidate", required=True, help="Comma-separated candidate seconds.")
+    parser.add_argument("--threshold-percent", type=float, default=DEFAULT_THRESHOLD_PERCENT)
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    args = parser.parse_args()
+
+    def _floats(raw: str) -> list[float]:
+        return [float(item) for item in raw.split(",") if item.strip()]
+
+    payload = compare_samples(
+        _floats(args.baseline),
+        _floats(args.candidate),
+        threshold_percent=args.threshold_percent,
+        confidence=args.confidence,
+        resamples=args.resamples,
+        seed=args.seed,
+    )
+    if args.format == "json":
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+    else:
+        ci = payload["delta_percent_ci"] or {"low": 0.0, "high": 0.0}
+        sys.stdout.write(
+            f"verdict: {payload['verdict']}\n"
+            f"delta_percent: {payload['delta_percent']:.2f} (ci {ci['low']:.2f}..{ci['high']:.2f})\n"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,23 +8,24 @@ import hashlib
 import json
 import math
 import statistics
-import subprocess
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from context_load_batch_v0 import ContextLoadSession
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
-def _json_hash(value: Any) -> str:
+def json_hash(value: Any) -> str:
     encoded = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
     return hashlib.sha256(encoded).hexdigest()
 
 
-def _tokenize(value: str) -> list[str]:
+def tokenize(value: str) -> list[str]:
     token = []
     out: list[str] = []
     for ch in value.lower():
@@ -60,6 +61,12 @@ def _build_parser() -> argparse.ArgumentParser:
         default="scripts/agent_context_loader_v0.py",
         help="Path to legacy context loader script used as pre-change baseline proxy.",
     )
+    parser.add_argument(
+        "--legacy-loader-ranking",
+        default="pattern",
+        choices=["pattern", "bm25"],
+        help="Task-file ranking passed to the legacy loader (`--ranking`).",
+    )
     parser.add_argument("--python-bin", default="python3")
     parser.add_argument("--top-k", type=int, default=5)
     parser.add_argument("--runs-per-query", type=int, default=30)
@@ -79,6 +86,15 @@ def _build_parser() -> argparse.ArgumentParser:
         default=".cortex/reports/project_state/phase2_retrieval_determinism_report_v0.json",
     )
     parser.add_argument("--timeout-seconds", type=int, default=60)
+    parser.add_argument(
+        "--context-load-mode",
+        default="batch",
+        choices=["batch", "process"],
+        help=(
+            "batch (default) reuses one warm coach/loader process for the first call per query; process spawns "
+            "one per call. Determinism repeats always run in fresh processes."
+        ),
+    )
     return parser
 
 
@@ -91,12 +107,12 @@ def _write_json(path: Path, payload: dict[str, Any]) -> None:
     path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
 
-def _run_command(cmd: list[str], timeout_seconds: int) -> str:
-    proc = subprocess.run(cmd, check=False, text=True, capture_output=True, timeout=timeout_seconds)
+def _run_command(session: ContextLoadSession, argv: list[str], timeout_seconds: int) -> str:
+    proc, _ = session.run(argv, timeout_seconds=timeout_seconds)
     if proc.returncode != 0:
         raise RuntimeError(
             "command failed\n"
-            f"cmd={cmd}\n"
+            f"cmd={proc.args}\n"
             f"returncode={proc.returncode}\n"
             f"stdout={proc.stdout}\n"
             f"stderr={proc.stderr}"
@@ -105,7 +121,7 @@ def _run_command(cmd: list[str], timeout_seconds: int) -> str:
 
 
 def _run_context_load(
-    coach_bin: str,
+    session: ContextLoadSession,
     project_dir: Path,
     query_text: str,
     profile_id: str,
@@ -114,8 +130,7 @@ def _run_context_load(
     max_chars_per_file: int,
     timeout_seconds: int,
 ) -> dict[str, Any]:
-    cmd = [
-        coach_bin,
+    argv = [
         "context-load",
         "--project-dir",
         str(project_dir),
@@ -130,21 +145,19 @@ def _run_context_load(
         "--max-chars-per-file",
         str(max_chars_per_file),
     ]
-    return json.loads(_run_command(cmd, timeout_seconds=timeout_seconds))
+    return json.loads(_run_command(session, argv, timeout_seconds=timeout_seconds))
 
 
 def _run_legacy_loader(
-    python_bin: str,
-    legacy_loader_script: Path,
+    session: ContextLoadSession,
     project_dir: Path,
     query_text: str,
     max_files: int,
     max_chars_per_file: int,
+    ranking: str,
     timeout_seconds: int,
 ) -> dict[str, Any]:
-    cmd = [
-        python_bin,
-        str(legacy_loader_script),
+    argv = [
         "--project-dir",
         str(project_dir),
         "--task",
@@ -154,7 +167,9 @@ def _run_legacy_loader(
         "--max-chars-per-file",
         str(max_chars_per_file),
     ]
-    return json.loads(_run_command(cmd, timeout_seconds=timeout_seconds))
+    if ranking != "pattern":
+        argv.extend(["--ranking", ranking])
+    return json.loads(_run_command(session, argv, timeout_seconds=timeout_seconds))
 
 
 def _entry_text(entry: dict[str, Any]) -> str:
@@ -177,15 +192,15 @@ def _any_token_hit(text: str, tokens: list[str]) -> bool:
 
 
 def _query_overlap_score(query_text: str, document_text: str) -> float:
-    query_tokens = set(_tokenize(query_text))
+    query_tokens = set(tokenize(query_text))
     if not query_tokens:
         return 0.0
-    doc_tokens = set(_tokenize(document_text))
+    doc_tokens = set(tokenize(document_text))
     overlap = len(query_tokens.intersection(doc_tokens)) / max(1, len(query_tokens))
     return round(min(1.0, overlap * 1.5), 6)
 
 
-def _relevance_gain(query: dict[str, Any], entry: dict[str, Any]) -> float:
+def relevance_gain(query: dict[str, Any], entry: dict[str, Any]) -> float:
     text = _entry_text(entry)
     signals = [str(s).lower() for s in query.get("must_include_signals_any", [])]
     tags = [str(s).lower() for s in query.get("must_include_tags_any", [])]
@@ -205,7 +220,7 @@ def _dcg_at_k(gains: list[float], k: int) -> float:
     return total
 
 
-def _ndcg_at_k(gains: list[float], k: int) -> float:
+def ndcg_at_k(gains: list[float], k: int) -> float:
     actual = _dcg_at_k(gains, k)
     ideal = _dcg_at_k(sorted(gains, reverse=True), k)
     if ideal <= 0:
@@ -228,7 +243,7 @@ def _group_hits(query: dict[str, Any], top_entries: list[dict[str, Any]]) -> dic
     }
 
 
-def _top_k_recall(query: dict[str, Any], top_entries: list[dict[str, Any]]) -> float:
+def top_k_recall(query: dict[str, Any], top_entries: list[dict[str, Any]]) -> float:
     hits = _group_hits(query, top_entries)
     required = [hits["must_include_signals_any"], hits["must_include_tags_any"]]
     score = sum(1 for item in required if item) / len(required)
@@ -263,7 +278,7 @@ def _normalized_ranking_hash(bundle: dict[str, Any]) -> str:
         "fallback_level": bundle.get("fallback_level"),
         "files": normalized_files,
     }
-    return _json_hash(payload)
+    return json_hash(payload)
 
 
 def _median(values: list[float]) -> float:
@@ -287,7 +302,7 @@ class QueryRunResult:
     ranking_hash: str
 
 
-def _collect_queries(fixture: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+def collect_queries(fixture: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
     query_by_id: dict[str, dict[str, Any]] = {
         str(query["query_id"]): query for query in fixture.get("queries", []) if isinstance(query, dict)
     }
@@ -302,18 +317,14 @@ def _collect_queries(fixture: dict[str, Any]) -> list[tuple[str, dict[str, Any]]
     return ordered
 
 
-def main() -> int:
-    args = _build_parser().parse_args()
-    project_dir = Path(args.project_dir).resolve()
-    fixture_path = Path(args.fixture_file)
-    legacy_loader_script = Path(args.legacy_loader_script)
-    relevance_out = Path(args.relevance_out)
-    determinism_out = Path(args.determinism_out)
-
-    fixture = _load_json(fixture_path)
-    fixture_hash = _json_hash(fixture)
-    ordered_queries = _collect_queries(fixture)
-
+def _evaluate_queries(
+    args: argparse.Namespace,
+    project_dir: Path,
+    ordered_queries: list[tuple[str, dict[str, Any]]],
+    coach_session: ContextLoadSession,
+    legacy_session: ContextLoadSession,
+    repeat_session: ContextLoadSession,
+) -> tuple[list[QueryRunResult], list[dict[str, Any]]]:
     query_results: list[QueryRunResult] = []
     determinism_results: list[dict[str, Any]] = []
 
@@ -322,7 +333,7 @@ def main() -> int:
         query_text = str(query["query_text"])
 
         post_bundle = _run_context_load(
-            coach_bin=args.coach_bin,
+            session=coach_session,
             project_dir=project_dir,
             query_text=query_text,
             profile_id=profile_id,
@@ -332,12 +343,12 @@ def main() -> int:
             timeout_seconds=args.timeout_seconds,
         )
         baseline_bundle = _run_legacy_loader(
-            python_bin=args.python_bin,
-            legacy_loader_script=legacy_loader_script,
+            session=legacy_session,
             project_dir=project_dir,
             query_text=query_text,
             max_files=args.max_files,
             max_chars_per_file=args.max_chars_per_file,
+            ranking=args.legacy_loader_ranking,
             timeout_seconds=args.timeout_seconds,
         )
 
@@ -347,8 +358,8 @@ def main() -> int:
         baseline_task_files = [entry for entry in baseline_files if str(entry.get("selected_by", "")).startswith("task:")]
         post_eval_files = post_task_files if post_task_files else post_files
         baseline_eval_files = baseline_task_files if baseline_task_files else baseline_files
-        post_gains = [_relevance_gain(query, entry) for entry in post_eval_files]
-        baseline_gains = [_relevance_gain(query, entry) for entry in baseline_eval_files]
+        post_gains = [relevance_gain(query, entry) for entry in post_eval_files]
+        baseline_gains = [relevance_gain(query, entry) for entry in baseline_eval_files]
         post_top = post_eval_files[: args.top_k]
         baseline_top = baseline_eval_files[: args.top_k]
         ranking_hash = _normalized_ranking_hash(post_bundle)
@@ -357,10 +368,10 @@ def main() -> int:
             QueryRunResult(
                 profile_id=profile_id,
                 query_id=query_id,
-                post_ndcg=_ndcg_at_k(post_gains, args.top_k),
-                baseline_ndcg=_ndcg_at_k(baseline_gains, args.top_k),
-                post_recall=_top_k_recall(query, post_top),
-                baseline_recall=_top_k_recall(query, baseline_top),
+                post_ndcg=ndcg_at_k(post_gains, args.top_k),
+                baseline_ndcg=ndcg_at_k(baseline_gains, args.top_k),
+                post_recall=top_k_recall(query, post_top),
+                baseline_recall=top_k_recall(query, baseline_top),
                 post_group_hits=_group_hits(query, post_top),
                 baseline_group_hits=_group_hits(query, baseline_top),
                 post_top_paths=[str(entry.get("path", "")) for entry in post_top],
@@ -372,7 +383,7 @@ def main() -> int:
         hashes = [ranking_hash]
         for _ in range(1, args.runs_per_query):
             repeat_bundle = _run_context_load(
-                coach_bin=args.coach_bin,
+                session=repeat_session,
                 project_dir=project_dir,
                 query_text=query_text,
                 profile_id=profile_id,
@@ -395,6 +406,34 @@ def main() -> int:
                 "deterministic": deterministic,
             }
         )
+    return query_results, determinism_results
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+    project_dir = Path(args.project_dir).resolve()
+    fixture_path = Path(args.fixture_file)
+    legacy_loader_script = Path(args.legacy_loader_script)
+    relevance_out = Path(args.relevance_out)
+    determinism_out = Path(args.determinism_out)
+
+    fixture = _load_json(fixture_path)
+    fixture_hash = json_hash(fixture)
+    ordered_queries = collect_queries(fixture)
+
+    warm = args.context_load_mode == "batch"
+    coach_session = ContextLoadSession([args.coach_bin], warm=warm)
+    legacy_session = ContextLoadSession([args.python_bin, str(legacy_loader_script)], warm=warm)
+    # Repeats must vary hash seed, import state and module caches, so they never share a warm process.
+    repeat_session = ContextLoadSession([args.coach_bin], warm=False)
+    try:
+        query_results, determinism_results = _evaluate_queries(
+            args, project_dir, ordered_queries, coach_session, legacy_session, repeat_session
+        )
+    finally:
+        coach_session.close()
+        legacy_session.close()
+        repeat_session.close()
 
     ndcg_post_all = [item.post_ndcg for item in query_results]
     ndcg_base_all = [item.baseline_ndcg for item in query_results]
@@ -470,8 +509,10 @@ def main() -> int:
         "fixture_version": fixture.get("version"),
         "fixture_hash": fixture_hash,
         "coach_bin": args.coach_bin,
+        "context_load_mode": args.context_load_mode,
         "legacy_baseline_proxy": {
             "script": str(legacy_loader_script),
+            "ranking": args.legacy_loader_ranking,
             "description": "Legacy deterministic context loader used as pre-change baseline proxy.",
         },
         "top_k": args.top_k,
@@ -516,6 +557,8 @@ def main() -> int:
         "fixture_version": fixture.get("version"),
         "fixture_hash": fixture_hash,
         "coach_bin": args.coach_bin,
+        "context_load_mode": args.context_load_mode,
+        "repeat_context_load_mode": repeat_session.mode,
         "weighting_mode": args.weighting_mode,
         "runs_per_query": args.runs_per_query,
         "hash_contract": {
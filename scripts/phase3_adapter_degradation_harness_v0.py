@@ -7,13 +7,13 @@ import argparse
 import hashlib
 import json
 import os
-import subprocess
-import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from context_load_batch_v0 import ContextLoadSession
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
@@ -219,8 +219,7 @@ def _build_env(args: argparse.Namespace) -> dict[str, str]:
 
 
 def _run_context_load(
-    base_cmd: list[str],
-    env: dict[str, str],
+    session: ContextLoadSession,
     *,
     project_dir: Path,
     case: EvalCase,
@@ -231,8 +230,7 @@ def _run_context_load(
     max_chars_per_file: int,
     timeout_seconds: int,
 ) -> RunResult:
-    cmd = [
-        *base_cmd,
+    argv = [
         "context-load",
         "--project-dir",
         str(project_dir),
@@ -254,19 +252,9 @@ def _run_context_load(
         str(max_chars_per_file),
     ]
     if case.adapter_mode == "beads_file":
-        cmd.extend(["--adapter-file", case.fixture_ref])
-
-    started = time.perf_counter()
-    proc = subprocess.run(
-        cmd,
-        cwd=str(project_dir),
-        text=True,
-        capture_output=True,
-        check=False,
-        timeout=timeout_seconds,
-        env=env,
-    )
-    elapsed = time.perf_counter() - started
+        argv.extend(["--adapter-file", case.fixture_ref])
+
+    proc, elapsed = session.run(argv, timeout_seconds=timeout_seconds)
 
     if proc.returncode != 0:
         error = (
@@ -307,8 +295,7 @@ def _evaluate_degradation(
     cases: list[EvalCase],
     *,
     project_dir: Path,
-    base_cmd: list[str],
-    env: dict[str, str],
+    session: ContextLoadSession,
     weighting_mode: str,
     adapter_max_items: int,
     adapter_stale_seconds: int,
@@ -326,8 +313,7 @@ def _evaluate_degradation(
         case_runs: list[dict[str, Any]] = []
         for run_index in range(1, degradation_runs_per_case + 1):
             run = _run_context_load(
-                base_cmd,
-                env,
+                session,
                 project_dir=project_dir,
                 case=case,
                 weighting_mode=weighting_mode,
@@ -437,8 +423,7 @@ def _evaluate_determinism(
     cases: list[EvalCase],
     *,
     project_dir: Path,
-    base_cmd: list[str],
-    env: dict[str, str],
+    session: ContextLoadSession,
     weighting_mode: str,
     adapter_max_items: int,
     adapter_stale_seconds: int,
@@ -459,8 +444,7 @@ def _evaluate_determinism(
 
         for _ in range(runs_per_case):
             run = _run_context_load(
-                base_cmd,
-                env,
+                session,
                 project_dir=project_dir,
                 case=case,
                 weighting_mode=weighting_mode,
@@ -579,6 +563,15 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--timeout-seconds", type=int, default=120)
     parser.add_argument("--runs-per-case", type=int, default=30)
     parser.add_argument("--degradation-runs-per-case", type=int, default=1)
+    parser.add_argument(
+        "--context-load-mode",
+        choices=["batch", "process"],
+        default="batch",
+        help=(
+            "batch (default) reuses one warm coach process for the degradation runs; process spawns one per "
+            "context-load call. Determinism repeats always run in fresh processes."
+        ),
+    )
     parser.add_argument(
         "--degradation-out",
         default=".cortex/reports/project_state/phase3_adapter_degradation_report_v0.json",
@@ -604,38 +597,46 @@ def main() -> int:
 
     base_cmd = _build_coach_base_command(args)
     env = _build_env(args)
+    session = ContextLoadSession(base_cmd, env=env, cwd=project_dir, warm=args.context_load_mode == "batch")
+    # Repeats must vary hash seed, import state and module caches, so they never share a warm process.
+    repeat_session = ContextLoadSession(base_cmd, env=env, cwd=project_dir, warm=False)
 
-    degradation_report = _evaluate_degradation(
-        cases,
-        project_dir=project_dir,
-        base_cmd=base_cmd,
-        env=env,
-        weighting_mode=args.weighting_mode,
-        adapter_max_items=max(1, int(args.adapter_max_items)),
-        adapter_stale_seconds=max(0, int(args.adapter_stale_seconds)),
-        max_files=max(1, int(args.max_files)),
-        max_chars_per_file=max(100, int(args.max_chars_per_file)),
-        timeout_seconds=max(1, int(args.timeout_seconds)),
-        degradation_runs_per_case=max(1, int(args.degradation_runs_per_case)),
-    )
-    determinism_report = _evaluate_determinism(
-        cases,
-        project_dir=project_dir,
-        base_cmd=base_cmd,
-        env=env,
-        weighting_mode=args.weighting_mode,
-        adapter_max_items=max(1, int(args.adapter_max_items)),
-        adapter_stale_seconds=max(0, int(args.adapter_stale_seconds)),
-        max_files=max(1, int(args.max_files)),
-        max_chars_per_file=max(100, int(args.max_chars_per_file)),
-        timeout_seconds=max(1, int(args.timeout_seconds)),
-        runs_per_case=max(1, int(args.runs_per_case)),
-    )
+    try:
+        degradation_report = _evaluate_degradation(
+            cases,
+            project_dir=project_dir,
+            session=session,
+            weighting_mode=args.weighting_mode,
+            adapter_max_items=max(1, int(args.adapter_max_items)),
+            adapter_stale_seconds=max(0, int(args.adapter_stale_seconds)),
+            max_files=max(1, int(args.max_files)),
+            max_chars_per_file=max(100, int(args.max_chars_per_file)),
+            timeout_seconds=max(1, int(args.timeout_seconds)),
+            degradation_runs_per_case=max(1, int(args.degradation_runs_per_case)),
+        )
+        determinism_report = _evaluate_determinism(
+            cases,
+            project_dir=project_dir,
+            session=repeat_session,
+            weighting_mode=args.weighting_mode,
+            adapter_max_items=max(1, int(args.adapter_max_items)),
+            adapter_stale_seconds=max(0, int(args.adapter_stale_seconds)),
+            max_files=max(1, int(args.max_files)),
+            max_chars_per_file=max(100, int(args.max_chars_per_file)),
+            timeout_seconds=max(1, int(args.timeout_seconds)),
+            runs_per_case=max(1, int(args.runs_per_case)),
+        )
+    finally:
+        session.close()
+        repeat_session.close()
 
     degradation_report["fixture_file"] = str(fixture_path)
     degradation_report["coach_command"] = base_cmd
+    degradation_report["context_load_mode"] = session.mode
     determinism_report["fixture_file"] = str(fixture_path)
     determinism_report["coach_command"] = base_cmd
+    determinism_report["context_load_mode"] = session.mode
+    determinism_report["repeat_context_load_mode"] = repeat_session.mode
 
     _write_json(Path(args.degradation_out), degradation_report)
     _write_json(Path(args.determinism_out), determinism_report)
@@ -10,11 +10,15 @@ import os
 import statistics
 import subprocess
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from context_load_batch_v0 import ContextLoadSession
+from synthetic_fixture_generator_v0 import DEFAULT_SEED, DEFAULT_WORK_DIR, build_scale_freeze, latency_growth
+from synthetic_fixture_generator_v0 import parse_scales
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
@@ -133,8 +137,7 @@ def _build_context_env(args: argparse.Namespace) -> dict[str, str]:
 
 
 def _run_context_load(
-    base_cmd: list[str],
-    env: dict[str, str],
+    session: ContextLoadSession,
     *,
     project_dir: Path,
     case: EvalCase,
@@ -145,8 +148,7 @@ def _run_context_load(
     max_chars_per_file: int,
     timeout_seconds: int,
 ) -> tuple[dict[str, Any], float]:
-    cmd = [
-        *base_cmd,
+    argv = [
         "context-load",
         "--project-dir",
         str(project_dir),
@@ -168,19 +170,10 @@ def _run_context_load(
         str(max_chars_per_file),
     ]
     if case.adapter_mode == "beads_file":
-        cmd.extend(["--adapter-file", case.fixture_ref])
-
-    started = time.perf_counter()
-    proc = subprocess.run(
-        cmd,
-        cwd=str(project_dir),
-        text=True,
-        capture_output=True,
-        check=False,
-        timeout=timeout_seconds,
-        env=env,
-    )
-    elapsed = time.perf_counter() - started
+        argv.extend(["--adapter-file", case.fixture_ref])
+
+    proc, elapsed = session.run(argv, timeout_seconds=timeout_seconds)
+    cmd = proc.args
     if proc.returncode != 0:
         raise RuntimeError(
             "context-load command failed\n"
@@ -239,6 +232,69 @@ def _budget_failures(
     return failures
 
 
+def _measure_profile(
+    session: ContextLoadSession,
+    args: argparse.Namespace,
+    project_dir: Path,
+    profile_id: str,
+    profile_cases: list[EvalCase],
+    runs: int,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    durations: list[float] = []
+    profile_failures: list[dict[str, Any]] = []
+    case_ids = [f"{c.scenario_id}:{c.query_id}" for c in profile_cases]
+
+    for run_idx in range(runs):
+        case = profile_cases[run_idx % len(profile_cases)]
+        bundle, elapsed = _run_context_load(
+            session,
+            project_dir=project_dir,
+            case=case,
+            weighting_mode=args.weighting_mode,
+            adapter_max_items=max(1, int(args.adapter_max_items)),
+            adapter_stale_seconds=max(0, int(args.adapter_stale_seconds)),
+            max_files=max(1, int(args.max_files)),
+            max_chars_per_file=max(100, int(args.max_chars_per_file)),
+            timeout_seconds=max(1, int(args.timeout_seconds)),
+        )
+        durations.append(elapsed)
+
+        failures = _budget_failures(
+            bundle,
+            case=case,
+            max_files=max(1, int(args.max_files)),
+            max_chars_per_file=max(100, int(args.max_chars_per_file)),
+            adapter_max_items=max(1, int(args.adapter_max_items)),
+        )
+        if failures:
+            profile_failures.append(
+                {
+                    "profile_id": profile_id,
+                    "run": run_idx + 1,
+                    "case_id": f"{case.scenario_id}:{case.query_id}",
+                    "failures": failures,
+                    "warning_classes": sorted({_warning_class(str(w)) for w in list(bundle.get("warnings", []))}),
+                }
+            )
+
+    p95 = _percentile(durations, 95.0)
+    row = {
+        "profile_id": profile_id,
+        "runs": len(durations),
+        "fixture_cases_cycle": case_ids,
+        "durations_seconds": durations,
+        "min_seconds": min(durations),
+        "max_seconds": max(durations),
+        "mean_seconds": float(sum(durations) / len(durations)),
+        "p50_seconds": _median(durations),
+        "p95_seconds": p95,
+        "target_p95_seconds": 2.5,
+        "target_met": p95 <= 2.5,
+        "budget_failures": len(profile_failures),
+    }
+    return row, profile_failures
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--project-dir", default=".")
@@ -262,6 +318,24 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--latency-runs-per-profile", type=int, default=30)
     parser.add_argument("--ci-runs", type=int, default=5)
     parser.add_argument("--timeout-seconds", type=int, default=180)
+    parser.add_argument(
+        "--context-load-mode",
+        choices=["batch", "process"],
+        default="process",
+        help="process (default) times one cold coach process per call; batch times calls on one warm process.",
+    )
+    parser.add_argument(
+        "--scale",
+        default="",
+        help="Comma-separated synthetic work-graph item counts (e.g. 1000,100000,1000000) to report latency growth.",
+    )
+    parser.add_argument("--scale-runs", type=int, default=3, help="Context-load runs per synthetic scale profile.")
+    parser.add_argument("--scale-seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "--scale-work-dir",
+        default=DEFAULT_WORK_DIR,
+        help="Where synthetic fixtures are generated; an existing set with the same scale and seed is reused.",
+    )
     parser.add_argument(
         "--phase2-ci-report",
         default=".cortex/reports/project_state/phase2_ci_overhead_report_v0.json",
@@ -292,74 +366,47 @@ def main() -> int:
     if not cases_by_profile:
         raise ValueError("no profile cases generated from fixture")
 
+    scale_freeze: dict[str, Any] | None = None
+    scale_files: list[dict[str, Any]] = []
+    scale_cases_by_profile: dict[str, list[EvalCase]] = {}
+    scales = parse_scales(args.scale)
+    if scales:
+        scale_work_dir = Path(args.scale_work_dir)
+        if not scale_work_dir.is_absolute():
+            scale_work_dir = (project_dir / scale_work_dir).resolve()
+        scale_freeze, scale_files = build_scale_freeze(
+            project_dir, "phase3_adapter", scales, seed=args.scale_seed, work_dir=scale_work_dir, base_freeze=fixture
+        )
+        scale_cases_by_profile = _build_cases_by_profile(scale_freeze)
+
     base_cmd = _build_context_base_cmd(args)
     env = _build_context_env(args)
 
     profile_rows: list[dict[str, Any]] = []
     all_durations: list[float] = []
     budget_failures_all: list[dict[str, Any]] = []
+    scale_rows: list[dict[str, Any]] = []
 
-    for profile_id, profile_cases in cases_by_profile.items():
-        if not profile_cases:
-            raise ValueError(f"profile has zero cases: {profile_id}")
-        durations: list[float] = []
-        profile_failures: list[dict[str, Any]] = []
-        case_ids = [f"{c.scenario_id}:{c.query_id}" for c in profile_cases]
-
-        for run_idx in range(args.latency_runs_per_profile):
-            case = profile_cases[run_idx % len(profile_cases)]
-            bundle, elapsed = _run_context_load(
-                base_cmd,
-                env,
-                project_dir=project_dir,
-                case=case,
-                weighting_mode=args.weighting_mode,
-                adapter_max_items=max(1, int(args.adapter_max_items)),
-                adapter_stale_seconds=max(0, int(args.adapter_stale_seconds)),
-                max_files=max(1, int(args.max_files)),
-                max_chars_per_file=max(100, int(args.max_chars_per_file)),
-                timeout_seconds=max(1, int(args.timeout_seconds)),
-            )
-            durations.append(elapsed)
-            all_durations.append(elapsed)
-
-            failures = _budget_failures(
-                bundle,
-                case=case,
-                max_files=max(1, int(args.max_files)),
-                max_chars_per_file=max(100, int(args.max_chars_per_file)),
-                adapter_max_items=max(1, int(args.adapter_max_items)),
+    session = ContextLoadSession(base_cmd, env=env, cwd=project_dir, warm=args.context_load_mode == "batch")
+    try:
+        for profile_id, profile_cases in cases_by_profile.items():
+            if not profile_cases:
+                raise ValueError(f"profile has zero cases: {profile_id}")
+            row, profile_failures = _measure_profile(
+                session, args, project_dir, profile_id, profile_cases, args.latency_runs_per_profile
             )
-            if failures:
-                detail = {
-                    "profile_id": profile_id,
-                    "run": run_idx + 1,
-                    "case_id": f"{case.scenario_id}:{case.query_id}",
-                    "failures": failures,
-                    "warning_classes": sorted(
-                        {_warning_class(str(w)) for w in list(bundle.get("warnings", []))}
-                    ),
-                }
-                profile_failures.append(detail)
-                budget_failures_all.append(detail)
-
-        p95 = _percentile(durations, 95.0)
-        profile_rows.append(
-            {
-                "profile_id": profile_id,
-                "runs": len(durations),
-                "fixture_cases_cycle": case_ids,
-                "durations_seconds": durations,
-                "min_seconds": min(durations),
-                "max_seconds": max(durations),
-                "mean_seconds": float(sum(durations) / len(durations)),
-                "p50_seconds": _median(durations),
-                "p95_seconds": p95,
-                "target_p95_seconds": 2.5,
-                "target_met": p95 <= 2.5,
-                "budget_failures": len(profile_failures),
-            }
-        )
+            all_durations.extend(row["durations_seconds"])
+            budget_failures_all.extend(profile_failures)
+            profile_rows.append(row)
+        for scale_profile in scale_freeze.get("profiles", []) if scale_freeze else []:
+            profile_id = str(scale_profile["profile_id"])
+            # Synthetic profiles load under the retrieval budget of the frozen profile they were derived from.
+            retrieval_profile = str(scale_profile.get("retrieval_profile", profile_id))
+            scale_cases = [replace(case, profile_id=retrieval_profile) for case in scale_cases_by_profile[profile_id]]
+            row, _ = _measure_profile(session, args, project_dir, profile_id, scale_cases, max(1, args.scale_runs))
+            scale_rows.append({"scale": int(scale_profile["scale"]), **row})
+    finally:
+        session.close()
 
     latency_target_met = all(row["target_met"] for row in profile_rows)
     latency_report = {
@@ -368,6 +415,7 @@ def main() -> int:
         "measurement_mode": "frozen_fixture_profile_cycle_adapter_enabled",
         "fixture_artifact": fixture.get("artifact"),
         "coach_command": base_cmd,
+        "context_load_mode": session.mode,
         "weighting_mode": args.weighting_mode,
         "profiles": profile_rows,
         "aggregate": {
@@ -382,6 +430,16 @@ def main() -> int:
         "target_met": latency_target_met,
         "run_at": _now_iso(),
     }
+    if scale_freeze is not None:
+        # Scale profiles describe growth only; latency and budget targets stay defined by the frozen profiles.
+        latency_report["scale"] = {
+            "freeze_artifact": scale_freeze["artifact"],
+            "seed": args.scale_seed,
+            "runs_per_profile": max(1, args.scale_runs),
+            "fixtures": scale_files,
+            "profiles": scale_rows,
+            "growth": latency_growth([(row["scale"], row["p50_seconds"]) for row in scale_rows]),
+        }
 
     total_runs = args.latency_runs_per_profile * len(profile_rows)
     pass_runs = total_runs - len(budget_failures_all)
@@ -10,6 +10,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from promotion_ranking_v0 import CandidateIndex, query_tokens
+
 
 SCORE_MODES = ("uniform", "evidence_bias")
 TIE_BREAK_ORDER = [
@@ -118,52 +120,6 @@ def _candidate_from_debt_item(raw: dict[str, Any], idx: int) -> dict[str, Any]:
     }
 
 
-def _query_tokens(query: str) -> list[str]:
-    tokens: list[str] = []
-    current: list[str] = []
-    for ch in query.lower():
-        if ch.isalnum():
-            current.append(ch)
-            continue
-        if current:
-            token = "".join(current)
-            if len(token) >= 3:
-                tokens.append(token)
-            current = []
-    if current:
-        token = "".join(current)
-        if len(token) >= 3:
-            tokens.append(token)
-    return sorted(set(tokens))
-
-
-def _impact_priority(impact: str) -> tuple[int, float]:
-    value = str(impact).strip().lower()
-    if value in {"critical", "high"}:
-        return 1, 1.0
-    if value == "medium":
-        return 2, 0.7
-    if value == "low":
-        return 3, 0.4
-    return 4, 0.2
-
-
-def _score_weights(score_mode: str) -> dict[str, float]:
-    if score_mode == "uniform":
-        return {
-            "lexical_score": 0.25,
-            "evidence_coverage": 0.25,
-            "linkage_score": 0.25,
-            "impact_score": 0.25,
-        }
-    return {
-        "lexical_score": 0.2,
-        "evidence_coverage": 0.35,
-        "linkage_score": 0.25,
-        "impact_score": 0.2,
-    }
-
-
 def _load_candidates_from_fixture(path: Path) -> list[dict[str, Any]]:
     payload = _load_json(path)
     if not isinstance(payload, dict):
@@ -223,80 +179,36 @@ def _rank_candidates(
     query: str,
     score_mode: str,
     candidate_limit: int,
+    index: CandidateIndex | None = None,
 ) -> list[dict[str, Any]]:
-    query_tokens = _query_tokens(query)
-    weights = _score_weights(score_mode)
-    scored_rows: list[dict[str, Any]] = []
-    for candidate in candidates:
-        searchable = " ".join(
-            [
-                str(candidate.get("title", "")),
-                str(candidate.get("summary", "")),
-                str(candidate.get("state", "")),
-                str(candidate.get("governance_impact", "")),
-                str(candidate.get("owner", "")),
-                str(candidate.get("next_action", "")),
-            ]
-        ).lower()
-        hit_count = sum(1 for token in query_tokens if token in searchable)
-        lexical_score = min(1.0, float(hit_count) / 6.0) if query_tokens else 0.0
-        evidence_coverage = min(1.0, float(len(candidate.get("evidence_refs", []))) / 3.0)
-        linkage_complete = bool(candidate.get("decision_refs")) and bool(candidate.get("reflection_refs"))
-        linkage_score = 1.0 if linkage_complete else 0.0
-        governance_impact = str(candidate.get("governance_impact", ""))
-        impact_priority, impact_score = _impact_priority(governance_impact)
-
-        combined_score = round(
-            (weights["lexical_score"] * lexical_score)
-            + (weights["evidence_coverage"] * evidence_coverage)
-            + (weights["linkage_score"] * linkage_score)
-            + (weights["impact_score"] * impact_score),
-            6,
-        )
-
-        enforcement_recommendation = "eligible_for_promotion"
-        if governance_impact in {"critical", "high"} and not linkage_complete:
-            enforcement_recommendation = "block_unlinked_governance_closure"
-
-        scored_rows.append(
+    """Top `candidate_limit` rows in TIE_BREAK_ORDER; pass `index` to reuse features across queries."""
+    index = index or CandidateIndex(candidates, score_mode)
+    has_tokens = bool(query_tokens(query))
+    selected: list[dict[str, Any]] = []
+    for rank, (idx, combined_score, lexical_hits) in enumerate(index.rank(query, candidate_limit), start=1):
+        candidate = index.candidates[idx]
+        selected.append(
             {
                 "candidate_id": candidate.get("candidate_id"),
                 "title": candidate.get("title"),
                 "summary": candidate.get("summary"),
                 "state": candidate.get("state"),
-                "governance_impact": governance_impact,
+                "governance_impact": str(candidate.get("governance_impact", "")),
                 "owner": candidate.get("owner"),
                 "next_action": candidate.get("next_action"),
                 "decision_refs": candidate.get("decision_refs"),
                 "reflection_refs": candidate.get("reflection_refs"),
                 "evidence_refs": candidate.get("evidence_refs"),
                 "impacted_artifacts": candidate.get("impacted_artifacts"),
-                "linkage_complete": linkage_complete,
+                "linkage_complete": index.linkage_complete[idx],
                 "promotion_contract_fields_complete": _promotion_contract_fields_complete(candidate),
-                "enforcement_recommendation": enforcement_recommendation,
-                "governance_impact_priority": impact_priority,
+                "enforcement_recommendation": index.enforcement_recommendation(idx),
+                "governance_impact_priority": index.impact_priority[idx],
                 "combined_score": combined_score,
-                "score_breakdown": {
-                    "lexical_score": round(lexical_score, 6),
-                    "evidence_coverage": round(evidence_coverage, 6),
-                    "linkage_score": round(linkage_score, 6),
-                    "impact_score": round(impact_score, 6),
-                },
+                "score_breakdown": index.breakdown(idx, lexical_hits, has_tokens),
+                "rank": rank,
             }
         )
-
-    ranked = sorted(
-        scored_rows,
-        key=lambda item: (
-            -float(item.get("combined_score", 0.0)),
-            -float(item.get("score_breakdown", {}).get("evidence_coverage", 0.0)),
-            int(item.get("governance_impact_priority", 99)),
-            str(item.get("candidate_id", "")),
-        ),
-    )
-    selected = ranked[:candidate_limit]
-    for idx, item in enumerate(selected, start=1):
-        item["rank"] = idx
     return selected
 
 
@@ -376,6 +288,7 @@ def main() -> int:
             fixture_ref = str(scenario.get("fixture_ref", "")).strip()
             scenario_fixture = (project_dir / fixture_ref).resolve()
             candidates = _load_candidates_from_fixture(scenario_fixture)
+            index = CandidateIndex(candidates, str(args.score_mode))
 
             for query_id in profile.get("query_ids", []):
                 query = query_by_id.get(str(query_id))
@@ -387,6 +300,7 @@ def main() -> int:
                     query=query_text,
                     score_mode=str(args.score_mode),
                     candidate_limit=max(1, int(args.candidate_limit)),
+                    index=index,
                 )
 
                 case_id = f"{profile_id}:{scenario_id}:{query_id}"
@@ -435,6 +349,7 @@ def main() -> int:
                         query=query_text,
                         score_mode=str(args.score_mode),
                         candidate_limit=max(1, int(args.candidate_limit)),
+                        index=index,
                     )
                     run_hashes.append(_ranking_hash(replay))
                 hash_set = sorted(set(run_hashes))
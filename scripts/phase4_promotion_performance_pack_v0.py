@@ -4,10 +4,10 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import math
 import os
-import shutil
 import statistics
 import subprocess
 import tempfile
@@ -16,6 +16,14 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from ephemeral_workspace_v0 import ephemeral_workspace
+from gate_step_timing_v0 import RECORDS_ENV, attribute_steps, read_records, step_medians
+from perf_measurement_v0 import compare_samples, overhead_target_met, run_interleaved
+from perf_measurement_v0 import durations as perf_durations
+from promotion_ranking_v0 import CandidateIndex
+from synthetic_fixture_generator_v0 import DEFAULT_SEED, DEFAULT_WORK_DIR, build_scale_freeze, latency_growth
+from synthetic_fixture_generator_v0 import parse_scales
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
@@ -68,52 +76,6 @@ def _to_string_list(value: Any) -> list[str]:
     return sorted(set(out))
 
 
-def _query_tokens(query: str) -> list[str]:
-    tokens: list[str] = []
-    current: list[str] = []
-    for ch in query.lower():
-        if ch.isalnum():
-            current.append(ch)
-            continue
-        if current:
-            token = "".join(current)
-            if len(token) >= 3:
-                tokens.append(token)
-            current = []
-    if current:
-        token = "".join(current)
-        if len(token) >= 3:
-            tokens.append(token)
-    return sorted(set(tokens))
-
-
-def _impact_priority(impact: str) -> tuple[int, float]:
-    value = str(impact).strip().lower()
-    if value in {"critical", "high"}:
-        return 1, 1.0
-    if value == "medium":
-        return 2, 0.7
-    if value == "low":
-        return 3, 0.4
-    return 4, 0.2
-
-
-def _score_weights(score_mode: str) -> dict[str, float]:
-    if score_mode == "uniform":
-        return {
-            "lexical_score": 0.25,
-            "evidence_coverage": 0.25,
-            "linkage_score": 0.25,
-            "impact_score": 0.25,
-        }
-    return {
-        "lexical_score": 0.2,
-        "evidence_coverage": 0.35,
-        "linkage_score": 0.25,
-        "impact_score": 0.2,
-    }
-
-
 def _normalize_impacted_artifacts(value: Any, fallback_title: str) -> list[dict[str, str]]:
     out: list[dict[str, str]] = []
     if not isinstance(value, list):
@@ -180,6 +142,25 @@ def _normalize_candidates(raw_fixture: dict[str, Any]) -> list[dict[str, Any]]:
     return out
 
 
+def _rank_candidate_batch(
+    index: CandidateIndex,
+    queries: list[str],
+    candidate_limit: int,
+) -> list[list[dict[str, Any]]]:
+    return [
+        [
+            {
+                "candidate_id": index.candidates[idx].get("candidate_id"),
+                "combined_score": combined_score,
+                "evidence_coverage": index.evidence_coverage_rounded[idx],
+                "governance_impact_priority": index.impact_priority[idx],
+            }
+            for idx, combined_score, _ in rows
+        ]
+        for rows in index.rank_batch(queries, candidate_limit)
+    ]
+
+
 def _rank_candidates(
     candidates: list[dict[str, Any]],
     *,
@@ -187,49 +168,7 @@ def _rank_candidates(
     score_mode: str,
     candidate_limit: int,
 ) -> list[dict[str, Any]]:
-    query_tokens = _query_tokens(query)
-    weights = _score_weights(score_mode)
-    scored_rows: list[dict[str, Any]] = []
-    for candidate in candidates:
-        searchable = " ".join(
-            [
-                str(candidate.get("title", "")),
-                str(candidate.get("summary", "")),
-                str(candidate.get("state", "")),
-                str(candidate.get("governance_impact", "")),
-            ]
-        ).lower()
-        hit_count = sum(1 for token in query_tokens if token in searchable)
-        lexical_score = min(1.0, float(hit_count) / 6.0) if query_tokens else 0.0
-        evidence_coverage = min(1.0, float(len(candidate.get("evidence_refs", []))) / 3.0)
-        linkage_complete = bool(candidate.get("decision_refs")) and bool(candidate.get("reflection_refs"))
-        linkage_score = 1.0 if linkage_complete else 0.0
-        impact_priority, impact_score = _impact_priority(str(candidate.get("governance_impact", "")))
-        combined_score = round(
-            (weights["lexical_score"] * lexical_score)
-            + (weights["evidence_coverage"] * evidence_coverage)
-            + (weights["linkage_score"] * linkage_score)
-            + (weights["impact_score"] * impact_score),
-            6,
-        )
-        scored_rows.append(
-            {
-                "candidate_id": candidate.get("candidate_id"),
-                "combined_score": combined_score,
-                "evidence_coverage": round(evidence_coverage, 6),
-                "governance_impact_priority": impact_priority,
-            }
-        )
-    ranked = sorted(
-        scored_rows,
-        key=lambda item: (
-            -float(item.get("combined_score", 0.0)),
-            -float(item.get("evidence_coverage", 0.0)),
-            int(item.get("governance_impact_priority", 99)),
-            str(item.get("candidate_id", "")),
-        ),
-    )
-    return ranked[:candidate_limit]
+    return _rank_candidate_batch(CandidateIndex(candidates, score_mode), [query], candidate_limit)[0]
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -243,11 +182,35 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--candidate-limit", type=int, default=8)
     parser.add_argument("--latency-runs-per-profile", type=int, default=30)
     parser.add_argument("--ci-runs", type=int, default=5)
+    parser.add_argument("--ci-warmup-runs", type=int, default=1, help="Discarded quality-gate runs per arm.")
+    parser.add_argument(
+        "--ci-step-runs",
+        type=int,
+        default=3,
+        help="Extra per-step-instrumented quality-gate runs per arm, kept out of the timed overhead samples.",
+    )
+    parser.add_argument(
+        "--baseline-ref",
+        help="Git ref to run as a live baseline, interleaved with the working tree (default: stored phase3 median).",
+    )
+    parser.add_argument("--bootstrap-seed", type=int, default=0)
     parser.add_argument("--timeout-seconds", type=int, default=300)
     parser.add_argument(
         "--phase3-ci-report",
         default=".cortex/reports/project_state/phase3_ci_overhead_report_v0.json",
     )
+    parser.add_argument(
+        "--scale",
+        default="",
+        help="Comma-separated synthetic candidate counts (e.g. 1000,100000,1000000) to report latency growth over.",
+    )
+    parser.add_argument("--scale-runs", type=int, default=5, help="Latency runs per synthetic scale profile.")
+    parser.add_argument("--scale-seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "--scale-work-dir",
+        default=DEFAULT_WORK_DIR,
+        help="Where synthetic fixtures are generated; an existing set with the same scale and seed is reused.",
+    )
     parser.add_argument(
         "--latency-out",
         default=".cortex/reports/project_state/phase4_latency_report_v0.json",
@@ -259,7 +222,14 @@ def _build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _measure_latency(args: argparse.Namespace, project_dir: Path, freeze: dict[str, Any]) -> dict[str, Any]:
+def _measure_latency(
+    args: argparse.Namespace,
+    project_dir: Path,
+    freeze: dict[str, Any],
+    *,
+    runs_per_profile: int | None = None,
+) -> dict[str, Any]:
+    runs = max(1, int(args.latency_runs_per_profile if runs_per_profile is None else runs_per_profile))
     scenario_map = {
         str(item["scenario_id"]): item for item in freeze.get("scenarios", []) if isinstance(item, dict)
     }
@@ -277,6 +247,7 @@ def _measure_latency(args: argparse.Namespace, project_dir: Path, freeze: dict[s
         scenario_ids = [str(v) for v in profile.get("scenario_ids", [])]
         query_ids = [str(v) for v in profile.get("query_ids", [])]
 
+        # Loaded per profile, so only one synthetic scale is held in memory at a time.
         scenario_candidates: list[list[dict[str, Any]]] = []
         for scenario_id in scenario_ids:
             scenario = scenario_map.get(scenario_id)
@@ -296,22 +267,19 @@ def _measure_latency(args: argparse.Namespace, project_dir: Path, freeze: dict[s
             query_texts.append(str(query.get("query_text", "")))
 
         durations: list[float] = []
-        for _ in range(max(1, int(args.latency_runs_per_profile))):
+        for _ in range(runs):
             started = time.perf_counter()
+            # Candidate features are built once per scenario and shared by its whole query batch.
             for candidates in scenario_candidates:
-                for query_text in query_texts:
-                    _rank_candidates(
-                        candidates,
-                        query=query_text,
-                        score_mode=str(args.score_mode),
-                        candidate_limit=max(1, int(args.candidate_limit)),
-                    )
+                index = CandidateIndex(candidates, str(args.score_mode))
+                _rank_candidate_batch(index, query_texts, max(1, int(args.candidate_limit)))
             durations.append(time.perf_counter() - started)
 
         all_durations.extend(durations)
         profile_results.append(
             {
                 "profile_id": profile_id,
+                "candidate_count": sum(len(candidates) for candidates in scenario_candidates),
                 "runs": len(durations),
                 "durations_seconds": durations,
                 "median_seconds": _median(durations),
@@ -328,7 +296,7 @@ def _measure_latency(args: argparse.Namespace, project_dir: Path, freeze: dict[s
         "project_dir": str(project_dir),
         "score_mode": str(args.score_mode),
         "candidate_limit": max(1, int(args.candidate_limit)),
-        "latency_runs_per_profile": max(1, int(args.latency_runs_per_profile)),
+        "latency_runs_per_profile": runs,
         "target_p95_seconds": 2.5,
         "summary": {
             "profile_count": len(profile_results),
@@ -343,20 +311,30 @@ def _measure_latency(args: argparse.Namespace, project_dir: Path, freeze: dict[s
     return payload
 
 
-def _prepare_ephemeral_workspace(project_dir: Path) -> Path:
-    temp_root = Path(tempfile.mkdtemp(prefix="phase4_perf_workspace_"))
-    workspace = temp_root / "repo"
-    shutil.copytree(
+def _measure_scale(args: argparse.Namespace, project_dir: Path, scales: list[int]) -> dict[str, Any]:
+    work_dir = Path(args.scale_work_dir)
+    work_dir = work_dir if work_dir.is_absolute() else (project_dir / work_dir).resolve()
+    freeze, files = build_scale_freeze(
         project_dir,
-        workspace,
-        ignore=shutil.ignore_patterns(".git", ".uv-cache", "__pycache__", "*.pyc", ".pytest_cache"),
+        "phase4_promotion",
+        scales,
+        seed=int(args.scale_seed),
+        work_dir=work_dir,
+        base_freeze=_load_json((project_dir / args.fixture_file).resolve()),
     )
-    subprocess.run(["git", "init"], cwd=str(workspace), check=True, capture_output=True, text=True)
-    subprocess.run(["git", "config", "user.email", "phase4-perf@example.com"], cwd=str(workspace), check=True)
-    subprocess.run(["git", "config", "user.name", "Phase4 Perf"], cwd=str(workspace), check=True)
-    subprocess.run(["git", "add", "."], cwd=str(workspace), check=True, capture_output=True, text=True)
-    subprocess.run(["git", "commit", "-m", "phase4 perf baseline"], cwd=str(workspace), check=True, capture_output=True)
-    return workspace
+    measured = _measure_latency(args, project_dir, freeze, runs_per_profile=args.scale_runs)
+    profiles = []
+    for scale, row in zip(scales, measured["profiles"]):
+        per_1k = row["median_seconds"] / (row["candidate_count"] / 1000.0) if row["candidate_count"] else 0.0
+        profiles.append({"scale": scale, **row, "median_seconds_per_1k_candidates": per_1k})
+    return {
+        "freeze_artifact": freeze["artifact"],
+        "seed": int(args.scale_seed),
+        "runs_per_profile": measured["latency_runs_per_profile"],
+        "fixtures": files,
+        "profiles": profiles,
+        "growth": latency_growth([(row["scale"], row["median_seconds"]) for row in profiles]),
+    }
 
 
 def _measure_ci_overhead(args: argparse.Namespace, project_dir: Path) -> dict[str, Any]:
@@ -365,57 +343,107 @@ def _measure_ci_overhead(args: argparse.Namespace, project_dir: Path) -> dict[st
         raise SystemExit(f"invalid phase3 baseline report: {args.phase3_ci_report}")
     phase3_median = float(phase3_report.get("phase3_median_seconds", 0.0) or 0.0)
 
-    workspace = _prepare_ephemeral_workspace(project_dir)
-    durations: list[float] = []
-    run_summaries: list[dict[str, Any]] = []
-
     env = os.environ.copy()
     env["UV_CACHE_DIR"] = str((project_dir / ".uv-cache").resolve())
     env["CORTEX_QG_SKIP_FOCUSED_TESTS"] = "1"
 
-    try:
-        for run_idx in range(1, max(1, int(args.ci_runs)) + 1):
-            started = time.perf_counter()
-            proc = subprocess.run(
-                ["bash", "scripts/quality_gate_ci_v0.sh"],
-                cwd=str(workspace),
-                text=True,
-                capture_output=True,
-                check=False,
-                timeout=int(args.timeout_seconds),
-                env=env,
-            )
-            elapsed = time.perf_counter() - started
-            durations.append(elapsed)
-            run_summaries.append(
-                {
-                    "run": run_idx,
-                    "returncode": proc.returncode,
-                    "duration_seconds": elapsed,
-                    "summary": _format_quality_gate_summary(proc),
-                }
+    with contextlib.ExitStack() as stack:
+        workspaces = {"candidate": stack.enter_context(ephemeral_workspace(project_dir))}
+        if args.baseline_ref:
+            workspaces["baseline"] = stack.enter_context(ephemeral_workspace(project_dir, ref=args.baseline_ref))
+
+        def run_once(arm: str, *, record_steps: bool = False) -> dict[str, Any]:
+            step_env: dict[str, str] = {}
+            records_file: Path | None = None
+            if record_steps:
+                # run_quiet appends one timing record per gate step; gates predating that leave the file empty.
+                fd, records_name = tempfile.mkstemp(prefix="phase4_gate_steps_", suffix=".jsonl")
+                os.close(fd)
+                records_file = Path(records_name)
+                step_env[RECORDS_ENV] = records_name
+            try:
+                started = time.perf_counter()
+                proc = subprocess.run(
+                    ["bash", "scripts/quality_gate_ci_v0.sh"],
+                    cwd=str(workspaces[arm]),
+                    text=True,
+                    capture_output=True,
+                    check=False,
+                    timeout=int(args.timeout_seconds),
+                    env={**env, **step_env},
+                )
+                elapsed = time.perf_counter() - started
+                steps = read_records(records_file) if records_file else []
+            finally:
+                if records_file:
+                    records_file.unlink(missing_ok=True)
+            record: dict[str, Any] = {
+                "returncode": proc.returncode,
+                "duration_seconds": elapsed,
+                "summary": _format_quality_gate_summary(proc),
+            }
+            if record_steps:
+                record["steps"] = steps
+            return record
+
+        # Timed runs stay uninstrumented: the per-step wrapper adds an interpreter per gate step, which neither
+        # the stored phase3 median nor an older baseline ref paid. Step records come from separate rounds.
+        samples = run_interleaved(
+            list(workspaces), run_once, max(1, int(args.ci_runs)), max(0, int(args.ci_warmup_runs))
+        )
+        step_samples: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        if int(args.ci_step_runs) > 0:
+            step_samples = run_interleaved(
+                list(workspaces),
+                lambda arm: run_once(arm, record_steps=True),
+                int(args.ci_step_runs),
+                warmup_runs=0,
             )
-    finally:
-        shutil.rmtree(workspace.parent, ignore_errors=True)
 
+    run_summaries = samples["candidate"]["runs"]
+    durations = perf_durations(run_summaries)
     phase4_median = _median(durations)
-    delta_percent = ((phase4_median - phase3_median) / phase3_median * 100.0) if phase3_median > 0 else 0.0
     all_pass = all(int(item.get("returncode", 1)) == 0 for item in run_summaries)
-    target_met = all_pass and delta_percent <= 10.0
+    baseline_runs = samples.get("baseline", {}).get("runs", [])
+    baseline_pass = all(int(item.get("returncode", 1)) == 0 for item in baseline_runs)
+    comparison = compare_samples(
+        perf_durations(baseline_runs) if args.baseline_ref else [phase3_median],
+        durations,
+        threshold_percent=10.0,
+        seed=int(args.bootstrap_seed),
+    )
+    delta_percent = float(comparison["delta_percent"])
+    candidate_steps = [item["steps"] for item in step_samples.get("candidate", {}).get("runs", [])]
+    baseline_steps = [item["steps"] for item in step_samples.get("baseline", {}).get("runs", [])]
+    step_attribution = None
+    if any(baseline_steps) and any(candidate_steps):
+        step_attribution = attribute_steps(
+            baseline_steps, candidate_steps, threshold_percent=10.0, seed=int(args.bootstrap_seed)
+        )
+    target_met = all_pass and baseline_pass and overhead_target_met(comparison)
 
+    measurement_mode = "required_ci_gate_vs_phase3_baseline_ephemeral_git_workspace_offline_probe"
+    if args.baseline_ref:
+        measurement_mode = "required_ci_gate_vs_baseline_ref_interleaved_ephemeral_git_workspace_offline_probe"
     payload: dict[str, Any] = {
         "version": "v0",
         "artifact": "phase4_ci_overhead_report_v0",
         "run_at": _now_iso(),
-        "measurement_mode": "required_ci_gate_vs_phase3_baseline_ephemeral_git_workspace_offline_probe",
+        "measurement_mode": measurement_mode,
         "phase3_baseline_source": args.phase3_ci_report,
         "phase3_median_seconds": phase3_median,
         "phase4_required_gate": "scripts/quality_gate_ci_v0.sh",
         "phase4_runs": max(1, int(args.ci_runs)),
+        "phase4_warmup_runs": max(0, int(args.ci_warmup_runs)),
         "phase4_durations_seconds": durations,
         "phase4_median_seconds": phase4_median,
         "delta_percent": delta_percent,
         "target_max_delta_percent": 10.0,
+        "verdict": comparison["verdict"],
+        "overhead_comparison": comparison,
+        "step_timing_runs": len(candidate_steps),
+        "phase4_step_medians_seconds": step_medians(candidate_steps),
+        "step_attribution": step_attribution,
         "target_met": target_met,
         "all_runs_passed": all_pass,
         "phase4_run_summaries": run_summaries,
@@ -426,6 +454,11 @@ def _measure_ci_overhead(args: argparse.Namespace, project_dir: Path) -> dict[st
             "focused_tests_probe_mode": "skipped via CORTEX_QG_SKIP_FOCUSED_TESTS=1 for offline-overhead reproducibility",
         },
     }
+    if args.baseline_ref:
+        payload["baseline_ref"] = args.baseline_ref
+        payload["baseline_durations_seconds"] = perf_durations(baseline_runs)
+        payload["baseline_runs_passed"] = baseline_pass
+        payload["baseline_run_summaries"] = baseline_runs
     return payload
 
 
@@ -440,7 +473,15 @@ def main() -> int:
     if not isinstance(freeze, dict):
         raise SystemExit(f"fixture freeze is not a JSON object: {fixture_path}")
 
+    try:
+        scales = parse_scales(args.scale)
+    except ValueError as exc:
+        raise SystemExit(f"invalid --scale: {exc}") from exc
+
     latency_payload = _measure_latency(args, project_dir, freeze)
+    if scales:
+        # Scale profiles describe growth only; the p95 target stays defined by the frozen profiles.
+        latency_payload["scale"] = _measure_scale(args, project_dir, scales)
     ci_overhead_payload = _measure_ci_overhead(args, project_dir)
 
     _write_json(latency_out, latency_payload)
@@ -4,17 +4,20 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
-import shutil
 import statistics
 import subprocess
-import tempfile
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from ephemeral_workspace_v0 import ephemeral_workspace
+from perf_measurement_v0 import compare_samples, overhead_target_met, run_interleaved
+from perf_measurement_v0 import durations as perf_durations
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
@@ -83,22 +86,6 @@ def _run_json_command(
     return payload, proc.returncode, stderr, stdout, elapsed
 
 
-def _prepare_ephemeral_workspace(project_dir: Path) -> Path:
-    temp_root = Path(tempfile.mkdtemp(prefix="phase5_recurring_cadence_"))
-    workspace = temp_root / "repo"
-    shutil.copytree(
-        project_dir,
-        workspace,
-        ignore=shutil.ignore_patterns(".git", ".uv-cache", "__pycache__", "*.pyc", ".pytest_cache"),
-    )
-    subprocess.run(["git", "init"], cwd=str(workspace), check=True, capture_output=True, text=True)
-    subprocess.run(["git", "config", "user.email", "phase5-cadence@example.com"], cwd=str(workspace), check=True)
-    subprocess.run(["git", "config", "user.name", "Phase5 Cadence"], cwd=str(workspace), check=True)
-    subprocess.run(["git", "add", "."], cwd=str(workspace), check=True, capture_output=True, text=True)
-    subprocess.run(["git", "commit", "-m", "phase5 cadence probe"], cwd=str(workspace), check=True, capture_output=True)
-    return workspace
-
-
 def _run_rollout_audit(
     *,
     project_dir: Path,
@@ -182,26 +169,21 @@ def _run_quality_gate_ci_samples(
     phase4_measurement_mode: str,
     quality_gate_script: str,
     ci_runs: int,
+    ci_warmup_runs: int,
     timeout_seconds: int,
 ) -> dict[str, Any]:
-    run_summaries: list[dict[str, Any]] = []
-    durations: list[float] = []
-    pass_count = 0
-
     measurement_mode = "required_ci_gate_full"
     workspace = project_dir
     env = os.environ.copy()
-    cleanup_root: Path | None = None
 
-    if "offline_probe" in phase4_measurement_mode.lower():
-        measurement_mode = "required_ci_gate_phase4_baseline_compatible_offline_probe"
-        workspace = _prepare_ephemeral_workspace(project_dir)
-        cleanup_root = workspace.parent
-        env["UV_CACHE_DIR"] = str((project_dir / ".uv-cache").resolve())
-        env["CORTEX_QG_SKIP_FOCUSED_TESTS"] = "1"
+    with contextlib.ExitStack() as stack:
+        if "offline_probe" in phase4_measurement_mode.lower():
+            measurement_mode = "required_ci_gate_phase4_baseline_compatible_offline_probe"
+            workspace = stack.enter_context(ephemeral_workspace(project_dir))
+            env["UV_CACHE_DIR"] = str((project_dir / ".uv-cache").resolve())
+            env["CORTEX_QG_SKIP_FOCUSED_TESTS"] = "1"
 
-    try:
-        for run_idx in range(max(1, ci_runs)):
+        def run_once(_arm: str) -> dict[str, Any]:
             started = time.perf_counter()
             proc = subprocess.run(
                 [quality_gate_script],
@@ -213,28 +195,24 @@ def _run_quality_gate_ci_samples(
                 env=env,
             )
             elapsed = time.perf_counter() - started
-            passed = proc.returncode == 0
-            if passed:
-                pass_count += 1
-            durations.append(elapsed)
-            run_summaries.append(
-                {
-                    "run": run_idx + 1,
-                    "returncode": proc.returncode,
-                    "status": "pass" if passed else "fail",
-                    "duration_seconds": elapsed,
-                    "summary": _format_quality_gate_summary(proc),
-                }
-            )
-    finally:
-        if cleanup_root is not None:
-            shutil.rmtree(cleanup_root, ignore_errors=True)
-
+            return {
+                "returncode": proc.returncode,
+                "status": "pass" if proc.returncode == 0 else "fail",
+                "duration_seconds": elapsed,
+                "summary": _format_quality_gate_summary(proc),
+            }
+
+        samples = run_interleaved(["candidate"], run_once, max(1, ci_runs), max(0, ci_warmup_runs))
+
+    run_summaries = samples["candidate"]["runs"]
+    durations = perf_durations(run_summaries)
+    pass_count = sum(1 for item in run_summaries if item["status"] == "pass")
     reliability_rate = float(pass_count / len(run_summaries)) if run_summaries else 0.0
     median_seconds = _median(durations)
     return {
         "measurement_mode": measurement_mode,
         "runs": len(run_summaries),
+        "warmup_runs": len(samples["candidate"]["warmup"]),
         "pass_count": pass_count,
         "reliability_rate": reliability_rate,
         "durations_seconds": durations,
@@ -256,6 +234,7 @@ def _render_text(payload: dict[str, Any]) -> str:
         f"quality_gate_ci_reliability_rate: {ci.get('reliability_rate', 0.0)}",
         f"quality_gate_ci_delta_percent_vs_phase4: {summary.get('ci_runtime_delta_percent', 0.0)}",
         f"overhead_tracking_status: {summary.get('overhead_tracking_status', 'unknown')}",
+        f"overhead_verdict: {summary.get('overhead_verdict', 'unknown')}",
     ]
     return "\n".join(lines)
 
@@ -267,6 +246,7 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--coach-script", default="scripts/cortex_project_coach_v0.py")
     parser.add_argument("--quality-gate-script", default="./scripts/quality_gate_ci_v0.sh")
     parser.add_argument("--ci-runs", type=int, default=3)
+    parser.add_argument("--ci-warmup-runs", type=int, default=1, help="Discarded quality-gate runs before sampling.")
     parser.add_argument("--timeout-seconds", type=int, default=300)
     parser.add_argument("--phase4-ci-report", default=".cortex/reports/project_state/phase4_ci_overhead_report_v0.json")
     parser.add_argument("--out-file", default=".cortex/reports/project_state/phase5_recurring_cadence_report_v0.json")
@@ -305,9 +285,11 @@ def main() -> int:
         phase4_measurement_mode=phase4_measurement_mode,
         quality_gate_script=args.quality_gate_script,
         ci_runs=max(1, int(args.ci_runs)),
+        ci_warmup_runs=max(0, int(args.ci_warmup_runs)),
         timeout_seconds=max(1, int(args.timeout_seconds)),
     )
-    ci_delta_percent = ((quality_gate["median_seconds"] - phase4_median_seconds) / phase4_median_seconds) * 100.0
+    overhead = compare_samples([phase4_median_seconds], quality_gate["durations_seconds"], threshold_percent=10.0)
+    ci_delta_percent = float(overhead["delta_percent"])
 
     transition_audit = rollout["audit_check"]
     read_mode_check = rollout["read_mode_check"]
@@ -323,6 +305,9 @@ def main() -> int:
         "delta_percent_vs_phase4": ci_delta_percent,
         "delta_within_legacy_threshold": ci_delta_percent <= 10.0,
         "status": "within_legacy_threshold" if ci_delta_percent <= 10.0 else "exceeds_legacy_threshold",
+        "verdict": overhead["verdict"],
+        "delta_percent_ci": overhead["delta_percent_ci"],
+        "target_met": overhead_target_met(overhead),
     }
     status = "pass" if all(bool(v) for v in hard_target_results.values()) else "fail"
 
@@ -353,6 +338,7 @@ def main() -> int:
             "phase4_baseline_median_seconds": phase4_median_seconds,
             "phase4_measurement_mode": phase4_measurement_mode,
             "delta_percent_vs_phase4": ci_delta_percent,
+            "overhead_comparison": overhead,
         },
         "summary": {
             "ci_runtime_delta_percent": ci_delta_percent,
@@ -360,6 +346,7 @@ def main() -> int:
             "transition_completeness_rate": transition_audit["transition_completeness_rate"],
             "transition_finding_count": transition_audit["finding_count"],
             "overhead_tracking_status": overhead_tracking["status"],
+            "overhead_verdict": overhead_tracking["verdict"],
         },
         "hard_targets": {
             "transition_completeness_rate": 1.0,
@@ -374,7 +361,7 @@ def main() -> int:
         },
         "next_action": (
             "Continue recurring cadence tracking."
-            if status == "pass" and overhead_tracking["delta_within_legacy_threshold"]
+            if status == "pass" and overhead_tracking["target_met"]
             else (
                 "Continue recurring cadence tracking and review CI overhead drift against updated baseline policy."
                 if status == "pass"
@@ -4,17 +4,20 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
-import shutil
 import statistics
 import subprocess
-import tempfile
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from ephemeral_workspace_v0 import ephemeral_workspace
+from perf_measurement_v0 import compare_samples, overhead_target_met, run_interleaved
+from perf_measurement_v0 import durations as perf_durations
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
@@ -115,22 +118,6 @@ def _run_required_check(
     }
 
 
-def _prepare_ephemeral_workspace(project_dir: Path) -> Path:
-    temp_root = Path(tempfile.mkdtemp(prefix="phase5_rollout_workspace_"))
-    workspace = temp_root / "repo"
-    shutil.copytree(
-        project_dir,
-        workspace,
-        ignore=shutil.ignore_patterns(".git", ".uv-cache", "__pycache__", "*.pyc", ".pytest_cache"),
-    )
-    subprocess.run(["git", "init"], cwd=str(workspace), check=True, capture_output=True, text=True)
-    subprocess.run(["git", "config", "user.email", "phase5-rollout@example.com"], cwd=str(workspace), check=True)
-    subprocess.run(["git", "config", "user.name", "Phase5 Rollout"], cwd=str(workspace), check=True)
-    subprocess.run(["git", "add", "."], cwd=str(workspace), check=True, capture_output=True, text=True)
-    subprocess.run(["git", "commit", "-m", "phase5 rollout ci probe"], cwd=str(workspace), check=True, capture_output=True)
-    return workspace
-
-
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--project-dir", default=".")
@@ -143,6 +130,7 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--cycle-id", required=True, choices=("cycle1", "cycle2"))
     parser.add_argument("--changed-by", default="ci_gate_owner")
     parser.add_argument("--ci-runs", type=int, default=5)
+    parser.add_argument("--ci-warmup-runs", type=int, default=1, help="Discarded quality-gate runs before sampling.")
     parser.add_argument("--timeout-seconds", type=int, default=300)
     parser.add_argument(
         "--phase4-ci-report",
@@ -424,22 +412,17 @@ def main() -> int:
         else rollout_audit_result.get("finding_count", 0)
     )
 
-    quality_gate_runs: list[dict[str, Any]] = []
-    quality_gate_durations: list[float] = []
-    quality_gate_pass_count = 0
     quality_gate_measurement_mode = "required_ci_gate_full"
     quality_gate_workspace = project_dir
     quality_gate_env = os.environ.copy()
-    workspace_cleanup_root: Path | None = None
-    if "offline_probe" in phase4_measurement_mode:
-        quality_gate_measurement_mode = "required_ci_gate_phase4_baseline_compatible_offline_probe"
-        quality_gate_workspace = _prepare_ephemeral_workspace(project_dir)
-        workspace_cleanup_root = quality_gate_workspace.parent
-        quality_gate_env["UV_CACHE_DIR"] = str((project_dir / ".uv-cache").resolve())
-        quality_gate_env["CORTEX_QG_SKIP_FOCUSED_TESTS"] = "1"
-
-    try:
-        for run_idx in range(max(1, int(args.ci_runs))):
+    with contextlib.ExitStack() as stack:
+        if "offline_probe" in phase4_measurement_mode:
+            quality_gate_measurement_mode = "required_ci_gate_phase4_baseline_compatible_offline_probe"
+            quality_gate_workspace = stack.enter_context(ephemeral_workspace(project_dir))
+            quality_gate_env["UV_CACHE_DIR"] = str((project_dir / ".uv-cache").resolve())
+            quality_gate_env["CORTEX_QG_SKIP_FOCUSED_TESTS"] = "1"
+
+        def run_quality_gate(_arm: str) -> dict[str, Any]:
             started = time.perf_counter()
             proc = subprocess.run(
                 [args.quality_gate_script],
@@ -451,28 +434,26 @@ def main() -> int:
                 env=quality_gate_env,
             )
             elapsed = time.perf_counter() - started
-            quality_gate_durations.append(elapsed)
-            passed = proc.returncode == 0
-            if passed:
-                quality_gate_pass_count += 1
-            quality_gate_runs.append(
-                {
-                    "run": run_idx + 1,
-                    "duration_seconds": elapsed,
-                    "returncode": proc.returncode,
-                    "status": "pass" if passed else "fail",
-                    "summary": _format_quality_gate_summary(proc),
-                }
-            )
-    finally:
-        if workspace_cleanup_root is not None:
-            shutil.rmtree(workspace_cleanup_root, ignore_errors=True)
+            return {
+                "duration_seconds": elapsed,
+                "returncode": proc.returncode,
+                "status": "pass" if proc.returncode == 0 else "fail",
+                "summary": _format_quality_gate_summary(proc),
+            }
+
+        quality_gate_samples = run_interleaved(
+            ["candidate"], run_quality_gate, max(1, int(args.ci_runs)), max(0, int(args.ci_warmup_runs))
+        )
 
+    quality_gate_runs = quality_gate_samples["candidate"]["runs"]
+    quality_gate_durations = perf_durations(quality_gate_runs)
+    quality_gate_pass_count = sum(1 for item in quality_gate_runs if item["status"] == "pass")
     quality_gate_reliability = (
         float(quality_gate_pass_count / len(quality_gate_runs)) if quality_gate_runs else 0.0
     )
     quality_gate_median_seconds = _median(quality_gate_durations)
-    ci_delta_percent = ((quality_gate_median_seconds - phase4_median_seconds) / phase4_median_seconds) * 100.0
+    ci_overhead = compare_samples([phase4_median_seconds], quality_gate_durations, threshold_percent=10.0)
+    ci_delta_percent = float(ci_overhead["delta_percent"])
 
     required_checks_pass = all(item["status"] == "pass" for item in required_checks)
     rollback_steps_pass = all(item["status"] == "pass" for item in rollback_steps)
@@ -530,7 +511,7 @@ def main() -> int:
     target_results = {
         "required_governance_gate_reliability_met": quality_gate_reliability >= 1.0,
         "required_governance_checks_pass_met": required_checks_pass,
-        "ci_runtime_delta_met": ci_delta_percent <= 10.0,
+        "ci_runtime_delta_met": overhead_target_met(ci_overhead),
         "rollback_drill_success_met": rollback_success,
         "mode_transition_completeness_met": transition_completeness_rate >= 1.0,
         "stop_rule_incident_free_met": len(stop_rule_incidents) == 0,
@@ -551,12 +532,14 @@ def main() -> int:
         "required_checks": required_checks,
         "quality_gate_runs": {
             "runs": len(quality_gate_runs),
+            "warmup_runs": len(quality_gate_samples["candidate"]["warmup"]),
             "pass_count": quality_gate_pass_count,
             "reliability_rate": quality_gate_reliability,
             "durations_seconds": quality_gate_durations,
             "run_summaries": quality_gate_runs,
             "median_seconds": quality_gate_median_seconds,
             "delta_percent_vs_phase4": ci_delta_percent,
+            "overhead_comparison": ci_overhead,
         },
         "rollout_mode": {
             "mode_before": mode_before,
@@ -591,6 +574,7 @@ def main() -> int:
             "required_governance_check_count": len(required_checks),
             "required_governance_gate_reliability_rate": quality_gate_reliability,
             "ci_runtime_delta_percent": ci_delta_percent,
+            "ci_runtime_verdict": ci_overhead["verdict"],
             "rollback_drill_success": rollback_success,
             "mode_transition_completeness_rate": transition_completeness_rate,
             "stop_rule_incident_count": len(stop_rule_incidents),
@@ -622,6 +606,7 @@ def main() -> int:
     lines.append(f"- Required checks pass: {pass_count}")
     lines.append(f"- quality-gate-ci reliability: `{quality_gate_reliability:.3f}`")
     lines.append(f"- quality-gate-ci median delta vs Phase 4: `{ci_delta_percent:.6f}%`")
+    lines.append(f"- quality-gate-ci overhead verdict: `{ci_overhead['verdict']}`")
     lines.append(f"- Rollback drill success: `{rollback_success}`")
     lines.append(f"- Transition completeness rate: `{transition_completeness_rate:.3f}`")
     lines.append(f"- Stop-rule incidents: `{len(stop_rule_incidents)}`")
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import subprocess
 import sys
@@ -12,8 +13,15 @@ from datetime import date, datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from path_matcher_v0 import RootMatcher
+from repo_file_index_v0 import git_files, untracked_files
+
 
 DEFAULT_CONTRACT_FILE = Path("contracts/project_state_boundary_contract_v0.json")
+LAST_GREEN_FILE_NAME = "project_state_boundary_last_green_v0.json"
+LAST_GREEN_REF = "last-green"
+# Paths that appear under these statuses did not exist at the base ref; M/T/D paths were already classified.
+NEW_PATH_STATUSES = ("A", "R", "C")
 
 
 @dataclass(frozen=True)
@@ -34,14 +42,6 @@ def _today_utc() -> date:
     return datetime.now(timezone.utc).date()
 
 
-def _is_path_under(path: str, root: str) -> bool:
-    normalized_path = path.strip("/")
-    normalized_root = root.strip("/")
-    if not normalized_root:
-        return False
-    return normalized_path == normalized_root or normalized_path.startswith(f"{normalized_root}/")
-
-
 def _load_json(path: Path) -> dict[str, Any]:
     payload = json.loads(path.read_text(encoding="utf-8"))
     if not isinstance(payload, dict):
@@ -123,39 +123,109 @@ def _load_waivers(waiver_file: Path) -> list[Waiver]:
     return waivers
 
 
-def _git_files(project_dir: Path, include_untracked: bool = True) -> list[str]:
-    tracked = subprocess.run(
-        ["git", "ls-files"],
+def _sha256_file(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def _safe_rel_path(project_dir: Path, path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(project_dir.resolve()))
+    except ValueError:
+        return str(path.resolve())
+
+
+def _git(project_dir: Path, *args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        ["git", *args],
         cwd=str(project_dir),
         text=True,
         capture_output=True,
         check=False,
     )
-    if tracked.returncode != 0:
-        raise RuntimeError(f"git ls-files failed: {tracked.stderr.strip()}")
-
-    files = [line.strip() for line in tracked.stdout.splitlines() if line.strip()]
-
-    if include_untracked:
-        untracked = subprocess.run(
-            ["git", "ls-files", "--others", "--exclude-standard"],
-            cwd=str(project_dir),
-            text=True,
-            capture_output=True,
-            check=False,
-        )
-        if untracked.returncode != 0:
-            raise RuntimeError(f"git ls-files --others failed: {untracked.stderr.strip()}")
-        files.extend(line.strip() for line in untracked.stdout.splitlines() if line.strip())
 
-    deduped = sorted(set(files))
-    return [path for path in deduped if not path.startswith(".git/")]
+
+def _resolve_commit(project_dir: Path, ref: str) -> str:
+    proc = _git(project_dir, "rev-parse", "-q", "--verify", f"{ref}^{{commit}}")
+    return proc.stdout.strip() if proc.returncode == 0 else ""
+
+
+def _diff_name_status(project_dir: Path, base_commit: str) -> tuple[list[str], set[str]]:
+    """Return (paths new since `base_commit`, every path touched) for the working tree vs the base."""
+    proc = _git(project_dir, "diff", "--name-status", "-z", "-M", "-C", base_commit, "--")
+    if proc.returncode != 0:
+        raise RuntimeError(f"git diff --name-status {base_commit} failed: {proc.stderr.strip()}")
+
+    tokens = proc.stdout.split("\0")
+    new_paths: list[str] = []
+    touched: set[str] = set()
+    idx = 0
+    while idx < len(tokens) and tokens[idx]:
+        status = tokens[idx]
+        width = 2 if status[0] in ("R", "C") else 1
+        paths = tokens[idx + 1 : idx + 1 + width]
+        idx += 1 + width
+        touched.update(paths)
+        if status[0] in NEW_PATH_STATUSES and paths:
+            new_paths.append(paths[-1])
+    return new_paths, touched
+
+
+def _load_last_green(path: Path) -> dict[str, Any] | None:
+    try:
+        payload = _load_json(path)
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != "v0" or not isinstance(payload.get("git_head"), str):
+        return None
+    return payload
+
+
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _incremental_files(
+    project_dir: Path,
+    since: str,
+    last_green: dict[str, Any] | None,
+    policy_inputs: dict[str, Path],
+) -> tuple[list[str] | None, str, str]:
+    """Return (paths to evaluate or None for a full scan, resolved base commit, full-scan reason)."""
+    if since == LAST_GREEN_REF:
+        if last_green is None:
+            return None, "", "no_last_green_snapshot"
+        base_ref = str(last_green["git_head"])
+        recorded = last_green.get("policy_input_sha256", {})
+        for name, path in policy_inputs.items():
+            if not isinstance(recorded, dict) or recorded.get(name) != _sha256_file(path):
+                return None, "", f"{name}_changed"
+    else:
+        base_ref = since
+
+    base_commit = _resolve_commit(project_dir, base_ref)
+    if not base_commit:
+        return None, "", "base_ref_unresolved"
+
+    new_paths, touched = _diff_name_status(project_dir, base_commit)
+    untracked = untracked_files(project_dir)
+    candidates = touched.union(untracked)
+    for name, path in policy_inputs.items():
+        if _safe_rel_path(project_dir, path) in candidates:
+            return None, base_commit, f"{name}_changed"
+
+    files = sorted({path for path in (*new_paths, *untracked) if not path.startswith(".git/")})
+    return files, base_commit, ""
 
 
 def _format_text(payload: dict[str, Any]) -> str:
     lines = [
         f"status: {payload.get('status')}",
         f"run_at: {payload.get('run_at')}",
+        f"scan_mode: {payload.get('scan_mode')}",
         f"files_scanned: {payload.get('files_scanned', 0)}",
         f"violations: {payload.get('violation_count', 0)}",
     ]
@@ -183,6 +253,21 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Project-state boundary enforcement gate.")
     parser.add_argument("--project-dir", default=".")
     parser.add_argument("--contract-file", default=str(DEFAULT_CONTRACT_FILE))
+    parser.add_argument(
+        "--since",
+        default="",
+        help=f"Only evaluate paths added/renamed since this git ref (or `{LAST_GREEN_REF}`) plus untracked files.",
+    )
+    parser.add_argument(
+        "--record-last-green",
+        action="store_true",
+        help="On pass, record HEAD and policy input digests as the last-green snapshot.",
+    )
+    parser.add_argument(
+        "--last-green-file",
+        default="",
+        help=f"Defaults to <project_state_root>/state/{LAST_GREEN_FILE_NAME}.",
+    )
     parser.add_argument("--format", default="text", choices=("text", "json"))
     args = parser.parse_args()
 
@@ -190,6 +275,11 @@ def main() -> int:
     contract_file = Path(args.contract_file)
     if not contract_file.is_absolute():
         contract_file = project_dir / contract_file
+    last_green_file: Path | None = None
+    policy_inputs: dict[str, Path] = {"contract_file": contract_file}
+    scan_mode = "full"
+    full_scan_reason = ""
+    base_commit = ""
 
     findings: list[dict[str, Any]] = []
     violations: list[dict[str, Any]] = []
@@ -210,6 +300,13 @@ def main() -> int:
         if not waiver_file.is_absolute():
             waiver_file = project_dir / waiver_file
         waivers = _load_waivers(waiver_file)
+        policy_inputs["waiver_file"] = waiver_file
+
+        last_green_file = Path(args.last_green_file) if args.last_green_file else (
+            Path(project_state_root) / "state" / LAST_GREEN_FILE_NAME
+        )
+        if not last_green_file.is_absolute():
+            last_green_file = project_dir / last_green_file
 
         for waiver in waivers:
             waivers_by_path[waiver.path.strip("/")] = waiver
@@ -233,14 +330,26 @@ def main() -> int:
                     }
                 )
 
-        files = _git_files(project_dir)
+        # Waiver expiry above is evaluated on every run; only the path walk is narrowed.
+        files: list[str] | None = None
+        if args.since:
+            last_green = _load_last_green(last_green_file) if args.since == LAST_GREEN_REF else None
+            files, base_commit, full_scan_reason = _incremental_files(
+                project_dir, args.since, last_green, policy_inputs
+            )
+        if files is None:
+            files = git_files(project_dir)
+        else:
+            scan_mode = "incremental"
         files_scanned = len(files)
 
+        state_root_matcher = RootMatcher([project_state_root])
+        forbidden_matcher = RootMatcher(forbidden_roots)
         for path in files:
-            if _is_path_under(path, project_state_root):
+            if path in state_root_matcher:
                 continue
 
-            violating_root = next((root for root in forbidden_roots if _is_path_under(path, root)), None)
+            violating_root = forbidden_matcher.match(path)
             if violating_root is None:
                 continue
 
@@ -283,6 +392,22 @@ def main() -> int:
         )
 
     status = "fail" if findings else "pass"
+    last_green_recorded = False
+    if status == "pass" and args.record_last_green and last_green_file is not None:
+        head = _resolve_commit(project_dir, "HEAD")
+        if head:
+            _write_json(
+                last_green_file,
+                {
+                    "version": "v0",
+                    "recorded_at": _now_iso(),
+                    "git_head": head,
+                    "scan_mode": scan_mode,
+                    "policy_input_sha256": {name: _sha256_file(path) for name, path in policy_inputs.items()},
+                },
+            )
+            last_green_recorded = True
+
     payload: dict[str, Any] = {
         "version": "v0",
         "run_at": _now_iso(),
@@ -291,6 +416,12 @@ def main() -> int:
         "contract_file": str(contract_file),
         "project_state_root": project_state_root,
         "forbidden_outside_project_state_roots": forbidden_roots,
+        "scan_mode": scan_mode,
+        "since": args.since,
+        "base_commit": base_commit,
+        "full_scan_reason": full_scan_reason,
+        "last_green_file": _safe_rel_path(project_dir, last_green_file) if last_green_file is not None else "",
+        "last_green_recorded": last_green_recorded,
         "files_scanned": files_scanned,
         "waiver_count": len(waivers),
         "expired_active_waivers": expired_active_waivers,
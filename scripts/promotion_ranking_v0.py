@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Column-based promotion candidate ranking shared by the phase 4 promotion harness and performance pack.
+
+`CandidateIndex` computes per-candidate features once per candidate list:
+
+- lowercased search text; each distinct query token is matched against it once and its hits are cached
+- rounded evidence coverage, linkage, impact priority and candidate id (the tie-break columns)
+- a score row holding the combined score for every lexical hit count (0..6), shared by candidates with equal
+  evidence, linkage and impact features
+
+The lexical score is `min(1, hits / 6)`, so 7 entries per row cover every query. They are computed with the same
+expression and rounding as the per-query loop they replace, which keeps scores and tie-break order byte-identical.
+A query then costs one substring pass per new token plus a partial top-`candidate_limit` selection.
+
+NumPy is optional. When it is installed, a query batch is scored as one array, and `np.partition` finds the score
+cut-off for `candidate_limit`. Without it, the same cut-off comes from `heapq`. Either way, only candidates at or
+above the cut-off are sorted by the full tie-break key.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised where NumPy is absent
+    np = None
+
+
+SEARCH_FIELDS = ("title", "summary", "state", "governance_impact", "owner", "next_action")
+LEXICAL_SATURATION = 6
+BLOCK_RECOMMENDATION = "block_unlinked_governance_closure"
+ELIGIBLE_RECOMMENDATION = "eligible_for_promotion"
+
+
+def query_tokens(query: str) -> list[str]:
+    tokens: list[str] = []
+    current: list[str] = []
+    for ch in query.lower():
+        if ch.isalnum():
+            current.append(ch)
+            continue
+        if current:
+            token = "".join(current)
+            if len(token) >= 3:
+                tokens.append(token)
+            current = []
+    if current:
+        token = "".join(current)
+        if len(token) >= 3:
+            tokens.append(token)
+    return sorted(set(tokens))
+
+
+def impact_priority(impact: str) -> tuple[int, float]:
+    value = str(impact).strip().lower()
+    if value in {"critical", "high"}:
+        return 1, 1.0
+    if value == "medium":
+        return 2, 0.7
+    if value == "low":
+        return 3, 0.4
+    return 4, 0.2
+
+
+def score_weights(score_mode: str) -> dict[str, float]:
+    if score_mode == "uniform":
+        return {
+            "lexical_score": 0.25,
+            "evidence_coverage": 0.25,
+            "linkage_score": 0.25,
+            "impact_score": 0.25,
+        }
+    return {
+        "lexical_score": 0.2,
+        "evidence_coverage": 0.35,
+        "linkage_score": 0.25,
+        "impact_score": 0.2,
+    }
+
+
+def _lexical_score(hit_count: int, has_tokens: bool) -> float:
+    return min(1.0, float(hit_count) / float(LEXICAL_SATURATION)) if has_tokens else 0.0
+
+
+class CandidateIndex:
+    """Precomputed ranking features for one candidate list and score mode."""
+
+    def __init__(self, candidates: Sequence[dict[str, Any]], score_mode: str, use_numpy: bool | None = None) -> None:
+        self.candidates = list(candidates)
+        self.score_mode = score_mode
+        self.use_numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+        weights = score_weights(score_mode)
+
+        searchables: list[str] = []
+        self.candidate_ids: list[str] = []
+        self.evidence_coverage_rounded: list[float] = []
+        self.linkage_complete: list[bool] = []
+        self.impact_priority: list[int] = []
+        self.impact_score: list[float] = []
+        # score_rows[r][h]: combined score for feature row r and h lexical hits (h == LEXICAL_SATURATION means >= 6).
+        # Rows depend only on (evidence coverage, linkage, impact), so backlogs share a few dozen of them.
+        self.score_rows: list[list[float]] = []
+        self.score_row: list[int] = []
+        row_ids: dict[tuple[float, float, float], int] = {}
+        for candidate in self.candidates:
+            searchables.append(" ".join(str(candidate.get(field, "")) for field in SEARCH_FIELDS).lower())
+            self.candidate_ids.append(str(candidate.get("candidate_id", "")))
+            evidence_coverage = min(1.0, float(len(candidate.get("evidence_refs", []))) / 3.0)
+            linkage_complete = bool(candidate.get("decision_refs")) and bool(candidate.get("reflection_refs"))
+            linkage_score = 1.0 if linkage_complete else 0.0
+            priority, impact_score = impact_priority(str(candidate.get("governance_impact", "")))
+            self.evidence_coverage_rounded.append(round(evidence_coverage, 6))
+            self.linkage_complete.append(linkage_complete)
+            self.impact_priority.append(priority)
+            self.impact_score.append(impact_score)
+
+            features = (evidence_coverage, linkage_score, impact_score)
+            row = row_ids.get(features)
+            if row is None:
+                row = row_ids[features] = len(self.score_rows)
+                self.score_rows.append(
+                    [
+                        round(
+                            (weights["lexical_score"] * _lexical_score(hits, True))
+                            + (weights["evidence_coverage"] * evidence_coverage)
+                            + (weights["linkage_score"] * linkage_score)
+                            + (weights["impact_score"] * impact_score),
+                            6,
+                        )
+                        for hits in range(LEXICAL_SATURATION + 1)
+                    ]
+                )
+            self.score_row.append(row)
+
+        self._searchables = searchables
+        self._token_hits: dict[str, list[int]] = {}
+        self._np_rows = None
+        self._np_scores = None
+        if self.use_numpy:
+            self._np_rows = np.array(self.score_row, dtype=np.int64)
+            # Reshape so an empty candidate list still gives a (0, 7) table that fancy indexing accepts.
+            self._np_scores = np.array(self.score_rows, dtype=np.float64).reshape(-1, LEXICAL_SATURATION + 1)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def token_hits(self, token: str) -> list[int]:
+        """Indices of candidates whose search text contains `token` (cached per index)."""
+        cached = self._token_hits.get(token)
+        if cached is not None:
+            return cached
+        hits = [idx for idx, text in enumerate(self._searchables) if token in text]
+        self._token_hits[token] = hits
+        return hits
+
+    def _hit_counts(self, tokens: list[str]) -> list[int]:
+        counts = [0] * len(self.candidates)
+        for token in tokens:
+            for idx in self.token_hits(token):
+                counts[idx] += 1
+        return counts
+
+    def sort_key(self, idx: int, score: float) -> tuple[float, float, int, str]:
+        return (-score, -self.evidence_coverage_rounded[idx], self.impact_priority[idx], self.candidate_ids[idx])
+
+    def _select(self, scores: Any, candidate_limit: int) -> list[int]:
+        total = len(self.candidates)
+        limit = max(0, min(int(candidate_limit), total))
+        if limit == 0:
+            return []
+        if limit < total:
+            # Every top-`limit` candidate scores at least the limit-th largest score; ties at the cut-off are kept
+            # so the full key decides between them.
+            if self._np_scores is not None:
+                cutoff = float(np.partition(scores, total - limit)[total - limit])
+                pool = np.flatnonzero(scores >= cutoff).tolist()
+            else:
+                cutoff = heapq.nlargest(limit, scores)[-1]
+                pool = [idx for idx, score in enumerate(scores) if score >= cutoff]
+        else:
+            pool = list(range(total))
+        # Equivalent to sorted(pool, key=...)[:limit], including stability.
+        return heapq.nsmallest(limit, pool, key=lambda idx: self.sort_key(idx, float(scores[idx])))
+
+    def _scores(self, tokens: list[str]) -> tuple[Any, list[int]]:
+        counts = self._hit_counts(tokens)
+        if self._np_scores is not None:
+            hits = np.minimum(np.array(counts, dtype=np.int64), LEXICAL_SATURATION)
+            return self._np_scores[self._np_rows, hits], counts
+        rows = self.score_rows
+        return [rows[row][min(count, LEXICAL_SATURATION)] for row, count in zip(self.score_row, counts)], counts
+
+    def rank(self, query: str, candidate_limit: int) -> list[tuple[int, float, int]]:
+        """`(candidate_index, combined_score, lexical_hits)` in rank order, at most `candidate_limit` rows."""
+        tokens = query_tokens(query)
+        scores, counts = self._scores(tokens)
+        return [(idx, float(scores[idx]), counts[idx]) for idx in self._select(scores, candidate_limit)]
+
+    def rank_batch(self, queries: Sequence[str], candidate_limit: int) -> list[list[tuple[int, float, int]]]:
+        """`rank` for several queries; with NumPy the batch is scored as one (queries x candidates) array."""
+        if self._np_scores is None or not queries:
+            return [self.rank(query, candidate_limit) for query in queries]
+        token_lists = [query_tokens(query) for query in queries]
+        counts = np.zeros((len(queries), len(self.candidates)), dtype=np.int64)
+        for row, tokens in enumerate(token_lists):
+            for token in tokens:
+                hits = self.token_hits(token)
+                if hits:
+                    counts[row, hits] += 1
+        scores = self._np_scores[self._np_rows[np.newaxis, :], np.minimum(counts, LEXICAL_SATURATION)]
+        out: list[list[tuple[int, float, int]]] = []
+        for row in range(len(queries)):
+            row_counts = counts[row].tolist()
+            out.append(
+                [
+                    (idx, float(scores[row, idx]), row_counts[idx])
+                    for idx in self._select(scores[row], candidate_limit)
+                ]
+            )
+        return out
+
+    def breakdown(self, idx: int, lexical_hits: int, has_tokens: bool) -> dict[str, float]:
+        return {
+            "lexical_score": round(_lexical_score(lexical_hits, has_tokens), 6),
+            "evidence_coverage": self.evidence_coverage_rounded[idx],
+            "linkage_score": round(1.0 if self.linkage_complete[idx] else 0.0, 6),
+            "impact_score": round(self.impact_score[idx], 6),
+        }
+
+    def enforcement_recommendation(self, idx: int) -> str:
+        governance_impact = str(self.candidates[idx].get("governance_impact", ""))
+        if governance_impact in {"critical", "high"} and not self.linkage_complete[idx]:
+            return BLOCK_RECOMMENDATION
+        return ELIGIBLE_RECOMMENDATION
+
+
+def _synthetic_candidates(count: int) -> list[dict[str, Any]]:
+    impacts = ("critical", "high", "medium", "low")
+    words = ("governance", "closure", "reflection", "decision", "linkage", "promotion", "evidence", "debt")
+    out: list[dict[str, Any]] = []
+    for idx in range(count):
+        out.append(
+            {
+                "candidate_id": f"pc_{idx:06d}",
+                "title": f"{words[idx % len(words)]} {words[(idx * 7) % len(words)]} item {idx}",
+                "summary": f"{words[(idx * 3) % len(words)]} follow-up",
+                "state": "ready" if idx % 3 else "blocked",
+                "governance_impact": impacts[idx % len(impacts)],
+                "decision_refs": ["d"] if idx % 2 else [],
+                "reflection_refs": ["r"] if idx % 5 else [],
+                "evidence_refs": [f"e{n}" for n in range(idx % 4)],
+            }
+        )
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time candidate ranking on a synthetic or fixture backlog.")
+    parser.add_argument("--fixture-file", help="Rank `tactical_candidates[]` from this fixture instead.")
+    parser.add_argument("--candidates", type=int, default=20000, help="Synthetic backlog size.")
+    parser.add_argument("--query", action="append", default=[], help="Query text (repeatable).")
+    parser.add_argument("--score-mode", choices=("evidence_bias", "uniform"), default="evidence_bias")
+    parser.add_argument("--candidate-limit", type=int, default=8)
+    parser.add_argument("--format", default="text", choices=("text", "json"))
+    args = parser.parse_args()
+
+    if args.fixture_file:
+        payload = json.loads(Path(args.fixture_file).read_text(encoding="utf-8"))
+        candidates = [item for item in payload.get("tactical_candidates", []) if isinstance(item, dict)]
+    else:
+        candidates = _synthetic_candidates(max(1, args.candidates))
+    queries = args.query or ["governance closure linkage", "reflection decision evidence"]
+
+    started = time.perf_counter()
+    index = CandidateIndex(candidates, args.score_mode)
+    build_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    ranked = index.rank_batch(queries, args.candidate_limit)
+    rank_seconds = time.perf_counter() - started
+
+    result = {
+        "version": "v0",
+        "status": "pass",
+        "candidate_count": len(index),
+        "query_count": len(queries),
+        "numpy": index.use_numpy,
+        "index_build_seconds": build_seconds,
+        "rank_seconds": rank_seconds,
+        "top_candidate_ids": [[index.candidate_ids[idx] for idx, _, _ in rows] for rows in ranked],
+    }
+    if args.format == "json":
+        sys.stdout.write(json.dumps(result, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(
+            f"candidates: {result['candidate_count']}\nqueries: {result['query_count']}\n"
+            f"numpy: {result['numpy']}\nindex_build_seconds: {build_seconds:.4f}\nrank_seconds: {rank_seconds:.4f}\n"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
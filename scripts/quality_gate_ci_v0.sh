@@ -9,6 +9,10 @@ run_quiet() {
   shift
   local log_file
   log_file="$(mktemp)"
+  if [[ -n "${CORTEX_QG_TIMING_RECORDS:-}" ]]; then
+    set -- python3 scripts/gate_step_timing_v0.py record \
+      --records-file "$CORTEX_QG_TIMING_RECORDS" --label "$label" -- "$@"
+  fi
   if ! "$@" >"$log_file" 2>&1; then
     echo "[quality-gate-ci] FAIL: ${label}"
     cat "$log_file"
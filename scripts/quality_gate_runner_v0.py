@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+"""Run the quality gate bundle in one interpreter with a shared repo snapshot.
+
+Gates that list repository files go through repo_file_index_v0, whose session cache is shared
+by every gate imported into this process. With `--timing-out`, every step also yields a timing record
+(gate_step_timing_v0) and the bundle writes them to one timing artifact.
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import contextlib
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterator
+
+from gate_step_timing_v0 import DEFAULT_TIMING_PATH, time_in_process, write_report
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROFILE_PREFIXES = {
+    "ci": "[quality-gate-ci]",
+    "local": "[quality-gate]",
+}
+FOCUSED_TEST_FILES = (
+    "tests/test_coach_decision_gap_check.py",
+    "tests/test_coach_reflection_enforcement_gate.py",
+    "tests/test_coach_context_load.py",
+    "tests/test_coach_quality_gate_sync_check.py",
+    "tests/test_phase4_enforcement_blocking_harness.py",
+    "tests/test_phase4_governance_debt_harness.py",
+)
+
+
+@dataclass(frozen=True)
+class GateStep:
+    step_id: str
+    title: str
+    label: str
+    kind: str
+    command: tuple[str, ...]
+    profiles: tuple[str, ...] = ("ci", "local")
+    depends_on: tuple[str, ...] = ()
+
+
+# Mirrors the run_quiet bundle in scripts/quality_gate_ci_v0.sh and scripts/quality_gate_v0.sh
+# (drift is checked by quality_gate_sync_check_v0.py). `{name}` placeholders are bound to per-run
+# temporary paths; `depends_on` lists steps whose outputs a step reads.
+GATE_STEPS: tuple[GateStep, ...] = (
+    GateStep(
+        step_id="sync_check",
+        title="quality gate sync check",
+        label="quality_gate_sync_check_v0.py",
+        kind="python",
+        command=(
+            "scripts/quality_gate_sync_check_v0.py",
+            "--ci-script",
+            "scripts/quality_gate_ci_v0.sh",
+            "--local-script",
+            "scripts/quality_gate_v0.sh",
+            "--format",
+            "json",
+        ),
+    ),
+    GateStep(
+        step_id="audit_needed",
+        title="audit-needed",
+        label="audit-needed --fail-on-required",
+        kind="python",
+        command=(
+            "scripts/cortex_project_coach_v0.py",
+            "audit-needed",
+            "--project-dir",
+            ".",
+            "--format",
+            "json",
+            "--fail-on-required",
+        ),
+        profiles=("local",),
+    ),
+    GateStep(
+        step_id="decision_gap_check",
+        title="decision gap check",
+        label="decision-gap-check",
+        kind="python",
+        command=(
+            "scripts/cortex_project_coach_v0.py",
+            "decision-gap-check",
+            "--project-dir",
+            ".",
+            "--format",
+            "json",
+            "--out-file",
+            "{decision_gap_report}",
+        ),
+    ),
+    GateStep(
+        step_id="hydration_compliance",
+        title="context hydration compliance gate",
+        label="context_hydration_gate_v0.py",
+        kind="python",
+        command=(
+            "scripts/context_hydration_gate_v0.py",
+            "compliance",
+            "--project-dir",
+            ".",
+            "--enforcement-mode",
+            "block",
+            "--latest-receipt-path",
+            "{hydration_latest_receipt}",
+            "--history-dir",
+            "{hydration_history_dir}",
+            "--emit-events",
+            "new_session,window_rollover",
+            "--verify-event",
+            "pre_closeout",
+            "--required-events",
+            "new_session,window_rollover",
+            "--format",
+            "json",
+        ),
+    ),
+    GateStep(
+        step_id="phase4_enforcement",
+        title="phase4 enforcement blocking harness",
+        label="phase4_enforcement_blocking_harness_v0.py",
+        kind="python",
+        command=(
+            "scripts/phase4_enforcement_blocking_harness_v0.py",
+            "--project-dir",
+            ".",
+            "--format",
+            "json",
+        ),
+    ),
+    GateStep(
+        step_id="reflection_enforcement",
+        title="reflection enforcement gate",
+        label="reflection_enforcement_gate_v0.py",
+        kind="python",
+        command=(
+            "scripts/reflection_enforcement_gate_v0.py",
+            "--project-dir",
+            ".",
+            "--required-decision-status",
+            "promoted",
+            "--min-scaffold-reports",
+            "1",
+            "--min-required-status-mappings",
+            "1",
+            "--decision-gap-report",
+            "{decision_gap_report}",
+            "--require-phase4-enforcement-report",
+            "--phase4-enforcement-report",
+            ".cortex/reports/project_state/phase4_enforcement_blocking_report_v0.json",
+            "--format",
+            "json",
+        ),
+        depends_on=("decision_gap_check", "phase4_enforcement"),
+    ),
+    GateStep(
+        step_id="mistake_provenance",
+        title="mistake provenance gate",
+        label="mistake_candidate_gate_v0.py",
+        kind="python",
+        command=(
+            "scripts/mistake_candidate_gate_v0.py",
+            "--project-dir",
+            ".",
+            "--format",
+            "json",
+        ),
+    ),
+    GateStep(
+        step_id="project_state_boundary",
+        title="project-state boundary gate",
+        label="project_state_boundary_gate_v0.py",
+        kind="python",
+        command=(
+            "scripts/project_state_boundary_gate_v0.py",
+            "--project-dir",
+            ".",
+            "--format",
+            "json",
+        ),
+    ),
+    GateStep(
+        step_id="temporal_release_surface",
+        title="temporal playbook release-surface gate",
+        label="temporal_playbook_release_gate_v0.py",
+        kind="python",
+        command=(
+            "scripts/temporal_playbook_release_gate_v0.py",
+            "--project-dir",
+            ".",
+            "--format",
+            "json",
+        ),
+    ),
+    GateStep(
+        step_id="docs_json",
+        title="docs and json integrity",
+        label="ci_validate_docs_and_json_v0.sh",
+        kind="shell",
+        command=("./scripts/ci_validate_docs_and_json_v0.sh",),
+    ),
+    GateStep(
+        step_id="focused_tests",
+        title="focused coach tests",
+        label="focused coach tests",
+        kind="pytest",
+        command=("uv", "run", "--locked", "--group", "dev", "pytest", "-q", *FOCUSED_TEST_FILES),
+    ),
+)
+
+
+def _select_steps(profile: str, step_ids: list[str]) -> list[GateStep]:
+    steps = [step for step in GATE_STEPS if profile in step.profiles]
+    if not step_ids:
+        return steps
+    known = {step.step_id for step in steps}
+    unknown = sorted(set(step_ids) - known)
+    if unknown:
+        raise ValueError(f"unknown step id(s) for profile {profile!r}: {', '.join(unknown)}")
+    return [step for step in steps if step.step_id in step_ids]
+
+
+def _validate_step_graph(steps: tuple[GateStep, ...] = GATE_STEPS) -> None:
+    index = {step.step_id: idx for idx, step in enumerate(steps)}
+    if len(index) != len(steps):
+        raise ValueError("duplicate gate step ids")
+    for idx, step in enumerate(steps):
+        for dep in step.depends_on:
+            if dep not in index:
+                raise ValueError(f"step {step.step_id!r} depends on unknown step {dep!r}")
+            # Declared order is a topological order, which keeps jobs=1 identical to the shell gate.
+            if index[dep] >= idx:
+                raise ValueError(f"step {step.step_id!r} must be declared after its dependency {dep!r}")
+
+
+def _bind_command(step: GateStep, bindings: dict[str, str]) -> list[str]:
+    return [part.format(**bindings) for part in step.command]
+
+
+@contextlib.contextmanager
+def _captured_output() -> Iterator[Path]:
+    """Redirect fd 1/2 to a temp file so delegated subprocess output is captured too."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    log_fd, log_name = tempfile.mkstemp(prefix="quality_gate_step_", suffix=".log")
+    saved_stdout = os.dup(1)
+    saved_stderr = os.dup(2)
+    try:
+        os.dup2(log_fd, 1)
+        os.dup2(log_fd, 2)
+        yield Path(log_name)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_stdout, 1)
+        os.dup2(saved_stderr, 2)
+        os.close(saved_stdout)
+        os.close(saved_stderr)
+        os.close(log_fd)
+
+
+class InProcessGateRunner:
+    def __init__(self, scripts_dir: Path = SCRIPTS_DIR, timing: bool = False) -> None:
+        self.scripts_dir = scripts_dir
+        self.timing = timing
+        self.timings: list[dict[str, Any]] = []
+        self._modules: dict[str, ModuleType] = {}
+
+    def _load_module(self, script_path: Path) -> ModuleType:
+        key = str(script_path.resolve())
+        module = self._modules.get(key)
+        if module is not None:
+            return module
+        # Gates import shared helpers (for example repo_file_index_v0) from their own directory.
+        if str(script_path.parent) not in sys.path:
+            sys.path.insert(0, str(script_path.parent))
+        spec = importlib.util.spec_from_file_location(script_path.stem, script_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"unable to load gate script: {script_path}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[script_path.stem] = module
+        spec.loader.exec_module(module)
+        if not callable(getattr(module, "main", None)):
+            raise ImportError(f"gate script has no main(): {script_path}")
+        self._modules[key] = module
+        return module
+
+    def _call_main(self, script_path: Path, argv: list[str]) -> int:
+        module = self._load_module(script_path)
+        saved_argv = sys.argv
+        sys.argv = [str(script_path), *argv]
+        try:
+            result = module.main()
+        except SystemExit as exc:
+            result = exc.code
+        except Exception as exc:  # noqa: BLE001
+            print(f"{script_path.name}: unhandled {type(exc).__name__}: {exc}", file=sys.stderr)
+            result = 1
+        finally:
+            sys.argv = saved_argv
+        if result is None:
+            return 0
+        if isinstance(result, int):
+            return result
+        print(result, file=sys.stderr)
+        return 1
+
+    def _run(self, step: GateStep, command: list[str]) -> int:
+        def call() -> int:
+            if step.kind != "python":
+                return subprocess.run(command, check=False).returncode
+            script_path = Path(command[0])
+            if not script_path.is_absolute():
+                script_path = self.scripts_dir / script_path.name
+            return self._call_main(script_path, command[1:])
+
+        if not self.timing:
+            return call()
+        returncode, record = time_in_process(step.label, call, step.step_id)
+        self.timings.append(record)
+        return returncode
+
+    def run_streamed(self, step: GateStep, command: list[str]) -> int:
+        return self._run(step, command)
+
+    def run_quiet(self, step: GateStep, command: list[str]) -> tuple[int, str]:
+        with _captured_output() as log_path:
+            returncode = self._run(step, command)
+        try:
+            log_text = log_path.read_text(encoding="utf-8", errors="replace")
+        finally:
+            log_path.unlink(missing_ok=True)
+        return returncode, log_text
+
+
+@dataclass(frozen=True)
+class StepResult:
+    step_id: str
+    status: str
+    returncode: int
+    log: str
+    detail: str = ""
+    timing: dict[str, Any] | None = None
+
+
+def _focused_tests_skipped(step: GateStep) -> bool:
+    return step.kind == "pytest" and os.environ.get("CORTEX_QG_SKIP_FOCUSED_TESTS", "0") == "1"
+
+
+def _make_bindings(tmp_dir: Path) -> dict[str, str]:
+    bindings = {
+        "decision_gap_report": str(tmp_dir / "decision_gap_report.json"),
+        "hydration_latest_receipt": str(tmp_dir / "hydration_latest_receipt.json"),
+        "hydration_history_dir": str(tmp_dir / "hydration_history"),
+    }
+    Path(bindings["hydration_latest_receipt"]).touch()
+    Path(bindings["hydration_history_dir"]).mkdir()
+    return bindings
+
+
+_WORKER_RUNNER: InProcessGateRunner | None = None
+
+
+def _run_step_in_worker(step_id: str, bindings: dict[str, str], timing: bool = False) -> StepResult:
+    global _WORKER_RUNNER
+    if _WORKER_RUNNER is None:
+        _WORKER_RUNNER = InProcessGateRunner(timing=timing)
+    step = next(item for item in GATE_STEPS if item.step_id == step_id)
+    if _focused_tests_skipped(step):
+        return StepResult(step_id=step_id, status="skipped", returncode=0, log="")
+    returncode, log_text = _WORKER_RUNNER.run_quiet(step, _bind_command(step, bindings))
+    return StepResult(
+        step_id=step_id,
+        status="pass" if returncode == 0 else "fail",
+        returncode=returncode,
+        log=log_text,
+        timing=_WORKER_RUNNER.timings.pop() if timing else None,
+    )
+
+
+def _run_sequential(
+    prefix: str,
+    steps: list[GateStep],
+    position: dict[str, int],
+    total: int,
+    bindings: dict[str, str],
+    runner: InProcessGateRunner,
+) -> int:
+    for step in steps:
+        print(f"{prefix} {position[step.step_id]}/{total} {step.title}", flush=True)
+        command = _bind_command(step, bindings)
+
+        if _focused_tests_skipped(step):
+            print(f"{prefix} focused coach tests skipped (CORTEX_QG_SKIP_FOCUSED_TESTS=1)", flush=True)
+            continue
+        if step.kind in {"shell", "pytest"}:
+            # Streamed like the shell gate; these steps are not wrapped in run_quiet.
+            if runner.run_streamed(step, command) != 0:
+                return 1
+            continue
+
+        returncode, log_text = runner.run_quiet(step, command)
+        if returncode != 0:
+            print(f"{prefix} FAIL: {step.label}")
+            sys.stdout.write(log_text)
+            sys.stdout.flush()
+            return 1
+    return 0
+
+
+def _schedule_parallel(
+    steps: list[GateStep],
+    bindings: dict[str, str],
+    jobs: int,
+    timing: bool = False,
+) -> dict[str, StepResult]:
+    """Run steps on a process pool as soon as their selected dependencies pass."""
+    selected = {step.step_id for step in steps}
+    pending = {step.step_id: step for step in steps}
+    results: dict[str, StepResult] = {}
+    running: dict[concurrent.futures.Future[StepResult], str] = {}
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for step_id, step in list(pending.items()):
+                deps = [dep for dep in step.depends_on if dep in selected]
+                failed = [dep for dep in deps if dep in results and results[dep].status in {"fail", "blocked"}]
+                if failed:
+                    results[step_id] = StepResult(
+                        step_id=step_id,
+                        status="blocked",
+                        returncode=1,
+                        log="",
+                        detail=", ".join(failed),
+                    )
+                    del pending[step_id]
+                    continue
+                if all(dep in results for dep in deps):
+                    running[pool.submit(_run_step_in_worker, step_id, bindings, timing)] = step_id
+                    del pending[step_id]
+            if not running:
+                continue
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                step_id = running.pop(future)
+                try:
+                    results[step_id] = future.result()
+                except Exception as exc:  # noqa: BLE001
+                    results[step_id] = StepResult(
+                        step_id=step_id,
+                        status="fail",
+                        returncode=1,
+                        log=f"{type(exc).__name__}: {exc}\n",
+                    )
+    return results
+
+
+def _emit_parallel_results(
+    prefix: str,
+    steps: list[GateStep],
+    position: dict[str, int],
+    total: int,
+    results: dict[str, StepResult],
+) -> int:
+    # Results are replayed in declared order so output is independent of completion order.
+    failed = False
+    for step in steps:
+        result = results[step.step_id]
+        print(f"{prefix} {position[step.step_id]}/{total} {step.title}")
+        if result.status == "skipped":
+            print(f"{prefix} focused coach tests skipped (CORTEX_QG_SKIP_FOCUSED_TESTS=1)")
+            continue
+        if result.status == "blocked":
+            failed = True
+            print(f"{prefix} SKIP: {step.label} (dependency failed: {result.detail})")
+            continue
+        if step.kind in {"shell", "pytest"}:
+            sys.stdout.write(result.log)
+        if result.status == "fail":
+            failed = True
+            print(f"{prefix} FAIL: {step.label}")
+            if step.kind == "python":
+                sys.stdout.write(result.log)
+    sys.stdout.flush()
+    return 1 if failed else 0
+
+
+def run_gate(
+    profile: str,
+    step_ids: list[str] | None = None,
+    jobs: int = 1,
+    timing_out: Path | None = None,
+    chrome_trace: Path | None = None,
+) -> int:
+    prefix = PROFILE_PREFIXES[profile]
+    os.environ.setdefault("UV_CACHE_DIR", str(Path.cwd() / ".uv-cache"))
+    Path(os.environ["UV_CACHE_DIR"]).mkdir(parents=True, exist_ok=True)
+
+    _validate_step_graph()
+    steps = _select_steps(profile, step_ids or [])
+    all_steps = _select_steps(profile, [])
+    total = len(all_steps)
+    position = {step.step_id: idx for idx, step in enumerate(all_steps, start=1)}
+
+    timing = timing_out is not None
+    with tempfile.TemporaryDirectory(prefix="quality_gate_runner_") as tmp:
+        bindings = _make_bindings(Path(tmp))
+        if jobs <= 1:
+            runner = InProcessGateRunner(timing=timing)
+            returncode = _run_sequential(prefix, steps, position, total, bindings, runner)
+            timings = runner.timings
+        else:
+            results = _schedule_parallel(steps, bindings, jobs, timing)
+            returncode = _emit_parallel_results(prefix, steps, position, total, results)
+            timings = [results[step.step_id].timing for step in steps if results[step.step_id].timing]
+
+    if timing_out is not None:
+        write_report(timings, timing_out, f"quality_gate_runner_v0.py --profile {profile}", chrome_trace)
+
+    if returncode != 0:
+        return returncode
+    print(f"{prefix} PASS")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profile", default="ci", choices=tuple(PROFILE_PREFIXES))
+    parser.add_argument(
+        "--step",
+        action="append",
+        default=[],
+        help="Run only the given step id (repeatable). Step numbering still follows the full profile.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run independent steps concurrently on N worker processes (1 keeps shell-gate fail-fast order).",
+    )
+    parser.add_argument(
+        "--timing-out",
+        nargs="?",
+        const=DEFAULT_TIMING_PATH,
+        help=f"Record per-step timing and resource use to this artifact (default path: {DEFAULT_TIMING_PATH}).",
+    )
+    parser.add_argument("--chrome-trace", help="With --timing-out, also write a Chrome trace-event JSON file.")
+    parser.add_argument("--list-steps", action="store_true")
+    args = parser.parse_args()
+
+    if args.list_steps:
+        for idx, step in enumerate(_select_steps(args.profile, []), start=1):
+            deps = ",".join(step.depends_on) or "-"
+            print(f"{idx}\t{step.step_id}\t{step.label}\t{deps}")
+        return 0
+
+    try:
+        return run_gate(
+            args.profile,
+            args.step,
+            max(1, args.jobs),
+            Path(args.timing_out) if args.timing_out else None,
+            Path(args.chrome_trace) if args.timing_out and args.chrome_trace else None,
+        )
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import argparse
+import importlib.util
 import json
 import re
 import sys
@@ -37,6 +38,9 @@ SHARED_TRAILING_COMMANDS = [
 ]
 
 
+RUNNER_PLACEHOLDER_PATTERN = re.compile(r"^\{(?P<name>[a-z_]+)\}$")
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
@@ -91,6 +95,96 @@ def _finding(check: str, message: str, **extra: Any) -> dict[str, Any]:
     return item
 
 
+def _load_runner_steps(runner_script: Path) -> tuple[list[Any], str | None]:
+    spec = importlib.util.spec_from_file_location("quality_gate_runner_sync_target", runner_script)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"unable to load gate runner: {runner_script}")
+    module = importlib.util.module_from_spec(spec)
+    # Dataclass definitions resolve their module through sys.modules while executing.
+    sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.modules.pop(spec.name, None)
+    graph_error: str | None = None
+    try:
+        module._validate_step_graph()
+    except ValueError as exc:
+        graph_error = str(exc)
+    return list(module.GATE_STEPS), graph_error
+
+
+def _runner_shell_command(step: Any) -> str:
+    parts: list[str] = []
+    for part in step.command:
+        match = RUNNER_PLACEHOLDER_PATTERN.match(part)
+        parts.append(f'"${match.group("name")}"' if match else part)
+    prefix = "python3 " if step.kind == "python" else ""
+    return _normalize_command(prefix + " ".join(parts))
+
+
+def _runner_findings(
+    runner_steps: list[Any],
+    profile: str,
+    entries: list[dict[str, str]],
+    script_text: str,
+) -> list[dict[str, Any]]:
+    findings: list[dict[str, Any]] = []
+    profile_steps = [step for step in runner_steps if profile in step.profiles]
+    quiet_steps = [step for step in profile_steps if step.kind == "python"]
+    if len(quiet_steps) != len(entries):
+        findings.append(
+            _finding(
+                "runner_entry_count_mismatch",
+                "Gate runner step count differs from run_quiet entries in the quality gate script.",
+                profile=profile,
+                runner_step_count=len(quiet_steps),
+                script_entry_count=len(entries),
+            )
+        )
+    for idx, (step, entry) in enumerate(zip(quiet_steps, entries), start=1):
+        runner_command = _runner_shell_command(step)
+        if step.label != entry["label"]:
+            findings.append(
+                _finding(
+                    "runner_label_mismatch",
+                    "Gate runner step label differs from the quality gate script.",
+                    profile=profile,
+                    index=idx,
+                    step_id=step.step_id,
+                    runner_label=step.label,
+                    script_label=entry["label"],
+                )
+            )
+        if runner_command != entry["command"]:
+            findings.append(
+                _finding(
+                    "runner_command_mismatch",
+                    "Gate runner step command differs from the quality gate script.",
+                    profile=profile,
+                    index=idx,
+                    step_id=step.step_id,
+                    runner_command=runner_command,
+                    script_command=entry["command"],
+                )
+            )
+    for step in profile_steps:
+        if step.kind == "python":
+            continue
+        runner_command = _runner_shell_command(step)
+        if not _contains_command(script_text, runner_command):
+            findings.append(
+                _finding(
+                    "runner_trailing_command_mismatch",
+                    "Gate runner trailing step command is missing from the quality gate script.",
+                    profile=profile,
+                    step_id=step.step_id,
+                    runner_command=runner_command,
+                )
+            )
+    return findings
+
+
 def _format_text(payload: dict[str, Any]) -> str:
     lines = [
         f"status: {payload.get('status')}",
@@ -112,6 +206,7 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Verify local and CI quality gates are synchronized.")
     parser.add_argument("--ci-script", default="scripts/quality_gate_ci_v0.sh")
     parser.add_argument("--local-script", default="scripts/quality_gate_v0.sh")
+    parser.add_argument("--runner-script", default="scripts/quality_gate_runner_v0.py")
     parser.add_argument("--format", default="text", choices=("text", "json"))
     args = parser.parse_args()
 
@@ -121,6 +216,8 @@ def main() -> int:
 
     ci_script = Path(args.ci_script)
     local_script = Path(args.local_script)
+    runner_script = Path(args.runner_script)
+    runner_step_count = 0
 
     try:
         ci_text = ci_script.read_text(encoding="utf-8")
@@ -262,6 +359,20 @@ def main() -> int:
                     )
                 )
 
+        runner_steps, graph_error = _load_runner_steps(runner_script)
+        runner_step_count = len(runner_steps)
+        if graph_error:
+            findings.append(
+                _finding(
+                    "runner_step_graph_invalid",
+                    "Gate runner step dependency graph is invalid.",
+                    runner_script=str(runner_script),
+                    error=graph_error,
+                )
+            )
+        findings.extend(_runner_findings(runner_steps, "ci", ci_entries, ci_text))
+        findings.extend(_runner_findings(runner_steps, "local", local_entries, local_text))
+
     except Exception as exc:  # noqa: BLE001
         findings.append(
             _finding(
@@ -277,6 +388,8 @@ def main() -> int:
         "status": status,
         "ci_script": str(ci_script),
         "local_script": str(local_script),
+        "runner_script": str(runner_script),
+        "runner_step_count": runner_step_count,
         "ci_entry_count": len(ci_entries),
         "local_entry_count": len(local_entries),
         "findings": findings,
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Shared git file index for gate scripts, cached per repository state.
+
+Gates call `git_files(project_dir)` instead of running `git ls-files` themselves.
+The tracked and untracked listings are built once and reused until the cache key changes:
+
+- tracked files: HEAD commit plus `.git/index` mtime/size
+- untracked files: mtimes of every directory the untracked walk visits, plus ignore-rule files
+
+The index is held in memory for the current process and persisted under the git dir
+(`<git-dir>/cortex/repo_file_index_v0.json`), so separate gate processes in one session share it.
+Set `CORTEX_REPO_INDEX_CACHE=0` to disable the on-disk copy.
+
+The visited directories are recorded at scan time: every directory in the worktree except `.git` and
+directories git reports as wholly ignored. That includes directories holding only ignored files and empty ones,
+so a file created anywhere git would look changes the key. A key whose newest input was modified within
+`RACY_WINDOW_NS` of the scan is not trusted, because a same-tick directory change would otherwise go unnoticed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from file_digest_cache_v0 import RACY_WINDOW_NS
+
+
+CACHE_VERSION = "v0"
+CACHE_REL_PATH = Path("cortex") / "repo_file_index_v0.json"
+CACHE_ENV_VAR = "CORTEX_REPO_INDEX_CACHE"
+
+
+@dataclass
+class RepoFileIndex:
+    project_dir: Path
+    git_dir: Path
+    tracked_key: str = ""
+    tracked: list[str] = field(default_factory=list)
+    untracked_key: str = ""
+    untracked: list[str] = field(default_factory=list)
+    # Directories the untracked walk visits and the ignore-rule files found in them, relative to project_dir.
+    untracked_inputs: list[str] = field(default_factory=list)
+    scans: int = 0
+
+
+_SESSION: dict[str, RepoFileIndex] = {}
+
+
+def _git(project_dir: Path, *args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        ["git", *args],
+        cwd=str(project_dir),
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+
+
+def _ls_files(project_dir: Path, *extra: str) -> list[str]:
+    proc = _git(project_dir, "ls-files", *extra)
+    if proc.returncode != 0:
+        label = " ".join(["git ls-files", *extra])
+        raise RuntimeError(f"{label} failed: {proc.stderr.strip()}")
+    return [line.strip() for line in proc.stdout.splitlines() if line.strip()]
+
+
+def _stat_token(path: Path) -> str:
+    try:
+        stat = path.stat()
+    except OSError:
+        return "-"
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _digest(parts: list[str]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _tracked_key(index: RepoFileIndex) -> str:
+    head = _git(index.project_dir, "rev-parse", "-q", "--verify", "HEAD")
+    head_sha = head.stdout.strip() if head.returncode == 0 else ""
+    return _digest([head_sha, _stat_token(index.git_dir / "index")])
+
+
+def _untracked_inputs(index: RepoFileIndex) -> list[str]:
+    """Directories git's untracked walk visits, plus the `.gitignore` files inside them."""
+    ignored = sorted(_ls_files(index.project_dir, "--others", "--ignored", "--exclude-standard", "--directory"))
+    # Git also lists directories it traverses for ignored files; only those listed without contents are skipped.
+    pruned = {
+        entry.rstrip("/")
+        for pos, entry in enumerate(ignored)
+        if entry.endswith("/") and not (pos + 1 < len(ignored) and ignored[pos + 1].startswith(entry))
+    }
+    inputs: list[str] = []
+    for root, dirnames, filenames in os.walk(index.project_dir):
+        rel_root = os.path.relpath(root, index.project_dir)
+        rel_root = "" if rel_root == "." else rel_root
+        inputs.append(rel_root)
+        dirnames[:] = sorted(
+            name for name in dirnames if name != ".git" and os.path.join(rel_root, name) not in pruned
+        )
+        if ".gitignore" in filenames:
+            inputs.append(os.path.join(rel_root, ".gitignore"))
+    return inputs
+
+
+def _untracked_key(index: RepoFileIndex) -> tuple[str, int]:
+    """Digest of the recorded walk inputs and the newest mtime among them."""
+    paths = [("exclude", index.git_dir / "info" / "exclude")]
+    paths.extend((f"w:{rel}", index.project_dir / rel) for rel in index.untracked_inputs)
+    parts: list[str] = []
+    newest_ns = 0
+    for label, path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            parts.append(f"{label}=-")
+            continue
+        parts.append(f"{label}={stat.st_mtime_ns}:{stat.st_size}")
+        newest_ns = max(newest_ns, stat.st_mtime_ns)
+    return _digest(parts), newest_ns
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get(CACHE_ENV_VAR, "1") != "0"
+
+
+def _load_persisted(index: RepoFileIndex) -> None:
+    if not _cache_enabled():
+        return
+    try:
+        payload = json.loads((index.git_dir / CACHE_REL_PATH).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+        return
+    tracked = payload.get("tracked")
+    untracked = payload.get("untracked")
+    if not isinstance(tracked, list) or not isinstance(untracked, list):
+        return
+    index.tracked_key = str(payload.get("tracked_key", ""))
+    index.tracked = [str(item) for item in tracked]
+    inputs = payload.get("untracked_inputs")
+    if not isinstance(inputs, list):
+        return
+    index.untracked_key = str(payload.get("untracked_key", ""))
+    index.untracked = [str(item) for item in untracked]
+    index.untracked_inputs = [str(item) for item in inputs]
+
+
+def _persist(index: RepoFileIndex) -> None:
+    if not _cache_enabled():
+        return
+    payload: dict[str, Any] = {
+        "version": CACHE_VERSION,
+        "tracked_key": index.tracked_key,
+        "tracked": index.tracked,
+        "untracked_key": index.untracked_key,
+        "untracked": index.untracked,
+        "untracked_inputs": index.untracked_inputs,
+    }
+    cache_path = index.git_dir / CACHE_REL_PATH
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_index(project_dir: Path) -> RepoFileIndex:
+    """Return the session index for `project_dir`, creating it (and loading any persisted copy) once."""
+    resolved = Path(project_dir).resolve()
+    key = str(resolved)
+    index = _SESSION.get(key)
+    if index is not None:
+        return index
+    proc = _git(resolved, "rev-parse", "--absolute-git-dir")
+    if proc.returncode != 0:
+        raise RuntimeError(f"git rev-parse --absolute-git-dir failed: {proc.stderr.strip()}")
+    index = RepoFileIndex(project_dir=resolved, git_dir=Path(proc.stdout.strip()))
+    _load_persisted(index)
+    _SESSION[key] = index
+    return index
+
+
+def refresh(index: RepoFileIndex, include_untracked: bool = True) -> RepoFileIndex:
+    changed = False
+    tracked_key = _tracked_key(index)
+    if tracked_key != index.tracked_key:
+        index.tracked = _ls_files(index.project_dir)
+        index.tracked_key = tracked_key
+        index.scans += 1
+        changed = True
+
+    if include_untracked:
+        stale = changed or not index.untracked_key
+        if not stale:
+            stale = _untracked_key(index)[0] != index.untracked_key
+        if stale:
+            scanned_at_ns = time.time_ns()
+            index.untracked_inputs = _untracked_inputs(index)
+            index.untracked = _ls_files(index.project_dir, "--others", "--exclude-standard")
+            untracked_key, newest_ns = _untracked_key(index)
+            # An input changed in the same tick as the scan may change again without moving its mtime.
+            index.untracked_key = untracked_key if scanned_at_ns - newest_ns >= RACY_WINDOW_NS else ""
+            index.scans += 1
+            changed = True
+
+    if changed:
+        _persist(index)
+    return index
+
+
+def git_files(project_dir: Path, include_untracked: bool = True) -> list[str]:
+    """Sorted, de-duplicated tracked (and optionally untracked) paths, excluding `.git/`."""
+    index = refresh(load_index(project_dir), include_untracked=include_untracked)
+    files = list(index.tracked)
+    if include_untracked:
+        files.extend(index.untracked)
+    deduped = sorted(set(files))
+    return [path for path in deduped if not path.startswith(".git/")]
+
+
+def untracked_files(project_dir: Path) -> list[str]:
+    """Sorted untracked, non-ignored paths from the shared index."""
+    index = refresh(load_index(project_dir), include_untracked=True)
+    return sorted(path for path in set(index.untracked) if not path.startswith(".git/"))
+
+
+def clear_session_cache() -> None:
+    _SESSION.clear()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Print or warm the shared gate file index.")
+    parser.add_argument("--project-dir", default=".")
+    parser.add_argument("--tracked-only", action="store_true")
+    parser.add_argument("--format", default="text", choices=("text", "json"))
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir).resolve()
+    files = git_files(project_dir, include_untracked=not args.tracked_only)
+    index = load_index(project_dir)
+    if args.format == "json":
+        payload = {
+            "version": CACHE_VERSION,
+            "project_dir": str(project_dir),
+            "file_count": len(files),
+            "tracked_count": len(index.tracked),
+            "untracked_count": 0 if args.tracked_only else len(index.untracked),
+            "scans": index.scans,
+            "cache_path": str(index.git_dir / CACHE_REL_PATH) if _cache_enabled() else "",
+        }
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write("\n".join(files))
+        sys.stdout.write("\n" if files else "")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Retrieval quality vs. latency benchmark for the context loader over synthetic corpora.
+
+Runs the frozen phase 2 query set against `agent_context_loader_v0.py` on generated corpora of increasing size and
+reports, per scale and retrieval mode, nDCG@k and top-k recall (the phase 2 harness scoring contract) next to
+p50/p95 latency, peak RSS and bytes read, in one artifact.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import phase2_retrieval_eval_harness_v0 as retrieval_eval
+
+
+CORPUS_VERSION = "v0"
+METRICS_MARKER = "__retrieval_benchmark_metrics__ "
+MODES = {
+    "pattern": [],
+    "bm25": ["--ranking", "bm25"],
+    "bm25_packed": ["--ranking", "bm25", "--max-total-chars", "16000"],
+}
+# Loader-visible directories and the share of the corpus each receives.
+CORPUS_LAYOUT = (
+    ("specs/{name}_spec_v0.md", 0.30),
+    (".cortex/artifacts/{name}_note_v0.md", 0.25),
+    ("policies/{name}_policy_v0.md", 0.20),
+    (".cortex/artifacts/governance_{name}_v0.md", 0.15),
+    (".cortex/artifacts/decisions/decision_{name}_v1.md", 0.10),
+)
+FILLER_WORDS = (
+    "backlog baseline budget cadence capacity catalog channel checkpoint cluster cohort component constraint "
+    "dashboard dataset default dependency deployment digest drift endpoint estimate export feature forecast "
+    "framework incident inventory iteration journal latency ledger lifecycle manifest metric milestone module "
+    "monitor namespace onboarding operator outline owner pipeline platform prototype queue quota registry release "
+    "renewal roadmap runbook sample schedule segment service snapshot sprint storage summary support template "
+    "throughput timeline tooling topology tracker upgrade vendor version workflow workload"
+).split()
+
+# Runs the loader in a child interpreter and reports its own runtime, peak RSS and bytes read on stderr.
+_CHILD_RUNNER = """
+import json, os, resource, runpy, sys, time
+
+def _rchar():
+    try:
+        with open("/proc/self/io", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+script = sys.argv[1]
+sys.argv = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(script))
+start_rchar = _rchar()
+started = time.perf_counter()
+code = 0
+try:
+    runpy.run_path(script, run_name="__main__")
+except SystemExit as exc:
+    code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+elapsed = time.perf_counter() - started
+end_rchar = _rchar()
+sys.stdout.flush()
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+bytes_read = None if start_rchar is None or end_rchar is None else end_rchar - start_rchar
+metrics = {"elapsed_seconds": elapsed, "peak_rss_bytes": rss, "bytes_read": bytes_read}
+sys.stderr.write(MARKER + json.dumps(metrics) + "\\n")
+sys.exit(code)
+"""
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _safe_rel_path(project_dir: Path, path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(project_dir.resolve()))
+    except ValueError:
+        return str(path.resolve())
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil((pct / 100.0) * len(ordered)))
+    idx = min(len(ordered) - 1, rank - 1)
+    return float(ordered[idx])
+
+
+def _median(values: list[float]) -> float:
+    if not values:
+        return 0.0
+    return round(float(statistics.median(values)), 6)
+
+
+def _query_vocabulary(query: dict[str, Any]) -> tuple[list[str], list[str], list[str]]:
+    words = retrieval_eval.tokenize(f"{query.get('task', '')} {query.get('query_text', '')}")
+    signals = [str(item) for item in query.get("must_include_signals_any", [])]
+    tags = [str(item) for item in query.get("must_include_tags_any", [])]
+    return words, signals, tags
+
+
+def _document(rng: random.Random, title: str, queries: list[dict[str, Any]], exclude_words: list[str]) -> str:
+    """Filler paragraphs; about a third of documents are about one fixture query, a few carry excluded tags."""
+    topic = rng.choice(queries) if queries and rng.random() < 0.3 else None
+    lines = [f"# {title}", ""]
+    for _ in range(rng.randint(3, 8)):
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(8, 16))]
+        if topic is not None:
+            query_words, signals, tags = _query_vocabulary(topic)
+            words.extend(rng.sample(query_words, min(len(query_words), rng.randint(1, 4))))
+            if signals and rng.random() < 0.5:
+                words.append(rng.choice(signals))
+            if tags and rng.random() < 0.5:
+                words.append(rng.choice(tags))
+        if exclude_words and rng.random() < 0.02:
+            words.append(rng.choice(exclude_words))
+        rng.shuffle(words)
+        lines.append(" ".join(words) + ".")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def synthesize_corpus(corpus_dir: Path, artifact_count: int, queries: list[dict[str, Any]], seed: int) -> bool:
+    """Write a deterministic corpus of `artifact_count` loader-visible files; False if a complete one exists."""
+    stamp = corpus_dir / ".benchmark_corpus_v0.json"
+    expected = {"corpus_version": CORPUS_VERSION, "artifact_count": artifact_count, "seed": seed}
+    if stamp.exists():
+        try:
+            if json.loads(stamp.read_text(encoding="utf-8")) == expected:
+                return False
+        except (OSError, ValueError):
+            pass
+
+    rng = random.Random(f"{seed}:{artifact_count}")
+    exclude_words = sorted({str(word) for query in queries for word in query.get("must_exclude_tags_all", [])})
+    (corpus_dir / ".cortex" / "reports").mkdir(parents=True, exist_ok=True)
+    _write_json(corpus_dir / ".cortex" / "manifest_v0.json", {"project": "retrieval-benchmark", "version": "v0"})
+    _write_json(corpus_dir / ".cortex" / "reports" / "lifecycle_audit_v0.json", {"status": "pass", "version": "v0"})
+
+    remaining = artifact_count
+    for layout_idx, (template, share) in enumerate(CORPUS_LAYOUT):
+        count = remaining if layout_idx == len(CORPUS_LAYOUT) - 1 else int(artifact_count * share)
+        remaining -= count
+        for idx in range(count):
+            name = f"{rng.choice(FILLER_WORDS)}_{layout_idx}_{idx:06d}"
+            path = corpus_dir / template.format(name=name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(_document(rng, name.replace("_", " "), queries, exclude_words), encoding="utf-8")
+    stamp.write_text(json.dumps(expected, sort_keys=True) + "\n", encoding="utf-8")
+    return True
+
+
+def _run_loader(
+    args: argparse.Namespace,
+    loader_script: Path,
+    corpus_dir: Path,
+    query_text: str,
+    mode_args: list[str],
+) -> tuple[dict[str, Any] | None, dict[str, Any]]:
+    argv = [
+        args.python_bin,
+        "-c",
+        _CHILD_RUNNER.replace("MARKER", repr(METRICS_MARKER)),
+        str(loader_script),
+        "--project-dir",
+        str(corpus_dir),
+        "--task",
+        query_text,
+        "--max-files",
+        str(args.max_files),
+        "--max-chars-per-file",
+        str(args.max_chars_per_file),
+        "--no-cache",
+        *mode_args,
+    ]
+    proc = subprocess.run(argv, capture_output=True, text=True, timeout=args.timeout_seconds, check=False)
+    metrics: dict[str, Any] = {}
+    for line in reversed(proc.stderr.splitlines()):
+        if line.startswith(METRICS_MARKER):
+            metrics = json.loads(line[len(METRICS_MARKER) :])
+            break
+    if proc.returncode != 0 or not metrics:
+        return None, {"returncode": proc.returncode, "stderr": proc.stderr[-2000:]}
+    return json.loads(proc.stdout), metrics
+
+
+def _eval_files(bundle: dict[str, Any]) -> list[dict[str, Any]]:
+    files = list(bundle.get("files", []))
+    task_files = [entry for entry in files if str(entry.get("selected_by", "")).startswith("task:")]
+    return task_files if task_files else files
+
+
+def _benchmark_mode(
+    args: argparse.Namespace,
+    loader_script: Path,
+    corpus_dir: Path,
+    queries: list[tuple[str, dict[str, Any]]],
+    mode: str,
+) -> dict[str, Any]:
+    mode_args = MODES[mode]
+    failures: list[dict[str, Any]] = []
+    # The first call builds the persisted artifact/BM25 indexes for this corpus; report it separately.
+    _, cold = _run_loader(args, loader_script, corpus_dir, str(queries[0][1]["query_text"]), mode_args)
+    if "elapsed_seconds" not in cold:
+        failures.append({"query_id": str(queries[0][1]["query_id"]), **cold})
+
+    latencies: list[float] = []
+    rss: list[int] = []
+    bytes_read: list[int] = []
+    ndcg: list[float] = []
+    recall: list[float] = []
+    for _, query in queries:
+        query_id = str(query["query_id"])
+        for run_idx in range(max(1, args.runs_per_query)):
+            bundle, metrics = _run_loader(args, loader_script, corpus_dir, str(query["query_text"]), mode_args)
+            if bundle is None:
+                failures.append({"query_id": query_id, **metrics})
+                break
+            latencies.append(float(metrics["elapsed_seconds"]))
+            rss.append(int(metrics["peak_rss_bytes"]))
+            if metrics.get("bytes_read") is not None:
+                bytes_read.append(int(metrics["bytes_read"]))
+            if run_idx == 0:
+                files = _eval_files(bundle)
+                gains = [retrieval_eval.relevance_gain(query, entry) for entry in files]
+                ndcg.append(retrieval_eval.ndcg_at_k(gains, args.top_k))
+                recall.append(retrieval_eval.top_k_recall(query, files[: args.top_k]))
+
+    return {
+        "mode": mode,
+        "loader_args": mode_args,
+        "query_count": len(ndcg),
+        "sample_count": len(latencies),
+        "median_ndcg_at_k": _median(ndcg),
+        "median_top_k_recall": _median(recall),
+        "latency_p50_seconds": _percentile(latencies, 50.0),
+        "latency_p95_seconds": _percentile(latencies, 95.0),
+        "cold_latency_seconds": cold.get("elapsed_seconds"),
+        "peak_rss_bytes": max(rss) if rss else None,
+        "bytes_read_p50": int(_percentile([float(v) for v in bytes_read], 50.0)) if bytes_read else None,
+        "bytes_read_max": max(bytes_read) if bytes_read else None,
+        "failures": failures,
+    }
+
+
+def _render_text(payload: dict[str, Any]) -> str:
+    lines = [
+        f"status: {payload.get('status')}",
+        f"queries: {payload.get('query_count')} top_k: {payload.get('top_k')}",
+    ]
+    for row in payload.get("results", []):
+        bytes_read = row["bytes_read_p50"]
+        lines.append(
+            f"- artifacts={row['artifact_count']} mode={row['mode']} ndcg@k={row['median_ndcg_at_k']:.3f} "
+            f"recall={row['median_top_k_recall']:.3f} p50_s={row['latency_p50_seconds']:.3f} "
+            f"p95_s={row['latency_p95_seconds']:.3f} rss_mib={(row['peak_rss_bytes'] or 0) / 2**20:.1f} "
+            f"read_kib={'n/a' if bytes_read is None else f'{bytes_read / 1024:.0f}'}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--project-dir", default=".")
+    parser.add_argument(
+        "--fixture-file",
+        default=".cortex/reports/project_state/phase2_retrieval_eval_fixture_freeze_v0.json",
+    )
+    parser.add_argument("--loader-script", default="scripts/agent_context_loader_v0.py")
+    parser.add_argument("--python-bin", default=sys.executable)
+    parser.add_argument("--scales", default="1000,10000,100000", help="Comma-separated synthetic artifact counts.")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of {', '.join(MODES)}.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--runs-per-query", type=int, default=3)
+    parser.add_argument("--max-files", type=int, default=16)
+    parser.add_argument("--max-chars-per-file", type=int, default=2000)
+    parser.add_argument("--timeout-seconds", type=int, default=600)
+    parser.add_argument(
+        "--work-dir",
+        default=".cortex/state/cache/retrieval_benchmark",
+        help="Where synthetic corpora are generated; an existing corpus with the same scale and seed is reused.",
+    )
+    parser.add_argument(
+        "--out-file",
+        default=".cortex/reports/project_state/retrieval_benchmark_report_v0.json",
+    )
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir).resolve()
+
+    def _resolve(raw: str) -> Path:
+        path = Path(raw)
+        return path if path.is_absolute() else (project_dir / path).resolve()
+
+    fixture_path = _resolve(args.fixture_file)
+    loader_script = _resolve(args.loader_script)
+    work_dir = _resolve(args.work_dir)
+    out_file = _resolve(args.out_file)
+
+    modes = [item.strip() for item in args.modes.split(",") if item.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown --modes: {', '.join(unknown)}")
+    scales = sorted({max(1, int(item)) for item in args.scales.split(",") if item.strip()})
+
+    fixture = json.loads(fixture_path.read_text(encoding="utf-8"))
+    queries = retrieval_eval.collect_queries(fixture)
+    query_defs = [query for _, query in queries]
+
+    results: list[dict[str, Any]] = []
+    corpora: list[dict[str, Any]] = []
+    for scale in scales:
+        corpus_dir = work_dir / f"corpus_{scale}_seed{args.seed}"
+        generated = synthesize_corpus(corpus_dir, scale, query_defs, args.seed)
+        corpora.append(
+            {"artifact_count": scale, "corpus_dir": _safe_rel_path(project_dir, corpus_dir), "generated": generated}
+        )
+        for mode in modes:
+            row = _benchmark_mode(args, loader_script, corpus_dir, queries, mode)
+            results.append({"artifact_count": scale, **row})
+
+    failure_count = sum(len(row["failures"]) for row in results)
+    status = "pass" if failure_count == 0 else "fail"
+    payload: dict[str, Any] = {
+        "artifact": "retrieval_benchmark_report_v0",
+        "version": "v0",
+        "run_at": _now_iso(),
+        "project_dir": str(project_dir),
+        "fixture_artifact": fixture.get("artifact"),
+        "fixture_hash": retrieval_eval.json_hash(fixture),
+        "loader_script": _safe_rel_path(project_dir, loader_script),
+        "seed": args.seed,
+        "top_k": args.top_k,
+        "runs_per_query": args.runs_per_query,
+        "max_files": args.max_files,
+        "max_chars_per_file": args.max_chars_per_file,
+        "query_count": len(queries),
+        "scales": scales,
+        "modes": modes,
+        "corpora": corpora,
+        "results": results,
+        "measurement_contract": {
+            "version": "v0",
+            "quality": "phase2_retrieval_eval_harness_v0 scoring contract over task files, first run per query",
+            "latency": "loader runtime inside a fresh interpreter with --no-cache, after one cold index-building call",
+            "peak_rss_bytes": "max ru_maxrss of the loader process across samples",
+            "bytes_read": "rchar delta from /proc/self/io around the loader run (null where unavailable)",
+        },
+        "failure_count": failure_count,
+        "status": status,
+    }
+    _write_json(out_file, payload)
+    payload["out_file"] = _safe_rel_path(project_dir, out_file)
+
+    if args.format == "json":
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(_render_text(payload))
+        sys.stdout.write("\n")
+    return 0 if status == "pass" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Shared JSON Schema validator registry for gate scripts.
+
+Each schema file is parsed, checked against its metaschema and compiled into a validator once
+per process. Entries are keyed by resolved path and revalidated by stat metadata, then by content
+hash, so an edited schema is recompiled while repeated and batch validations reuse the instance.
+`validate_instance` returns the same message `jsonschema.validate` would raise (best match).
+
+Validators are process-local; the in-process quality gate runner shares them across gate steps.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+import jsonschema
+from jsonschema.exceptions import best_match
+
+
+CONTRACT_SCHEMA_GLOB = "*_schema_v0.json"
+
+
+@dataclass
+class _Entry:
+    stat_token: tuple[int, int]
+    sha256: str
+    validator: Any
+
+
+_VALIDATORS: dict[str, _Entry] = {}
+_STATS = {"compiled": 0, "reused": 0}
+
+
+def _stat_token(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def load_validator(schema_file: Path) -> Any:
+    """Return a cached validator for `schema_file`; raises OSError/ValueError/SchemaError on bad input."""
+    path = Path(schema_file).resolve()
+    key = str(path)
+    stat_token = _stat_token(path)
+    entry = _VALIDATORS.get(key)
+    if entry is not None and entry.stat_token == stat_token:
+        _STATS["reused"] += 1
+        return entry.validator
+
+    raw = path.read_bytes()
+    sha256 = hashlib.sha256(raw).hexdigest()
+    if entry is not None and entry.sha256 == sha256:
+        entry.stat_token = stat_token
+        _STATS["reused"] += 1
+        return entry.validator
+
+    schema = json.loads(raw.decode("utf-8"))
+    if not isinstance(schema, dict):
+        raise ValueError(f"expected JSON object schema at {path}")
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    validator = validator_cls(schema)
+    _VALIDATORS[key] = _Entry(stat_token=stat_token, sha256=sha256, validator=validator)
+    _STATS["compiled"] += 1
+    return validator
+
+
+def _error_message(validator: Any, instance: Any) -> str | None:
+    error = best_match(validator.iter_errors(instance))
+    return None if error is None else str(error)
+
+
+def validate_instance(schema_file: Path, instance: Any) -> str | None:
+    """Validation error message for `instance`, or None when it conforms."""
+    return _error_message(load_validator(schema_file), instance)
+
+
+def validate_instances(schema_file: Path, instances: Iterable[Any]) -> list[str | None]:
+    """Batch form of `validate_instance`; the schema is resolved once for the whole batch."""
+    validator = load_validator(schema_file)
+    return [_error_message(validator, instance) for instance in instances]
+
+
+def contract_schema_files(contracts_dir: Path) -> list[Path]:
+    """`contracts/*_schema_v0.json` files that declare a JSON Schema dialect (`$schema`)."""
+    files: list[Path] = []
+    for path in sorted(Path(contracts_dir).glob(CONTRACT_SCHEMA_GLOB)):
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            files.append(path)
+            continue
+        if isinstance(payload, dict) and "$schema" in payload:
+            files.append(path)
+    return files
+
+
+def registry_stats() -> dict[str, int]:
+    return {"cached_validators": len(_VALIDATORS), **_STATS}
+
+
+def clear_session_cache() -> None:
+    _VALIDATORS.clear()
+    _STATS.update(compiled=0, reused=0)
+
+
+def _load_instances(path: Path) -> list[Any]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in {".ndjson", ".jsonl"}:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [json.loads(text)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compile contract schemas and batch-validate instance files.")
+    parser.add_argument("--project-dir", default=".")
+    parser.add_argument("--contracts-dir", default="contracts")
+    parser.add_argument("--schema-file", default="", help="Validate instances against this schema.")
+    parser.add_argument("instances", nargs="*", help="JSON files, or NDJSON/JSONL files with one instance per line.")
+    parser.add_argument("--format", default="text", choices=("text", "json"))
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir).resolve()
+    contracts_dir = Path(args.contracts_dir)
+    if not contracts_dir.is_absolute():
+        contracts_dir = project_dir / contracts_dir
+
+    findings: list[dict[str, Any]] = []
+    schema_files = contract_schema_files(contracts_dir)
+    if args.schema_file:
+        schema_file = Path(args.schema_file)
+        schema_files = [schema_file if schema_file.is_absolute() else project_dir / schema_file]
+
+    for schema_file in schema_files:
+        try:
+            load_validator(schema_file)
+        except Exception as exc:  # noqa: BLE001
+            findings.append(
+                {
+                    "check": "schema_compile_failed",
+                    "severity": "error",
+                    "path": str(schema_file),
+                    "message": str(exc).splitlines()[0] if str(exc) else type(exc).__name__,
+                }
+            )
+
+    instance_count = 0
+    if args.instances and args.schema_file and not findings:
+        for raw_path in args.instances:
+            instance_path = Path(raw_path)
+            if not instance_path.is_absolute():
+                instance_path = project_dir / instance_path
+            try:
+                instances = _load_instances(instance_path)
+            except (OSError, json.JSONDecodeError) as exc:
+                findings.append(
+                    {
+                        "check": "instance_load_failed",
+                        "severity": "error",
+                        "path": str(instance_path),
+                        "message": str(exc),
+                    }
+                )
+                continue
+            instance_count += len(instances)
+            for idx, error in enumerate(validate_instances(schema_files[0], instances)):
+                if error is not None:
+                    findings.append(
+                        {
+                            "check": "instance_schema_validation_failed",
+                            "severity": "error",
+                            "path": str(instance_path),
+                            "index": idx,
+                            "message": error.splitlines()[0],
+                        }
+                    )
+
+    status = "fail" if findings else "pass"
+    payload: dict[str, Any] = {
+        "version": "v0",
+        "project_dir": str(project_dir),
+        "status": status,
+        "schema_files": [str(path) for path in schema_files],
+        "instance_count": instance_count,
+        "registry": registry_stats(),
+        "findings": findings,
+    }
+    if args.format == "json":
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+        sys.stdout.write("\n")
+    else:
+        lines = [
+            f"status: {status}",
+            f"schemas: {len(schema_files)}",
+            f"instances: {instance_count}",
+        ]
+        for item in findings:
+            lines.append(f"- {item['check']}: path={item['path']} {item['message']}")
+        sys.stdout.write("\n".join(lines) + "\n")
+    return 1 if status == "fail" else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""Deterministic large-scale fixtures for the Phase 3 adapter and Phase 4 promotion harnesses.
+
+Emits scenario files in the frozen fixture schemas (`tactical_candidates` / `governance_debt_items` for Phase 4,
+beads adapter `items` for Phase 3) at 1k to 1M items, plus a synthetic freeze that binds one `scale_<n>` profile per
+scale to the frozen `large` profile queries, so the performance packs can measure how latency grows with scale.
+Output depends only on (family, scale, seed); a complete scenario directory is reused rather than regenerated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+
+GENERATOR_VERSION = "v0"
+DEFAULT_WORK_DIR = ".cortex/state/cache/synthetic_fixtures"
+DEFAULT_SEED = 7
+BASE_PROFILE = "large"
+BASE_FREEZES = {
+    "phase4_promotion": ".cortex/reports/project_state/phase4_promotion_eval_fixture_freeze_v0.json",
+    "phase3_adapter": ".cortex/reports/project_state/phase3_work_graph_eval_fixture_freeze_v0.json",
+}
+FAMILIES = tuple(BASE_FREEZES)
+# Fixed capture time, so generated timestamps never depend on when the generator ran.
+CAPTURED_AT = datetime(2026, 2, 24, 12, 0, 0, tzinfo=timezone.utc)
+
+# Governance impact skews low: most promotion candidates are routine, few are critical.
+IMPACT_WEIGHTS = (("critical", 0.05), ("high", 0.20), ("medium", 0.45), ("low", 0.30))
+# P(decision ref), P(reflection ref) by impact; high-impact work is more often fully linked.
+LINKAGE_RATES = {"critical": (0.92, 0.80), "high": (0.85, 0.65), "medium": (0.60, 0.40), "low": (0.35, 0.15)}
+# Evidence ref counts 0..6, long-tailed around one or two refs.
+EVIDENCE_COUNT_WEIGHTS = (0.14, 0.30, 0.24, 0.15, 0.09, 0.05, 0.03)
+CANDIDATE_STATE_WEIGHTS = (("ready", 0.72), ("blocked", 0.28))
+DEBT_STATE_WEIGHTS = (("ready", 0.58), ("blocked", 0.42))
+ADAPTER_STATE_WEIGHTS = (("ready", 0.45), ("blocked", 0.20), ("priority", 0.20), ("stale", 0.10), ("unknown", 0.05))
+ADAPTER_PRIORITY_WEIGHTS = (0.08, 0.14, 0.20, 0.20, 0.16, 0.12, 0.10)
+# Vocabulary is drawn Zipf-style, so a few terms are common and query hit counts vary across candidates.
+TERMS = (
+    "governance closure promotion candidate linkage evidence decision reflection debt backlog ready blocked owner "
+    "action priority focus ordering determinism adapter degradation gate rollout budget latency runtime policy "
+    "audit schema migration contract visibility enforcement cardinality bounded ranking coverage"
+).split()
+TERM_CUM_WEIGHTS = tuple(itertools.accumulate(1.0 / math.sqrt(rank + 1) for rank in range(len(TERMS))))
+OWNERS = (
+    "Governance Enforcement Lead",
+    "Runtime Reliability Lead",
+    "CI/Gate Owner",
+    "Maintainer Council",
+    "Adapter Integration Owner",
+)
+NEXT_ACTIONS = (
+    "Link reflection scaffold before closure.",
+    "Promote candidate with complete evidence mapping.",
+    "Re-run required governance gate bundle after linkage fixes.",
+    "Attach decision record for governance-impacting change.",
+    "Confirm owner sign-off and close debt item.",
+)
+EVIDENCE_STEMS = ("phase3_adapter_budget_report", "phase3_ci_overhead_report", "phase4_latency_report", "gate_bundle")
+ADAPTER_TAGS = {
+    "ready": ("ready", "focus", "bounded", "deterministic"),
+    "blocked": ("governance", "blocked", "owner", "non-blocking"),
+    "priority": ("priority", "focus", "ordering"),
+    "stale": ("stale", "freshness", "degraded"),
+    "unknown": ("unknown", "triage"),
+}
+
+
+_CUMULATIVE = {
+    table: ([name for name, _ in table], list(itertools.accumulate(weight for _, weight in table)))
+    for table in (IMPACT_WEIGHTS, CANDIDATE_STATE_WEIGHTS, DEBT_STATE_WEIGHTS, ADAPTER_STATE_WEIGHTS)
+}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _iso(value: datetime) -> str:
+    return value.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _safe_rel_path(project_dir: Path, path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(project_dir))
+    except ValueError:
+        return str(path.resolve())
+
+
+def parse_scales(raw: str) -> list[int]:
+    """Comma-separated item counts, de-duplicated and ascending."""
+    scales = sorted({int(item) for item in str(raw).split(",") if item.strip()})
+    if any(scale < 1 for scale in scales):
+        raise ValueError(f"scales must be positive item counts: {raw}")
+    return scales
+
+
+def _pick(rng: random.Random, table: tuple[tuple[str, float], ...]) -> str:
+    names, cum_weights = _CUMULATIVE[table]
+    return rng.choices(names, cum_weights=cum_weights)[0]
+
+
+def _phrase(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(TERMS, cum_weights=TERM_CUM_WEIGHTS, k=rng.randint(low, high)))
+
+
+def iter_tactical_candidates(rng: random.Random, count: int, prefix: str) -> Iterator[dict[str, Any]]:
+    counts = range(len(EVIDENCE_COUNT_WEIGHTS))
+    for idx in range(1, count + 1):
+        impact = _pick(rng, IMPACT_WEIGHTS)
+        decision_rate, reflection_rate = LINKAGE_RATES[impact]
+        evidence_count = rng.choices(counts, weights=EVIDENCE_COUNT_WEIGHTS)[0]
+        yield {
+            "candidate_id": f"pc_{prefix}_{idx:07d}",
+            "title": _phrase(rng, 3, 6).capitalize(),
+            "summary": _phrase(rng, 4, 10),
+            "state": _pick(rng, CANDIDATE_STATE_WEIGHTS),
+            "governance_impact": impact,
+            "decision_refs": [f"dec_{prefix}_{idx:07d}"] if rng.random() < decision_rate else [],
+            "reflection_refs": [f"ref_{prefix}_{idx:07d}"] if rng.random() < reflection_rate else [],
+            "evidence_refs": [
+                f".cortex/reports/project_state/{rng.choice(EVIDENCE_STEMS)}_{rng.randrange(count):07d}_v0.json"
+                for _ in range(evidence_count)
+            ],
+            "impacted_artifacts": [
+                f"playbooks/cortex_{rng.choice(TERMS)}_{rng.randrange(64):02d}_v0.md" for _ in range(rng.randint(0, 2))
+            ],
+        }
+
+
+def iter_governance_debt(rng: random.Random, count: int, prefix: str) -> Iterator[dict[str, Any]]:
+    for idx in range(1, count + 1):
+        state = _pick(rng, DEBT_STATE_WEIGHTS)
+        yield {
+            "debt_id": f"gd_{prefix}_{idx:07d}",
+            "state": state,
+            "owner": rng.choice(OWNERS),
+            "next_action": rng.choice(NEXT_ACTIONS),
+            "dependency_refs": [
+                f"{'ref' if state == 'blocked' else 'dec'}_{prefix}_{rng.randrange(count):07d}"
+                for _ in range(rng.choices((0, 1, 2, 3), weights=(0.15, 0.50, 0.25, 0.10))[0])
+            ],
+        }
+
+
+def iter_adapter_items(rng: random.Random, count: int, prefix: str) -> Iterator[dict[str, Any]]:
+    # Items age over 30 days; stale items are older than the packs' default one-day staleness window.
+    for idx in range(1, count + 1):
+        state = _pick(rng, ADAPTER_STATE_WEIGHTS)
+        age_seconds = rng.randrange(2 * 86400, 30 * 86400) if state == "stale" else rng.randrange(86400)
+        tags = ADAPTER_TAGS[state]
+        yield {
+            "id": f"wk_{prefix}_{state}_{idx:07d}",
+            "priority": rng.choices(range(1, 8), weights=ADAPTER_PRIORITY_WEIGHTS)[0],
+            "source_updated_at": _iso(CAPTURED_AT - timedelta(seconds=age_seconds)),
+            "state": state,
+            "summary": _phrase(rng, 5, 12).capitalize() + ".",
+            "tags": rng.sample(tags, rng.randint(1, len(tags))),
+            "title": _phrase(rng, 3, 6).capitalize(),
+        }
+
+
+def write_fixture(path: Path, header: dict[str, Any], key: str, items: Iterable[dict[str, Any]]) -> int:
+    """Stream `header` plus an `items` array under `key` as one JSON object; returns the item count."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    count = 0
+    with tmp.open("w", encoding="utf-8") as handle:
+        handle.write("{\n")
+        for name in sorted(header):
+            handle.write(f"  {json.dumps(name)}: {json.dumps(header[name], sort_keys=True)},\n")
+        handle.write(f"  {json.dumps(key)}: [")
+        for item in items:
+            handle.write(",\n    " if count else "\n    ")
+            handle.write(json.dumps(item, sort_keys=True))
+            count += 1
+        handle.write("\n  ]\n}\n")
+    os.replace(tmp, path)
+    return count
+
+
+def _scenario_specs(family: str, scale: int) -> list[dict[str, Any]]:
+    if family == "phase4_promotion":
+        return [
+            {
+                "scenario_id": f"s_scale_{scale}_candidate_ranking",
+                "file": "candidate_ranking_v0.json",
+                "key": "tactical_candidates",
+                "items": iter_tactical_candidates,
+                "description": f"{scale} synthetic tactical candidates for ranking latency at scale.",
+            },
+            {
+                "scenario_id": f"s_scale_{scale}_governance_debt_backlog",
+                "file": "governance_debt_backlog_v0.json",
+                "key": "governance_debt_items",
+                "items": iter_governance_debt,
+                "description": f"{scale} synthetic governance debt items for debt-surfacing latency at scale.",
+            },
+        ]
+    if family == "phase3_adapter":
+        return [
+            {
+                "scenario_id": f"s_scale_{scale}_adapter_healthy",
+                "file": "adapter_healthy_v0.json",
+                "key": "items",
+                "items": iter_adapter_items,
+                "description": f"{scale} synthetic beads work-graph items; bounded adapter selection required.",
+                "adapter_mode": "beads_file",
+                "adapter_status_expected": "loaded",
+            }
+        ]
+    raise ValueError(f"unknown fixture family: {family}")
+
+
+def ensure_scale_fixtures(work_dir: Path, family: str, scale: int, seed: int) -> tuple[list[dict[str, Any]], bool]:
+    """Scenario specs with a `path` for each file at this scale; False if a complete set was reused."""
+    scale_dir = work_dir / family / f"scale_{scale}_seed{seed}"
+    stamp = scale_dir / ".synthetic_fixture_v0.json"
+    expected = {"generator_version": GENERATOR_VERSION, "family": family, "scale": scale, "seed": seed}
+    specs = _scenario_specs(family, scale)
+    for spec in specs:
+        spec["path"] = scale_dir / spec["file"]
+
+    if stamp.exists() and all(spec["path"].exists() for spec in specs):
+        try:
+            if json.loads(stamp.read_text(encoding="utf-8")) == expected:
+                return specs, False
+        except (OSError, ValueError):
+            pass
+
+    stamp.unlink(missing_ok=True)
+    for spec in specs:
+        rng = random.Random(f"{seed}:{family}:{scale}:{spec['scenario_id']}")
+        prefix = f"s{scale}"
+        if family == "phase3_adapter":
+            header = {"adapter_id": "beads", "adapter_fetched_at": _iso(CAPTURED_AT)}
+        else:
+            header = {
+                "profile_id": f"scale_{scale}",
+                "scenario_id": spec["scenario_id"],
+                "captured_at": _iso(CAPTURED_AT),
+            }
+        write_fixture(spec["path"], header, spec["key"], spec["items"](rng, scale, prefix))
+    stamp.write_text(json.dumps(expected, sort_keys=True) + "\n", encoding="utf-8")
+    return specs, True
+
+
+def build_scale_freeze(
+    project_dir: Path,
+    family: str,
+    scales: list[int],
+    *,
+    seed: int = DEFAULT_SEED,
+    work_dir: Path | None = None,
+    base_freeze: dict[str, Any] | None = None,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Generate (or reuse) fixtures for each scale and return a freeze in the family's schema plus per-file rows.
+
+    Each `scale_<n>` profile reuses the queries of the base freeze's `large` profile and records that profile
+    as its `retrieval_profile`, so profile-keyed callers keep a valid retrieval budget at every scale.
+    """
+    work_dir = work_dir or (project_dir / DEFAULT_WORK_DIR)
+    if base_freeze is None:
+        base_freeze = json.loads((project_dir / BASE_FREEZES[family]).read_text(encoding="utf-8"))
+    base_profile = next(
+        (item for item in base_freeze.get("profiles", []) if item.get("profile_id") == BASE_PROFILE), None
+    )
+    if base_profile is None:
+        raise ValueError(f"base freeze has no {BASE_PROFILE!r} profile: {base_freeze.get('artifact')}")
+    base_queries = {str(item.get("query_id")): item for item in base_freeze.get("queries", [])}
+
+    profiles: list[dict[str, Any]] = []
+    scenarios: list[dict[str, Any]] = []
+    queries: list[dict[str, Any]] = []
+    files: list[dict[str, Any]] = []
+    for scale in scales:
+        profile_id = f"scale_{scale}"
+        specs, generated = ensure_scale_fixtures(work_dir, family, scale, seed)
+        for spec in specs:
+            fixture_ref = _safe_rel_path(project_dir, spec["path"])
+            scenario = {"scenario_id": spec["scenario_id"], "fixture_ref": fixture_ref}
+            if "adapter_mode" in spec:
+                scenario["adapter_mode"] = spec["adapter_mode"]
+                scenario["adapter_status_expected"] = spec["adapter_status_expected"]
+            scenario["description"] = spec["description"]
+            scenarios.append(scenario)
+            files.append(
+                {
+                    "family": family,
+                    "scale": scale,
+                    "scenario_id": spec["scenario_id"],
+                    "fixture_ref": fixture_ref,
+                    "generated": generated,
+                }
+            )
+        query_ids: list[str] = []
+        for base_query_id in base_profile.get("query_ids", []):
+            query = dict(base_queries[str(base_query_id)])
+            query["query_id"] = f"q_scale_{scale}_" + str(base_query_id).removeprefix(f"q_{BASE_PROFILE}_")
+            query["profile_id"] = profile_id
+            queries.append(query)
+            query_ids.append(query["query_id"])
+        profiles.append(
+            {
+                "profile_id": profile_id,
+                "description": f"Synthetic {scale}-item profile generated from the {BASE_PROFILE} profile queries.",
+                "retrieval_profile": BASE_PROFILE,
+                "scale": scale,
+                "scenario_ids": [spec["scenario_id"] for spec in specs],
+                "query_ids": query_ids,
+            }
+        )
+
+    freeze = {
+        "artifact": f"{family}_synthetic_scale_fixture_freeze_v0",
+        "version": "v0",
+        "status": "synthetic",
+        "base_fixture_artifact": base_freeze.get("artifact"),
+        "generator": "scripts/synthetic_fixture_generator_v0.py",
+        "generator_version": GENERATOR_VERSION,
+        "seed": seed,
+        "scales": list(scales),
+        "profiles": profiles,
+        "scenarios": scenarios,
+        "queries": queries,
+        "freeze_rules": base_freeze.get("freeze_rules", {}),
+    }
+    _write_json(work_dir / family / f"scale_freeze_seed{seed}_v0.json", freeze)
+    return freeze, files
+
+
+def latency_growth(points: list[tuple[int, float]]) -> dict[str, Any]:
+    """Log-log least-squares slope of latency against scale: ~1.0 is linear, below sublinear, above superlinear."""
+    usable = sorted((scale, seconds) for scale, seconds in points if scale > 0 and seconds > 0)
+    out: dict[str, Any] = {
+        "scales": [scale for scale, _ in usable],
+        "growth_exponent": None,
+        "growth_class": None,
+        "scale_ratio": None,
+        "latency_ratio": None,
+    }
+    if len({scale for scale, _ in usable}) < 2:
+        return out
+    xs = [math.log(scale) for scale, _ in usable]
+    ys = [math.log(seconds) for _, seconds in usable]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum((x - mean_x) ** 2 for x in xs)
+    out["growth_exponent"] = round(slope, 4)
+    out["growth_class"] = "sublinear" if slope < 0.9 else ("linear" if slope <= 1.1 else "superlinear")
+    out["scale_ratio"] = usable[-1][0] / usable[0][0]
+    out["latency_ratio"] = round(usable[-1][1] / usable[0][1], 4)
+    return out
+
+
+def _render_text(payload: dict[str, Any]) -> str:
+    lines = [f"synthetic fixtures: seed={payload['seed']} scales={','.join(str(s) for s in payload['scales'])}"]
+    for family in payload["families"]:
+        lines.append(f"- {family['family']}: freeze={family['freeze_file']}")
+        for row in family["files"]:
+            action = "generated" if row["generated"] else "reused"
+            lines.append(f"  - scale={row['scale']} {row['scenario_id']} {action} {row['fixture_ref']}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--project-dir", default=".")
+    parser.add_argument("--family", choices=(*FAMILIES, "all"), default="all")
+    parser.add_argument("--scales", default="1000,10000,100000", help="Comma-separated item counts per scenario.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "--work-dir",
+        default=DEFAULT_WORK_DIR,
+        help="Where fixtures are generated; an existing set with the same family, scale and seed is reused.",
+    )
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir).resolve()
+    work_dir = Path(args.work_dir)
+    work_dir = work_dir if work_dir.is_absolute() else (project_dir / work_dir).resolve()
+    try:
+        scales = parse_scales(args.scales)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    families: list[dict[str, Any]] = []
+    for family in FAMILIES if args.family == "all" else (args.family,):
+        _, files = build_scale_freeze(project_dir, family, scales, seed=args.seed, work_dir=work_dir)
+        freeze_file = work_dir / family / f"scale_freeze_seed{args.seed}_v0.json"
+        families.append({"family": family, "freeze_file": _safe_rel_path(project_dir, freeze_file), "files": files})
+
+    payload = {
+        "artifact": "synthetic_fixture_generation_v0",
+        "version": "v0",
+        "run_at": _now_iso(),
+        "seed": args.seed,
+        "scales": scales,
+        "families": families,
+        "status": "pass",
+    }
+    if args.format == "json":
+        sys.stdout.write(json.dumps(payload, indent=2, sort_keys=True))
+    else:
+        sys.stdout.write(_render_text(payload))
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,14 +5,15 @@ from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 import sys
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
-from fnmatch import fnmatch
 from pathlib import Path
 from typing import Any
 
+from path_matcher_v0 import GlobMatcher
+from repo_file_index_v0 import git_files
+
 
 DEFAULT_CONTRACT_FILE = Path("contracts/temporal_playbook_release_surface_contract_v0.json")
 
@@ -112,39 +113,6 @@ def _parse_entry(item: dict[str, Any], index: int) -> TemporalPlaybookEntry:
     )
 
 
-def _git_files(project_dir: Path, include_untracked: bool = True) -> list[str]:
-    tracked = subprocess.run(
-        ["git", "ls-files"],
-        cwd=str(project_dir),
-        text=True,
-        capture_output=True,
-        check=False,
-    )
-    if tracked.returncode != 0:
-        raise RuntimeError(f"git ls-files failed: {tracked.stderr.strip()}")
-
-    files = [line.strip() for line in tracked.stdout.splitlines() if line.strip()]
-
-    if include_untracked:
-        untracked = subprocess.run(
-            ["git", "ls-files", "--others", "--exclude-standard"],
-            cwd=str(project_dir),
-            text=True,
-            capture_output=True,
-            check=False,
-        )
-        if untracked.returncode != 0:
-            raise RuntimeError(f"git ls-files --others failed: {untracked.stderr.strip()}")
-        files.extend(line.strip() for line in untracked.stdout.splitlines() if line.strip())
-
-    deduped = sorted(set(files))
-    return [path for path in deduped if not path.startswith(".git/")]
-
-
-def _matches_any(path: str, globs: list[str]) -> bool:
-    return any(fnmatch(path, pattern) for pattern in globs)
-
-
 def _format_text(payload: dict[str, Any]) -> str:
     lines = [
         f"status: {payload.get('status')}",
@@ -206,6 +174,7 @@ def main() -> int:
     try:
         contract = _load_contract(contract_file)
         classification_globs = [_normalize_rel_path(str(item)) for item in contract["classification_globs"]]
+        classification_matcher = GlobMatcher(classification_globs)
         allowlist = sorted({_normalize_rel_path(str(item)) for item in contract["durable_allowlist"]})
 
         temporal_raw = contract["temporal_playbooks"]
@@ -246,7 +215,7 @@ def main() -> int:
             )
 
         for path in sorted(allowlist_set):
-            if not _matches_any(path, classification_globs):
+            if path not in classification_matcher:
                 findings.append(
                     _finding(
                         "allowlist_path_not_classified",
@@ -255,8 +224,8 @@ def main() -> int:
                     )
                 )
 
-        files = _git_files(project_dir)
-        candidate_files = sorted(path for path in files if _matches_any(path, classification_globs))
+        files = git_files(project_dir)
+        candidate_files = sorted(path for path in files if path in classification_matcher)
 
         for candidate in candidate_files:
             if candidate in allowlist_set:
@@ -272,7 +241,7 @@ def main() -> int:
                 )
 
         for entry in temporal_entries:
-            if not _matches_any(entry.path, classification_globs):
+            if entry.path not in classification_matcher:
                 findings.append(
                     _finding(
                         "temporal_entry_not_classified",
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from conftest import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import agent_context_loader_v0 as loader  # noqa: E402
+
+
+SAMPLES = [
+    b"",
+    b"short",
+    b"line one\r\nline two\rline three\n" * 40,
+    "café € \U0001F600 ".encode("utf-8") * 200,
+    b"valid \xff\xfe broken \xe2\x82 tail" * 100,
+    b"\xef\xbb\xbfbom prefixed\r\n" * 50,
+]
+
+
+def _read_text_excerpt(path: Path, max_chars: int) -> tuple[str, bool]:
+    text = path.read_text(encoding="utf-8", errors="replace")
+    if len(text) <= max_chars:
+        return text, False
+    return text[:max_chars], True
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_read_excerpt_matches_full_read(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_mmap: bool) -> None:
+    # Tiny reads force chunk boundaries inside multi-byte characters and between \r and \n.
+    monkeypatch.setattr(loader, "EXCERPT_MIN_READ_BYTES", 1)
+    if use_mmap:
+        monkeypatch.setattr(loader, "EXCERPT_MMAP_THRESHOLD_BYTES", 1)
+    for idx, data in enumerate(SAMPLES):
+        path = tmp_path / f"sample_{idx}.md"
+        path.write_bytes(data)
+        expected_len = len(_read_text_excerpt(path, 10**9)[0])
+        for max_chars in (1, 5, expected_len - 1, expected_len, expected_len + 1, 2500):
+            if max_chars < 1:
+                continue
+            assert loader.read_excerpt(path, max_chars) == _read_text_excerpt(path, max_chars), (idx, max_chars)
+
+
+def test_read_excerpt_reads_only_what_the_budget_needs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "large.md"
+    path.write_bytes(b"x" * (512 * 1024))
+    reads: list[int] = []
+    real_open = Path.open
+
+    class CountingFile:
+        def __init__(self, fh: Any) -> None:
+            self._fh = fh
+
+        def readinto(self, buf: Any) -> int:
+            count = self._fh.readinto(buf)
+            reads.append(count)
+            return count
+
+        def __getattr__(self, name: str) -> Any:
+            return getattr(self._fh, name)
+
+        def __enter__(self) -> CountingFile:
+            return self
+
+        def __exit__(self, *exc: object) -> None:
+            self._fh.close()
+
+    monkeypatch.setattr(Path, "open", lambda self, *a, **kw: CountingFile(real_open(self, *a, **kw)))
+    excerpt, truncated = loader.read_excerpt(path, 2500)
+
+    assert truncated is True
+    assert excerpt == "x" * 2500
+    assert sum(reads) <= loader.EXCERPT_MIN_READ_BYTES
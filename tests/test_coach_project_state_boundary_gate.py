@@ -4,14 +4,14 @@ import json
 import sys
 from pathlib import Path
 
-from conftest import REPO_ROOT, run_cmd
+from conftest import REPO_ROOT, init_git_repo, run_cmd
 
 
 BOUNDARY_GATE_SCRIPT = REPO_ROOT / "scripts" / "project_state_boundary_gate_v0.py"
 BOUNDARY_CONTRACT_FILE = REPO_ROOT / "contracts" / "project_state_boundary_contract_v0.json"
 
 
-def run_boundary_gate(project_dir: Path, expect_code: int = 0) -> dict:
+def run_boundary_gate(project_dir: Path, *extra_args: str, expect_code: int = 0) -> dict:
     proc = run_cmd(
         [
             sys.executable,
@@ -22,6 +22,7 @@ def run_boundary_gate(project_dir: Path, expect_code: int = 0) -> dict:
             str(BOUNDARY_CONTRACT_FILE),
             "--format",
             "json",
+            *extra_args,
         ],
         cwd=REPO_ROOT,
         expect_code=expect_code,
@@ -87,3 +88,81 @@ def test_boundary_gate_fails_for_expired_active_waiver(initialized_project: Path
     checks = [f["check"] for f in payload["findings"]]
     assert payload["status"] == "fail"
     assert "expired_active_waiver" in checks
+
+
+def _write_waiver(project_dir: Path, expires_on: str) -> None:
+    waiver_file = project_dir / ".cortex" / "policies" / "project_state_boundary_waivers_v0.json"
+    waiver_file.parent.mkdir(parents=True, exist_ok=True)
+    waiver_file.write_text(
+        json.dumps(
+            {
+                "version": "v0",
+                "waivers": [
+                    {
+                        "path": "reports/legacy.md",
+                        "reason": "temporary migration",
+                        "decision_id": "dec_test",
+                        "owner": "test",
+                        "expires_on": expires_on,
+                        "status": "active",
+                    }
+                ],
+            },
+            indent=2,
+            sort_keys=True,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def _plain_project(tmp_path: Path) -> Path:
+    project_dir = tmp_path / "proj"
+    (project_dir / "reports").mkdir(parents=True)
+    init_git_repo(project_dir)
+    (project_dir / "README.md").write_text("demo\n", encoding="utf-8")
+    (project_dir / "reports" / "legacy.md").write_text("legacy\n", encoding="utf-8")
+    _write_waiver(project_dir, "2999-01-01")
+    run_cmd(["git", "add", "."], cwd=project_dir)
+    run_cmd(["git", "commit", "-m", "baseline"], cwd=project_dir)
+    return project_dir
+
+
+def test_boundary_gate_since_last_green_evaluates_only_new_paths(tmp_path: Path) -> None:
+    project_dir = _plain_project(tmp_path)
+
+    baseline = run_boundary_gate(project_dir, "--since", "last-green", "--record-last-green")
+    assert baseline["scan_mode"] == "full"
+    assert baseline["full_scan_reason"] == "no_last_green_snapshot"
+    assert baseline["last_green_recorded"] is True
+    assert (project_dir / baseline["last_green_file"]).exists()
+
+    (project_dir / "docs").mkdir()
+    (project_dir / "docs" / "note.md").write_text("note\n", encoding="utf-8")
+    run_cmd(["git", "add", "docs/note.md"], cwd=project_dir)
+    run_cmd(["git", "commit", "-m", "add note"], cwd=project_dir)
+    run_cmd(["git", "mv", "docs/note.md", "reports/note.md"], cwd=project_dir)
+    (project_dir / "reports" / "scratch.md").write_text("scratch\n", encoding="utf-8")
+
+    payload = run_boundary_gate(project_dir, "--since", "last-green", expect_code=1)
+    assert payload["scan_mode"] == "incremental"
+    # The renamed note, the untracked scratch file and the (untracked) last-green snapshot itself.
+    assert payload["files_scanned"] == 3
+    assert sorted(v["path"] for v in payload["violations"]) == ["reports/note.md", "reports/scratch.md"]
+
+    explicit = run_boundary_gate(project_dir, "--since", "HEAD", expect_code=1)
+    assert explicit["scan_mode"] == "incremental"
+    assert explicit["violation_count"] == 2
+
+
+def test_boundary_gate_since_rescans_when_waivers_change(tmp_path: Path) -> None:
+    project_dir = _plain_project(tmp_path)
+    run_boundary_gate(project_dir, "--record-last-green")
+
+    _write_waiver(project_dir, "2020-01-01")
+    payload = run_boundary_gate(project_dir, "--since", "last-green", expect_code=1)
+    checks = [f["check"] for f in payload["findings"]]
+    assert payload["scan_mode"] == "full"
+    assert payload["full_scan_reason"] == "waiver_file_changed"
+    assert "expired_active_waiver" in checks
+    assert [v["path"] for v in payload["violations"]] == ["reports/legacy.md"]
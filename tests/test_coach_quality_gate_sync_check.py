@@ -10,6 +10,7 @@ from conftest import REPO_ROOT, run_cmd
 SYNC_CHECK_SCRIPT = REPO_ROOT / "scripts" / "quality_gate_sync_check_v0.py"
 CI_GATE_SCRIPT = REPO_ROOT / "scripts" / "quality_gate_ci_v0.sh"
 LOCAL_GATE_SCRIPT = REPO_ROOT / "scripts" / "quality_gate_v0.sh"
+RUNNER_SCRIPT = REPO_ROOT / "scripts" / "quality_gate_runner_v0.py"
 
 
 def run_sync_check(ci_script: Path, local_script: Path, expect_code: int = 0) -> dict:
@@ -78,3 +79,36 @@ def test_quality_gate_sync_check_fails_when_local_precheck_drifted(tmp_path: Pat
     checks = {finding["check"] for finding in payload["findings"]}
     assert payload["status"] == "fail"
     assert "local_precheck_label_mismatch" in checks
+
+
+def test_quality_gate_sync_check_fails_when_runner_step_drifts(tmp_path: Path) -> None:
+    runner_copy = tmp_path / "quality_gate_runner_v0.py"
+    runner_copy.write_text(
+        RUNNER_SCRIPT.read_text(encoding="utf-8").replace(
+            '"--min-scaffold-reports",\n            "1",',
+            '"--min-scaffold-reports",\n            "0",',
+            1,
+        ),
+        encoding="utf-8",
+    )
+
+    proc = run_cmd(
+        [
+            sys.executable,
+            str(SYNC_CHECK_SCRIPT),
+            "--ci-script",
+            str(CI_GATE_SCRIPT),
+            "--local-script",
+            str(LOCAL_GATE_SCRIPT),
+            "--runner-script",
+            str(runner_copy),
+            "--format",
+            "json",
+        ],
+        cwd=REPO_ROOT,
+        expect_code=1,
+    )
+    payload = json.loads(proc.stdout)
+    mismatches = [f for f in payload["findings"] if f["check"] == "runner_command_mismatch"]
+    assert {f["profile"] for f in mismatches} == {"ci", "local"}
+    assert {f["step_id"] for f in mismatches} == {"reflection_enforcement"}
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import context_artifact_index_v0 as artifact_index  # noqa: E402
+
+
+INDEX_SCRIPT = REPO_ROOT / "scripts" / "context_artifact_index_v0.py"
+PATTERNS = [
+    ".cortex/artifacts/decisions/decision_*_v*.md",
+    ".cortex/artifacts/*.md",
+    "specs/*.md",
+    "missing/*.md",
+]
+
+
+def _age(path: Path) -> None:
+    # Push mtimes outside the racy window so listings are persisted.
+    old = path.stat().st_mtime_ns - 10 * artifact_index.RACY_WINDOW_NS
+    os.utime(path, ns=(old, old))
+
+
+def _project(tmp_path: Path) -> Path:
+    project_dir = tmp_path / "proj"
+    decisions = project_dir / ".cortex" / "artifacts" / "decisions"
+    decisions.mkdir(parents=True)
+    (project_dir / "specs").mkdir()
+    for name in ("decision_a_v1.md", "decision_b_v2.md", "notes.md"):
+        (decisions / name).write_text(name, encoding="utf-8")
+    (project_dir / ".cortex" / "artifacts" / "governance_x_v0.md").write_text("g", encoding="utf-8")
+    (project_dir / ".cortex" / "artifacts" / "nested.md").mkdir()
+    (project_dir / "specs" / "spec_one_v0.md").write_text("s", encoding="utf-8")
+    for path in (decisions, decisions.parent, project_dir / "specs"):
+        _age(path)
+    return project_dir
+
+
+def _glob(project_dir: Path, pattern: str, files_only: bool) -> list[str]:
+    return [
+        path.relative_to(project_dir).as_posix()
+        for path in sorted(project_dir.glob(pattern))
+        if not files_only or path.is_file()
+    ]
+
+
+def test_artifact_index_matches_glob_and_refreshes_changed_directories(tmp_path: Path) -> None:
+    project_dir = _project(tmp_path)
+    index_file = artifact_index.default_index_file(project_dir)
+
+    cold = artifact_index.ArtifactIndex(project_dir, index_file)
+    for pattern in PATTERNS:
+        for files_only in (False, True):
+            assert cold.matches(pattern, files_only=files_only) == _glob(project_dir, pattern, files_only)
+    assert cold.scanned == 3
+    cold.save()
+
+    decisions = project_dir / ".cortex" / "artifacts" / "decisions"
+    (decisions / "decision_c_v1.md").write_text("c", encoding="utf-8")
+    _age(decisions)
+
+    warm = artifact_index.ArtifactIndex(project_dir, index_file)
+    assert warm.matches(PATTERNS[0]) == _glob(project_dir, PATTERNS[0], False)
+    assert warm.matches(PATTERNS[0])[-1].endswith("decision_c_v1.md")
+    assert warm.matches("specs/*.md") == ["specs/spec_one_v0.md"]
+    assert warm.stats() == {"enabled": True, "directories_scanned": 1, "directories_reused": 1}
+
+    rows = json.loads(index_file.read_text(encoding="utf-8"))["directories"]["specs"]["entries"]
+    assert [dict(zip(artifact_index.ENTRY_FIELDS, row))["kind"] for row in rows] == ["spec"]
+
+
+def test_context_loader_output_is_identical_with_and_without_index(tmp_path: Path) -> None:
+    project_dir = _project(tmp_path)
+    loader = REPO_ROOT / "scripts" / "agent_context_loader_v0.py"
+    base = [sys.executable, str(loader), "--project-dir", str(project_dir), "--task", "spec"]
+
+    direct = run_cmd([*base, "--no-artifact-index"], cwd=REPO_ROOT).stdout
+    assert not artifact_index.default_index_file(project_dir).exists()
+    cold = run_cmd(base, cwd=REPO_ROOT).stdout
+    warm = run_cmd(base, cwd=REPO_ROOT).stdout
+    assert direct == cold == warm
+
+    stats = json.loads(
+        run_cmd(
+            [sys.executable, str(INDEX_SCRIPT), "--project-dir", str(project_dir), "--format", "json"],
+            cwd=REPO_ROOT,
+        ).stdout
+    )
+    assert stats["directories_scanned"] == 0
+    assert stats["kinds"] == {"decision": 2, "policy": 1, "spec": 1}
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import context_bm25_index_v0 as bm25  # noqa: E402
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    # Outside the racy window so stat tokens are recorded.
+    old = path.stat().st_mtime_ns - 10 * bm25.RACY_WINDOW_NS
+    os.utime(path, ns=(old, old))
+
+
+def test_bm25_index_ranks_deterministically_and_updates_incrementally(tmp_path: Path) -> None:
+    _write(tmp_path / "specs" / "alpha_spec_v0.md", "rollout rollout kill switch")
+    _write(tmp_path / "specs" / "beta_spec_v0.md", "kill switch ownership")
+    _write(tmp_path / "specs" / "gamma_spec_v0.md", "kill switch ownership")
+    _write(tmp_path / "specs" / "delta_spec_v0.md", "unrelated notes")
+    docs = sorted(f"specs/{p.name}" for p in (tmp_path / "specs").iterdir())
+    index_file = bm25.default_index_file(tmp_path)
+
+    index = bm25.Bm25Index(tmp_path, index_file)
+    index.refresh(docs)
+    ranked = index.rank("kill switch ownership", docs)
+    assert [rel for rel, _ in ranked] == [
+        "specs/beta_spec_v0.md",
+        "specs/gamma_spec_v0.md",
+        "specs/alpha_spec_v0.md",
+    ]
+    assert ranked[0][1] == ranked[1][1] > ranked[2][1] > 0
+    assert index.rank("rollout", docs)[0][0] == "specs/alpha_spec_v0.md"
+    index.save()
+
+    _write(tmp_path / "specs" / "delta_spec_v0.md", "rollout runbook rollout rollout")
+    (tmp_path / "specs" / "alpha_spec_v0.md").unlink()
+    docs.remove("specs/alpha_spec_v0.md")
+
+    warm = bm25.Bm25Index(tmp_path, index_file)
+    warm.refresh(docs)
+    assert (warm.indexed, warm.reused) == (1, 2)
+    assert [rel for rel, _ in warm.rank("rollout", docs)] == ["specs/delta_spec_v0.md"]
+    warm.save()
+    payload = json.loads(index_file.read_text(encoding="utf-8"))
+    assert "specs/alpha_spec_v0.md" not in payload["docs"]
+    assert "kill" in payload["postings"] and "specs/alpha_spec_v0.md" not in payload["postings"]["kill"]
+
+
+def test_loader_bm25_ranking_fills_budget_by_score(tmp_path: Path) -> None:
+    for idx in range(6):
+        _write(tmp_path / "specs" / f"a{idx}_filler_spec_v0.md", "general notes about nothing in particular")
+    _write(tmp_path / "specs" / "zz_hydration_spec_v0.md", "context hydration receipts and hydration capsules")
+    _write(tmp_path / ".cortex" / "manifest_v0.json", "{}")
+    loader = REPO_ROOT / "scripts" / "agent_context_loader_v0.py"
+    base = [
+        sys.executable,
+        str(loader),
+        "--project-dir",
+        str(tmp_path),
+        "--task",
+        "spec for context hydration receipts",
+        "--max-files",
+        "3",
+        "--fallback-mode",
+        "none",
+    ]
+
+    pattern = json.loads(run_cmd(base, cwd=REPO_ROOT).stdout)
+    ranked = json.loads(run_cmd([*base, "--ranking", "bm25"], cwd=REPO_ROOT).stdout)
+
+    assert pattern["ranking"] == "pattern"
+    assert "specs/zz_hydration_spec_v0.md" not in [f["path"] for f in pattern["files"]]
+    assert ranked["ranking"] == "bm25"
+    task_files = [f for f in ranked["files"] if f["selected_by"].startswith("task:")]
+    assert task_files[0]["path"] == "specs/zz_hydration_spec_v0.md"
+    assert task_files[0]["selected_by"] == "task:bm25"
+    assert task_files[0]["score"] > 0
+    assert json.loads(run_cmd([*base, "--ranking", "bm25"], cwd=REPO_ROOT).stdout) == ranked
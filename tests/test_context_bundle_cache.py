@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import context_bundle_cache_v0 as bundle_cache  # noqa: E402
+
+
+LOADER = REPO_ROOT / "scripts" / "agent_context_loader_v0.py"
+
+
+def _entries(project_dir: Path) -> list[Path]:
+    # Bundle entries only; section manifests for --since-bundle share the directory.
+    return sorted(
+        path
+        for path in bundle_cache.default_cache_dir(project_dir).glob("*.json")
+        if not path.name.startswith("manifest-")
+    )
+
+
+def test_loader_serves_identical_bundle_from_cache_until_a_file_changes(tmp_path: Path) -> None:
+    (tmp_path / ".cortex").mkdir()
+    (tmp_path / ".cortex" / "manifest_v0.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "specs").mkdir()
+    spec = tmp_path / "specs" / "alpha_spec_v0.md"
+    spec.write_text("# Alpha\n\nfirst revision\n", encoding="utf-8")
+    base = [sys.executable, str(LOADER), "--project-dir", str(tmp_path), "--task", "spec", "--ranking", "bm25"]
+
+    uncached = run_cmd([*base, "--no-cache"], cwd=REPO_ROOT).stdout
+    assert _entries(tmp_path) == []
+    cold = run_cmd(base, cwd=REPO_ROOT).stdout
+    entries = _entries(tmp_path)
+    assert len(entries) == 1
+    assert entries[0].read_text(encoding="utf-8") == cold == uncached
+    assert run_cmd(base, cwd=REPO_ROOT).stdout == cold
+
+    # A same-size rewrite and a new candidate file both change the key.
+    spec.write_text("# Alpha\n\nnewer revision\n", encoding="utf-8")
+    edited = json.loads(run_cmd(base, cwd=REPO_ROOT).stdout)
+    assert "newer revision" in edited["files"][-1]["excerpt"]
+    (tmp_path / "specs" / "beta_spec_v0.md").write_text("beta", encoding="utf-8")
+    added = json.loads(run_cmd(base, cwd=REPO_ROOT).stdout)
+    assert "specs/beta_spec_v0.md" in [entry["path"] for entry in added["files"]]
+    assert len(_entries(tmp_path)) == 3
+
+    out_file = tmp_path / "bundle.json"
+    run_cmd([*base, "--out-file", str(out_file)], cwd=REPO_ROOT)
+    assert json.loads(out_file.read_text(encoding="utf-8")) == added
+    assert len(_entries(tmp_path)) == 3
+
+
+def test_bundle_cache_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = bundle_cache.BundleCache(tmp_path / "bundles", max_bytes=250)
+    for key in ("a", "b"):
+        cache.put(key, key * 100)
+    assert cache.get("a") == "a" * 100
+    cache.put("c", "c" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a" * 100
+    assert cache.get("c") == "c" * 100
+    assert cache.stats() == {"hits": 3, "misses": 1, "evicted": 1}
+    assert bundle_cache.cache_key({"task": "x"}) != bundle_cache.cache_key({"task": "y"})
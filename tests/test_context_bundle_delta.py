@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import context_bundle_delta_v0 as bundle_delta  # noqa: E402
+
+
+LOADER = REPO_ROOT / "scripts" / "agent_context_loader_v0.py"
+
+
+def test_since_bundle_emits_only_changed_sections_and_rebuilds_full_view(tmp_path: Path) -> None:
+    (tmp_path / ".cortex" / "artifacts" / "decisions").mkdir(parents=True)
+    (tmp_path / ".cortex" / "manifest_v0.json").write_text('{"project": "demo"}', encoding="utf-8")
+    decision = tmp_path / ".cortex" / "artifacts" / "decisions" / "decision_rollout_v1.md"
+    decision.write_text("# Rollout\n\n## Context\nstable\n\n## Decision\nship it\n", encoding="utf-8")
+    (tmp_path / "specs").mkdir()
+    (tmp_path / "specs" / "alpha_spec_v0.md").write_text("# Alpha\n\nunchanged\n", encoding="utf-8")
+    base = [sys.executable, str(LOADER), "--project-dir", str(tmp_path), "--task", "spec"]
+
+    first_output = run_cmd(base, cwd=REPO_ROOT).stdout
+    first = json.loads(first_output)
+    first_sha = hashlib.sha256(first_output.encode("utf-8")).hexdigest()
+
+    decision.write_text("# Rollout\n\n## Context\nstable\n\n## Decision\nhold it\n", encoding="utf-8")
+    delta = json.loads(run_cmd([*base, "--since-bundle", first_sha], cwd=REPO_ROOT).stdout)
+    full_output = run_cmd([*base, "--no-cache"], cwd=REPO_ROOT).stdout
+
+    assert delta["mode"] == "delta"
+    assert delta["since_bundle_found"] is True
+    assert delta["bundle_sha256"] == hashlib.sha256(full_output.encode("utf-8")).hexdigest()
+    assert [(s["path"], s["title"], s["status"]) for s in delta["sections"]] == [
+        (".cortex/artifacts/decisions/decision_rollout_v1.md", "Decision", "changed")
+    ]
+    assert delta["removed"] == []
+    assert delta["stats"]["sections_unchanged"] == delta["stats"]["sections_total"] - 1
+    full = json.loads(full_output)
+    assert bundle_delta.rebuild_excerpts(delta, first) == {f["path"]: f["excerpt"] for f in full["files"]}
+
+    unknown = json.loads(run_cmd([*base, "--since-bundle", "f" * 64], cwd=REPO_ROOT).stdout)
+    assert unknown["since_bundle_found"] is False
+    assert unknown["stats"]["sections_sent"] == unknown["stats"]["sections_total"]
+    assert f"since_bundle_not_found:{'f' * 64}" in unknown["warnings"]
+
+
+def test_build_delta_reports_added_and_removed_sections() -> None:
+    old = {"files": [{"path": "a.md", "excerpt": "# One\nx\n# Two\ny\n"}, {"path": "b.json", "excerpt": "{}"}]}
+    new = {"files": [{"path": "a.md", "excerpt": "# One\nx\n# Three\nz\n"}]}
+    old_manifest = bundle_delta.bundle_manifest(old)
+    new_manifest = bundle_delta.bundle_manifest(new)
+
+    delta = bundle_delta.build_delta(new, "sha", new_manifest, "old", old_manifest)
+
+    assert [(s["title"], s["status"]) for s in delta["sections"]] == [("Three", "added")]
+    assert [(s["path"], s["title"]) for s in delta["removed"]] == [("a.md", "Two"), ("b.json", "")]
+    assert bundle_delta.rebuild_excerpts(delta, old) == {"a.md": "# One\nx\n# Three\nz\n"}
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from conftest import REPO_ROOT
+
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import context_hydration_gate_v0 as gate  # noqa: E402
+
+
+def _receipt(event: str, hydrated_at: str) -> dict:
+    return {"version": "v0", "event": event, "hydrated_at": hydrated_at, "receipt_id": f"chr_{event}"}
+
+
+def test_history_index_tracks_appends_and_external_changes(tmp_path: Path) -> None:
+    history_dir = tmp_path / "history"
+    gate._append_history_receipt(history_dir, "r1.json", _receipt("new_session", "2026-01-01T00:00:00Z"))
+    gate._append_history_receipt(history_dir, "r2.json", _receipt("window_rollover", "2026-01-02T00:00:00Z"))
+    gate._append_history_receipt(history_dir, "r3.json", _receipt("new_session", "2026-01-03T00:00:00Z"))
+
+    assert gate._list_history_events(history_dir) == {"new_session": 2, "window_rollover": 1}
+    since = datetime(2026, 1, 2, 12, tzinfo=timezone.utc)
+    # Counts stay all-time: the 2026-01-01 receipt is counted although only the later one is after `since`.
+    assert gate._list_history_events(history_dir, since=since) == {"new_session": 2}
+
+    # Receipts written or removed outside the gate are reconciled from the directory.
+    (history_dir / "external.json").write_text(
+        json.dumps(_receipt("pre_closeout", "2026-01-04T00:00:00Z")), encoding="utf-8"
+    )
+    (history_dir / "r2.json").unlink()
+    assert gate._list_history_events(history_dir) == {"new_session": 2, "pre_closeout": 1}
+    log_lines = (history_dir / gate.HISTORY_INDEX_FILE).read_text(encoding="utf-8").splitlines()
+    log_receipts = [json.loads(line)["receipt"] for line in log_lines]
+    assert log_receipts == ["external.json", "r1.json", "r3.json"]
+
+
+def test_history_index_rotates_active_log(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(gate, "HISTORY_INDEX_ROTATE_LINES", 2)
+    history_dir = tmp_path / "history"
+    for idx in range(5):
+        receipt = _receipt("new_session", f"2026-01-0{idx + 1}T00:00:00Z")
+        gate._append_history_receipt(history_dir, f"r{idx}.json", receipt)
+
+    summary = json.loads((history_dir / gate.HISTORY_SUMMARY_FILE).read_text(encoding="utf-8"))
+    assert summary["segment_count"] == 2
+    assert summary["active_lines"] == 1
+    assert summary["events"]["new_session"]["count"] == 5
+    assert summary["events"]["new_session"]["last_hydrated_at"] == "2026-01-05T00:00:00Z"
+
+    (history_dir / gate.HISTORY_SUMMARY_FILE).unlink()
+    assert gate._list_history_events(history_dir) == {"new_session": 5}
+
+
+def test_history_summary_written_in_racy_window_is_rebuilt(tmp_path: Path, monkeypatch) -> None:
+    history_dir = tmp_path / "history"
+    gate._append_history_receipt(history_dir, "r1.json", _receipt("new_session", "2026-01-01T00:00:00Z"))
+    summary = json.loads((history_dir / gate.HISTORY_SUMMARY_FILE).read_text(encoding="utf-8"))
+
+    # A receipt landing in the same mtime tick as the summary write leaves the directory stat unchanged.
+    (history_dir / "external.json").write_text(
+        json.dumps(_receipt("pre_closeout", "2026-01-02T00:00:00Z")), encoding="utf-8"
+    )
+    os.utime(history_dir, ns=(summary["dir_mtime_ns"], summary["dir_mtime_ns"]))
+    assert gate._list_history_events(history_dir) == {"new_session": 1, "pre_closeout": 1}
+
+    # Once the directory is older than the racy window, a rebuilt summary is trusted without rescanning.
+    old_ns = time.time_ns() - 60 * 1_000_000_000
+    os.utime(history_dir, ns=(old_ns, old_ns))
+    gate._load_history_summary(history_dir)
+    assert os.stat(history_dir).st_mtime_ns == old_ns
+    monkeypatch.setattr(gate, "_rebuild_history_index", lambda _: pytest.fail("trusted summary was rebuilt"))
+    assert gate._list_history_events(history_dir) == {"new_session": 1, "pre_closeout": 1}
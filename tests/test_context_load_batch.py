@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from context_load_batch_v0 import ContextLoadSession, context_load_argv  # noqa: E402
+
+
+BATCH_SCRIPT = REPO_ROOT / "scripts" / "context_load_batch_v0.py"
+FAKE_COACH = """import json
+import os
+import sys
+
+args = sys.argv[1:]
+if "--task" in args and args[args.index("--task") + 1] == "boom":
+    print("boom requested", file=sys.stderr)
+    sys.exit(2)
+print(json.dumps({"argv": args, "pid": os.getpid()}))
+"""
+
+
+def _fake_coach(tmp_path: Path) -> Path:
+    coach = tmp_path / "fake_coach.py"
+    coach.write_text(FAKE_COACH, encoding="utf-8")
+    return coach
+
+
+def test_batch_session_reuses_one_process_and_matches_process_mode(tmp_path: Path) -> None:
+    coach = _fake_coach(tmp_path)
+    base_cmd = [sys.executable, str(coach)]
+    argvs = [
+        context_load_argv({"task": "alpha", "retrieval_profile": "small", "max_files": 4}, tmp_path),
+        context_load_argv({"task": "beta", "adapter_mode": "off"}, tmp_path),
+        context_load_argv({"task": "boom"}, tmp_path),
+    ]
+
+    with ContextLoadSession(base_cmd, cwd=tmp_path) as batch, ContextLoadSession(base_cmd, warm=False) as cold:
+        assert batch.mode == "batch"
+        assert cold.mode == "process"
+        warm_runs = [batch.run(argv, timeout_seconds=30)[0] for argv in argvs]
+        cold_runs = [cold.run(argv, timeout_seconds=30)[0] for argv in argvs]
+
+    for warm, fresh in zip(warm_runs, cold_runs):
+        assert warm.returncode == fresh.returncode
+        assert warm.stderr == fresh.stderr
+    warm_argvs = [json.loads(p.stdout)["argv"] for p in warm_runs[:2]]
+    assert warm_argvs == [json.loads(p.stdout)["argv"] for p in cold_runs[:2]]
+    assert warm_runs[2].returncode == 2
+    assert "boom requested" in warm_runs[2].stderr
+
+    warm_pids = {json.loads(p.stdout)["pid"] for p in warm_runs[:2]}
+    cold_pids = {json.loads(p.stdout)["pid"] for p in cold_runs[:2]}
+    assert len(warm_pids) == 1
+    assert len(cold_pids) == 2
+
+
+def test_batch_cli_streams_one_result_per_request(tmp_path: Path) -> None:
+    coach = _fake_coach(tmp_path)
+    requests = "\n".join(
+        [
+            json.dumps({"id": "q1", "task": "alpha", "weighting_mode": "uniform"}),
+            json.dumps({"id": "q2", "task": "boom"}),
+        ]
+    )
+    proc = subprocess.run(
+        [sys.executable, str(BATCH_SCRIPT), "--project-dir", str(tmp_path), "--coach-script", str(coach)],
+        input=requests + "\n",
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    assert proc.returncode == 1, proc.stderr
+    rows = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert [row["id"] for row in rows] == ["q1", "q2"]
+    assert rows[0]["error"] is None
+    assert rows[0]["bundle"]["argv"][:4] == ["context-load", "--project-dir", str(tmp_path), "--task"]
+    assert "--weighting-mode" in rows[0]["bundle"]["argv"]
+    assert rows[1]["bundle"] is None
+    assert "boom requested" in rows[1]["error"]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from conftest import REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import agent_context_loader_v0 as loader  # noqa: E402
+from context_artifact_index_v0 import ArtifactIndex  # noqa: E402
+
+
+LOADER = REPO_ROOT / "scripts" / "agent_context_loader_v0.py"
+
+
+def _project(tmp_path: Path) -> Path:
+    project_dir = tmp_path / "proj"
+    (project_dir / ".cortex").mkdir(parents=True)
+    (project_dir / ".cortex" / "manifest_v0.json").write_text('{"project": "demo"}', encoding="utf-8")
+    (project_dir / "specs").mkdir()
+    for idx in range(6):
+        body = f"# Spec {idx}\n\nrollout {idx}\n" + "detail line\n" * (idx * 40)
+        (project_dir / "specs" / f"s{idx}_spec_v0.md").write_text(body, encoding="utf-8")
+    return project_dir
+
+
+def _reassemble(lines: list[str]) -> dict:
+    records = [json.loads(line) for line in lines]
+    header, *files, summary = records
+    assert header.pop("record") == "header"
+    assert summary.pop("record") == "summary"
+    assert {item.pop("record") for item in files} <= {"file"}
+    return {**header, **summary, "files": files}
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [
+        [],
+        ["--max-chars-per-file", "40", "--ranking", "bm25"],
+        ["--max-total-chars", "120"],
+        ["--task", "unmatched", "--max-files", "1"],
+    ],
+)
+def test_ndjson_stream_reassembles_to_json_bundle(tmp_path: Path, extra: list[str]) -> None:
+    project_dir = _project(tmp_path)
+    base = [sys.executable, str(LOADER), "--project-dir", str(project_dir), "--task", "rollout spec", "--no-cache"]
+    bundle = json.loads(run_cmd([*base, *extra], cwd=REPO_ROOT).stdout)
+    streamed = run_cmd([*base, *extra, "--format", "ndjson"], cwd=REPO_ROOT).stdout.splitlines()
+
+    assert len(streamed) == len(bundle["files"]) + 2
+    assert _reassemble(streamed) == bundle
+
+
+def test_ndjson_writes_header_before_reading_and_reads_unrestricted_files_one_at_a_time(tmp_path: Path) -> None:
+    project_dir = _project(tmp_path)
+    # Without control-plane files every budgeted level fails and the unrestricted level is streamed.
+    (project_dir / ".cortex" / "manifest_v0.json").unlink()
+    events: list[str] = []
+
+    class Sink:
+        def write(self, text: str) -> None:
+            events.append("write:" + json.loads(text)["record"])
+
+        def flush(self) -> None:
+            pass
+
+    def read_text(rel: str) -> str:
+        events.append("read")
+        return (project_dir / rel).read_text(encoding="utf-8")
+
+    args = loader.parse_args(["--project-dir", str(project_dir), "--task", "nothing", "--format", "ndjson"])
+    loader.stream_output(args, project_dir, 1, 100, None, ArtifactIndex(project_dir, None), None, Sink(), read_text)
+
+    assert events[0] == "write:header"
+    assert events[-1] == "write:summary"
+    assert events[1:-1] == ["read", "write:file"] * 6
+
+
+def test_ndjson_rejects_since_bundle(tmp_path: Path) -> None:
+    proc = run_cmd(
+        [
+            sys.executable,
+            str(LOADER),
+            "--project-dir",
+            str(tmp_path),
+            "--format",
+            "ndjson",
+            "--since-bundle",
+            "0" * 64,
+        ],
+        cwd=REPO_ROOT,
+        expect_code=2,
+    )
+    assert "--since-bundle requires --format json" in proc.stderr
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from context_packer_v0 import pack_files, split_sections  # noqa: E402
+
+
+def test_split_sections_by_markdown_heading_and_json_key() -> None:
+    markdown = "intro line\n# Title\nbody\n## Sub\nmore\n"
+    sections = split_sections("specs/a.md", markdown)
+    assert [title for title, _ in sections] == ["", "Title", "Sub"]
+    assert "".join(text for _, text in sections) == markdown
+
+    sections = split_sections("x.json", json.dumps({"a": 1, "b": {"c": 2}}))
+    assert [title for title, _ in sections] == ["a", "b"]
+    assert split_sections("x.json", "{not json") == [("", "{not json")]
+
+
+def test_pack_files_keeps_control_plane_first_and_prefers_relevant_sections() -> None:
+    boilerplate = "".join(f"## Boilerplate {idx}\n" + "filler text " * 20 + "\n" for idx in range(6))
+    files = [
+        {"path": "manifest.json", "selected_by": "control_plane", "text": '{"project": "demo"}', "truncated": False},
+        {"path": "specs/a_generic.md", "selected_by": "task:spec:specs/*.md", "text": boilerplate, "truncated": False},
+        {
+            "path": "specs/z_hydration.md",
+            "selected_by": "task:spec:specs/*.md",
+            "text": "# Hydration\nhydration receipts are verified per turn\n## Unrelated\n" + "noise " * 60,
+            "truncated": False,
+        },
+    ]
+
+    packed, warnings, packed_chars = pack_files(files, "verify hydration receipts", 600, 2500)
+
+    assert warnings == []
+    assert packed_chars <= 600
+    assert sum(len(item["excerpt"]) for item in packed) == packed_chars
+    assert packed[0]["path"] == "manifest.json"
+    by_path = {item["path"]: item for item in packed}
+    assert by_path["specs/z_hydration.md"]["sections"][0] == "Hydration"
+    assert by_path["specs/z_hydration.md"]["truncated"] is True
+
+    tight, warnings, _ = pack_files(files, "verify hydration receipts", 10, 2500)
+    assert warnings == ["packing_budget_exhausted:manifest.json"]
+    assert tight == []
+
+
+def test_loader_global_budget_mode_packs_within_total(tmp_path: Path) -> None:
+    (tmp_path / ".cortex").mkdir()
+    (tmp_path / ".cortex" / "manifest_v0.json").write_text('{"project": "demo"}', encoding="utf-8")
+    (tmp_path / "specs").mkdir()
+    for idx in range(4):
+        (tmp_path / "specs" / f"a{idx}_spec_v0.md").write_text("# Notes\n" + "generic " * 400, encoding="utf-8")
+    (tmp_path / "specs" / "z_hydration_spec_v0.md").write_text(
+        "# Hydration\ncontext hydration receipts\n## Appendix\n" + "other " * 400, encoding="utf-8"
+    )
+    loader = REPO_ROOT / "scripts" / "agent_context_loader_v0.py"
+    base = [sys.executable, str(loader), "--project-dir", str(tmp_path), "--task", "spec hydration receipts"]
+
+    bundle = json.loads(run_cmd([*base, "--max-files", "3", "--max-tokens", "250"], cwd=REPO_ROOT).stdout)
+
+    assert bundle["budget"]["max_total_chars"] == 1000
+    assert bundle["budget"]["packed_chars"] <= 1000
+    assert bundle["files"][0]["selected_by"] == "control_plane"
+    assert "specs/z_hydration_spec_v0.md" in [item["path"] for item in bundle["files"]]
+    assert bundle["fallback_attempts"][0]["max_total_chars"] == 1000
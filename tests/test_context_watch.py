@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import REPO_ROOT, run_cmd
+
+
+LOADER = REPO_ROOT / "scripts" / "agent_context_loader_v0.py"
+REQUESTS = (
+    ["--task", "spec"],
+    ["--task", "rollout spec", "--ranking", "bm25"],
+    ["--task", "rollout", "--ranking", "bm25", "--max-total-chars", "400"],
+)
+
+
+def _project(tmp_path: Path) -> Path:
+    project_dir = tmp_path / "proj"
+    (project_dir / ".cortex" / "artifacts" / "decisions").mkdir(parents=True)
+    (project_dir / ".cortex" / "manifest_v0.json").write_text('{"project": "demo"}', encoding="utf-8")
+    (project_dir / ".cortex" / "artifacts" / "decisions" / "decision_rollout_v1.md").write_text(
+        "# Rollout\n\nship behind a flag\n", encoding="utf-8"
+    )
+    (project_dir / "specs").mkdir()
+    (project_dir / "specs" / "alpha_spec_v0.md").write_text("# Alpha\n\nrollout notes\n", encoding="utf-8")
+    return project_dir
+
+
+def _one_shot(project_dir: Path, argv: list[str]) -> str:
+    argv = [sys.executable, str(LOADER), "--project-dir", str(project_dir), "--no-cache", *argv]
+    return run_cmd(argv, cwd=REPO_ROOT).stdout
+
+
+def _mutate(project_dir: Path, step: int) -> None:
+    if step == 0:
+        (project_dir / "specs" / "beta_spec_v0.md").write_text("# Beta\n\nrollout rollout\n", encoding="utf-8")
+    elif step == 1:
+        decision = project_dir / ".cortex" / "artifacts" / "decisions" / "decision_rollout_v1.md"
+        decision.write_text("# Rollout\n\nhold the flag\n", encoding="utf-8")
+    elif step == 2:
+        (project_dir / "specs" / "alpha_spec_v0.md").unlink()
+    else:
+        (project_dir / "policies").mkdir()
+        (project_dir / "policies" / "rollout_policy.md").write_text("# Policy\n\nrollout rules\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize("backend", ["inotify", "poll"])
+def test_watch_mode_matches_one_shot_loader_across_changes(tmp_path: Path, backend: str) -> None:
+    if backend == "inotify" and not sys.platform.startswith("linux"):
+        pytest.skip("inotify requires Linux")
+    project_dir = _project(tmp_path)
+    proc = subprocess.Popen(
+        [sys.executable, str(LOADER), "--project-dir", str(project_dir), "--watch", "--watch-backend", backend],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert proc.stdin is not None and proc.stdout is not None
+
+    def request(payload: dict) -> dict:
+        proc.stdin.write(json.dumps(payload) + "\n")
+        proc.stdin.flush()
+        return json.loads(proc.stdout.readline())
+
+    try:
+        for step in range(5):
+            for idx, argv in enumerate(REQUESTS):
+                response = request({"version": "v0", "op": "load", "id": f"{step}-{idx}", "argv": argv})
+                assert response["id"] == f"{step}-{idx}"
+                assert response["returncode"] == 0, response["stderr"]
+                assert response["stdout"] == _one_shot(project_dir, argv)
+            if step < 4:
+                _mutate(project_dir, step)
+        info = request({"op": "ping"})
+        assert info["backend"] == backend
+        assert info["served"] == 5 * len(REQUESTS)
+        assert request({"op": "load", "argv": ["--max-files", "many"]})["returncode"] == 2
+        assert request({"op": "shutdown"})["status"] == "ok"
+        assert proc.wait(timeout=10) == 0
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_watch_mode_serves_requests_over_unix_socket(tmp_path: Path) -> None:
+    project_dir = _project(tmp_path)
+    socket_path = tmp_path / "watch.sock"
+    proc = subprocess.Popen(
+        [sys.executable, str(LOADER), "--project-dir", str(project_dir), "--watch", "--socket", str(socket_path)]
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            stream = client.makefile("rw", encoding="utf-8")
+            for payload in ({"op": "load", "argv": list(REQUESTS[1])}, {"op": "shutdown"}):
+                stream.write(json.dumps(payload) + "\n")
+                stream.flush()
+            loaded = json.loads(stream.readline())
+            assert loaded["stdout"] == _one_shot(project_dir, list(REQUESTS[1]))
+            assert json.loads(stream.readline())["status"] == "ok"
+        assert proc.wait(timeout=10) == 0
+        assert not socket_path.exists()
+    finally:
+        proc.kill()
+        proc.wait()
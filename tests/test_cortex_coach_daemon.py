@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from conftest import COACH_SCRIPT, REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import cortex_coach_daemon_v0 as daemon  # noqa: E402
+
+
+DAEMON_SCRIPT = REPO_ROOT / "scripts" / "cortex_coach_daemon_v0.py"
+FAKE_COACH = """#!{python}
+import os
+import socket
+import sys
+import threading
+
+print("argv=" + " ".join(sys.argv[1:]))
+print("cwd=" + os.getcwd())
+print("warn=" + os.environ.get("CORTEX_FAKE_COACH_MARK", ""), file=sys.stderr)
+print("secret=" + os.environ.get("FAKE_COACH_SECRET", ""), file=sys.stderr)
+sys.exit(3 if "fail" in sys.argv else 0)
+"""
+
+
+def _fake_coach_env(tmp_path: Path) -> dict[str, str]:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    coach = bin_dir / "cortex-coach"
+    coach.write_text(FAKE_COACH.format(python=sys.executable), encoding="utf-8")
+    coach.chmod(0o755)
+    env = dict(os.environ)
+    env["PATH"] = f"{bin_dir}{os.pathsep}{env.get('PATH', '')}"
+    env["CORTEX_COACH_DAEMON"] = "1"
+    env["CORTEX_COACH_DAEMON_SOCKET"] = str(tmp_path / "run" / "d.sock")
+    return env
+
+
+def _run(args: list[str], env: dict[str, str], cwd: Path) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(args, cwd=str(cwd), env=env, text=True, capture_output=True, check=False)
+
+
+def test_delegator_output_matches_with_and_without_daemon(tmp_path: Path) -> None:
+    env = _fake_coach_env(tmp_path)
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    commands = [
+        ["audit-needed", "--project-dir", str(project_dir), "fail"],
+        ["coach", "--project-dir", str(project_dir), "--format", "text"],
+    ]
+
+    fallback = [_run([sys.executable, str(COACH_SCRIPT), *argv], env, project_dir) for argv in commands]
+
+    started = _run([sys.executable, str(DAEMON_SCRIPT), "start", "--format", "json"], env, REPO_ROOT)
+    assert started.returncode == 0, started.stdout + started.stderr
+    try:
+        env["CORTEX_FAKE_COACH_MARK"] = "per-request-env"
+        env["FAKE_COACH_SECRET"] = "must-not-reach-daemon"
+        warm = [_run([sys.executable, str(COACH_SCRIPT), *argv], env, project_dir) for argv in commands]
+        status_proc = _run([sys.executable, str(DAEMON_SCRIPT), "status", "--format", "json"], env, REPO_ROOT)
+        status = json.loads(status_proc.stdout)
+    finally:
+        _run([sys.executable, str(DAEMON_SCRIPT), "stop"], env, REPO_ROOT)
+
+    assert status["served"] == 2
+    for cold, hot in zip(fallback, warm):
+        assert (hot.returncode, hot.stdout) == (cold.returncode, cold.stdout)
+        assert hot.stderr == cold.stderr.replace("warn=", "warn=per-request-env")
+    assert [proc.returncode for proc in warm] == [3, 0]
+
+
+def test_daemon_refuses_non_python_coach(tmp_path: Path) -> None:
+    coach = tmp_path / "cortex-coach"
+    coach.write_text("#!/bin/sh\necho hi\n", encoding="utf-8")
+    coach.chmod(0o755)
+    proc = run_cmd(
+        [sys.executable, str(DAEMON_SCRIPT), "start", "--coach-bin", str(coach), "--socket", str(tmp_path / "d.sock")],
+        cwd=REPO_ROOT,
+        expect_code=1,
+    )
+    assert "not a Python console script" in proc.stdout
+
+
+def _listen(socket_dir: Path, reply: bytes) -> tuple[socket.socket, threading.Thread, list[bytes]]:
+    socket_dir.mkdir(mode=0o700)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    previous_umask = os.umask(0o077)
+    try:
+        server.bind(str(socket_dir / "d.sock"))
+    finally:
+        os.umask(previous_umask)
+    server.listen(1)
+    server.settimeout(5)
+    received: list[bytes] = []
+
+    def _reply() -> None:
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            return
+        with conn:
+            received.append(conn.makefile("rb").readline())
+            conn.sendall(reply)
+
+    thread = threading.Thread(target=_reply)
+    thread.start()
+    return server, thread, received
+
+
+def test_unreadable_daemon_reply_fails_the_command(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    server, thread, received = _listen(tmp_path / "run", b'{"version": "v0", "status": "ok", "retu\n')
+    monkeypatch.setenv("CORTEX_COACH_DAEMON", "1")
+    monkeypatch.setenv("CORTEX_COACH_DAEMON_SOCKET", str(tmp_path / "run" / "d.sock"))
+    monkeypatch.setenv("FAKE_COACH_SECRET", "must-not-reach-daemon")
+    try:
+        proc = daemon.run_command(sys.executable, ["coach"])
+    finally:
+        thread.join()
+        server.close()
+
+    assert proc is not None and proc.returncode == 1
+    assert "unreadable response" in proc.stderr
+    request = json.loads(received[0])
+    assert "FAKE_COACH_SECRET" not in request["env"]
+    assert request["env"]["CORTEX_COACH_DAEMON"] == "1"
+
+
+def test_client_is_opt_in_and_skips_untrusted_sockets(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    reply = b'{"version": "v0", "status": "ok", "returncode": 0, "stdout": "pass", "stderr": ""}\n'
+    server, thread, received = _listen(tmp_path / "run", reply)
+    monkeypatch.setenv("CORTEX_COACH_DAEMON_SOCKET", str(tmp_path / "run" / "d.sock"))
+    try:
+        monkeypatch.delenv("CORTEX_COACH_DAEMON", raising=False)
+        assert daemon.run_command(sys.executable, ["coach"]) is None
+        monkeypatch.setenv("CORTEX_COACH_DAEMON", "1")
+        (tmp_path / "run").chmod(0o755)
+        assert daemon.run_command(sys.executable, ["coach"]) is None
+        (tmp_path / "run").chmod(0o700)
+        (tmp_path / "run" / "d.sock").chmod(0o766)
+        assert daemon.run_command(sys.executable, ["coach"]) is None
+        assert received == []
+        (tmp_path / "run" / "d.sock").chmod(0o700)
+        proc = daemon.run_command(sys.executable, ["coach"])
+    finally:
+        server.close()
+        thread.join()
+
+    assert proc is not None and (proc.returncode, proc.stdout) == (0, "pass")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from ephemeral_workspace_v0 import WorkspaceProvider  # noqa: E402
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=str(cwd), check=True, capture_output=True, text=True).stdout
+
+
+def _project(tmp_path: Path) -> Path:
+    project_dir = tmp_path / "proj"
+    (project_dir / "scripts").mkdir(parents=True)
+    _git(project_dir, "init", "-q")
+    (project_dir / ".gitignore").write_text("*.log\n", encoding="utf-8")
+    (project_dir / "scripts" / "gate.sh").write_text("echo gate\n", encoding="utf-8")
+    (project_dir / "README.md").write_text("v1\n", encoding="utf-8")
+    _git(project_dir, "add", ".")
+    _git(project_dir, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-q", "-m", "init")
+    return project_dir
+
+
+def _files(root: Path) -> dict[str, str]:
+    return {
+        path.relative_to(root).as_posix(): path.read_text(encoding="utf-8")
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and ".git" not in path.relative_to(root).parts
+    }
+
+
+def test_workspace_is_clean_single_commit_snapshot_of_working_tree(tmp_path: Path) -> None:
+    project_dir = _project(tmp_path)
+    (project_dir / "README.md").write_text("v2 uncommitted\n", encoding="utf-8")
+    (project_dir / "notes.md").write_text("untracked\n", encoding="utf-8")
+    (project_dir / "debug.log").write_text("ignored\n", encoding="utf-8")
+    (project_dir / "scripts" / "__pycache__").mkdir()
+    (project_dir / "scripts" / "__pycache__" / "gate.pyc").write_text("x", encoding="utf-8")
+    source_status = _git(project_dir, "status", "--porcelain")
+
+    provider = WorkspaceProvider(project_dir)
+    with provider.acquire() as workspace:
+        assert _files(workspace) == {
+            ".gitignore": "*.log\n",
+            "README.md": "v2 uncommitted\n",
+            "notes.md": "untracked\n",
+            "scripts/gate.sh": "echo gate\n",
+        }
+        assert _git(workspace, "status", "--porcelain") == ""
+        assert _git(workspace, "rev-list", "--count", "HEAD").strip() == "1"
+
+    assert provider.store_dir == (project_dir / ".git" / "cortex" / "ephemeral_workspace_v0").resolve()
+    assert _git(project_dir, "status", "--porcelain") == source_status
+    assert _git(project_dir, "for-each-ref").count("\n") == 1
+
+
+def test_pooled_workspace_is_reset_between_uses_and_slots_are_exclusive(tmp_path: Path) -> None:
+    project_dir = _project(tmp_path)
+    provider = WorkspaceProvider(project_dir)
+
+    with provider.acquire() as first:
+        (first / "README.md").write_text("dirtied by a gate\n", encoding="utf-8")
+        (first / "report.json").write_text("{}", encoding="utf-8")
+        (first / "run.log").write_text("ignored output\n", encoding="utf-8")
+        with provider.acquire() as concurrent:
+            assert concurrent != first
+            assert _files(concurrent)["README.md"] == "v1\n"
+
+    (project_dir / "README.md").write_text("v3\n", encoding="utf-8")
+    with provider.acquire() as second:
+        assert second == first
+        assert _files(second) == {".gitignore": "*.log\n", "README.md": "v3\n", "scripts/gate.sh": "echo gate\n"}
+        assert _git(second, "status", "--porcelain") == ""
+
+
+def test_non_git_project_uses_explicit_store(tmp_path: Path) -> None:
+    project_dir = tmp_path / "plain"
+    project_dir.mkdir()
+    (project_dir / "a.txt").write_text("a\n", encoding="utf-8")
+    provider = WorkspaceProvider(project_dir, store_dir=tmp_path / "store")
+
+    commit = provider.snapshot()
+    assert provider.snapshot() == commit
+    with provider.acquire(commit) as workspace:
+        assert _files(workspace) == {"a.txt": "a\n"}
+        assert _git(workspace, "rev-parse", "HEAD").strip() == commit
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT
+
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from file_digest_cache_v0 import DigestCache  # noqa: E402
+
+
+def _write_aged(path: Path, text: str, age_seconds: int = 60) -> None:
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    aged = stat.st_mtime_ns - age_seconds * 1_000_000_000
+    os.utime(path, ns=(aged, aged))
+
+
+def test_digest_cache_reuses_digest_until_stat_changes(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache" / "file_digest_cache_v0.json"
+    target = tmp_path / "capsule.md"
+    _write_aged(target, "alpha")
+
+    first = DigestCache(cache_file)
+    assert first.sha256(target) == hashlib.sha256(b"alpha").hexdigest()
+    first.save()
+
+    second = DigestCache(cache_file)
+    assert second.sha256(target) == hashlib.sha256(b"alpha").hexdigest()
+    assert second.stats() == {"enabled": True, "hits": 1, "misses": 0}
+
+    _write_aged(target, "beta!", age_seconds=30)
+    assert second.sha256(target) == hashlib.sha256(b"beta!").hexdigest()
+    assert second.misses == 1
+
+
+def test_digest_cache_skips_recently_modified_and_disabled(tmp_path: Path) -> None:
+    cache_file = tmp_path / "file_digest_cache_v0.json"
+    target = tmp_path / "fresh.md"
+    target.write_text("fresh", encoding="utf-8")
+
+    cache = DigestCache(cache_file)
+    cache.sha256(target)
+    cache.save()
+    assert not cache_file.exists()
+
+    disabled = DigestCache(None)
+    _write_aged(target, "fresh")
+    disabled.sha256(target)
+    disabled.sha256(target)
+    assert disabled.stats() == {"enabled": False, "hits": 0, "misses": 2}
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import gate_step_timing_v0 as timing  # noqa: E402
+import perf_measurement_v0 as perf  # noqa: E402
+
+
+TIMING_SCRIPT = REPO_ROOT / "scripts" / "gate_step_timing_v0.py"
+
+
+def test_record_and_report_python_gate_and_command(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("a\n", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("b\n", encoding="utf-8")
+    gate = tmp_path / "fake_gate_v0.py"
+    gate.write_text(
+        "import subprocess, sys\n"
+        "for name in ('a.txt', 'b.txt', 'a.txt'):\n"
+        "    open(name, encoding='utf-8').read()\n"
+        "open('out.txt', 'w', encoding='utf-8').write('x')\n"
+        "subprocess.run(['true'], check=True)\n"
+        "print('gate ran')\n"
+        "raise SystemExit(3)\n",
+        encoding="utf-8",
+    )
+    records = tmp_path / "records.jsonl"
+    base = [sys.executable, str(TIMING_SCRIPT), "record", "--records-file", str(records)]
+
+    proc = run_cmd([*base, "--label", "fake", "--", "python3", str(gate)], cwd=tmp_path, expect_code=3)
+    assert proc.stdout == "gate ran\n"
+    run_cmd([*base, "--label", "shell", "--", "bash", "-c", "cat a.txt >/dev/null"], cwd=tmp_path)
+
+    gate_record, shell_record = timing.read_records(records)
+    assert (gate_record["label"], gate_record["probe"], gate_record["returncode"]) == ("fake", "python_gate", 3)
+    assert gate_record["subprocesses_spawned"] == 1
+    # Both data files count once; the gate's own imports may add a few more.
+    assert gate_record["files_read"] >= 2
+    assert gate_record["wall_seconds"] > 0 and gate_record["peak_rss_bytes"] > 0
+    assert (shell_record["probe"], shell_record["files_read"], shell_record["subprocesses_spawned"]) == (
+        "command",
+        None,
+        None,
+    )
+
+    run_cmd(
+        [
+            sys.executable,
+            str(TIMING_SCRIPT),
+            "report",
+            "--project-dir",
+            str(tmp_path),
+            "--records-file",
+            str(records),
+            "--chrome-trace",
+            "trace.json",
+            "--format",
+            "json",
+        ],
+        cwd=tmp_path,
+    )
+    report = json.loads((tmp_path / timing.DEFAULT_TIMING_PATH).read_text(encoding="utf-8"))
+    assert (report["status"], report["step_count"], report["slowest_step"]) == ("fail", 2, "fake")
+    trace = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))
+    assert [(event["name"], event["ph"]) for event in trace["traceEvents"]] == [("fake", "X"), ("shell", "X")]
+    assert trace["traceEvents"][0]["ts"] == 0
+
+
+def test_attribute_steps_ranks_the_regressed_gate() -> None:
+    def _run(slow_seconds: float, jitter: float) -> list[dict[str, float | str]]:
+        return [
+            {"label": "sync", "wall_seconds": 0.50 + jitter},
+            {"label": "boundary", "wall_seconds": slow_seconds + jitter},
+            {"label": "docs", "wall_seconds": 1.00 - jitter},
+        ]
+
+    jitters = (0.0, 0.01, -0.01, 0.005, -0.005)
+    baseline = [_run(2.0, jitter) for jitter in jitters]
+    candidate = [_run(3.0, jitter) for jitter in jitters]
+    candidate[0].append({"label": "new_gate", "wall_seconds": 0.1})
+
+    result = timing.attribute_steps(baseline, candidate)
+
+    assert result["regressed_steps"] == ["boundary"]
+    top = result["steps"][0]
+    assert (top["label"], top["verdict"], round(top["share_of_slowdown"], 6)) == ("boundary", perf.REGRESSED, 1.0)
+    assert {item["label"]: item["verdict"] for item in result["steps"][1:]} == {
+        "sync": perf.NOT_REGRESSED,
+        "docs": perf.NOT_REGRESSED,
+    }
+    assert result["candidate_only_steps"] == ["new_gate"]
+    assert timing.step_medians(candidate)["boundary"] == 3.0
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import client_training_migration_handoff_v0 as handoff  # noqa: E402
+import parallel_io_v0 as parallel_io  # noqa: E402
+
+
+def test_map_ordered_keeps_input_order_and_per_item_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    threads: set[str] = set()
+
+    def work(item: int) -> int:
+        threads.add(threading.current_thread().name)
+        time.sleep(0.002 * (5 - item % 5))
+        if item == 3:
+            raise FileNotFoundError(item)
+        return item * 10
+
+    outcomes = parallel_io.map_ordered(work, list(range(10)))
+    assert [result for result, _ in outcomes] == [0, 10, 20, None, 40, 50, 60, 70, 80, 90]
+    assert [type(error).__name__ for _, error in outcomes if error is not None] == ["FileNotFoundError"]
+    assert len(threads) > 1
+
+    monkeypatch.setenv(parallel_io.IO_WORKERS_ENV_VAR, "1")
+    threads.clear()
+    assert [result for result, _ in parallel_io.map_ordered(work, [0, 1])] == [0, 10]
+    assert threads == {threading.current_thread().name}
+
+
+def test_handoff_verify_bundle_reports_in_manifest_order(tmp_path: Path) -> None:
+    snapshot = tmp_path / "snapshot"
+    snapshot.mkdir()
+    (snapshot / "sub").mkdir()
+    entries = []
+    for idx in range(6):
+        path = snapshot / f"file_{idx}.txt"
+        path.write_text(f"payload {idx}", encoding="utf-8")
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        entries.append({"bundle_path": f"snapshot/{path.name}", "target_path": f"t/{path.name}", "sha256": digest})
+    rows = [f"{entry['sha256']}  {entry['bundle_path'].split('/', 1)[1]}" for entry in entries]
+    (tmp_path / "sha256_v0.txt").write_text("\n".join(rows) + "\n", encoding="utf-8")
+    os.chmod(snapshot / "file_1.txt", 0o755)
+    entries[2]["sha256"] = "0" * 64
+    entries.insert(3, {"bundle_path": "snapshot/missing.txt", "target_path": "t/missing.txt", "sha256": "x"})
+    entries.insert(4, {"bundle_path": "snapshot/sub", "target_path": "t/sub", "sha256": "x"})
+    entries.insert(5, "not an object")
+
+    verified, failures = handoff._verify_bundle(bundle_root=tmp_path, manifest={"files": entries})
+
+    assert [entry["bundle_path"] for entry in verified] == [f"snapshot/file_{idx}.txt" for idx in (0, 1, 3, 4, 5)]
+    assert [entry["is_executable_source"] for entry in verified] == [False, True, False, False, False]
+    assert verified[0]["size_bytes"] == len("payload 0")
+    assert [failure["error"] for failure in failures] == [
+        "checksum mismatch",
+        "source file missing",
+        "source path is not a file",
+        "non-object manifest entry",
+    ]
+
+
+def test_loader_output_is_identical_with_serial_io(tmp_path: Path) -> None:
+    (tmp_path / ".cortex").mkdir()
+    (tmp_path / ".cortex" / "manifest_v0.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "specs").mkdir()
+    for idx in range(20):
+        (tmp_path / "specs" / f"s{idx:02d}_spec_v0.md").write_text(f"# Spec {idx}\n\nrollout {idx}\n", encoding="utf-8")
+    loader = REPO_ROOT / "scripts" / "agent_context_loader_v0.py"
+    base = [sys.executable, str(loader), "--project-dir", str(tmp_path), "--task", "rollout spec", "--no-cache"]
+    serial_env = {**os.environ, parallel_io.IO_WORKERS_ENV_VAR: "1"}
+
+    for extra in ([], ["--ranking", "bm25", "--max-total-chars", "600"]):
+        parallel = run_cmd([*base, *extra, "--no-artifact-index"], cwd=REPO_ROOT).stdout
+        serial = subprocess.run(
+            [*base, *extra, "--no-artifact-index"], cwd=REPO_ROOT, env=serial_env, capture_output=True, text=True
+        ).stdout
+        assert parallel == serial
+
+
+def test_changing_width_keeps_earlier_pools_usable() -> None:
+    # A caller that fetched the width-2 pool may still be submitting after another caller switches width.
+    narrow = parallel_io._shared_pool(2)
+    wide = parallel_io._shared_pool(3)
+    assert wide is not narrow
+    assert parallel_io._shared_pool(2) is narrow
+    assert narrow.submit(lambda: "still open").result(timeout=5) == "still open"
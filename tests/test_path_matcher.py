@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sys
+from fnmatch import fnmatch
+
+from conftest import REPO_ROOT
+
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from path_matcher_v0 import GlobMatcher, RootMatcher  # noqa: E402
+
+
+PATHS = [
+    "reports/a.md",
+    "reports",
+    "reportsx/a.md",
+    "docs/reports/a.md",
+    ".cortex/reports/a.md",
+    "a/b/c/d.json",
+    "a/b",
+    "playbooks/cortex_plan_v0.md",
+    "playbooks/sub/cortex_plan_v0.md",
+    "playbooks/other.md",
+    "x/lit/y/file_1.yaml",
+    "x/y/lit/z/file_1.yaml",
+    "lit/file_1.yaml",
+    "x/[lit]/y",
+    "/leading/slash.md",
+]
+
+
+def _naive_root(path: str, roots: list[str]) -> str | None:
+    for root in roots:
+        normalized_path = path.strip("/")
+        normalized_root = root.strip("/")
+        if normalized_root and (
+            normalized_path == normalized_root or normalized_path.startswith(f"{normalized_root}/")
+        ):
+            return root.strip("/")
+    return None
+
+
+def test_root_matcher_matches_first_declared_root() -> None:
+    roots = ["a/b/c", "reports/", "a", "", "a/b"]
+    matcher = RootMatcher(roots)
+    for path in PATHS:
+        assert matcher.match(path) == _naive_root(path, roots), path
+    assert matcher.match("a/b/c/d.json") == "a/b/c"
+
+
+def test_glob_matcher_agrees_with_fnmatch() -> None:
+    globs = [
+        "playbooks/cortex_*.md",
+        "*/lit/*",
+        "*lit/*.yaml",
+        "a/*",
+        "a/b/c/?.json",
+        "x/[[]lit]/*",
+        "[!x]*/reports/*",
+        "/leading/*",
+        "*",
+    ]
+    for pattern_count in range(1, len(globs) + 1):
+        subset = globs[:pattern_count]
+        matcher = GlobMatcher(subset)
+        for path in PATHS:
+            expected = any(fnmatch(path, pattern) for pattern in subset)
+            assert (path in matcher) == expected, (subset, path)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import perf_measurement_v0 as perf  # noqa: E402
+import phase4_promotion_performance_pack_v0 as phase4_pack  # noqa: E402
+
+
+def test_run_interleaved_warms_up_then_alternates_arms() -> None:
+    calls: list[str] = []
+
+    def run_once(arm: str) -> dict[str, float]:
+        calls.append(arm)
+        return {"duration_seconds": float(len(calls))}
+
+    samples = perf.run_interleaved(["baseline", "candidate"], run_once, runs=3, warmup_runs=1)
+
+    assert calls == ["baseline", "candidate", "baseline", "candidate", "candidate", "baseline", "baseline", "candidate"]
+    assert perf.durations(samples["baseline"]["warmup"]) == [1.0]
+    assert perf.durations(samples["baseline"]["runs"]) == [3.0, 6.0, 7.0]
+    assert [record["run"] for record in samples["candidate"]["runs"]] == [1, 2, 3]
+
+
+def test_compare_samples_verdicts() -> None:
+    baseline = [10.0, 10.2, 9.9, 10.1, 10.0]
+
+    regressed = perf.compare_samples(baseline, [12.5, 12.4, 12.6, 12.5, 12.7])
+    assert regressed["verdict"] == perf.REGRESSED
+    assert regressed["delta_percent_ci"]["low"] > 10.0
+
+    # One stalled run would push a plain mean over the threshold; it is rejected as an outlier.
+    steady = perf.compare_samples(baseline, [10.1, 10.0, 10.2, 10.1, 30.0])
+    assert steady["verdict"] == perf.NOT_REGRESSED
+    assert steady["candidate"]["rejected_outliers_seconds"] == [30.0]
+
+    noisy = perf.compare_samples(baseline, [9.0, 12.0, 10.5, 11.8, 9.4])
+    assert noisy["verdict"] == perf.INCONCLUSIVE
+    assert noisy["delta_percent_ci"]["low"] <= 10.0 < noisy["delta_percent_ci"]["high"]
+
+    assert perf.compare_samples(baseline, [10.0, 10.1])["verdict"] == perf.INCONCLUSIVE
+    assert perf.overhead_target_met(noisy) is (noisy["delta_percent"] <= 10.0)
+    # A noisy sample must not turn a point estimate over the threshold into a pass.
+    over = perf.compare_samples([10.0], [10.4, 11.3, 11.2, 12.5, 13.0])
+    assert (over["verdict"], over["delta_percent"] > 10.0) == (perf.INCONCLUSIVE, True)
+    assert perf.overhead_target_met(over) is False
+    assert perf.overhead_target_met(steady) is True
+    reference = perf.compare_samples([10.0], [10.1, 10.0, 10.2])
+    assert (reference["baseline_kind"], reference["verdict"]) == ("fixed_reference", perf.NOT_REGRESSED)
+    assert perf.compare_samples(baseline, [12.5, 12.4, 12.6], seed=3) == perf.compare_samples(
+        baseline, [12.5, 12.4, 12.6], seed=3
+    )
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=str(cwd), check=True, capture_output=True, text=True).stdout.strip()
+
+
+def test_phase4_ci_overhead_interleaves_live_baseline_ref(tmp_path: Path) -> None:
+    project_dir = tmp_path / "proj"
+    (project_dir / "scripts").mkdir(parents=True)
+    gate = project_dir / "scripts" / "quality_gate_ci_v0.sh"
+    gate.write_text("sleep 0.02\necho '[quality-gate-ci] PASS'\n", encoding="utf-8")
+    report = project_dir / "phase3.json"
+    report.write_text(json.dumps({"phase3_median_seconds": 1.0}), encoding="utf-8")
+    _git(project_dir, "init", "-q")
+    _git(project_dir, "add", ".")
+    _git(project_dir, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-q", "-m", "fast gate")
+    gate.write_text("sleep 0.25\necho '[quality-gate-ci] PASS'\n", encoding="utf-8")
+
+    args = argparse.Namespace(
+        phase3_ci_report="phase3.json",
+        ci_runs=3,
+        ci_warmup_runs=1,
+        ci_step_runs=1,
+        timeout_seconds=60,
+        baseline_ref="HEAD",
+        bootstrap_seed=0,
+    )
+    payload = phase4_pack._measure_ci_overhead(args, project_dir)
+
+    assert payload["measurement_mode"].endswith("offline_probe")
+    assert payload["baseline_runs_passed"] and payload["all_runs_passed"]
+    assert max(payload["baseline_durations_seconds"]) < min(payload["phase4_durations_seconds"])
+    assert payload["overhead_comparison"]["baseline_kind"] == "samples"
+    assert payload["verdict"] == perf.REGRESSED
+    assert payload["target_met"] is False
+    # Step records come from their own round; the timed runs never pay for the per-step wrapper.
+    assert payload["step_timing_runs"] == 1
+    assert not any("steps" in item for item in payload["phase4_run_summaries"])
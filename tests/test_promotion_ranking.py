@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import random
+import sys
+from typing import Any
+
+import pytest
+
+from conftest import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import phase4_promotion_candidate_harness_v0 as harness  # noqa: E402
+import phase4_promotion_performance_pack_v0 as pack  # noqa: E402
+import promotion_ranking_v0 as ranking  # noqa: E402
+
+
+NUMPY_MODES = [False, pytest.param(True, marks=pytest.mark.skipif(ranking.np is None, reason="numpy not installed"))]
+WORDS = ("gov", "governance", "closure", "linkage", "reflect", "decision", "debt", "evidence", "ready", "high")
+QUERIES = ("", "governance closure", "gov linkage decision debt ready high evidence reflect", "zz", "closure-debt!")
+
+
+def _candidates(seed: int, count: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    # Few distinct ids and feature values, so ties reach every level of the tie-break key.
+    return [
+        {
+            "candidate_id": f"pc_{rng.randint(0, count // 2):03d}",
+            "title": " ".join(rng.choices(WORDS, k=rng.randint(0, 4))),
+            "summary": " ".join(rng.choices(WORDS, k=rng.randint(0, 3))),
+            "state": rng.choice(["ready", "blocked"]),
+            "governance_impact": rng.choice(["critical", "high", "medium", "low", "other"]),
+            "decision_refs": ["d"] * rng.randint(0, 1),
+            "reflection_refs": ["r"] * rng.randint(0, 1),
+            "evidence_refs": [str(n) for n in range(rng.randint(0, 4))],
+            "impacted_artifacts": [],
+            "owner": rng.choice(["", "gov team"]),
+            "next_action": rng.choice(["", "close linkage"]),
+        }
+        for _ in range(count)
+    ]
+
+
+def _reference_order(candidates: list[dict[str, Any]], query: str, score_mode: str) -> list[tuple[str, float]]:
+    """The per-query loop and full sort that CandidateIndex replaces."""
+    tokens = ranking.query_tokens(query)
+    weights = ranking.score_weights(score_mode)
+    rows = []
+    for candidate in candidates:
+        searchable = " ".join(str(candidate.get(field, "")) for field in ranking.SEARCH_FIELDS).lower()
+        hit_count = sum(1 for token in tokens if token in searchable)
+        lexical = min(1.0, float(hit_count) / 6.0) if tokens else 0.0
+        evidence = min(1.0, float(len(candidate["evidence_refs"])) / 3.0)
+        linkage = 1.0 if candidate["decision_refs"] and candidate["reflection_refs"] else 0.0
+        priority, impact = ranking.impact_priority(candidate["governance_impact"])
+        score = round(
+            (weights["lexical_score"] * lexical)
+            + (weights["evidence_coverage"] * evidence)
+            + (weights["linkage_score"] * linkage)
+            + (weights["impact_score"] * impact),
+            6,
+        )
+        rows.append((-score, -round(evidence, 6), priority, candidate["candidate_id"]))
+    return [(row[3], -row[0]) for row in sorted(rows)]
+
+
+@pytest.mark.parametrize("use_numpy", NUMPY_MODES)
+def test_candidate_index_matches_reference_order(use_numpy: bool) -> None:
+    for seed in range(40):
+        candidates = _candidates(seed, 1 + seed * 3)
+        for score_mode in ("uniform", "evidence_bias"):
+            index = ranking.CandidateIndex(candidates, score_mode, use_numpy=use_numpy)
+            for query in QUERIES:
+                expected = _reference_order(candidates, query, score_mode)
+                for limit in (1, 4, 500):
+                    ranked = index.rank(query, limit)
+                    assert [(index.candidate_ids[idx], score) for idx, score, _ in ranked] == expected[:limit]
+            batch = index.rank_batch(list(QUERIES), 4)
+            assert batch == [index.rank(query, 4) for query in QUERIES]
+
+
+@pytest.mark.parametrize("use_numpy", NUMPY_MODES)
+def test_candidate_index_handles_empty_and_single_candidate_lists(use_numpy: bool) -> None:
+    empty = ranking.CandidateIndex([], "evidence_bias", use_numpy=use_numpy)
+    assert empty.rank("governance closure", 8) == []
+    assert empty.rank_batch(list(QUERIES), 8) == [[] for _ in QUERIES]
+
+    candidates = _candidates(3, 1)
+    single = ranking.CandidateIndex(candidates, "evidence_bias", use_numpy=use_numpy)
+    for query in QUERIES:
+        expected = _reference_order(candidates, query, "evidence_bias")
+        assert [(single.candidate_ids[idx], score) for idx, score, _ in single.rank(query, 8)] == expected
+    assert single.rank_batch(list(QUERIES), 8) == [single.rank(query, 8) for query in QUERIES]
+
+
+def test_harness_and_pack_rows_are_stable_across_index_reuse() -> None:
+    candidates = _candidates(7, 60)
+    index = ranking.CandidateIndex(candidates, "evidence_bias")
+    first = harness._rank_candidates(
+        candidates, query="governance closure", score_mode="evidence_bias", candidate_limit=5, index=index
+    )
+    replay = harness._rank_candidates(
+        candidates, query="governance closure", score_mode="evidence_bias", candidate_limit=5, index=index
+    )
+    fresh = harness._rank_candidates(
+        candidates, query="governance closure", score_mode="evidence_bias", candidate_limit=5
+    )
+
+    assert json.dumps(first) == json.dumps(replay) == json.dumps(fresh)
+    assert [item["rank"] for item in first] == [1, 2, 3, 4, 5]
+    for item in first:
+        expected = "eligible_for_promotion"
+        if item["governance_impact"] in {"critical", "high"} and not item["linkage_complete"]:
+            expected = "block_unlinked_governance_closure"
+        assert item["enforcement_recommendation"] == expected
+
+    pack_rows = pack._rank_candidates(
+        candidates, query="governance closure", score_mode="evidence_bias", candidate_limit=5
+    )
+    assert [row["candidate_id"] for row in pack_rows] == [item["candidate_id"] for item in first]
+    assert [row["combined_score"] for row in pack_rows] == [item["combined_score"] for item in first]
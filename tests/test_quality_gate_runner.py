@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import sys
+
+from conftest import REPO_ROOT, run_cmd
+
+
+RUNNER_SCRIPT = REPO_ROOT / "scripts" / "quality_gate_runner_v0.py"
+
+
+def test_quality_gate_runner_lists_profile_steps() -> None:
+    ci = run_cmd([sys.executable, str(RUNNER_SCRIPT), "--list-steps"], cwd=REPO_ROOT)
+    local = run_cmd([sys.executable, str(RUNNER_SCRIPT), "--profile", "local", "--list-steps"], cwd=REPO_ROOT)
+
+    ci_ids = [line.split("\t")[1] for line in ci.stdout.splitlines()]
+    local_ids = [line.split("\t")[1] for line in local.stdout.splitlines()]
+    assert len(ci_ids) == 10
+    assert len(local_ids) == 11
+    assert ci_ids[0] == local_ids[0] == "sync_check"
+    assert local_ids[1] == "audit_needed"
+    assert local_ids[2:] == ci_ids[1:]
+
+
+def test_quality_gate_runner_runs_selected_steps_in_process() -> None:
+    proc = run_cmd(
+        [
+            sys.executable,
+            str(RUNNER_SCRIPT),
+            "--step",
+            "sync_check",
+            "--step",
+            "mistake_provenance",
+        ],
+        cwd=REPO_ROOT,
+    )
+    lines = proc.stdout.splitlines()
+    assert lines == [
+        "[quality-gate-ci] 1/10 quality gate sync check",
+        "[quality-gate-ci] 6/10 mistake provenance gate",
+        "[quality-gate-ci] PASS",
+    ]
+
+
+def test_quality_gate_runner_rejects_unknown_step() -> None:
+    proc = run_cmd(
+        [sys.executable, str(RUNNER_SCRIPT), "--step", "audit_needed"],
+        cwd=REPO_ROOT,
+        expect_code=2,
+    )
+    assert "unknown step id" in proc.stderr
+
+
+def test_quality_gate_runner_parallel_output_follows_declared_order() -> None:
+    args = [
+        sys.executable,
+        str(RUNNER_SCRIPT),
+        "--jobs",
+        "3",
+        "--step",
+        "mistake_provenance",
+        "--step",
+        "sync_check",
+    ]
+    proc = run_cmd(args, cwd=REPO_ROOT)
+    assert proc.stdout.splitlines() == [
+        "[quality-gate-ci] 1/10 quality gate sync check",
+        "[quality-gate-ci] 6/10 mistake provenance gate",
+        "[quality-gate-ci] PASS",
+    ]
+
+
+def test_quality_gate_runner_declares_reflection_dependencies() -> None:
+    proc = run_cmd([sys.executable, str(RUNNER_SCRIPT), "--list-steps"], cwd=REPO_ROOT)
+    deps = {line.split("\t")[1]: line.split("\t")[3] for line in proc.stdout.splitlines()}
+    assert deps["reflection_enforcement"] == "decision_gap_check,phase4_enforcement"
+    assert {step_id for step_id, value in deps.items() if value != "-"} == {"reflection_enforcement"}
+
+
+def test_quality_gate_runner_writes_step_timing_artifact(tmp_path) -> None:
+    timing_out = tmp_path / "timing.json"
+    run_cmd(
+        [
+            sys.executable,
+            str(RUNNER_SCRIPT),
+            "--step",
+            "sync_check",
+            "--step",
+            "mistake_provenance",
+            "--timing-out",
+            str(timing_out),
+            "--chrome-trace",
+            str(tmp_path / "trace.json"),
+        ],
+        cwd=REPO_ROOT,
+    )
+    payload = json.loads(timing_out.read_text(encoding="utf-8"))
+    assert payload["status"] == "pass"
+    assert [item["step_id"] for item in payload["steps"]] == ["sync_check", "mistake_provenance"]
+    for item in payload["steps"]:
+        assert item["probe"] == "in_process"
+        assert item["wall_seconds"] > 0 and item["files_read"] >= 1
+    trace = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))
+    assert len(trace["traceEvents"]) == 2
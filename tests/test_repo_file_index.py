@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from conftest import REPO_ROOT, init_git_repo, run_cmd
+
+
+INDEX_SCRIPT = REPO_ROOT / "scripts" / "repo_file_index_v0.py"
+
+
+def _index(project_dir: Path, *extra: str) -> dict:
+    proc = run_cmd(
+        [sys.executable, str(INDEX_SCRIPT), "--project-dir", str(project_dir), "--format", "json", *extra],
+        cwd=REPO_ROOT,
+    )
+    return json.loads(proc.stdout)
+
+
+def _files(project_dir: Path) -> list[str]:
+    proc = run_cmd([sys.executable, str(INDEX_SCRIPT), "--project-dir", str(project_dir)], cwd=REPO_ROOT)
+    return proc.stdout.splitlines()
+
+
+def _age_worktree(project_dir: Path) -> None:
+    """Backdate worktree mtimes past the racy window, as for a tree that has been at rest."""
+    past = time.time() - 60
+    for root, dirnames, filenames in os.walk(project_dir):
+        dirnames[:] = [name for name in dirnames if name != ".git"]
+        for name in filenames:
+            os.utime(os.path.join(root, name), (past, past))
+        os.utime(root, (past, past))
+    exclude = project_dir / ".git" / "info" / "exclude"
+    if exclude.exists():
+        os.utime(exclude, (past, past))
+
+
+def test_repo_file_index_reuses_persisted_listing_until_repo_state_changes(tmp_path: Path) -> None:
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    init_git_repo(project_dir)
+    (project_dir / "README.md").write_text("readme", encoding="utf-8")
+    run_cmd(["git", "add", "README.md"], cwd=project_dir)
+    run_cmd(["git", "commit", "-m", "baseline"], cwd=project_dir)
+    _age_worktree(project_dir)
+
+    first = _index(project_dir)
+    assert first["scans"] == 2
+    assert first["file_count"] == 1
+
+    warm = _index(project_dir)
+    assert warm["scans"] == 0
+
+    (project_dir / "reports").mkdir()
+    (project_dir / "reports" / "new.md").write_text("new", encoding="utf-8")
+    assert _files(project_dir) == ["README.md", "reports/new.md"]
+
+    (project_dir / ".gitignore").write_text("reports/\n", encoding="utf-8")
+    assert _files(project_dir) == [".gitignore", "README.md"]
+
+    run_cmd(["git", "add", "-f", "reports/new.md"], cwd=project_dir)
+    assert _files(project_dir) == [".gitignore", "README.md", "reports/new.md"]
+
+
+def test_repo_file_index_cache_can_be_disabled(tmp_path: Path, monkeypatch) -> None:
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    init_git_repo(project_dir)
+    (project_dir / "a.txt").write_text("a", encoding="utf-8")
+
+    monkeypatch.setenv("CORTEX_REPO_INDEX_CACHE", "0")
+    _index(project_dir)
+    second = _index(project_dir)
+    assert second["scans"] == 2
+    assert second["cache_path"] == ""
+    assert not (project_dir / ".git" / "cortex" / "repo_file_index_v0.json").exists()
+
+
+def test_repo_file_index_sees_new_files_in_ignored_only_and_fresh_directories(tmp_path: Path) -> None:
+    project_dir = tmp_path / "proj"
+    (project_dir / "cache" / "sub").mkdir(parents=True)
+    init_git_repo(project_dir)
+    (project_dir / ".gitignore").write_text("*.pyc\n", encoding="utf-8")
+    (project_dir / "cache" / "a.pyc").write_text("a", encoding="utf-8")
+    (project_dir / "cache" / "sub" / "b.pyc").write_text("b", encoding="utf-8")
+    run_cmd(["git", "add", ".gitignore"], cwd=project_dir)
+    run_cmd(["git", "commit", "-m", "baseline"], cwd=project_dir)
+
+    # Directories changed within the racy window are never trusted, so the next call scans again.
+    _index(project_dir)
+    assert _index(project_dir)["scans"] == 1
+
+    _age_worktree(project_dir)
+    _index(project_dir)
+    assert _index(project_dir)["scans"] == 0
+
+    (project_dir / "cache" / "sub" / "new.md").write_text("new", encoding="utf-8")
+    assert _files(project_dir) == [".gitignore", "cache/sub/new.md"]
+
+    _age_worktree(project_dir)
+    _index(project_dir)
+    (project_dir / "cache" / "sub" / "fresh").mkdir()
+    (project_dir / "cache" / "sub" / "fresh" / "c.md").write_text("c", encoding="utf-8")
+    assert _files(project_dir) == [".gitignore", "cache/sub/fresh/c.md", "cache/sub/new.md"]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import retrieval_benchmark_v0 as benchmark  # noqa: E402
+
+
+FIXTURE = REPO_ROOT / ".cortex" / "reports" / "project_state" / "phase2_retrieval_eval_fixture_freeze_v0.json"
+
+
+def _small_fixture(tmp_path: Path) -> Path:
+    fixture = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    keep = [profile["query_ids"][0] for profile in fixture["profiles"][:2]]
+    fixture["profiles"] = [
+        {**profile, "query_ids": [query_id for query_id in profile["query_ids"] if query_id in keep]}
+        for profile in fixture["profiles"][:2]
+    ]
+    fixture["queries"] = [query for query in fixture["queries"] if query["query_id"] in keep]
+    path = tmp_path / "fixture.json"
+    path.write_text(json.dumps(fixture), encoding="utf-8")
+    return path
+
+
+def test_synthesize_corpus_is_deterministic_and_reused(tmp_path: Path) -> None:
+    queries = json.loads(FIXTURE.read_text(encoding="utf-8"))["queries"]
+
+    def snapshot(root: Path) -> dict[str, str]:
+        return {
+            str(path.relative_to(root)): path.read_text(encoding="utf-8")
+            for path in sorted(root.rglob("*"))
+            if path.is_file()
+        }
+
+    assert benchmark.synthesize_corpus(tmp_path / "a", 120, queries, seed=3) is True
+    assert benchmark.synthesize_corpus(tmp_path / "b", 120, queries, seed=3) is True
+    assert benchmark.synthesize_corpus(tmp_path / "a", 120, queries, seed=3) is False
+    corpus = snapshot(tmp_path / "a")
+    assert corpus == snapshot(tmp_path / "b")
+    assert sum(1 for rel in corpus if rel.endswith(".md")) == 120
+    assert any(rel.startswith("specs/") for rel in corpus)
+    assert any(rel.startswith(".cortex/artifacts/decisions/decision_") for rel in corpus)
+
+
+def test_benchmark_reports_quality_and_cost_per_scale_and_mode(tmp_path: Path) -> None:
+    out_file = tmp_path / "report.json"
+    proc = run_cmd(
+        [
+            sys.executable,
+            str(REPO_ROOT / "scripts" / "retrieval_benchmark_v0.py"),
+            "--project-dir",
+            str(REPO_ROOT),
+            "--fixture-file",
+            str(_small_fixture(tmp_path)),
+            "--scales",
+            "60,30",
+            "--modes",
+            "pattern,bm25",
+            "--runs-per-query",
+            "2",
+            "--work-dir",
+            str(tmp_path / "work"),
+            "--out-file",
+            str(out_file),
+            "--format",
+            "json",
+        ],
+        cwd=REPO_ROOT,
+    )
+    payload = json.loads(proc.stdout)
+    assert payload == {**json.loads(out_file.read_text(encoding="utf-8")), "out_file": payload["out_file"]}
+    assert payload["status"] == "pass"
+    assert payload["scales"] == [30, 60]
+    assert [(row["artifact_count"], row["mode"]) for row in payload["results"]] == [
+        (30, "pattern"),
+        (30, "bm25"),
+        (60, "pattern"),
+        (60, "bm25"),
+    ]
+    for row in payload["results"]:
+        assert row["query_count"] == 2
+        assert row["sample_count"] == 4
+        assert 0.0 <= row["median_ndcg_at_k"] <= 1.0
+        assert 0.0 <= row["median_top_k_recall"] <= 1.0
+        assert 0.0 < row["latency_p50_seconds"] <= row["latency_p95_seconds"]
+        assert row["peak_rss_bytes"] > 0
+        if sys.platform.startswith("linux"):
+            assert row["bytes_read_p50"] > 0
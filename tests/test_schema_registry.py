@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import jsonschema
+import pytest
+
+from conftest import REPO_ROOT
+
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import schema_registry_v0 as registry  # noqa: E402
+
+
+SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "required": ["name"],
+    "properties": {"name": {"type": "string"}, "count": {"type": "integer"}},
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    registry.clear_session_cache()
+    yield
+    registry.clear_session_cache()
+
+
+def test_registry_compiles_once_and_matches_jsonschema_messages(tmp_path: Path) -> None:
+    schema_file = tmp_path / "demo_schema_v0.json"
+    schema_file.write_text(json.dumps(SCHEMA), encoding="utf-8")
+    instances = [{"name": "ok"}, {"count": 1}, {"name": "x", "count": "many"}]
+
+    results = registry.validate_instances(schema_file, instances)
+    assert results[0] is None
+    for instance, message in zip(instances[1:], results[1:]):
+        with pytest.raises(jsonschema.ValidationError) as excinfo:
+            jsonschema.validate(instance=instance, schema=SCHEMA)
+        assert message == str(excinfo.value)
+
+    assert registry.load_validator(schema_file) is registry.load_validator(schema_file)
+    assert registry.registry_stats()["compiled"] == 1
+
+    # Same content with a new mtime reuses the validator; new content recompiles it.
+    stat = schema_file.stat()
+    os.utime(schema_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    registry.load_validator(schema_file)
+    assert registry.registry_stats()["compiled"] == 1
+    schema_file.write_text(json.dumps({**SCHEMA, "required": ["count"]}), encoding="utf-8")
+    assert registry.validate_instance(schema_file, {"name": "ok"}) is not None
+    assert registry.registry_stats()["compiled"] == 2
+
+
+def test_registry_lists_and_compiles_repo_contract_schemas() -> None:
+    schema_files = registry.contract_schema_files(REPO_ROOT / "contracts")
+    names = {path.name for path in schema_files}
+    assert "context_hydration_receipt_schema_v0.json" in names
+    assert "mistake_candidate_schema_v0.json" not in names
+    for path in schema_files:
+        registry.load_validator(path)
+    assert registry.registry_stats()["cached_validators"] == len(schema_files)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+from conftest import REPO_ROOT, run_cmd
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import phase3_adapter_performance_pack_v0 as phase3_pack  # noqa: E402
+import phase4_promotion_performance_pack_v0 as phase4_pack  # noqa: E402
+import synthetic_fixture_generator_v0 as generator  # noqa: E402
+
+
+GENERATOR_SCRIPT = REPO_ROOT / "scripts" / "synthetic_fixture_generator_v0.py"
+FIXTURES = REPO_ROOT / ".cortex" / "fixtures"
+
+
+def _item_keys(path: Path, key: str) -> set[str]:
+    return set(json.loads(path.read_text(encoding="utf-8"))[key][0])
+
+
+def test_generator_is_deterministic_and_matches_frozen_schemas(tmp_path: Path) -> None:
+    base = [sys.executable, str(GENERATOR_SCRIPT), "--project-dir", str(REPO_ROOT), "--scales", "300,30"]
+    for name in ("a", "b"):
+        run_cmd([*base, "--seed", "3", "--work-dir", str(tmp_path / name), "--format", "json"], cwd=REPO_ROOT)
+    files_a = sorted(path.relative_to(tmp_path / "a") for path in (tmp_path / "a").rglob("[!.]*_v0.json"))
+    # One freeze per family, two Phase 4 scenarios and one Phase 3 scenario per scale.
+    assert len(files_a) == 2 + 3 * 2
+    for rel in files_a:
+        text_a = (tmp_path / "a" / rel).read_text(encoding="utf-8")
+        text_b = (tmp_path / "b" / rel).read_text(encoding="utf-8")
+        # Freezes carry absolute fixture refs for out-of-tree work dirs; scenario files must match byte for byte.
+        assert text_a.replace(str(tmp_path / "a"), "") == text_b.replace(str(tmp_path / "b"), "")
+
+    rerun = run_cmd([*base, "--seed", "3", "--work-dir", str(tmp_path / "a"), "--format", "json"], cwd=REPO_ROOT)
+    assert not any(row["generated"] for family in json.loads(rerun.stdout)["families"] for row in family["files"])
+
+    scale_dir = tmp_path / "a" / "phase4_promotion" / "scale_300_seed3"
+    candidates = json.loads((scale_dir / "candidate_ranking_v0.json").read_text(encoding="utf-8"))
+    assert len(candidates["tactical_candidates"]) == 300
+    assert _item_keys(scale_dir / "candidate_ranking_v0.json", "tactical_candidates") >= _item_keys(
+        FIXTURES / "phase4_promotion" / "large_high_cardinality_candidate_ranking_v0.json", "tactical_candidates"
+    )
+    assert _item_keys(scale_dir / "governance_debt_backlog_v0.json", "governance_debt_items") == _item_keys(
+        FIXTURES / "phase4_promotion" / "large_governance_debt_backlog_v0.json", "governance_debt_items"
+    )
+    adapter_file = tmp_path / "a" / "phase3_adapter" / "scale_300_seed3" / "adapter_healthy_v0.json"
+    assert _item_keys(adapter_file, "items") == _item_keys(
+        FIXTURES / "phase3_adapter" / "large_adapter_healthy_v0.json", "items"
+    )
+    impacts = {item["governance_impact"] for item in candidates["tactical_candidates"]}
+    assert impacts == {"critical", "high", "medium", "low"}
+
+    freeze, _ = generator.build_scale_freeze(REPO_ROOT, "phase3_adapter", [30, 300], seed=3, work_dir=tmp_path / "a")
+    cases = phase3_pack._build_cases_by_profile(freeze)
+    assert list(cases) == ["scale_30", "scale_300"]
+    assert {case.expected_adapter_status for rows in cases.values() for case in rows} == {"loaded"}
+    assert [profile["retrieval_profile"] for profile in freeze["profiles"]] == ["large", "large"]
+
+
+def test_phase4_scale_profiles_report_latency_growth(tmp_path: Path) -> None:
+    args = phase4_pack._build_parser().parse_args(
+        ["--scale", "40,400", "--scale-runs", "2", "--scale-work-dir", str(tmp_path), "--scale-seed", "1"]
+    )
+    result = phase4_pack._measure_scale(args, REPO_ROOT, generator.parse_scales(args.scale))
+
+    assert [(row["scale"], row["candidate_count"], row["runs"]) for row in result["profiles"]] == [
+        (40, 80, 2),
+        (400, 800, 2),
+    ]
+    assert result["growth"]["scales"] == [40, 400]
+    assert result["growth"]["scale_ratio"] == 10.0
+    assert result["growth"]["growth_class"] in {"sublinear", "linear", "superlinear"}
+
+    linear = generator.latency_growth([(1000, 0.01), (10000, 0.1), (100000, 1.0)])
+    assert (linear["growth_exponent"], linear["growth_class"]) == (1.0, "linear")
+    assert generator.latency_growth([(1000, 0.01)])["growth_exponent"] is None